@@ -0,0 +1,260 @@
+"""
+Entraînement par lot de l'IA des allumettes (self-play vectorisé).
+
+`train_batch` remplace la boucle `GameModel.play()` + `AI.train()` de
+`main._start_training` : des milliers de parties sont jouées en même
+temps avec NumPy (nombre d'allumettes, joueur au trait, tirages
+ε-greedy contre la `ValueTable`), puis la value-function de l'élève est
+mise à jour en une passe TD sur toutes les transitions du lot.
+
+Équivalences avec le code séquentiel :
+
+- Mêmes politiques : `Player` (aléatoire), `PerfectPlayer` et `AI`
+  (ε-greedy, même départage des égalités que `ValueTable.best_move`).
+- Même tirage du premier joueur que `GameModel.shuffle` (une chance sur deux).
+- Mêmes transitions que `AI.play` / `AI.win` / `AI.lose` : (n, n') entre
+  deux tours de l'élève, puis (n, "win") ou (n, "lose") en fin de partie.
+- Même décroissance d'ε (`AI.next_epsilon` tous les `epsilon_decay` parties).
+
+La mise à jour TD parcourt les nombres d'allumettes par ordre croissant,
+ce qui correspond à l'ordre inverse de `AI.train` (les états d'une partie
+décroissent). Les transitions sont agrégées dans une matrice de comptage
+[état, écart vers l'état suivant] : le coût d'une mise à jour dépend du
+nombre d'allumettes, pas du nombre de parties du lot.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+from .player import AI, Human, PerfectPlayer, Player
+from .solver import LOSE, MAX_TAKE, WIN, ValueTable
+
+
+_MAX_GAP: int = 2 * MAX_TAKE
+"""Écart max entre deux tours de l'élève (son coup + celui de l'adversaire)."""
+
+# Colonnes de la matrice de comptage : écarts 1.._MAX_GAP puis terminaux
+_COL_WIN: int = _MAX_GAP
+_COL_LOSE: int = _MAX_GAP + 1
+_NB_COLS: int = _MAX_GAP + 2
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Politiques vectorisées
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _random_moves(rng: np.random.Generator, nb: np.ndarray) -> np.ndarray:
+    """Coup uniforme dans 1..min(3, nb) pour chaque partie (cf. Player.play)."""
+    return (rng.random(len(nb)) * np.minimum(MAX_TAKE, nb)).astype(np.int64) + 1
+
+
+def _greedy_moves(values: np.ndarray, nb: np.ndarray) -> np.ndarray:
+    """Version vectorisée de `ValueTable.best_move` (égalité => plus petit coup)."""
+    takes = np.arange(1, MAX_TAKE + 1)
+    after = nb[:, None] - takes[None, :]
+    neighbour = np.where(after >= 0, values[np.maximum(after, 0)], np.inf)
+    return np.argmin(neighbour, axis=1) + 1
+
+
+def _perfect_moves(rng: np.random.Generator, nb: np.ndarray) -> np.ndarray:
+    """Version vectorisée de `PerfectPlayer.play`."""
+    take = (nb - 1) % (MAX_TAKE + 1)
+    return np.where(take > 0, take, _random_moves(rng, nb))
+
+
+def _policy_moves(
+    player: Player,
+    nb: np.ndarray,
+    epsilon: np.ndarray | float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Coups joués par `player` dans chaque partie (nb allumettes restantes).
+
+    Raises:
+        ValueError: pour un joueur humain (pas de politique automatique).
+    """
+    if isinstance(player, AI):
+        explore = rng.random(len(nb)) < epsilon
+        return np.where(
+            explore, _random_moves(rng, nb), _greedy_moves(player.value_function.values, nb)
+        )
+    if isinstance(player, PerfectPlayer):
+        return _perfect_moves(rng, nb)
+    if isinstance(player, Human):
+        raise ValueError("Un joueur humain ne peut pas jouer un lot de parties")
+    return _random_moves(rng, nb)
+
+
+def _opponent_epsilon(opponent: Player) -> float:
+    """ε de l'adversaire s'il s'agit d'une IA (0 sinon, valeur ignorée)."""
+    return opponent.epsilon if isinstance(opponent, AI) else 0.0
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Lot de parties
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def play_batch(
+    student: AI,
+    opponent: Player,
+    nb_games: int,
+    nb_matches: int,
+    epsilon: np.ndarray | float,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, int]:
+    """
+    Joue `nb_games` parties élève contre adversaire, toutes en même temps.
+
+    Les deux value-functions sont figées pendant le lot (l'élève n'apprend
+    qu'ensuite, via `td_update_batch`).
+
+    Args:
+        student: IA qui apprend (politique ε-greedy, ε par partie).
+        opponent: Adversaire (Player, PerfectPlayer ou AI).
+        nb_games: Taille du lot.
+        nb_matches: Nombre d'allumettes au départ.
+        epsilon: ε de l'élève, scalaire ou un par partie.
+        rng: Générateur aléatoire NumPy.
+
+    Returns:
+        Tuple (counts, student_wins) : matrice [état, colonne] du nombre de
+        transitions de l'élève (colonnes : écart 1.._MAX_GAP vers son état
+        suivant, puis victoire, défaite) et nombre de parties gagnées.
+    """
+    student.value_function.grow(nb_matches)
+    if isinstance(opponent, AI):
+        opponent.value_function.grow(nb_matches)
+    epsilon = np.broadcast_to(epsilon, (nb_games,))
+
+    nb = np.full(nb_games, nb_matches, dtype=np.int64)
+    student_turn = rng.random(nb_games) < 0.5     # GameModel.shuffle
+    previous = np.full(nb_games, -1, dtype=np.int64)
+    active = np.ones(nb_games, dtype=bool)
+    counts = np.zeros((nb_matches + 1, _NB_COLS), dtype=np.int64)
+    student_wins = 0
+
+    while active.any():
+        games = np.flatnonzero(active)
+        turn = student_turn[games]
+
+        # Tour de l'élève : transition (état précédent, état courant)
+        mine = games[turn]
+        seen = mine[previous[mine] >= 0]
+        np.add.at(counts, (previous[seen], previous[seen] - nb[seen] - 1), 1)
+        previous[mine] = nb[mine]
+
+        moves = np.empty(len(games), dtype=np.int64)
+        moves[turn] = _policy_moves(student, nb[mine], epsilon[mine], rng)
+        theirs = games[~turn]
+        moves[~turn] = _policy_moves(opponent, nb[theirs], _opponent_epsilon(opponent), rng)
+        nb[games] -= moves
+
+        # Fin de partie : celui qui a pris la dernière allumette perd
+        over = games[nb[games] <= 0]
+        lost = student_turn[over]
+        played = previous[over] >= 0   # l'élève a joué au moins un coup
+        np.add.at(
+            counts,
+            (previous[over][played], np.where(lost, _COL_LOSE, _COL_WIN)[played]),
+            1,
+        )
+        student_wins += int((~lost).sum())
+        active[over] = False
+        student_turn[games] = ~student_turn[games]
+
+    return counts, student_wins
+
+
+def td_update_batch(table: ValueTable, counts: np.ndarray, learning_rate: float) -> None:
+    """
+    Mise à jour TD de `table` avec les transitions agrégées d'un lot.
+
+    Les états sont parcourus par ordre croissant, comme `AI.train` parcourt
+    une partie à l'envers : la cible V(n') d'un état est déjà à jour. Pour
+    un état vu k fois, la cible est la moyenne des k cibles et le pas vaut
+    1 - (1 - α)^k, soit exactement l'effet de k mises à jour séquentielles
+    vers une même cible.
+
+    Args:
+        table: Value-function de l'élève (modifiée sur place).
+        counts: Matrice renvoyée par `play_batch`.
+        learning_rate: α de l'élève.
+    """
+    values = table.values
+    for n in np.flatnonzero(counts.sum(axis=1)):
+        row = counts[n]
+        nb_seen = int(row.sum())
+        gaps = np.flatnonzero(row[:_MAX_GAP])
+        target = (
+            float(row[gaps] @ values[n - gaps - 1])
+            + row[_COL_WIN] * WIN
+            + row[_COL_LOSE] * LOSE
+        ) / nb_seen
+        step = 1.0 - (1.0 - learning_rate) ** nb_seen
+        values[n] += step * (target - values[n])
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Boucle d'entraînement
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def train_batch(
+    student: AI,
+    opponent: Player,
+    nb_games: int,
+    nb_matches: int = 12,
+    epsilon_decay: int = 5000,
+    batch_size: int = 1024,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    Entraîne `student` sur `nb_games` parties jouées par lots.
+
+    Même contrat que la boucle de `main._start_training` : ε de l'élève
+    décroît via `AI.next_epsilon` toutes les `epsilon_decay` parties, et
+    les compteurs `nb_wins` / `nb_loses` des deux joueurs sont mis à jour.
+
+    Args:
+        student: IA qui apprend.
+        opponent: Adversaire (n'apprend pas).
+        nb_games: Nombre total de parties.
+        nb_matches: Nombre d'allumettes au départ.
+        epsilon_decay: Parties entre deux appels à `student.next_epsilon()`.
+        batch_size: Parties jouées entre deux mises à jour TD.
+        progress_callback: Fonction(games_done, total) appelée après chaque
+            lot. None pour désactiver.
+        seed: Graine du générateur NumPy (reproductibilité).
+    """
+    rng = np.random.default_rng(seed)
+
+    # ε de chaque palier de décroissance (mêmes valeurs que la boucle séquentielle)
+    schedule = [student.epsilon]
+    for _ in range(max(nb_games - 1, 0) // epsilon_decay):
+        student.next_epsilon()
+        schedule.append(student.epsilon)
+    schedule = np.array(schedule)
+
+    games_done = 0
+    while games_done < nb_games:
+        size = min(batch_size, nb_games - games_done)
+        game_index = np.arange(games_done, games_done + size)
+        counts, wins = play_batch(
+            student, opponent, size, nb_matches,
+            schedule[game_index // epsilon_decay], rng,
+        )
+        td_update_batch(student.value_function, counts, student.learning_rate)
+
+        student.nb_wins += wins
+        student.nb_loses += size - wins
+        opponent.nb_wins += size - wins
+        opponent.nb_loses += wins
+
+        games_done += size
+        if progress_callback is not None:
+            progress_callback(games_done, nb_games)
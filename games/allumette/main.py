@@ -17,16 +17,21 @@ Projet: IN252 - HENaLLux 2025-2026
 """
 
 import tkinter as tk
-from .player import Player, Human, AI
-from .game_model import GameModel
+from .player import Player, Human, AI, PerfectPlayer
+from .batch_train import train_batch
 from .game_controller import GameController
 from .views.matchstick_menu_view import MatchstickMenuView
 from .views.game_view import GameView
 from .views.training_view import TrainingView
 from language_manager import lang_manager
+from training_service import TrainingJobMixin
 
 
-class MatchstickGameApp(tk.Tk):
+# Parties jouées en parallèle entre deux mises à jour de la value-function
+_BATCH_SIZE = 1024
+
+
+class MatchstickGameApp(TrainingJobMixin, tk.Tk):
     """
     Application principale du jeu des allumettes.
     
@@ -75,8 +80,11 @@ class MatchstickGameApp(tk.Tk):
         3. Détruit tous ses widgets enfants
         4. Réinitialise current_view à None
         
+        Un entraînement en cours est annulé (il appartient à la vue quittée).
+
         Précondition: Peut être appelée même si current_view est None.
         """
+        self._cancel_training()
         if self.current_view:
             # Désenregistrer du gestionnaire de langue pour éviter
             # que des callbacks soient appelés sur des widgets détruits
@@ -222,7 +230,10 @@ class MatchstickGameApp(tk.Tk):
             on_start_training=lambda nb, dec, lr, opp: self._start_training(
                 target, nb, dec, lr, opp
             ),
-            on_back=self.show_matchstick_menu
+            on_back=self.show_matchstick_menu,
+            on_pause=self._pause_training,
+            on_resume=self._resume_training,
+            on_cancel=self._cancel_training,
         )
         self.current_view.pack(fill=tk.BOTH, expand=True)
     
@@ -238,8 +249,8 @@ class MatchstickGameApp(tk.Tk):
         Lance l'entraînement d'une IA avec les paramètres donnés.
         
         L'entraînement fonctionne par itérations :
-        1. L'IA "élève" joue contre un adversaire
-        2. Après chaque partie, l'élève met à jour sa value-function
+        1. L'IA "élève" joue un lot de parties contre un adversaire
+        2. Après chaque lot, l'élève met à jour sa value-function
         3. Epsilon diminue progressivement (exploration → exploitation)
         4. Les résultats sont affichés et peuvent être sauvegardés
         
@@ -251,7 +262,10 @@ class MatchstickGameApp(tk.Tk):
             learning_rate (float): Taux d'apprentissage (0.0 à 1.0).
                                   Plus élevé = apprentissage rapide mais instable.
             opponent_type (str): Type d'adversaire.
-                                Valeurs : "random" ou "other_ai"
+                                Valeurs : "random", "perfect" ou "other_ai"
+        
+        La boucle tourne dans un thread (TrainingJob) : la fenêtre reste
+        réactive et la vue relève la progression via `after()`.
         
         Side Effects:
             - Met à jour la barre de progression dans la vue
@@ -275,6 +289,9 @@ class MatchstickGameApp(tk.Tk):
         if opponent_type == "random":
             # Adversaire aléatoire simple
             opponent = Player("Random")
+        elif opponent_type == "perfect":
+            # Joueur parfait (solution exacte, cf. solver.py)
+            opponent = PerfectPlayer("Perfect")
         else:
             # L'autre IA (avec faible exploration pour être stable)
             opp_save = "AI_save_2" if target == "ai1" else "AI_save_1"
@@ -284,43 +301,31 @@ class MatchstickGameApp(tk.Tk):
             except FileNotFoundError:
                 pass
         
-        # === CRÉER LE JEU D'ENTRAÎNEMENT ===
-        # displayable=False car pas besoin d'affichage console
-        training_game = GameModel(12, student, opponent, displayable=False)
-        
-        # === BOUCLE D'ENTRAÎNEMENT ===
-        for i in range(nb_games):
-            # Diminuer epsilon régulièrement pour réduire l'exploration
-            if i % epsilon_decay == 0 and i > 0:
-                student.next_epsilon()
-            
-            # Jouer une partie complète
-            training_game.play()
-            
-            # Entraîner uniquement l'élève (pas l'adversaire)
-            # Met à jour la value-function avec TD-Learning
-            student.train()
-            
-            # Réinitialiser pour la partie suivante
-            training_game.reset()
-            
-            # Mettre à jour la barre de progression
-            # (rafraîchissement tous les 1000 parties pour performance)
-            if i % 1000 == 0 or i == nb_games - 1:
-                self.current_view.update_progress(i + 1, nb_games)
-                self.current_view.update()  # Forcer le rafraîchissement Tkinter
+        # === BOUCLE D'ENTRAÎNEMENT (thread de travail) ===
+        # Parties de 12 allumettes jouées par lots vectorisés (batch_train) :
+        # même politique ε-greedy, même décroissance d'epsilon et mise à
+        # jour TD équivalente à student.train() après chaque lot
+        view = self.current_view
+        def run(progress):
+            return train_batch(
+                student, opponent, nb_games,
+                nb_matches=12,
+                epsilon_decay=epsilon_decay,
+                batch_size=_BATCH_SIZE,
+                progress_callback=progress,
+            )
         
         # === AFFICHER LES RÉSULTATS ===
-        # Récupérer le nombre de victoires de l'adversaire
-        opponent_wins = opponent.nb_wins if hasattr(opponent, 'nb_wins') else 0
-        
-        # Afficher l'écran de résultats avec statistiques et analyse
-        self.current_view.show_results(
-            student.nb_wins,      # Victoires de l'élève
-            opponent_wins,        # Victoires de l'adversaire
-            nb_games,            # Nombre total de parties
-            on_save_callback=lambda: student.upload(save_name)  # Sauvegarde
-        )
+        def on_done(_result) -> None:
+            # Afficher l'écran de résultats avec statistiques et analyse
+            view.show_results(
+                student.nb_wins,      # Victoires de l'élève
+                opponent.nb_wins,     # Victoires de l'adversaire
+                nb_games,             # Nombre total de parties
+                on_save_callback=lambda: student.upload(save_name)  # Sauvegarde
+            )
+        
+        self._start_training_job(run, view, on_done)
     
     def _quit_to_home(self) -> None:
         """
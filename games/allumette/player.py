@@ -4,6 +4,8 @@ Module contenant les classes Player, Human et AI pour le jeu des allumettes.
 import random
 import json
 
+from .solver import LOSE, MAX_TAKE, WIN, ValueTable, winning_move
+
 
 class Player:
     """
@@ -101,6 +103,29 @@ class Human(Player):
             except ValueError:
                 print("Invalid input. Please enter a number.")
 
+class PerfectPlayer(Player):
+    """
+    Adversaire parfait en O(1) (cf. solver.winning_move).
+
+    Joue le coup gagnant quand il existe ; en position perdante, retire
+    une quantité aléatoire pour laisser à l'adversaire une chance de
+    se tromper.
+    """
+
+    def play(self) -> int:
+        """
+        Retourne le coup parfait pour le nombre d'allumettes restantes.
+
+        Returns:
+            int: Nombre d'allumettes à retirer (1 à min(3, nb restant)).
+        """
+        return winning_move(self.game.nb) or random.randint(1, min(MAX_TAKE, self.game.nb))
+
+
+# Valeur des transitions terminales de l'historique de l'IA
+_TERMINAL_VALUES = {"win": WIN, "lose": LOSE}
+
+
 class AI(Player):
 
     def __init__(self, name, epsilon=0.9, learning_rate=0.01, game=None):
@@ -109,23 +134,13 @@ class AI(Player):
         self.learning_rate = learning_rate
         self.history = []
         self.previous_state = None
-        self.value_function = {"win": +1, "lose": -1}
+        # V(n) pour le joueur au trait avec n allumettes (tableau plat)
+        self.value_function = ValueTable()
 
 
     def exploit(self):
-        vf = self.value_function
-        current_nb = self.game.nb
-        max_take = min(3, current_nb)
-        best_action = 1
-        best_value = float('inf')
-
-        for action in range(1, max_take + 1):
-            new_state = current_nb - action
-            value = vf.get(new_state, 0)
-            if value < best_value:
-                best_value = value
-                best_action = action
-        return best_action
+        # Coup qui laisse à l'adversaire la plus petite valeur
+        return self.value_function.best_move(self.game.nb)
 
     def play(self):
         current_nb = self.game.nb
@@ -169,11 +184,11 @@ class AI(Player):
         self.previous_state = None
 
     def train(self):
-
+        vf = self.value_function
         for s, s_prime in reversed(self.history):
-            v_s       = self.value_function.get(s, 0)
-            v_s_prime = self.value_function.get(s_prime, 0)
-            self.value_function[s] = v_s + self.learning_rate * (v_s_prime - v_s)
+            v_s       = vf[s]
+            v_s_prime = _TERMINAL_VALUES[s_prime] if isinstance(s_prime, str) else vf[s_prime]
+            vf[s] = v_s + self.learning_rate * (v_s_prime - v_s)
         self.history.clear()
 
 
@@ -185,7 +200,7 @@ class AI(Player):
         data = {
             "epsilon": self.epsilon,
             "learning_rate": self.learning_rate,
-            "value_function": self.value_function
+            "value_function": self.value_function.to_dict()
         }
 
         with open(file_name, "w") as f:
@@ -197,4 +212,5 @@ class AI(Player):
 
         self.epsilon = data["epsilon"]
         self.learning_rate = data["learning_rate"]
-        self.value_function = data["value_function"]
+        # Clés JSON string ("12") reconverties en indices entiers
+        self.value_function = ValueTable.from_dict(data["value_function"])
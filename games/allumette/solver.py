@@ -0,0 +1,202 @@
+"""
+Résolution exacte du jeu des allumettes et value-function en tableau.
+
+Règles (cf. GameModel) : chaque joueur retire 1 à `MAX_TAKE` allumettes,
+celui qui prend la dernière perd. La valeur d'un nombre d'allumettes `n`
+est celle du joueur À QUI C'EST LE TOUR :
+
+- `WIN`  (+1) : il existe un coup qui laisse l'adversaire en position perdante ;
+- `LOSE` (-1) : tous les coups laissent l'adversaire en position gagnante.
+
+Case 0 : l'adversaire vient de prendre la dernière allumette, le joueur
+au trait a donc gagné (V(0) = WIN).
+
+`solve` calcule ces valeurs en une passe rétrograde (de 0 vers N). Elles
+sont périodiques : les positions perdantes sont exactement n ≡ 1 (mod 4),
+ce qui donne le coup parfait en O(1) pour n'importe quel N
+(`winning_move`), y compris des millions d'allumettes.
+
+`ValueTable` remplace le dict de l'IA (`AI.value_function`) par un
+tableau plat indexé par le nombre d'allumettes : lecture directe des
+voisins dans `exploit`, et plus de clés string après un aller-retour JSON.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+MAX_TAKE: int = 3
+"""Nombre maximum d'allumettes retirées par coup."""
+
+WIN: float = 1.0
+"""Valeur d'une position gagnante pour le joueur au trait."""
+
+LOSE: float = -1.0
+"""Valeur d'une position perdante pour le joueur au trait."""
+
+_PERIOD: int = MAX_TAKE + 1
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Résolution exacte
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def solve(n_max: int) -> np.ndarray:
+    """
+    Valeur exacte de chaque position 0..n_max, en une passe linéaire.
+
+    V(n) = WIN si l'une des positions atteignables n-1..n-MAX_TAKE vaut
+    LOSE. Un compteur des positions perdantes de cette fenêtre glissante
+    rend chaque pas O(1).
+
+    Args:
+        n_max: Plus grand nombre d'allumettes à résoudre.
+
+    Returns:
+        Tableau int8 de taille n_max + 1 (WIN / LOSE).
+    """
+    # Liste Python pendant la passe (l'accès élément par élément à un
+    # tableau NumPy est ~10x plus lent), convertie à la fin
+    values = [int(WIN)] * (n_max + 1)
+    lose = int(LOSE)
+    losing_in_window = 0
+    for n in range(1, n_max + 1):
+        if not losing_in_window:
+            values[n] = lose
+            losing_in_window += 1
+        # Fenêtre du pas suivant : n+1-MAX_TAKE..n
+        if n >= MAX_TAKE and values[n - MAX_TAKE] == lose:
+            losing_in_window -= 1
+    return np.array(values, dtype=np.int8)
+
+
+def is_winning(n: int) -> bool:
+    """Vrai si le joueur au trait avec `n` allumettes gagne en jouant parfaitement."""
+    return n % _PERIOD != 1
+
+
+def winning_move(n: int) -> Optional[int]:
+    """
+    Coup parfait en O(1) : laisser l'adversaire sur n ≡ 1 (mod 4).
+
+    Args:
+        n: Nombre d'allumettes restantes (>= 1).
+
+    Returns:
+        Nombre d'allumettes à retirer, ou None si la position est perdante
+        (aucun coup ne sauve la partie contre un adversaire parfait).
+    """
+    take = (n - 1) % _PERIOD
+    return take if take else None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Value-function en tableau
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class ValueTable:
+    """
+    Value-function V(n) stockée dans un tableau NumPy plat.
+
+    `values[n]` est la valeur (apprise ou exacte) pour le joueur au trait
+    avec `n` allumettes ; `values[0]` vaut WIN. Le tableau s'agrandit à la
+    demande (`grow`) quand une partie commence avec plus d'allumettes.
+
+    Attributes:
+        values (np.ndarray): Valeurs float64 indexées par nombre d'allumettes.
+    """
+
+    def __init__(self, size: int = 16) -> None:
+        """
+        Crée une table à zéro (positions jamais vues) de `size` cases.
+
+        Args:
+            size: Nombre de cases initial (n = 0..size-1).
+        """
+        self.values = np.zeros(max(size, 1))
+        self.values[0] = WIN
+
+    @classmethod
+    def exact(cls, n_max: int) -> "ValueTable":
+        """Table remplie avec les valeurs exactes de `solve(n_max)`."""
+        table = cls(n_max + 1)
+        table.values[:] = solve(n_max)
+        return table
+
+    def grow(self, n: int) -> None:
+        """Garantit que `values[n]` existe (agrandit par doublement)."""
+        size = len(self.values)
+        if n < size:
+            return
+        new_size = max(n + 1, 2 * size)
+        self.values = np.concatenate([self.values, np.zeros(new_size - size)])
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, n: int) -> float:
+        return float(self.values[n]) if n < len(self.values) else 0.0
+
+    def __setitem__(self, n: int, value: float) -> None:
+        self.grow(n)
+        self.values[n] = value
+
+    def best_move(self, n: int) -> int:
+        """
+        Coup glouton : celui qui laisse à l'adversaire la plus petite valeur.
+
+        En cas d'égalité, le plus petit nombre d'allumettes l'emporte.
+
+        Args:
+            n: Nombre d'allumettes restantes (>= 1).
+        """
+        self.grow(n)
+        max_take = min(MAX_TAKE, n)
+        # Voisins n-1, n-2, ... dans l'ordre des coups 1, 2, ...
+        row = self.values[n - max_take:n].tolist()[::-1]
+        return row.index(min(row)) + 1
+
+    def policy_accuracy(self, n_max: int) -> float:
+        """
+        Part des positions gagnantes 1..n_max où `best_move` est parfait.
+
+        Sert à évaluer une IA entraînée contre la solution exacte.
+        """
+        winning = [n for n in range(1, n_max + 1) if is_winning(n)]
+        if not winning:
+            return 1.0
+        correct = sum(self.best_move(n) == winning_move(n) for n in winning)
+        return correct / len(winning)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Sérialisation JSON
+    # ──────────────────────────────────────────────────────────────────────
+
+    def to_dict(self) -> dict[str, float]:
+        """
+        Dict JSON {"win", "lose", "1", "2", ...} (format des sauvegardes).
+
+        JSON n'a que des clés string : `from_dict` les reconvertit en
+        entiers.
+        """
+        data = {"win": WIN, "lose": LOSE}
+        data.update({str(n): float(v) for n, v in enumerate(self.values) if n > 0})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValueTable":
+        """
+        Reconstruit la table depuis un dict de sauvegarde.
+
+        Accepte clés entières ou strings ("12") ; les entrées terminales
+        "win" / "lose" des anciennes sauvegardes sont ignorées.
+        """
+        counts = {int(key): value for key, value in data.items() if key not in ("win", "lose")}
+        table = cls(max(counts, default=0) + 1)
+        for n, value in counts.items():
+            if n > 0:
+                table.values[n] = value
+        return table
@@ -5,6 +5,7 @@ Module contenant la vue d'entraînement de l'IA.
 import tkinter as tk
 from tkinter import Frame, ttk
 from language_manager import lang_manager
+from training_service import TrainingControls
 
 
 class TrainingView(Frame):
@@ -18,11 +19,16 @@ class TrainingView(Frame):
     TEXT_COLOR = "#2C3E50"
     SUCCESS_COLOR = "#27AE60"
     
-    def __init__(self, master, ai_target="ai1", on_start_training=None, on_back=None):
+    def __init__(self, master, ai_target="ai1", on_start_training=None, on_back=None,
+                 on_pause=None, on_resume=None, on_cancel=None):
         super().__init__(master, bg=self.BG_COLOR)
         self.ai_target = ai_target
         self.on_start_training = on_start_training
         self.on_back = on_back
+        # Contrôle de l'entraînement en arrière-plan (cf. training_service)
+        self.on_pause = on_pause
+        self.on_resume = on_resume
+        self.on_cancel = on_cancel
         
         self.params_entries = {}
         self.progress_var = tk.IntVar(value=0)
@@ -76,6 +82,7 @@ class TrainingView(Frame):
         opp_name = "IA 2" if self.ai_target == "ai1" else "IA 1"
         tk.Radiobutton(form_frame, text=opp_name, variable=self.opponent_var, value="other_ai", bg=self.CARD_BG).grid(row=3, column=1, sticky="w")
         tk.Radiobutton(form_frame, text="Random", variable=self.opponent_var, value="random", bg=self.CARD_BG).grid(row=4, column=1, sticky="w")
+        tk.Radiobutton(form_frame, text="Perfect", variable=self.opponent_var, value="perfect", bg=self.CARD_BG).grid(row=5, column=1, sticky="w")
 
         self.start_btn = tk.Button(
             self.params_card, text=lang_manager.get_text("start_training"), font=("Helvetica", 14, "bold"),
@@ -90,6 +97,9 @@ class TrainingView(Frame):
         self.progress_label = tk.Label(self.progress_frame, text="", bg=self.CARD_BG)
         self.progress_label.pack(pady=10)
 
+        self.controls = TrainingControls(self.progress_frame, on_pause=self.on_pause, on_resume=self.on_resume, on_cancel=self.on_cancel, font=None)
+        self.controls.pack(pady=(0, 10))
+
     def _create_results_section(self) -> None:
         self.results_frame = Frame(self, bg=self.CARD_BG, relief=tk.RAISED, bd=3)
         tk.Label(self.results_frame, text=lang_manager.get_text("training_complete"), font=("Helvetica", 16, "bold"), fg=self.SUCCESS_COLOR, bg=self.CARD_BG).pack(pady=10)
@@ -121,6 +131,12 @@ class TrainingView(Frame):
         if self.on_start_training:
             self.on_start_training(nb, dec, lr, opp)
 
+    def show_cancelled(self) -> None:
+        self.progress_frame.pack_forget()
+        self.controls.reset()
+        self.progress_var.set(0)
+        self.params_card.pack(fill=tk.BOTH, padx=60, pady=20)
+
     def update_progress(self, current: int, total: int) -> None:
         self.progress_var.set(int((current / total) * 100))
         self.progress_label.config(text=lang_manager.get_text("games_played").format(current, total))
@@ -148,4 +164,5 @@ class TrainingView(Frame):
         self.title_label.config(text=lang_manager.get_text("training_title").format(target_name))
         self.back_btn.config(text="← " + lang_manager.get_text("back"))
         self.start_btn.config(text=lang_manager.get_text("start_training"))
-        self.save_btn.config(text=lang_manager.get_text("save_results"))
\ No newline at end of file
+        self.save_btn.config(text=lang_manager.get_text("save_results"))
+        self.controls.update_language()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from .game_model import GameModel
+from .game_model import GAME_MODELS
 from .player import Player
 from time import time
 from math import log
@@ -23,13 +23,14 @@ def compare_ai(*ais):
     print(f"{'-'*4}{'-'*len(ais)*15}")     
 
 
-def training(ai1, ai2, nb_games, nb_epsilon, size):
+def training(ai1, ai2, nb_games, nb_epsilon, size, backend="bitboard"):
     # Train the AIs @ai1 and @ai2 during @nb_games games
     # epsilon decrease every @nb_epsilon games
+    # @backend selects the board engine (see game_model.GAME_MODELS)
     ais_with_qtable = [a for a in [ai1, ai2] if hasattr(a, 'q_table')]
     commit_interval = max(1000, nb_games // 10)  # adaptatif selon nb_games
 
-    training_game = GameModel(ai1, ai2, size, displayable = False)
+    training_game = GAME_MODELS[backend](ai1, ai2, size, displayable = False)
     for i in range(0, nb_games):
         if i % nb_epsilon == 0:
             if ai1.type =='AI' : ai1.next_epsilon()
@@ -45,10 +46,10 @@ def training(ai1, ai2, nb_games, nb_epsilon, size):
     for ai in ais_with_qtable:
         ai.q_table.commit()
             
-def testing(*ais, nb_games):
+def testing(*ais, nb_games, backend="bitboard"):
     random_player = Player("random")
     for ai in ais:
-        test_game = GameModel(ai, random_player, displayable=False)
+        test_game = GAME_MODELS[backend](ai, random_player, displayable=False)
         wins = 0
         for i in range(nb_games):
             test_game.play()
@@ -59,7 +60,7 @@ def testing(*ais, nb_games):
         print(f"{wins/nb_games*100:.2f}%")
 
 def train_with_progress(student, opponent, nb_games, size=5, progress_callback=None,
-                        progress_step=200):
+                        progress_step=200, backend="bitboard"):
     """
     Lance un entraînement d'une IA contre un adversaire avec retour de progression.
 
@@ -77,6 +78,9 @@ def train_with_progress(student, opponent, nb_games, size=5, progress_callback=N
             une dernière fois à la fin.
         progress_step: Intervalle (en parties) entre deux callbacks. Plus
             l'intervalle est petit, plus l'UI reste fluide mais plus c'est lent.
+        backend: Moteur de plateau ("grid" ou "bitboard", cf.
+            `game_model.GAME_MODELS`). Le bitboard donne les mêmes parties
+            mais évite le BFS et les re-parcours du plateau à chaque coup.
 
     Returns:
         Tuple (wins, losses, draws) du student après l'entraînement.
@@ -85,7 +89,7 @@ def train_with_progress(student, opponent, nb_games, size=5, progress_callback=N
     ais_with_qtable = [a for a in (student, opponent) if hasattr(a, 'q_table') and a.q_table is not None]
     commit_interval = max(1000, nb_games // 10)
 
-    training_game = GameModel(student, opponent, size, displayable=False)
+    training_game = GAME_MODELS[backend](student, opponent, size, displayable=False)
 
     # Réinitialiser les compteurs pour ne mesurer que ce run
     for player in (student, opponent):
@@ -0,0 +1,511 @@
+"""
+Arène de tournois entre agents Cubee, avec classement Elo.
+
+`run_tournament` fait s'affronter des agents (Q-tables enregistrées,
+joueur aléatoire, alpha-beta, MCTS) en round-robin ou en système suisse :
+
+- chaque rencontre se joue en parties groupées par tâches, réparties sur
+  un pool de processus ; les Q-tables ne sont envoyées qu'une fois par
+  processus (initialiseur du pool) et les IA y jouent sans apprendre
+  (`AI(training=False)`) ;
+- les couleurs alternent d'une partie à l'autre (l'agent A commence une
+  partie sur deux) et quelques coups d'ouverture aléatoires diversifient
+  des parties qui, sinon, seraient toutes identiques entre deux agents
+  gloutons ;
+- une partie qui dépasse `max_moves` coups (deux agents déterministes
+  peuvent tourner en rond sur leurs propres cases) est arbitrée au score ;
+- chaque tâche a sa propre graine, dérivée de la graine du tournoi : le
+  résultat ne dépend pas du nombre de processus (à temps de réflexion
+  fixé en profondeur pour alpha-beta, cf. `AgentSpec.max_depth`) ;
+- l'Elo est estimé par maximum de vraisemblance (Bradley-Terry, nul =
+  demi-victoire) et son intervalle de confiance à 95 % par bootstrap sur
+  les parties de chaque rencontre ;
+- le classement est écrit dans la table `arena_result`.
+"""
+
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from .dao.arena_result import ArenaResult
+from .dao.q_table import QTable
+from .dao.q_table_repository import QTableRepo, Row
+from .game_model import GAME_MODELS
+from .player import AI, Player
+from .search import AlphaBetaPlayer, MCTSPlayer
+
+
+AGENT_KINDS: Tuple[str, ...] = ("q", "random", "alphabeta", "mcts")
+"""Types d'agents acceptés par l'arène."""
+
+FORMATS: Tuple[str, ...] = ("round_robin", "swiss")
+"""Formats de tournoi."""
+
+ELO_BASE: float = 1500.0
+"""Elo moyen des agents d'un tournoi."""
+
+_ELO_SCALE: float = 400.0 / math.log(10)
+"""Passage de la force Bradley-Terry (log) à l'échelle Elo."""
+
+_TASK_GAMES: int = 10
+"""Parties jouées par tâche (pair : couleurs équilibrées dans la tâche)."""
+
+_MOVES_PER_CELL: int = 40
+"""Plafond de coups par case du plateau avant arbitrage (cf. `_play_game`)."""
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Agents et résultats
+# ──────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """
+    Description picklable d'un agent de l'arène.
+
+    Attributes:
+        name: Nom affiché (unique dans un tournoi).
+        kind: Type d'agent, parmi AGENT_KINDS.
+        gama: Gama de la Q-table (kind "q"), tel qu'écrit en base.
+        learning_rate: Learning rate de la Q-table (kind "q").
+        time_budget: Temps de réflexion par coup (alpha-beta, MCTS).
+        max_depth: Profondeur maximale d'alpha-beta. Avec un budget de
+            temps large, une profondeur fixe rend les parties reproductibles.
+    """
+    name: str
+    kind: str = "q"
+    gama: Optional[str] = None
+    learning_rate: Optional[str] = None
+    time_budget: float = 0.01
+    max_depth: int = 64
+
+
+class MatchResult(NamedTuple):
+    """Bilan d'une tâche de parties, du point de vue de l'agent `first`."""
+    first: int
+    second: int
+    wins: int
+    draws: int
+    losses: int
+
+
+@dataclass
+class Standing:
+    """
+    Classement d'un agent à l'issue d'un tournoi.
+
+    Attributes:
+        agent: Nom de l'agent.
+        games: Parties jouées.
+        wins / draws / losses: Bilan.
+        elo: Elo estimé (moyenne du tournoi = ELO_BASE).
+        elo_low / elo_high: Intervalle de confiance à 95 %.
+    """
+    agent: str
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    elo: float
+    elo_low: float
+    elo_high: float
+
+    @property
+    def score(self) -> float:
+        """Part des points marqués (nul = 1/2)."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+
+def saved_agents(session) -> List[AgentSpec]:
+    """
+    Un agent par couple (gama, learning_rate) présent dans la Q-table.
+
+    Args:
+        session: Session SQLAlchemy active.
+
+    Returns:
+        Liste d'AgentSpec de type "q", triée par hyperparamètres.
+    """
+    query = (
+        select(QTable.gama, QTable.learning_rate)
+        .distinct()
+        .order_by(QTable.gama, QTable.learning_rate)
+    )
+    return [
+        AgentSpec(f"Q(γ={gama}, α={learning_rate})", "q", gama, learning_rate)
+        for gama, learning_rate in session.execute(query)
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Côté worker
+# ──────────────────────────────────────────────────────────────────────────
+
+
+_TABLES: Dict[Tuple[str, str], Dict[int, Row]] = {}
+"""Q-tables des agents "q", reçues une fois par processus du pool."""
+
+
+def _init_worker(tables: Dict[Tuple[str, str], Dict[int, Row]]) -> None:
+    """Initialiseur du pool : garde les Q-tables en RAM pour toutes les tâches."""
+    _TABLES.update(tables)
+
+
+def _build_player(spec: AgentSpec) -> Player:
+    """Instancie le joueur décrit par `spec` (IA en lecture seule)."""
+    if spec.kind == "q":
+        player = AI(spec.name, gama=spec.gama, learning_rate=spec.learning_rate, training=False)
+        table = _TABLES[(spec.gama, spec.learning_rate)]
+        player.q_table = QTableRepo.detached(spec.gama, spec.learning_rate, table)
+        return player
+    if spec.kind == "alphabeta":
+        return AlphaBetaPlayer(spec.name, time_budget=spec.time_budget, max_depth=spec.max_depth)
+    if spec.kind == "mcts":
+        return MCTSPlayer(spec.name, time_budget=spec.time_budget, seed=random.getrandbits(32))
+    return Player(spec.name)
+
+
+def _play_game(game, first: Player, second: Player, opening_moves: int,
+               max_moves: int) -> Optional[Player]:
+    """
+    Joue une partie où `first` a les couleurs du joueur 1.
+
+    Même boucle que `GameModel.play`, mais les couleurs sont imposées
+    (reset les tire au hasard), les `opening_moves` premiers coups de
+    chaque joueur sont aléatoires et la partie est arbitrée au score
+    (`get_winner`) après `max_moves` tours.
+
+    Returns:
+        Le joueur gagnant, None en cas d'égalité.
+    """
+    game.reset()
+    game.players[1], game.players[2] = first, second
+    first.game = second.game = game
+
+    for _ in range(2 * opening_moves):
+        if game.is_game_over():
+            break
+        moves = game.legal_move()
+        if not moves or not game.move(random.choice(moves)):
+            game.next_player()
+
+    for _ in range(max_moves):
+        if game.is_game_over():
+            break
+        if not game.players[game.player_turn].play():
+            game.next_player()  # passer le tour si bloqué
+    game.end_game()
+
+    winner = game.get_winner()
+    return None if winner is None else game.players[winner]
+
+
+def _play_task(task: dict) -> MatchResult:
+    """
+    Joue une tâche de parties entre deux agents (exécutée dans le pool).
+
+    Args:
+        task: Dict {first, second (index), specs (AgentSpec, AgentSpec),
+            nb_games, size, backend, opening_moves, max_moves, seed}.
+
+    Returns:
+        Bilan de l'agent `first`.
+    """
+    random.seed(task["seed"])
+    spec_a, spec_b = task["specs"]
+    player_a, player_b = _build_player(spec_a), _build_player(spec_b)
+    game = GAME_MODELS[task["backend"]](player_a, player_b, task["size"], displayable=False)
+
+    wins = draws = losses = 0
+    for index in range(task["nb_games"]):
+        # Couleurs alternées : l'agent A commence une partie sur deux
+        first, second = (player_a, player_b) if index % 2 == 0 else (player_b, player_a)
+        winner = _play_game(game, first, second, task["opening_moves"], task["max_moves"])
+        if winner is None:
+            draws += 1
+        elif winner is player_a:
+            wins += 1
+        else:
+            losses += 1
+    return MatchResult(task["first"], task["second"], wins, draws, losses)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Elo (Bradley-Terry) et intervalles de confiance
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _bradley_terry(scores: np.ndarray, games: np.ndarray, prior: float = 1.0,
+                   iterations: int = 1000, tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Elo par maximum de vraisemblance (algorithme MM de Hunter).
+
+    Chaque agent reçoit `prior` parties nulles virtuelles contre un agent
+    de force 1 : l'estimation reste finie même pour un agent qui gagne ou
+    perd toutes ses parties.
+
+    Args:
+        scores: scores[i, j] = points marqués par i contre j.
+        games: games[i, j] = parties jouées entre i et j (symétrique).
+
+    Returns:
+        Elo de chaque agent, centrés sur ELO_BASE.
+    """
+    points = scores.sum(axis=1) + prior / 2
+    strength = np.ones(len(points))
+    for _ in range(iterations):
+        pair_sum = strength[:, None] + strength[None, :]
+        updated = points / ((games / pair_sum).sum(axis=1) + prior / (strength + 1.0))
+        converged = np.max(np.abs(np.log(updated / strength))) < tolerance
+        strength = updated
+        if converged:
+            break
+    elo = _ELO_SCALE * np.log(strength)
+    return ELO_BASE + elo - elo.mean()
+
+
+def elo_ratings(nb_agents: int, results: Sequence[MatchResult], nb_bootstrap: int = 200,
+                seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Elo des agents et intervalle de confiance à 95 %.
+
+    L'intervalle est obtenu par bootstrap paramétrique : les parties de
+    chaque paire d'agents sont retirées (victoire / nul / défaite selon
+    les fréquences observées), puis l'Elo est ré-estimé.
+
+    Args:
+        nb_agents: Nombre d'agents (index des MatchResult).
+        results: Bilans des tâches jouées.
+        nb_bootstrap: Nombre de ré-échantillonnages (0 = pas d'intervalle).
+        seed: Graine du bootstrap.
+
+    Returns:
+        Tuple (elo, elo_low, elo_high), un tableau par borne.
+    """
+    # Bilans regroupés par paire (i < j), du point de vue de i
+    pairs: Dict[Tuple[int, int], np.ndarray] = {}
+    for result in results:
+        i, j, wdl = result.first, result.second, np.array(result[2:])
+        if i > j:
+            i, j, wdl = j, i, wdl[::-1]
+        pairs[(i, j)] = pairs.get((i, j), 0) + wdl
+
+    def rate(counts: Dict[Tuple[int, int], np.ndarray]) -> np.ndarray:
+        scores = np.zeros((nb_agents, nb_agents))
+        games = np.zeros((nb_agents, nb_agents))
+        for (i, j), (wins, draws, losses) in counts.items():
+            scores[i, j] += wins + 0.5 * draws
+            scores[j, i] += losses + 0.5 * draws
+            games[i, j] = games[j, i] = games[i, j] + wins + draws + losses
+        return _bradley_terry(scores, games)
+
+    elo = rate(pairs)
+    if nb_bootstrap <= 0 or not pairs:
+        return elo, elo.copy(), elo.copy()
+
+    rng = np.random.default_rng(seed)
+    samples = {
+        pair: rng.multinomial(wdl.sum(), wdl / wdl.sum(), size=nb_bootstrap)
+        for pair, wdl in pairs.items() if wdl.sum() > 0
+    }
+    bootstrap = np.array([
+        rate({pair: drawn[b] for pair, drawn in samples.items()}) for b in range(nb_bootstrap)
+    ])
+    low, high = np.percentile(bootstrap, [2.5, 97.5], axis=0)
+    return elo, low, high
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Appariements
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def swiss_pairings(points: Sequence[float], played: Sequence[set],
+                   byes: set) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """
+    Appariements d'une ronde suisse.
+
+    Les agents sont classés par points (puis par index) ; chacun affronte
+    le mieux classé des suivants qu'il n'a pas encore rencontré (à défaut,
+    le suivant). Avec un nombre impair d'agents, le moins bien classé
+    n'ayant pas encore été exempté ne joue pas cette ronde.
+
+    Args:
+        points: Points de chaque agent.
+        played: played[i] = index des agents déjà rencontrés par i.
+        byes: Index des agents déjà exemptés (complété sur place).
+
+    Returns:
+        Tuple (paires, exempté ou None).
+    """
+    order = sorted(range(len(points)), key=lambda i: (-points[i], i))
+    bye = None
+    if len(order) % 2:
+        bye = next((i for i in reversed(order) if i not in byes), order[-1])
+        order.remove(bye)
+        byes.add(bye)
+
+    pairs = []
+    while order:
+        first = order.pop(0)
+        second = next((i for i in order if i not in played[first]), order[0])
+        order.remove(second)
+        pairs.append((first, second))
+    return pairs, bye
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Tournoi
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def run_tournament(
+    session,
+    agents: Sequence[AgentSpec],
+    fmt: str = "round_robin",
+    games_per_match: int = 20,
+    rounds: Optional[int] = None,
+    size: int = 5,
+    backend: str = "bitboard",
+    opening_moves: int = 2,
+    max_moves: Optional[int] = None,
+    nb_workers: Optional[int] = None,
+    seed: int = 0,
+    nb_bootstrap: int = 200,
+    name: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[Standing]:
+    """
+    Joue un tournoi entre agents et écrit le classement dans `arena_result`.
+
+    Args:
+        session: Session SQLAlchemy active (Q-tables lues, classement écrit).
+        agents: Agents du tournoi (noms uniques, au moins 2).
+        fmt: "round_robin" (chaque paire se rencontre) ou "swiss".
+        games_per_match: Parties par rencontre (arrondi au multiple de
+            `_TASK_GAMES` supérieur, pour équilibrer les couleurs).
+        rounds: Nombre de rondes suisses (défaut : ⌈log2(nb agents)⌉ + 1).
+        size: Taille du plateau Cubee (défaut 5).
+        backend: Moteur de plateau (cf. `game_model.GAME_MODELS`).
+        opening_moves: Coups aléatoires joués par chaque agent en début de partie.
+        max_moves: Tours de jeu avant arbitrage au score (défaut :
+            `_MOVES_PER_CELL` par case du plateau).
+        nb_workers: Taille du pool (défaut : nombre de cœurs).
+        seed: Graine du tournoi (parties et bootstrap).
+        nb_bootstrap: Ré-échantillonnages pour l'intervalle de confiance.
+        name: Nom du tournoi en base (défaut : format + date).
+        progress_callback: Fonction(rencontres jouées, total) appelée après
+            chaque ronde. None pour désactiver.
+
+    Returns:
+        Classement, trié par Elo décroissant.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt!r} (attendu : {FORMATS})")
+    if len(agents) < 2:
+        raise ValueError("Un tournoi demande au moins deux agents")
+    if len({spec.name for spec in agents}) != len(agents):
+        raise ValueError("Les noms des agents doivent être uniques")
+    for spec in agents:
+        if spec.kind not in AGENT_KINDS:
+            raise ValueError(f"Agent inconnu : {spec.kind!r} (attendu : {AGENT_KINDS})")
+
+    repository = QTableRepo(session)
+    tables = {
+        (spec.gama, spec.learning_rate): repository.load(spec.gama, spec.learning_rate)
+        for spec in agents if spec.kind == "q"
+    }
+
+    nb_agents = len(agents)
+    nb_tasks = math.ceil(games_per_match / _TASK_GAMES)
+    if fmt == "swiss":
+        rounds = rounds or math.ceil(math.log2(nb_agents)) + 1
+        total = rounds * (nb_agents // 2)
+    else:
+        rounds = 1
+        total = nb_agents * (nb_agents - 1) // 2
+
+    results: List[MatchResult] = []
+    points = [0.0] * nb_agents
+    played = [set() for _ in range(nb_agents)]
+    byes: set = set()
+    matches_done = 0
+    with ProcessPoolExecutor(max_workers=nb_workers or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(tables,)) as pool:
+        for _ in range(rounds):
+            if fmt == "swiss":
+                pairs, _bye = swiss_pairings(points, played, byes)
+            else:
+                pairs = list(itertools.combinations(range(nb_agents), 2))
+
+            tasks = [
+                {
+                    "first": i,
+                    "second": j,
+                    "specs": (agents[i], agents[j]),
+                    "nb_games": _TASK_GAMES,
+                    "size": size,
+                    "backend": backend,
+                    "opening_moves": opening_moves,
+                    "max_moves": max_moves or _MOVES_PER_CELL * size * size,
+                    # Graine propre à la tâche : indépendante de l'ordonnancement
+                    "seed": f"{seed}:{matches_done + index}:{chunk}",
+                }
+                for index, (i, j) in enumerate(pairs)
+                for chunk in range(nb_tasks)
+            ]
+            for result in pool.map(_play_task, tasks):
+                results.append(result)
+                points[result.first] += result.wins + 0.5 * result.draws
+                points[result.second] += result.losses + 0.5 * result.draws
+            for i, j in pairs:
+                played[i].add(j)
+                played[j].add(i)
+
+            matches_done += len(pairs)
+            if progress_callback is not None:
+                progress_callback(matches_done, total)
+
+    elo, low, high = elo_ratings(nb_agents, results, nb_bootstrap, seed)
+    tally = np.zeros((nb_agents, 3), dtype=int)
+    for result in results:
+        tally[result.first] += result[2:]
+        tally[result.second] += result[2:][::-1]
+
+    standings = [
+        Standing(spec.name, int(tally[i].sum()), *map(int, tally[i]),
+                 float(elo[i]), float(low[i]), float(high[i]))
+        for i, spec in enumerate(agents)
+    ]
+    standings.sort(key=lambda standing: standing.elo, reverse=True)
+
+    name = name or f"{fmt} {datetime.now():%Y-%m-%d %H:%M:%S}"
+    session.add_all(
+        ArenaResult(
+            tournament=name, agent=s.agent, games=s.games, wins=s.wins, draws=s.draws,
+            losses=s.losses, elo=s.elo, elo_low=s.elo_low, elo_high=s.elo_high,
+        )
+        for s in standings
+    )
+    session.commit()
+    return standings
+
+
+def format_standings(standings: Sequence[Standing]) -> str:
+    """Classement en tableau texte (console)."""
+    lines = [f"{'Agent':<28}{'Parties':>8}{'V':>6}{'N':>6}{'D':>6}{'Score':>8}{'Elo':>8}  IC 95 %"]
+    for s in standings:
+        lines.append(
+            f"{s.agent:<28}{s.games:>8}{s.wins:>6}{s.draws:>6}{s.losses:>6}"
+            f"{s.score:>8.1%}{s.elo:>8.0f}  [{s.elo_low:.0f}, {s.elo_high:.0f}]"
+        )
+    return "\n".join(lines)
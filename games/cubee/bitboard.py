@@ -0,0 +1,206 @@
+"""
+Primitives bit à bit pour le moteur "bitboard" de Cubee.
+
+Chaque joueur possède un masque entier : le bit `row * size + col` vaut 1
+si la case lui appartient. Les opérations coûteuses du modèle grille
+(BFS d'enclos, comptage des scores, recherche de case vide) deviennent
+quelques décalages et `&` / `|` sur des entiers Python.
+
+Ce module ne contient aucune règle du jeu : il ne connaît que la
+géométrie du plateau. La logique (tours, captures, fin de partie) reste
+dans `game_model.BitboardGameModel`.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+# Mêmes directions (et même ordre) que GameModel.DIRECTIONS
+_DIRECTIONS: Dict[str, Tuple[int, int]] = {
+    "up":    (-1,  0),
+    "down":  ( 1,  0),
+    "left":  ( 0, -1),
+    "right": ( 0,  1),
+}
+
+# Les 8 cases autour d'une case, dans le sens horaire en partant du haut :
+# les voisins orthogonaux (4-connexité) sont aux positions paires
+_RING: Tuple[Tuple[int, int], ...] = (
+    (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1),
+)
+
+
+@dataclass(frozen=True)
+class BoardGeometry:
+    """
+    Masques précalculés pour un plateau carré de côté `size`.
+
+    Attributes:
+        size: Côté du plateau.
+        full: Masque de toutes les cases du plateau.
+        not_first_col: Toutes les cases sauf la colonne 0 (évite le
+            débordement d'une ligne sur la suivante lors d'un `<< 1`).
+        not_last_col: Toutes les cases sauf la dernière colonne
+            (même rôle pour `>> 1`).
+        moves: Pour chaque case, la case voisine atteinte dans chaque
+            direction, ou -1 si le déplacement sort du plateau.
+        ring: Pour chaque case, les indices des 8 cases qui l'entourent
+            (sens horaire depuis le haut, -1 hors plateau), cf. `ring_runs`.
+    """
+
+    size: int
+    full: int
+    not_first_col: int
+    not_last_col: int
+    moves: Tuple[Dict[str, int], ...]
+    ring: Tuple[Tuple[int, ...], ...]
+
+    def bit(self, row: int, col: int) -> int:
+        """Retourne le masque de la case (row, col)."""
+        return 1 << (row * self.size + col)
+
+    def index(self, row: int, col: int) -> int:
+        """Retourne l'indice linéaire de la case (row, col)."""
+        return row * self.size + col
+
+    def neighbours(self, mask: int) -> int:
+        """
+        Retourne le masque des cases adjacentes (4-connexité) à `mask`.
+
+        Le résultat peut contenir des cases de `mask` lui-même ; il est
+        borné au plateau.
+        """
+        size = self.size
+        return (
+            ((mask << 1) & self.not_first_col)
+            | ((mask >> 1) & self.not_last_col)
+            | (mask << size)
+            | (mask >> size)
+        ) & self.full
+
+    def flood_fill(self, seed: int, passable: int) -> int:
+        """
+        Étend `seed` à toutes les cases de `passable` connexes à lui.
+
+        Équivalent bit à bit du BFS de `GameModel.check_enclosure` : chaque
+        itération avance le front d'une case dans les 4 directions à la
+        fois, pour un coût de quelques opérations sur entiers.
+
+        Args:
+            seed: Masque de départ (généralement une seule case).
+            passable: Cases que le remplissage a le droit de traverser.
+
+        Returns:
+            Masque des cases atteintes (seed inclus).
+        """
+        size = self.size
+        not_first_col = self.not_first_col
+        not_last_col = self.not_last_col
+        region = seed
+        while True:
+            grown = (
+                region
+                | ((region << 1) & not_first_col)
+                | ((region >> 1) & not_last_col)
+                | (region << size)
+                | (region >> size)
+            ) & passable
+            grown |= seed
+            if grown == region:
+                return region
+            region = grown
+
+    def from_rows(self, rows: List[List[int]]) -> Dict[int, int]:
+        """Convertit une matrice `List[List[int]]` en {joueur: masque}."""
+        masks = {1: 0, 2: 0}
+        for row, line in enumerate(rows):
+            for col, cell in enumerate(line):
+                if cell in masks:
+                    masks[cell] |= self.bit(row, col)
+        return masks
+
+
+@lru_cache(maxsize=None)
+def geometry(size: int) -> BoardGeometry:
+    """
+    Construit (une seule fois par taille) la géométrie d'un plateau.
+
+    Args:
+        size: Côté du plateau.
+
+    Returns:
+        BoardGeometry partagée par tous les modèles de cette taille.
+    """
+    full = (1 << (size * size)) - 1
+    first_col = 0
+    last_col = 0
+    for row in range(size):
+        first_col |= 1 << (row * size)
+        last_col |= 1 << (row * size + size - 1)
+
+    moves = []
+    for row in range(size):
+        for col in range(size):
+            targets = {}
+            for direction, (delta_row, delta_col) in _DIRECTIONS.items():
+                new_row, new_col = row + delta_row, col + delta_col
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    targets[direction] = new_row * size + new_col
+                else:
+                    targets[direction] = -1
+            moves.append(targets)
+
+    ring = []
+    for row in range(size):
+        for col in range(size):
+            ring.append(tuple(
+                (row + delta_row) * size + col + delta_col
+                if 0 <= row + delta_row < size and 0 <= col + delta_col < size
+                else -1
+                for delta_row, delta_col in _RING
+            ))
+
+    return BoardGeometry(
+        size=size,
+        full=full,
+        not_first_col=full & ~first_col,
+        not_last_col=full & ~last_col,
+        moves=tuple(moves),
+        ring=tuple(ring),
+    )
+
+
+def ring_runs(passable: Sequence[bool]) -> List[int]:
+    """
+    Groupes de voisins franchissables d'une case, vus depuis son pourtour.
+
+    Quand une case devient infranchissable, seuls ses voisins orthogonaux
+    franchissables peuvent se retrouver séparés. Deux voisins qui se
+    suivent sur le pourtour (via la diagonale entre eux) restent reliés
+    sans passer par la case : un seul groupe signifie qu'elle ne coupe
+    rien, plusieurs groupes qu'elle PEUT couper (à confirmer par un
+    remplissage, les groupes pouvant se rejoindre plus loin).
+
+    Args:
+        passable: 8 booléens, dans l'ordre de `BoardGeometry.ring`.
+
+    Returns:
+        Une position du pourtour (voisin orthogonal, donc paire) par groupe.
+    """
+    if all(passable):
+        return [0]
+    # Départ juste après une case bloquante : aucun groupe ne boucle
+    start = list(passable).index(False)
+    runs = []
+    seed = -1
+    for offset in range(1, 9):
+        position = (start + offset) % 8
+        if passable[position]:
+            if seed < 0 and position % 2 == 0:
+                seed = position
+        else:
+            if seed >= 0:
+                runs.append(seed)
+            seed = -1
+    return runs
@@ -0,0 +1,38 @@
+"""
+    model db des résultats de tournoi (cf. arena.py)
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from .base import Base
+
+
+class ArenaResult(Base):
+    """
+        Classement d'un agent à l'issue d'un tournoi Cubee.
+    """
+
+    __tablename__ = 'arena_result'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    """Nom du tournoi (toutes les lignes d'un même classement le partagent)"""
+    tournament = Column(String(100), nullable=False, index=True)
+
+    """Date d'écriture du classement"""
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    """Nom de l'agent (cf. arena.AgentSpec.name)"""
+    agent = Column(String(100), nullable=False)
+
+    """Parties jouées et bilan (victoires, nuls, défaites)"""
+    games = Column(Integer, nullable=False)
+    wins = Column(Integer, nullable=False)
+    draws = Column(Integer, nullable=False)
+    losses = Column(Integer, nullable=False)
+
+    """Elo estimé et intervalle de confiance à 95 % (bootstrap)"""
+    elo = Column(Float, nullable=False)
+    elo_low = Column(Float, nullable=False)
+    elo_high = Column(Float, nullable=False)
@@ -0,0 +1,132 @@
+"""
+Migrations du schéma SQLite de Cubee.
+
+`migrate` applique, dans l'ordre, les étapes que la base n'a pas encore
+vues ; la version atteinte est mémorisée dans `PRAGMA user_version`.
+À appeler avant `Base.metadata.create_all`.
+
+1. `migrate_state_keys` : clé d'état texte `String(1000)` + index
+   secondaire -> clé entière compacte stockée en BLOB (cf. `state_key`).
+2. `canonicalize_states` : repli des états sur leur orientation
+   canonique (cf. `symmetry`).
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..state_key import parse_legacy_key
+from .q_table import QTable
+from .q_table_repository import QTableRepo
+
+
+_LEGACY_TABLE: str = "q_table_legacy"
+
+
+def _state_column_type(engine: Engine) -> str | None:
+    """Type SQL déclaré de `q_table.state`, ou None si la table n'existe pas."""
+    with engine.connect() as connection:
+        columns = connection.exec_driver_sql("PRAGMA table_info(q_table)").fetchall()
+    # Ligne PRAGMA : (cid, name, type, notnull, dflt_value, pk)
+    return next((column[2] for column in columns if column[1] == "state"), None)
+
+
+def migrate_state_keys(engine: Engine, batch_size: int = 10_000) -> int:
+    """
+    Réécrit la Q-table avec des clés d'état compactes si nécessaire.
+
+    Étapes (une seule transaction) :
+    1. renomme l'ancienne table en `q_table_legacy`,
+    2. crée la nouvelle table `q_table`,
+    3. recopie les lignes par lots de `batch_size` en convertissant chaque
+       clé texte via `parse_legacy_key` (les clés illisibles sont ignorées),
+    4. supprime l'ancienne table (et son index).
+    Un `VACUUM` final rend au disque la place libérée.
+
+    Args:
+        engine: Moteur SQLAlchemy de la base Cubee.
+        batch_size: Nombre de lignes converties par lot.
+
+    Returns:
+        Nombre de lignes converties (0 si aucune migration n'était nécessaire).
+    """
+    state_type = _state_column_type(engine)
+    if state_type is None or "BLOB" in state_type.upper():
+        return 0
+
+    converted = 0
+    stmt = insert(QTable).prefix_with("OR REPLACE")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"ALTER TABLE q_table RENAME TO {_LEGACY_TABLE}")
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_q_table_state")
+        QTable.__table__.create(connection)
+
+        last_rowid = 0
+        while True:
+            batch = connection.exec_driver_sql(
+                f"SELECT rowid, gama, learning_rate, state, action_up, action_down, "
+                f"action_left, action_right FROM {_LEGACY_TABLE} "
+                f"WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size),
+            ).fetchall()
+            if not batch:
+                break
+            last_rowid = batch[-1][0]
+
+            rows = []
+            for _rowid, gama, learning_rate, state, up, down, left, right in batch:
+                key = parse_legacy_key(state)
+                if key is None:
+                    continue
+                rows.append({
+                    "gama": gama, "learning_rate": learning_rate, "state": key,
+                    "action_up": up, "action_down": down,
+                    "action_left": left, "action_right": right,
+                })
+            if rows:
+                connection.execute(stmt, rows)
+                converted += len(rows)
+
+        connection.exec_driver_sql(f"DROP TABLE {_LEGACY_TABLE}")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM")
+
+    return converted
+
+
+def canonicalize_states(engine: Engine) -> int:
+    """
+    Replie les états de la Q-table sur leur orientation canonique.
+
+    Args:
+        engine: Moteur SQLAlchemy de la base Cubee (clés déjà compactes).
+
+    Returns:
+        Nombre de lignes repliées (0 si la table n'existe pas).
+    """
+    if _state_column_type(engine) is None:
+        return 0
+    with Session(engine) as session:
+        return QTableRepo(session).canonicalize()
+
+
+_STEPS = (migrate_state_keys, canonicalize_states)
+
+
+def migrate(engine: Engine) -> None:
+    """
+    Amène la base à la dernière version du schéma.
+
+    Args:
+        engine: Moteur SQLAlchemy de la base Cubee.
+    """
+    with engine.connect() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+    for step in _STEPS[version:]:
+        step(engine)
+
+    if version < len(_STEPS):
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"PRAGMA user_version = {len(_STEPS)}")
@@ -2,7 +2,25 @@
     model db q_table
 """
 from .base import Base
-from sqlalchemy import Column, Integer, Float, String, UniqueConstraint
+from sqlalchemy import Column, Float, LargeBinary, String
+from sqlalchemy.types import TypeDecorator
+
+from ..state_key import key_from_bytes, key_to_bytes
+
+
+class StateKey(TypeDecorator):
+    """
+        Clé d'état entière (cf. state_key.encode_key) stockée en BLOB compact.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else key_to_bytes(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else key_from_bytes(value)
 
 
 class QTable(Base):
@@ -18,8 +36,8 @@ class QTable(Base):
     """alpha ou learning rate clés composite"""
     learning_rate  = Column(String(10), primary_key=True)
 
-    """Etat"""
-    state = Column(String(1000), primary_key=True, index=True)
+    """Etat (clé entière compacte, BLOB en base — la clé primaire sert d'index)"""
+    state = Column(StateKey, primary_key=True)
 
     """Valeur Q pour l'action aller en haut depuis cet état."""
     action_up = Column(Float)
@@ -32,4 +50,3 @@ class QTable(Base):
 
     """Valeur Q pour l'action aller à gauche depuis cet état."""
     action_left = Column(Float)
-
@@ -1,73 +1,411 @@
-""" Repository q-table"""
+"""
+Repository RAM-first pour la Q-table de Cubee.
+
+Même stratégie que `pixel_kart/dao/q_table_repository.py` :
+- la table d'un couple (gama, learning_rate) est chargée en mémoire en un
+  seul SELECT, au premier accès (ou explicitement via `load`),
+- `get_q_value` / `update_q_value` ne touchent ensuite que des floats
+  dans un dict (aucun objet ORM, rien dans l'identity map de la session),
+- `get_row` / `set_row` lisent ou écrivent les 4 actions d'un état en un
+  seul accès (choix glouton et max TD de l'IA),
+- les états modifiés sont marqués dans un set `dirty` et écrits par un
+  `INSERT OR REPLACE` groupé lors de `flush()` / `commit()`,
+- optionnellement, un budget `max_states` borne la RAM : cache LRU par
+  table, éviction avec écriture des états dirty, relecture à la demande
+  et compteurs `stats` (hits / misses / évictions).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select
 
 from .q_table import QTable
-from .base import Base
+from ..state_key import LOSE_KEY, WIN_KEY
+from ..symmetry import canonicalize_key, to_canonical
+
+
+ACTIONS = ("up", "down", "left", "right")
+"""Ordre des actions dans une ligne de Q-values (= GameModel.DIRECTIONS)."""
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+Row = List[Optional[float]]
+"""Q-values d'un état, dans l'ordre de `ACTIONS` (None = jamais écrite)."""
+
+QRow = Tuple[float, float, float, float]
+"""Q-values d'un état renvoyées par `get_row` (0.0 = jamais écrite)."""
+
+_ZERO_ROW: QRow = (0.0, 0.0, 0.0, 0.0)
+
+_EVICTION_BATCH: float = 0.1
+"""Part du budget évincée d'un coup (une seule écriture groupée)."""
+
+
+_TABLE = QTable.__table__
+_FETCH_ROW = select(*(_TABLE.c[f"action_{a}"] for a in ACTIONS)).where(
+    _TABLE.c.gama == bindparam("b_gama"),
+    _TABLE.c.learning_rate == bindparam("b_learning_rate"),
+    _TABLE.c.state == bindparam("b_state"),
+)
+"""Lecture d'une ligne (requête Core construite une fois, cf. `_fetch`)."""
+
+
+def _is_known(row: Optional[Row]) -> bool:
+    """Vrai si la ligne existe et porte au moins une Q-value."""
+    return row is not None and any(value is not None for value in row)
+
+
+@dataclass
+class CacheStats:
+    """
+    Compteurs du cache de Q-values d'un QTableRepo.
+
+    Attributes:
+        hits: Lectures servies depuis la RAM.
+        misses: Lectures d'un état absent de la RAM.
+        evictions: États retirés de la RAM (budget `max_states` atteint).
+        write_backs: États dirty écrits en base au moment de leur éviction.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    write_backs: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Part des lectures servies depuis la RAM."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
 
 class QTableRepo:
+    """
+    Gère les Q-tables de Cubee en RAM avec persistance par batch.
+
+    Utilisation typique :
+        repo = QTableRepo(session)
+        repo.get_q_value(0.9, 0.1, state, "up")          # lecture mémoire
+        repo.update_q_value("0.9", "0.1", state, "up", q)  # mémoire + dirty
+        repo.commit()                                     # écriture groupée
+
+    Une même instance peut servir plusieurs IA, y compris avec des
+    hyperparamètres différents : chaque couple (gama, learning_rate) a sa
+    propre table en mémoire.
+
+    Budget mémoire (`max_states`) : par défaut chaque table est chargée en
+    entier. Avec un budget, une table garde au plus `max_states` états en
+    RAM, dans l'ordre LRU : au-delà, les `_EVICTION_BATCH` états les moins
+    récemment utilisés sont retirés, ceux qui sont dirty étant d'abord
+    écrits en base (un seul INSERT groupé). Un état évincé est relu en base
+    à son prochain accès. La RAM reste ainsi bornée quelle que soit la
+    durée de l'entraînement, au prix d'un SELECT par défaut de cache.
+    """
 
-    def __init__(self, session):
+    def __init__(self, session, max_states: Optional[int] = None):
         """
             Initialise le repository avec une session SQLAlchemy.
+
+            Args:
+                session: Session SQLAlchemy active.
+                max_states: Nombre maximal d'états gardés en RAM par table
+                    (~300 octets par état), None pour tout garder.
         """
         self.session = session
-        self.cache: dict = {}
+        self.max_states = max_states
+        self.tables: Dict[Tuple[str, str], Dict[int, Row]] = {}
+        self.dirty: set[Tuple[str, str, int]] = set()
+        self.stats = CacheStats()
+        # Vrai si la table en RAM contient toute la table en base : un état
+        # absent de la RAM est alors inconnu, sans requête
+        self._complete: Dict[Tuple[str, str], bool] = {}
+
+    @classmethod
+    def detached(cls, gama, learning_rate, table: Dict[int, Row]) -> "QTableRepo":
+        """
+        Repository sans session sur une table déjà en mémoire.
+
+        Sert aux processus d'entraînement parallèle (cf. parallel_train.py) :
+        lectures et écritures restent en RAM, les états modifiés sont
+        suivis dans `dirty`, mais `flush` / `commit` ne doivent pas être
+        appelés (aucune base derrière).
 
+        Args:
+            gama: Facteur d'actualisation (float ou str).
+            learning_rate: Taux d'apprentissage (float ou str).
+            table: Dict état -> Q-values (ordre `ACTIONS`), utilisé tel quel.
+        """
+        repository = cls(None)
+        params = (str(gama), str(learning_rate))
+        repository.tables[params] = table
+        repository._complete[params] = True
+        return repository
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Chargement
+    # ──────────────────────────────────────────────────────────────────────
+
+    def load(self, gama, learning_rate) -> Dict[int, Row]:
+        """
+        Charge (ou recharge) la table d'un couple d'hyperparamètres en un
+        seul SELECT (limité à `max_states` états si un budget est fixé).
+
+        Args:
+            gama: Facteur d'actualisation (float ou str).
+            learning_rate: Taux d'apprentissage (float ou str).
+
+        Returns:
+            Le dict état -> Q-values, désormais servi depuis la RAM.
+        """
+        params = (str(gama), str(learning_rate))
+        columns = [getattr(QTable, f"action_{a}") for a in ACTIONS]
+        query = select(QTable.state, *columns).where(
+            QTable.gama == params[0],
+            QTable.learning_rate == params[1],
+        )
+        if self.max_states is None:
+            table = {state: list(values) for state, *values in self.session.execute(query)}
+            self._complete[params] = True
+        else:
+            result = self.session.execute(query.limit(self.max_states))
+            table = OrderedDict((state, list(values)) for state, *values in result)
+            self._complete[params] = len(table) < self.max_states
+        self.tables[params] = table
+        return table
 
+    def _table(self, gama, learning_rate) -> Dict[int, Row]:
+        """Table en RAM du couple (gama, learning_rate), chargée au besoin."""
+        table = self.tables.get((str(gama), str(learning_rate)))
+        if table is None:
+            table = self.load(gama, learning_rate)
+        return table
 
     def init_final_states(self, gama, learning_rate):
         """
             Initialise les état finaux du jeux dans la db
         """
-        if self.session.query(QTable).filter(
-            QTable.gama == gama,
-            QTable.learning_rate == learning_rate,
-            QTable.state.in_(["win", "lose"])
-            ).count() == 0:
+        for state, value in ((WIN_KEY, 10.0), (LOSE_KEY, -10.0)):
+            if not _is_known(self._lookup(gama, learning_rate, state)):
+                self.set_row(gama, learning_rate, state, [value] * len(ACTIONS))
+        self.commit()
 
-            self.session.add_all([
-                QTable(gama=gama, learning_rate=learning_rate, state="win",  action_up=10, action_down=10, action_left=10, action_right=10),
-                QTable(gama=gama, learning_rate=learning_rate,state="lose", action_up=-10, action_down=-10, action_left=-10, action_right=-10),
-            ])
-        self.session.commit()        
+    # ──────────────────────────────────────────────────────────────────────
+    # Cache (RAM, LRU si budget)
+    # ──────────────────────────────────────────────────────────────────────
 
-    
-    def get_by_id(self, gama, learning_rate, state):
+    def _lookup(self, gama, learning_rate, state) -> Optional[Row]:
         """
-            Retourne les 4 ligne possible 
+        Ligne d'un état : RAM, sinon base si la table a débordé du budget.
+
+        Returns:
+            La ligne (modifiable sur place), None si l'état est inconnu
+            d'une table complète en RAM.
         """
+        table = self._table(gama, learning_rate)
+        row = table.get(state)
+        if row is not None:
+            self.stats.hits += 1
+            if self.max_states is not None:
+                table.move_to_end(state)
+            return row
 
-        return self.session.get(QTable, (str(gama), str(learning_rate), state))
-    
-    def get_q_value(self, gama, learning_rate, state, action):
-        key = (str(gama), str(learning_rate), state)
-        if key not in self.cache:  # lit la DB seulement si pas en cache
-            row = self.session.get(QTable, key)
-            self.cache[key] = row
-        row = self.cache.get(key)
-        if row:
-            return getattr(row, f"action_{action}", 0.0) or 0.0
-        return 0.0
+        self.stats.misses += 1
+        params = (str(gama), str(learning_rate))
+        if self._complete[params]:
+            return None
+        # Table partielle : l'état a pu être évincé. Un état absent de la
+        # base est gardé vide en RAM pour ne pas le redemander à chaque accès.
+        row = self._fetch(params, state) or [None] * len(ACTIONS)
+        self._insert(params, table, state, row)
+        return row
 
-    def update_q_value(self, gama, learning_rate, state, action, new_value):
+    def _fetch(self, params: Tuple[str, str], state) -> Optional[Row]:
+        """Relit la ligne d'un état en base (None si absente)."""
+        values = self.session.connection().execute(
+            _FETCH_ROW, {"b_gama": params[0], "b_learning_rate": params[1], "b_state": state}
+        ).first()
+        return None if values is None else list(values)
+
+    def _insert(self, params: Tuple[str, str], table: Dict[int, Row], state, row: Row) -> None:
+        """Ajoute une ligne en RAM, en évinçant les plus anciennes au-delà du budget."""
+        table[state] = row
+        if self.max_states is not None and len(table) > self.max_states:
+            self._evict(params, table)
+
+    def _evict(self, params: Tuple[str, str], table: Dict[int, Row]) -> None:
+        """Retire les états les moins récents, en écrivant d'abord les dirty."""
+        nb_evicted = max(1, int(self.max_states * _EVICTION_BATCH))
+        written = []
+        for _ in range(nb_evicted):
+            state, values = table.popitem(last=False)
+            key = params + (state,)
+            if key in self.dirty:
+                self.dirty.discard(key)
+                written.append((key, values))
+        self._write(written)
+        self._complete[params] = False
+        self.stats.evictions += nb_evicted
+        self.stats.write_backs += len(written)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Lecture / écriture
+    # ──────────────────────────────────────────────────────────────────────
+
+    def get_by_id(self, gama, learning_rate, state) -> Optional[Dict[str, float]]:
+        """
+            Retourne les 4 Q-values d'un état ({action: valeur}), ou None
+            si l'état est inconnu.
+        """
+        row = self._lookup(gama, learning_rate, state)
+        if not _is_known(row):
+            return None
+        return {action: value or 0.0 for action, value in zip(ACTIONS, row)}
+
+    def get_q_value(self, gama, learning_rate, state, action) -> float:
+        """Q-value (state, action), 0.0 si inconnue."""
+        row = self._lookup(gama, learning_rate, state)
+        if row is None:
+            return 0.0
+        return row[ACTION_INDEX[action]] or 0.0
+
+    def get_row(self, gama, learning_rate, state) -> QRow:
+        """
+        Les 4 Q-values d'un état en un seul accès (ordre `ACTIONS`).
+
+        Args:
+            gama: Facteur d'actualisation (float ou str).
+            learning_rate: Taux d'apprentissage (float ou str).
+            state: Clé d'état.
+
+        Returns:
+            Tuple de 4 floats, 0.0 pour les actions jamais écrites.
+        """
+        row = self._lookup(gama, learning_rate, state)
+        if row is None:
+            return _ZERO_ROW
+        up, down, left, right = row
+        return (up or 0.0, down or 0.0, left or 0.0, right or 0.0)
+
+    def set_row(self, gama, learning_rate, state, values) -> None:
         """
-        Met à jour la Q-value en mémoire (et en base si la session le décide).
+        Remplace les 4 Q-values d'un état (ordre `ACTIONS`) et le marque dirty.
 
-        Note de perf : on n'appelle PAS `session.flush()` ici. Sur un entraînement
-        de plusieurs dizaines de milliers de parties, un flush par update génère
-        des millions d'écritures disque (SQLite fsync) et ralentit fortement le
-        training. Les modifications sont écrites en base lors du `commit()`
-        périodique appelé depuis la boucle d'entraînement (`ai_train.py`).
+        Args:
+            gama: Facteur d'actualisation (float ou str).
+            learning_rate: Taux d'apprentissage (float ou str).
+            state: Clé d'état.
+            values: 4 valeurs (None = jamais écrite).
         """
-        key = (str(gama), str(learning_rate), state)
-        row = self.cache.get(key) or self.session.get(QTable, key)
-        if row:
-            setattr(row, f"action_{action}", new_value)
-            self.cache[key] = row  # met à jour le cache
+        params = (str(gama), str(learning_rate))
+        table = self._table(gama, learning_rate)
+        if state in table:
+            table[state] = list(values)
+            if self.max_states is not None:
+                table.move_to_end(state)
         else:
-            new_row = QTable(gama=str(gama), learning_rate=str(learning_rate), state=state, **{f"action_{action}": new_value})
-            self.session.add(new_row)
-            self.cache[key] = new_row
+            self._insert(params, table, state, list(values))
+        self.dirty.add(params + (state,))
+
+    def update_q_value(self, gama, learning_rate, state, action, new_value):
+        """
+        Met à jour la Q-value en RAM et marque l'état comme dirty.
+
+        Rien n'est écrit en base ici : les états modifiés sont persistés
+        ensemble lors du `commit()` périodique de la boucle d'entraînement
+        (`ai_train.py`), ou à leur éviction si un budget est fixé.
+        """
+        row = self._lookup(gama, learning_rate, state)
+        params = (str(gama), str(learning_rate))
+        if row is None:
+            row = [None] * len(ACTIONS)
+            self._insert(params, self.tables[params], state, row)
+        row[ACTION_INDEX[action]] = new_value
+        self.dirty.add(params + (state,))
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Persistance par batch
+    # ──────────────────────────────────────────────────────────────────────
+
+    def flush(self) -> None:
+        """Écrit les états dirty par un seul `INSERT OR REPLACE` (sans commit)."""
+        if not self.dirty:
+            return
+        self._write([(key, self.tables[key[:2]][key[2]]) for key in self.dirty])
+        self.dirty.clear()
+
+    def _write(self, rows: List[Tuple[Tuple[str, str, int], Row]]) -> None:
+        """`INSERT OR REPLACE` groupé de lignes ((gama, lr, état), valeurs)."""
+        if not rows:
+            return
+        records = []
+        for (gama, learning_rate, state), values in rows:
+            record = {"gama": gama, "learning_rate": learning_rate, "state": state}
+            record.update(zip((f"action_{a}" for a in ACTIONS), values))
+            records.append(record)
+        # Insert "Core" sur la table : un seul executemany, là où l'insert
+        # ORM regroupe les lignes par colonnes non nulles
+        self.session.execute(insert(QTable.__table__).prefix_with("OR REPLACE"), records)
 
     def commit(self):
-        self.session.commit()
\ No newline at end of file
+        """Persiste les états dirty puis valide la transaction."""
+        self.flush()
+        self.session.commit()
+
+    def canonicalize(self) -> int:
+        """
+        Replie la Q-table sur les orientations canoniques (cf. symmetry.py).
+
+        Chaque ligne dont l'état n'est pas canonique est fusionnée dans la
+        ligne de son état canonique, actions traduites dans ce repère ;
+        quand plusieurs orientations d'un même état ont une valeur pour une
+        action, la moyenne est retenue. Les états terminaux sont conservés.
+
+        Returns:
+            Nombre de lignes non canoniques repliées (puis supprimées).
+        """
+        self.commit()
+        columns = [getattr(QTable, f"action_{a}") for a in ACTIONS]
+        rows = self.session.execute(
+            select(QTable.gama, QTable.learning_rate, QTable.state, *columns)
+        ).all()
+
+        merged: dict = {}    # (gama, lr, clé canonique) -> action -> [valeurs]
+        folded = []          # lignes non canoniques à supprimer
+        touched = set()      # lignes canoniques à réécrire
+        for gama, learning_rate, state, *values in rows:
+            if state in (WIN_KEY, LOSE_KEY):
+                continue
+            canonical, transform = canonicalize_key(state)
+            if canonical != state:
+                folded.append({"gama": gama, "learning_rate": learning_rate, "state": state})
+                touched.add((gama, learning_rate, canonical))
+            target = merged.setdefault((gama, learning_rate, canonical), {})
+            for action, value in zip(ACTIONS, values):
+                if value is not None:
+                    target.setdefault(to_canonical(transform, action), []).append(value)
+
+        if not folded:
+            return 0
+
+        table = QTable.__table__
+        self.session.execute(
+            delete(table).where(
+                table.c.gama == bindparam("b_gama"),
+                table.c.learning_rate == bindparam("b_learning_rate"),
+                table.c.state == bindparam("b_state"),
+            ),
+            [{f"b_{name}": value for name, value in row.items()} for row in folded],
+        )
+        rewritten = []
+        for gama, learning_rate, state in touched:
+            values = merged[(gama, learning_rate, state)]
+            row = {"gama": gama, "learning_rate": learning_rate, "state": state}
+            for action in ACTIONS:
+                samples = values.get(action)
+                row[f"action_{action}"] = sum(samples) / len(samples) if samples else None
+            rewritten.append(row)
+        self.session.execute(insert(table).prefix_with("OR REPLACE"), rewritten)
+        self.session.commit()
+        self.tables.clear()  # rechargées au prochain accès
+        self._complete.clear()
+        return len(folded)
@@ -5,7 +5,7 @@ Fait le lien entre GameModel (logique métier) et GameView (interface graphique)
 
 from typing import Optional
 
-from .game_model import GameModel
+from .game_model import GameModel, GameStateDTO
 from .game_view import GameView
 from .player import Player, Human
 
@@ -167,8 +167,8 @@ class GameController:
         current_name = self.model.players[self.model.player_turn].name
         return f"Tour de {current_name}."
 
-    def get_state_dto(self) -> dict:
-        """Retourne un DTO décrivant l'état courant complet de la partie."""
+    def get_state_dto(self) -> GameStateDTO:
+        """Retourne l'instantané (immuable) de l'état courant de la partie."""
         return self.model.get_state_dto()
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -188,16 +188,16 @@ class GameController:
     def _refresh_view(self) -> None:
         """Synchronise la Vue avec l'état courant du Modèle."""
         dto = self.model.get_state_dto()
-        players_positions = {1: (dto['position_player1']), 2: (dto['position_player2'])}
+        players_positions = {1: dto.position_player1, 2: dto.position_player2}
         self.view.update_board(
-            dto['board'],
+            dto.board,
             players_positions,
-            dto['size']
+            dto.size
         )
         self.view.update_scores(
-            dto['scores'],
-            dto['turn'],
-            dto['player_names']
+            dict(zip((1, 2), dto.scores)),
+            dto.turn,
+            dict(zip((1, 2), dto.player_names))
         )
 
     # ──────────────────────────────────────────────────────────────────────────
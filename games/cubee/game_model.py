@@ -3,11 +3,102 @@ Modèle du jeu Cubee.
 Contient toute la logique métier : plateau, mouvements, enew_columnlos, scores.
 """
 import random
-import copy
 from collections import deque
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+from .bitboard import BoardGeometry, geometry, ring_runs
 from .player import Player, Human
+from .state_key import encode_key
+from .symmetry import canonicalize
+
+
+# === DTO ===
+
+@dataclass(frozen=True)
+class GameStateDTO:
+    """
+    Instantané immuable et hashable de l'état d'une partie de Cubee.
+
+    Produit une seule fois par position par `GameModel.get_state_dto()`
+    puis partagé tel quel par l'IA, le contrôleur et la vue : aucune
+    copie n'est nécessaire puisque rien ne peut le modifier.
+
+    Attributes:
+        size: Côté du plateau.
+        board: Plateau aplati ligne par ligne, un octet par case
+            (0 = vide, 1 = joueur 1, 2 = joueur 2). La case (ligne, colonne)
+            est `board[ligne * size + colonne]`.
+        turn: Joueur dont c'est le tour (1 ou 2).
+        position_player1: Position (ligne, colonne) du joueur 1.
+        position_player2: Position (ligne, colonne) du joueur 2.
+        scores: (score joueur 1, score joueur 2).
+        is_game_over: True si la partie est terminée dans cette position.
+        player_names: (nom joueur 1, nom joueur 2) — ignorés par == et hash.
+    """
+    size: int
+    board: bytes
+    turn: int
+    position_player1: Tuple[int, int]
+    position_player2: Tuple[int, int]
+    scores: Tuple[int, int]
+    is_game_over: bool
+    player_names: Tuple[str, str] = field(default=("", ""), compare=False)
+
+    def score(self, player: int) -> int:
+        """Retourne le score du joueur 1 ou 2."""
+        return self.scores[player - 1]
+
+    @property
+    def winner(self) -> Optional[int]:
+        """Numéro du joueur en tête (1 ou 2), ou None en cas d'égalité."""
+        if self.scores[0] > self.scores[1]:
+            return 1
+        if self.scores[1] > self.scores[0]:
+            return 2
+        return None
+
+    @cached_property
+    def key(self) -> int:
+        """
+        Clé d'état compacte pour la Q-table (cf. state_key.encode_key),
+        calculée une seule fois par instantané.
+        """
+        return encode_key(
+            self.size, self.board,
+            self.position_player1, self.position_player2, self.turn,
+        )
+
+    @cached_property
+    def canonical(self) -> Tuple[int, int]:
+        """
+        (clé canonique, transformation) de l'instantané : clé de son
+        orientation canonique parmi les 8 symétries du plateau
+        (cf. symmetry.canonicalize), calculée une seule fois.
+        """
+        return canonicalize(
+            self.size, self.board,
+            self.position_player1, self.position_player2, self.turn,
+        )
+
+
+class MoveDelta(NamedTuple):
+    """
+    Delta compact d'un coup, journalisé par `GameModel.move` pour `undo`.
+
+    Attributes:
+        direction: Direction jouée (pour `redo`).
+        gained: Masque des cases gagnées par le coup (bit `ligne * size +
+            colonne`) : case nouvellement coloriée et cases capturées.
+        previous_position: Position du joueur avant le coup.
+        player: Joueur qui a joué (donc le trait avant le coup).
+    """
+    direction: str
+    gained: int
+    previous_position: Tuple[int, int]
+    player: int
 
 
 class GameModel:
@@ -15,7 +106,11 @@ class GameModel:
     Modèle prinew_columnipal du jeu Cubee.
 
     Gère l'état complet du jeu : plateau, positions des joueurs,
-    tours, scores, détection d'enclos (via BFS).
+    tours, scores, détection d'enclos (via BFS, incrémentale à chaque coup).
+
+    Chaque coup est journalisé sous forme de delta compact (`history`,
+    cf. MoveDelta) : `undo()` / `redo()` permettent d'explorer des coups
+    (recherche, récompense, simulation) sans copier le plateau.
 
     Le plateau est représenté par une matrice :
         0 = case vide
@@ -54,6 +149,9 @@ class GameModel:
         self.winner: Optional[Player] = None
         self.loser: Optional[Player] = None
 
+        # Dernier instantané produit (None = à reconstruire)
+        self._snapshot: Optional[GameStateDTO] = None
+
         self._initialize_game()
 
     # ──────────────────────────────────────────────
@@ -86,34 +184,47 @@ class GameModel:
         self.player_turn: int = 1
         self.winner = None
         self.loser  = None
+        self._snapshot = None
+        self._reset_history()
+
+    def _reset_history(self) -> None:
+        """Vide les piles d'annulation (nouveau plateau)."""
+        self.history: List[MoveDelta] = []
+        self._redo: List[str] = []
 
     # ──────────────────────────────────────────────
     # Sérialisation d'état 
     # ──────────────────────────────────────────────
 
-    def get_state_dto(self) -> dict:
+    def get_state_dto(self) -> GameStateDTO:
         """
-        Construit et retourne un DTO représentant l'état courant complet.
+        Retourne l'instantané (GameStateDTO) de l'état courant.
 
-        Fournit un instantané sérialisable utilisable par le contrôleur
-        ou la vue sans accès direct aux attributs internes du modèle.
+        L'instantané est construit au plus une fois par position : tant
+        qu'aucun coup n'est joué, les appels suivants (IA avant / après
+        son coup, contrôleur, vue) renvoient le même objet immuable.
 
         Returns:
-            Instané de GameStateDTO décrivant la partie à cet instant.
+            Instance de GameStateDTO décrivant la partie à cet instant.
         """
-        scores = self.get_scores()
-        return  {
-            'size' : self.size,
-            'board' : copy.deepcopy(self.board),
-            'turn' : self.player_turn,
-            'position_player1' : self.player_position[1],
-            'position_player2' : self.player_position[2],
-            'player_names' : {key: player.name for key, player in self.players.items()},
-            'scores' : scores,
-            'is_game_over' : self.is_game_over(),
-            'winner' : self.get_winner(),
-        }
-    
+        if self._snapshot is None:
+            board = self._board_bytes()
+            self._snapshot = GameStateDTO(
+                size=self.size,
+                board=board,
+                turn=self.player_turn,
+                position_player1=self.player_position[1],
+                position_player2=self.player_position[2],
+                scores=(board.count(self.PLAYER1), board.count(self.PLAYER2)),
+                is_game_over=self.is_game_over(),
+                player_names=(self.players[1].name, self.players[2].name),
+            )
+        return self._snapshot
+
+    def _board_bytes(self) -> bytes:
+        """Plateau aplati (un octet par case) pour GameStateDTO.board."""
+        return bytes(chain.from_iterable(self.board))
+
 
     # ──────────────────────────────────────────────
     # Validation & déplacement
@@ -227,17 +338,80 @@ class GameModel:
         new_row, new_col = row + direction_row, col + direction_column
 
         # Déplacer et colorier la case
-        self.player_position[self.player_turn] = (new_row, new_col)
-        self.board[new_row][new_col] = self.player_turn
-
-        # Vérifier les enclos créés par ce déplacement
-        self.check_enclosure()
+        player = self.player_turn
+        previous_position = self.player_position[player]
+        gained = 0
+        self.player_position[player] = (new_row, new_col)
+        if self.board[new_row][new_col] == self.EMPTY:
+            self.board[new_row][new_col] = player
+            gained = 1 << (new_row * self.size + new_col)
+            # Vérifier les enclos créés par ce déplacement (seule une case
+            # nouvellement coloriée peut en fermer un)
+            gained |= self._enclose_around(new_row, new_col)
+        self._snapshot = None
+        self._record(direction, gained, previous_position, player)
 
         # Changer de joueur
         self.next_player()
 
         return True
 
+    # ──────────────────────────────────────────────
+    # Annulation / rétablissement
+    # ──────────────────────────────────────────────
+
+    def _record(self, direction: str, gained: int,
+                previous_position: Tuple[int, int], player: int) -> None:
+        """Journalise un coup ; un nouveau coup invalide les coups rétablissables."""
+        self.history.append(MoveDelta(direction, gained, previous_position, player))
+        if self._redo:
+            self._redo.clear()
+
+    def undo(self) -> bool:
+        """
+        Annule le dernier coup (cases gagnées, position, trait).
+
+        Les passes de `play()` (joueur bloqué) ne sont pas journalisées.
+
+        Returns:
+            True si un coup a été annulé, False si l'historique est vide.
+        """
+        if not self.history:
+            return False
+        delta = self.history.pop()
+        if delta.gained:
+            self._release(delta.gained, delta.player)
+        self.player_position[delta.player] = delta.previous_position
+        self.player_turn = delta.player
+        self._snapshot = None
+        self._redo.append(delta.direction)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Rejoue le dernier coup annulé.
+
+        Returns:
+            True si un coup a été rejoué, False s'il n'y en a pas.
+        """
+        if not self._redo:
+            return False
+        pending = self._redo
+        self._redo = []
+        direction = pending.pop()
+        self.move(direction)
+        self._redo = pending
+        return True
+
+    def _release(self, gained: int, player: int) -> None:
+        """Remet à vide les cases de `gained` (annulation d'un coup)."""
+        size = self.size
+        while gained:
+            low = gained & -gained
+            row, column = divmod(low.bit_length() - 1, size)
+            self.board[row][column] = self.EMPTY
+            gained ^= low
+
     # ──────────────────────────────────────────────
     # Gestion des tours
     # ──────────────────────────────────────────────
@@ -251,6 +425,7 @@ class GameModel:
         change de joueurs courant
         """
         self.player_turn = 3 - self.player_turn
+        self._snapshot = None
 
     # ──────────────────────────────────────────────
     # Détection d'enclos (BFS)
@@ -268,6 +443,7 @@ class GameModel:
         """
         current_player = self.player_turn
         opponent = 3 - current_player
+        self._snapshot = None
 
         opponent_row, opponent_column = self.player_position[opponent]
 
@@ -302,6 +478,118 @@ class GameModel:
                 if self.board[row][column] == self.EMPTY and not reachable[row][column]:
                     self.board[row][column] = current_player
 
+    def _enclose_around(self, row: int, column: int) -> int:
+        """
+        Version incrémentale de check_enclosure après coloriage de (row, column).
+
+        Pour le joueur courant, les cases franchissables par l'adversaire
+        (vides ou adverses) ne diminuent qu'à ses propres coups : après
+        chacun de ses coups, toutes les cases vides sont reliées à
+        l'adversaire. Un nouvel enclos ne peut donc venir que d'une coupure
+        par la case qui vient d'être coloriée :
+
+        1. Test local (`ring_runs`) : si les voisins franchissables de la
+           case restent reliés par son pourtour, rien n'est coupé — O(1),
+           le cas de loin le plus fréquent.
+        2. Sinon, un BFS par morceau potentiel, avancés à tour de rôle : deux
+           BFS qui se rencontrent fusionnent, un BFS épuisé est un morceau
+           complet. On s'arrête dès qu'il ne reste qu'un morceau ouvert
+           (celui de l'adversaire) : le coût est celui des petits morceaux,
+           c'est-à-dire des cases capturées.
+
+        Suppose un plateau atteint par des coups légaux ; après une
+        modification arbitraire de `board`, utiliser check_enclosure.
+
+        Returns:
+            Masque des cases capturées (cf. MoveDelta.gained).
+        """
+        current_player = self.player_turn
+        board = self.board
+        size = self.size
+        ring = geometry(size).ring[row * size + column]
+        passable = [
+            index >= 0 and board[index // size][index % size] != current_player
+            for index in ring
+        ]
+        runs = ring_runs(passable)
+        if len(runs) < 2:
+            return 0
+
+        opponent_cell = self.player_position[3 - current_player]
+        # Un BFS par morceau : owner[case] = BFS d'origine, parent = fusions
+        parent = list(range(len(runs)))
+        queues: List[deque] = []
+        cells: List[List[Tuple[int, int]]] = []
+        has_opponent: List[bool] = []
+        owner: Dict[Tuple[int, int], int] = {}
+        for search, position in enumerate(runs):
+            start = divmod(ring[position], size)
+            owner[start] = search
+            queues.append(deque([start]))
+            cells.append([start])
+            has_opponent.append(start == opponent_cell)
+
+        def find(search: int) -> int:
+            while parent[search] != search:
+                search = parent[search]
+            return search
+
+        active = list(range(len(runs)))
+        closed: List[int] = []
+        while active:
+            # Un seul morceau ouvert et l'adversaire pas dans un morceau
+            # fermé : ce morceau ouvert est le sien, inutile de le finir
+            if len(active) == 1 and not any(has_opponent[search] for search in closed):
+                break
+            for search in active:
+                if parent[search] != search or not queues[search]:
+                    continue
+                cell_row, cell_column = queues[search].popleft()
+                for direction_row, direction_column in self.DIRECTIONS.values():
+                    new_row = cell_row + direction_row
+                    new_column = cell_column + direction_column
+                    if not (0 <= new_row < size and 0 <= new_column < size):
+                        continue
+                    if board[new_row][new_column] == current_player:
+                        continue
+                    cell = (new_row, new_column)
+                    other = owner.get(cell)
+                    if other is None:
+                        owner[cell] = search
+                        queues[search].append(cell)
+                        cells[search].append(cell)
+                        if cell == opponent_cell:
+                            has_opponent[search] = True
+                        continue
+                    other = find(other)
+                    if other != search:
+                        # Les deux BFS sont dans le même morceau : fusion
+                        parent[other] = search
+                        queues[search].extend(queues[other])
+                        queues[other].clear()
+                        cells[search].extend(cells[other])
+                        has_opponent[search] = has_opponent[search] or has_opponent[other]
+            still_active = []
+            for search in active:
+                if parent[search] != search:
+                    continue
+                if queues[search]:
+                    still_active.append(search)
+                else:
+                    closed.append(search)
+            active = still_active
+
+        # Capture des cases vides des morceaux fermés sans l'adversaire
+        captured = 0
+        for search in closed:
+            if has_opponent[search]:
+                continue
+            for cell_row, cell_column in cells[search]:
+                if board[cell_row][cell_column] == self.EMPTY:
+                    board[cell_row][cell_column] = current_player
+                    captured |= 1 << (cell_row * size + cell_column)
+        return captured
+
     # ──────────────────────────────────────────────
     # Scores & fin de partie
     # ──────────────────────────────────────────────
@@ -410,4 +698,268 @@ class GameModel:
             success = current.play()
             if not success:
                 self.next_player()  # passer le tour si bloqué
-        self.end_game()
\ No newline at end of file
+        self.end_game()
+
+class BitboardGameModel(GameModel):
+    """
+    Variante de GameModel dont le plateau est stocké sous forme de bitboards.
+
+    Même API publique que GameModel (move, legal_move, get_scores,
+    is_game_over, get_state_dto, play...), mais :
+    - chaque joueur possède un masque entier de ses cases (`masks`),
+    - l'enclos est détecté par un remplissage bit à bit (`flood_fill`)
+      au lieu d'un BFS case par case,
+    - les scores sont des compteurs tenus à jour à chaque capture, ce qui
+      évite de re-parcourir tout le plateau dans get_scores / is_game_over.
+
+    Pensé pour l'entraînement (self-play sur 7x7 / 9x9) ; la vue continue
+    d'utiliser `board`, reconstruit à la demande depuis les masques.
+
+    Les deltas de `history` utilisent le même masque que les bitboards :
+    `undo()` se réduit à quelques opérations sur entiers, ce qui en fait le
+    moteur des joueurs à recherche (cf. search.py).
+    """
+
+    def _initialize_game(self) -> None:
+        """Initialise les masques, les compteurs et les positions de départ."""
+        self.geometry: BoardGeometry = geometry(self.size)
+        # Mélange les joueurs (même ordre d'appels aléatoires que GameModel)
+        self.shuffle()
+        self.player_position: Dict[int, Tuple[int, int]] = {
+            1: (0, 0),
+            2: (self.size - 1, self.size - 1),
+        }
+        self.masks: Dict[int, int] = {
+            1: self.geometry.bit(0, 0),
+            2: self.geometry.bit(self.size - 1, self.size - 1),
+        }
+        self._sync_counters()
+
+        self.player_turn: int = 1
+        self.winner = None
+        self.loser  = None
+        self._snapshot = None
+
+    def _sync_counters(self) -> None:
+        """Recalcule cases vides, scores et plateau aplati depuis `masks`."""
+        self.empty: int = self.geometry.full & ~(self.masks[1] | self.masks[2])
+        self.scores: Dict[int, int] = {
+            1: self.masks[1].bit_count(),
+            2: self.masks[2].bit_count(),
+        }
+        # Plateau aplati tenu à jour case par case, copié tel quel
+        # dans les instantanés (cf. _board_bytes)
+        self.cells = bytearray(self.size * self.size)
+        for player, mask in self.masks.items():
+            self._paint(mask, player)
+        self._reset_history()
+        self._snapshot = None
+
+    def _paint(self, mask: int, player: int) -> None:
+        """Reporte dans `cells` les cases de `mask` attribuées à `player`."""
+        cells = self.cells
+        while mask:
+            low = mask & -mask
+            cells[low.bit_length() - 1] = player
+            mask ^= low
+
+    def _board_bytes(self) -> bytes:
+        """Voir GameModel._board_bytes — simple copie de `cells`."""
+        return bytes(self.cells)
+
+    # ──────────────────────────────────────────────
+    # Vue "matrice" (compatibilité avec GameModel)
+    # ──────────────────────────────────────────────
+
+    @property
+    def board(self) -> List[List[int]]:
+        """Matrice du plateau reconstruite depuis `cells` (copie)."""
+        size = self.size
+        return [list(self.cells[row * size:(row + 1) * size]) for row in range(size)]
+
+    @board.setter
+    def board(self, rows: List[List[int]]) -> None:
+        """Remplace le plateau par une matrice (utile pour les tests)."""
+        self.masks = self.geometry.from_rows(rows)
+        self._sync_counters()
+
+    def load_state(self, state: GameStateDTO) -> None:
+        """
+        Recopie un instantané (plateau, positions, trait) dans ce modèle.
+
+        Permet de chercher sur un bitboard privé à partir de n'importe
+        quel moteur (cf. search.py) ; l'historique repart de zéro.
+
+        Args:
+            state: Instantané de même taille que ce modèle.
+        """
+        masks = {1: 0, 2: 0}
+        for index, cell in enumerate(state.board):
+            if cell in masks:
+                masks[cell] |= 1 << index
+        self.masks = masks
+        self.player_position = {1: state.position_player1, 2: state.position_player2}
+        self.player_turn = state.turn
+        self._sync_counters()
+
+    # ──────────────────────────────────────────────
+    # Validation & déplacement
+    # ──────────────────────────────────────────────
+
+    def _target(self, player: int, direction: str) -> int:
+        """Indice de la case visée par `direction`, ou -1 si interdite."""
+        if direction not in self.DIRECTIONS:
+            return -1
+        row, col = self.player_position[player]
+        target = self.geometry.moves[row * self.size + col][direction]
+        if target < 0 or (self.masks[3 - player] >> target) & 1:
+            return -1
+        return target
+
+    def is_valid_move(self, player: int, direction: str) -> bool:
+        """Voir GameModel.is_valid_move."""
+        return self._target(player, direction) >= 0
+
+    def colours_new_cell(self, direction: str) -> bool:
+        """Vrai si le coup du joueur courant colorie une case vide."""
+        target = self._target(self.player_turn, direction)
+        return target >= 0 and (self.empty >> target) & 1 == 1
+
+    def move(self, direction: str) -> bool:
+        """Voir GameModel.move — colorie la case via les masques."""
+        player = self.player_turn
+        target = self._target(player, direction)
+        if target < 0:
+            return False
+
+        before = self.masks[player]
+        previous_position = self.player_position[player]
+        self.player_position[player] = divmod(target, self.size)
+        bit = 1 << target
+        if self.empty & bit:
+            self.empty ^= bit
+            self.masks[player] |= bit
+            self.scores[player] += 1
+            self.cells[target] = player
+            # Seule une case nouvellement coloriée peut fermer un enclos
+            self._enclose_around(target)
+        self._snapshot = None
+        self._record(direction, self.masks[player] ^ before, previous_position, player)
+
+        self.next_player()
+        return True
+
+    def _release(self, gained: int, player: int) -> None:
+        """Voir GameModel._release — retire `gained` du masque du joueur."""
+        self.masks[player] ^= gained
+        self.empty |= gained
+        self.scores[player] -= gained.bit_count()
+        self._paint(gained, self.EMPTY)
+
+    # ──────────────────────────────────────────────
+    # Détection d'enclos (flood-fill bit à bit)
+    # ──────────────────────────────────────────────
+
+    def check_enclosure(self) -> None:
+        """
+        Capture les cases vides que l'adversaire ne peut plus atteindre.
+
+        Même règle que GameModel.check_enclosure, mais la zone atteignable
+        est calculée par `BoardGeometry.flood_fill` sur les cases vides ou
+        adverses.
+        """
+        current_player = self.player_turn
+        opponent = 3 - current_player
+        if not self.empty:
+            return
+
+        opponent_row, opponent_column = self.player_position[opponent]
+        reachable = self.geometry.flood_fill(
+            self.geometry.bit(opponent_row, opponent_column),
+            self.empty | self.masks[opponent],
+        )
+        self._capture(self.empty & ~reachable)
+
+    def _enclose_around(self, target: int) -> None:
+        """
+        Voir GameModel._enclose_around — version bit à bit.
+
+        Les morceaux potentiels sont des masques étendus d'un anneau à la
+        fois, à tour de rôle ; deux masques qui se touchent fusionnent.
+        """
+        current_player = self.player_turn
+        if not self.empty:
+            return
+        passable_mask = self.empty | self.masks[3 - current_player]
+        ring = self.geometry.ring[target]
+        runs = ring_runs([index >= 0 and (passable_mask >> index) & 1 for index in ring])
+        if len(runs) < 2:
+            return
+
+        opponent_row, opponent_column = self.player_position[3 - current_player]
+        opponent_bit = self.geometry.bit(opponent_row, opponent_column)
+        neighbours = self.geometry.neighbours
+        active = [1 << ring[position] for position in runs]
+        closed: List[int] = []
+        while active:
+            if len(active) == 1 and not any(region & opponent_bit for region in closed):
+                break
+            still_active: List[int] = []
+            while active:
+                region = active.pop()
+                grown = (region | neighbours(region)) & passable_mask
+                # Fusion avec les morceaux qu'il rejoint (étendus ou non)
+                for others in (still_active, active):
+                    for other in [other for other in others if other & grown]:
+                        others.remove(other)
+                        grown |= other
+                if grown == region:
+                    closed.append(region)
+                else:
+                    still_active.append(grown)
+            active = still_active
+
+        for region in closed:
+            if not region & opponent_bit:
+                self._capture(region & self.empty)
+
+    def _capture(self, captured: int) -> None:
+        """Attribue au joueur courant les cases vides de `captured`."""
+        if not captured:
+            return
+        current_player = self.player_turn
+        self.masks[current_player] |= captured
+        self.empty ^= captured
+        self.scores[current_player] += captured.bit_count()
+        self._paint(captured, current_player)
+        self._snapshot = None
+
+    # ──────────────────────────────────────────────
+    # Scores & fin de partie
+    # ──────────────────────────────────────────────
+
+    def get_scores(self) -> Dict[int, int]:
+        """Voir GameModel.get_scores — lecture des compteurs (copie)."""
+        return dict(self.scores)
+
+    def is_game_over(self) -> bool:
+        """Voir GameModel.is_game_over — sans parcours du plateau."""
+        if not self.empty:
+            return True
+        player = self.player_turn
+        return not any(self._target(player, direction) >= 0 for direction in self.DIRECTIONS)
+
+    def get_winner(self) -> Optional[int]:
+        """Voir GameModel.get_winner."""
+        if self.scores[1] > self.scores[2]:
+            return 1
+        if self.scores[2] > self.scores[1]:
+            return 2
+        return None
+
+
+GAME_MODELS: Dict[str, type] = {
+    "grid": GameModel,
+    "bitboard": BitboardGameModel,
+}
+"""Moteurs de plateau disponibles, sélectionnables par nom (cf. ai_train)."""
@@ -5,7 +5,7 @@ Responsable uniquement de l'affichage — aucune logique métier ici.
 
 import tkinter as tk
 from tkinter import messagebox
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 
 class GameView(tk.Frame):
@@ -258,7 +258,7 @@ class GameView(tk.Frame):
 
     def update_board(
         self,
-        board: List[List[int]],
+        board: bytes,
         player_pos: Dict[int, Tuple[int, int]],
         size: int
     ) -> None:
@@ -269,7 +269,8 @@ class GameView(tk.Frame):
         La position courante de chaque joueur est affichée avec un emoji.
 
         Args:
-            board:      Matrice représentant l'état du plateau.
+            board:      Plateau aplati (GameStateDTO.board), case (ligne,
+                        colonne) à l'indice `ligne * size + colonne`.
             player_pos: Positions {joueur: (ligne, colonne)}.
             size:       Dimension du plateau.
         """
@@ -290,7 +291,7 @@ class GameView(tk.Frame):
                 cx = (x1 + x2) // 2
                 cy = (y1 + y2) // 2
 
-                cell_val = board[row][col]
+                cell_val = board[row * size + col]
                 if (row, col) == p1_pos:
                     color = self.COLOR_P1_CURRENT
                 elif (row, col) == p2_pos:
@@ -19,21 +19,33 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from language_manager import lang_manager
+from training_service import TrainingJobMixin
 from .ai_train import train_with_progress
+from .arena import AgentSpec, format_standings, run_tournament, saved_agents
 from .dao.base import Base
+from .dao.migration import migrate
 from .dao.q_table_repository import QTableRepo
 from .game_controller import GameController
+from .parallel_train import train_parallel
 from .player import AI, Human, Player
+from .search import AlphaBetaPlayer
 from .views.menu_view import CubeeMenuView
 from .views.training_view import CubeeTrainingView
 
 
+_SPARRING_TIME_BUDGET: float = 0.01
+"""Temps de réflexion par coup de l'adversaire alpha-beta à l'entraînement."""
+
+_TRAINING_CACHE_STATES: int = 500_000
+"""États de Q-table gardés en RAM pendant l'entraînement (~150 Mo)."""
+
+
 # ──────────────────────────────────────────────────────────────────────────
 # Application principale
 # ──────────────────────────────────────────────────────────────────────────
 
 
-class CubeeApp(tk.Tk):
+class CubeeApp(TrainingJobMixin, tk.Tk):
     """
     Application principale du jeu Cubee.
 
@@ -54,9 +66,10 @@ class CubeeApp(tk.Tk):
 
         # Session DB partagée par toutes les vues qui en ont besoin
         engine = create_engine("sqlite:///cubee.db")
+        migrate(engine)
         Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+        self.Session = sessionmaker(bind=engine)
+        self.session = self.Session()
         self.db_q_table = QTableRepo(self.session)
 
         self.current_view: tk.Frame | None = None
@@ -74,7 +87,9 @@ class CubeeApp(tk.Tk):
 
         Si la vue courante est une `GameView`, on retire en plus ses bindings
         clavier globaux (sinon ils resteraient actifs sur la nouvelle vue).
+        Un entraînement en cours est annulé.
         """
+        self._cancel_training()
         if self.current_view is not None:
             if hasattr(self.current_view, "unbind_keys"):
                 self.current_view.unbind_keys()
@@ -102,6 +117,9 @@ class CubeeApp(tk.Tk):
             self,
             on_start_training=self._start_training,
             on_back=self.show_menu,
+            on_pause=self._pause_training,
+            on_resume=self._resume_training,
+            on_cancel=self._cancel_training,
         )
         self.current_view.pack(fill=tk.BOTH, expand=True)
 
@@ -153,50 +171,91 @@ class CubeeApp(tk.Tk):
 
     def _start_training(self, params: dict) -> None:
         """
-        Lance l'entraînement IA depuis la vue training.
+        Lance l'entraînement IA depuis la vue training, en arrière-plan.
+
+        La boucle tourne dans un thread (TrainingJob) avec sa propre session
+        et son propre repository : la fenêtre reste réactive et la vue relève
+        la progression via `after()`. Une annulation garde ce qui a déjà été
+        appris (commit du repository en fin de thread) ; le repository de
+        l'app, dont le cache RAM est alors périmé, est remplacé dans le
+        thread Tk une fois le thread terminé.
+
+        Avec plus d'un worker, les parties sont réparties sur des processus
+        (cf. `parallel_train.train_parallel`) ; chacun garde toute la
+        Q-table en RAM, le repository est alors créé sans budget mémoire.
 
         Args:
             params: Dictionnaire des hyperparamètres lus dans la vue :
-                {nb_games, gamma, alpha, epsilon, opponent}
+                {nb_games, gamma, alpha, epsilon, nb_workers, opponent}
         """
         view = self.current_view
         if not isinstance(view, CubeeTrainingView):
             return  # sécurité — la vue a changé entre temps
 
-        # Construction de l'IA "élève" et de l'adversaire
-        student = AI("Trainee",
-                     gama=params["gamma"],
-                     learning_rate=params["alpha"],
-                     epsilon=params["epsilon"])
-        student.q_table = self.db_q_table
-        student.init_db()
-
-        if params["opponent"] == "self":
-            opponent: Player = AI("Sparring Partner",
-                                  gama=params["gamma"],
-                                  learning_rate=params["alpha"],
-                                  epsilon=params["epsilon"])
-            opponent.q_table = self.db_q_table
-            opponent.init_db()
-        else:
-            opponent = Player("Random")
-
-        # Wrapper du callback pour forcer le rafraîchissement Tkinter
-        def progress(current: int, total: int) -> None:
-            view.update_progress(current, total)
-            view.update()
-
-        # Lancement de l'entraînement (bloquant — l'UI est rafraîchie via progress)
-        start_ts = time.time()
-        wins, losses, _draws = train_with_progress(
-            student=student,
-            opponent=opponent,
-            nb_games=params["nb_games"],
-            progress_callback=progress,
-        )
-        elapsed = time.time() - start_ts
-
-        view.show_results(wins, losses, params["nb_games"], elapsed)
+        def run(progress) -> tuple[tuple[int, int, int], float]:
+            session = self.Session()
+            nb_workers = params.get("nb_workers", 1)
+            if nb_workers > 1:
+                q_table = QTableRepo(session)
+            else:
+                # Budget mémoire : RAM stable même pour de longs entraînements
+                q_table = QTableRepo(session, max_states=_TRAINING_CACHE_STATES)
+            try:
+                start_ts = time.time()
+                if nb_workers > 1:
+                    results = train_parallel(
+                        q_table,
+                        nb_games=params["nb_games"],
+                        gamma=params["gamma"],
+                        alpha=params["alpha"],
+                        epsilon=params["epsilon"],
+                        opponent=params["opponent"],
+                        nb_workers=nb_workers,
+                        search_time_budget=_SPARRING_TIME_BUDGET,
+                        progress_callback=progress,
+                    )
+                    return results, time.time() - start_ts
+
+                # Construction de l'IA "élève" et de l'adversaire
+                student = AI("Trainee",
+                             gama=params["gamma"],
+                             learning_rate=params["alpha"],
+                             epsilon=params["epsilon"])
+                student.q_table = q_table
+                student.init_db()
+
+                if params["opponent"] == "self":
+                    opponent: Player = AI("Sparring Partner",
+                                          gama=params["gamma"],
+                                          learning_rate=params["alpha"],
+                                          epsilon=params["epsilon"])
+                    opponent.q_table = q_table
+                    opponent.init_db()
+                elif params["opponent"] == "search":
+                    opponent = AlphaBetaPlayer("Alpha-Beta", time_budget=_SPARRING_TIME_BUDGET)
+                else:
+                    opponent = Player("Random")
+
+                results = train_with_progress(
+                    student=student,
+                    opponent=opponent,
+                    nb_games=params["nb_games"],
+                    progress_callback=progress,
+                )
+                return results, time.time() - start_ts
+            finally:
+                q_table.commit()
+                session.close()
+
+        def on_done(result: tuple[tuple[int, int, int], float]) -> None:
+            (wins, losses, _draws), elapsed = result
+            view.show_results(wins, losses, params["nb_games"], elapsed)
+
+        def on_finished() -> None:
+            # Thread Tk : le cache RAM du repository de l'app est périmé
+            self.db_q_table = QTableRepo(self.session)
+
+        self._start_training_job(run, view, on_done, on_finished=on_finished)
 
     # ──────────────────────────────────────────────────────────────────────
     # Sortie vers l'accueil
@@ -232,6 +291,7 @@ def train() -> None:
         python -c "from games.cubee.main import train; train()"
     """
     engine = create_engine("sqlite:///cubee.db")
+    migrate(engine)
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -254,5 +314,31 @@ def train() -> None:
     print()
 
 
+def tournament() -> None:
+    """
+    Point d'entrée console : tournoi entre toutes les Q-tables enregistrées.
+
+    Le joueur aléatoire et l'alpha-beta servent de repères ; le classement
+    (Elo + IC 95 %) est affiché et écrit dans la table `arena_result` :
+        python -c "from games.cubee.main import tournament; tournament()"
+    """
+    engine = create_engine("sqlite:///cubee.db")
+    migrate(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    agents = saved_agents(session) + [
+        AgentSpec("Random", kind="random"),
+        AgentSpec("Alpha-Beta", kind="alphabeta", time_budget=_SPARRING_TIME_BUDGET),
+    ]
+    standings = run_tournament(
+        session, agents,
+        progress_callback=lambda c, t: print(f"\rMatches: {c}/{t}", end="", flush=True),
+    )
+    print()
+    print(format_standings(standings))
+    session.close()
+
+
 if __name__ == "__main__":
     run_game()
@@ -0,0 +1,312 @@
+"""
+Entraînement Q-learning multi-processus pour Cubee.
+
+`train_parallel` répartit les parties d'un entraînement (contre le joueur
+aléatoire, en self-play ou contre la recherche alpha-beta) sur des
+processus workers persistants. L'entraînement avance par manches :
+
+1. au démarrage, chaque worker reçoit une fois la Q-table du couple
+   (gama, learning_rate) et la garde en RAM (`QTableRepo.detached`) ;
+2. à chaque manche, le maître envoie à chaque worker une tranche de parties
+   (un ε par partie, même décroissance que `ai_train.train_with_progress`)
+   ainsi que les lignes fusionnées à la manche précédente ;
+3. chaque worker applique ces lignes, joue ses parties et renvoie les
+   lignes qu'il a modifiées ;
+4. le maître fusionne les écarts (delta) de ces lignes par rapport à sa
+   propre table, identique à celle des workers en début de manche.
+
+Seules les lignes touchées circulent entre processus : le coût d'une
+manche côté maître dépend du nombre d'états visités, pas de la taille de
+la Q-table, ce qui laisse les workers jouer l'essentiel du temps.
+
+Fusion des lignes (`merge_rows`) : un worker renvoie des lignes complètes
+(4 Q-values, None = jamais écrite). Action par action, le maître ne garde
+que les valeurs qui diffèrent de sa propre ligne ; l'écart part de 0.0
+quand sa valeur est None (le worker est le premier à écrire l'action).
+Les écarts d'une même action sont moyennés (`merge="mean"`) ou additionnés
+(`merge="sum"`). Une action qu'aucun worker n'a écrite reste None : un
+état découvert par un seul worker ne reçoit pas de 0.0 parasites, et
+`QTableRepo` continue de distinguer les actions jamais essayées.
+
+Seul le maître parle à SQLite : les lignes fusionnées passent par
+`QTableRepo.set_row` et sont écrites par un seul INSERT groupé au commit
+de fin d'entraînement.
+"""
+
+import multiprocessing
+import os
+import pickle
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .ai_train import _NB_STEPS
+from .dao.q_table_repository import ACTIONS, QTableRepo, Row
+from .game_model import GAME_MODELS
+from .player import AI, Player
+from .search import AlphaBetaPlayer
+
+
+_REDUCERS: Dict[str, Callable[[List[float]], float]] = {
+    "mean": lambda gaps: sum(gaps) / len(gaps),
+    "sum": sum,
+}
+"""Combinaison des écarts des workers sur une même action."""
+
+MERGE_MODES: Tuple[str, ...] = tuple(_REDUCERS)
+"""Valeurs admises pour `merge` (cf. `merge_rows`)."""
+
+OPPONENTS: Tuple[str, ...] = ("random", "self", "search")
+"""Adversaires possibles de l'IA entraînée (cf. CubeeTrainingView)."""
+
+_ROUND_GAMES: int = 500
+"""Nombre de parties jouées par chaque worker entre deux fusions."""
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Côté worker
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _worker_loop(connection, setup: dict) -> None:
+    """
+    Boucle d'un processus worker : joue les tranches envoyées par le maître.
+
+    Messages reçus : les lignes à appliquer puis les ε des parties à jouer,
+    ou None pour s'arrêter. Réponse : (lignes modifiées, (victoires, défaites,
+    nuls) de l'IA entraînée), ou l'exception levée.
+
+    Args:
+        connection: Extrémité worker du Pipe.
+        setup: Dict {gama, learning_rate, table, opponent, size, backend,
+            search_time_budget, seed}.
+    """
+    if setup["seed"] is not None:
+        random.seed(setup["seed"])
+
+    gama, learning_rate = setup["gama"], setup["learning_rate"]
+    table = setup["table"]
+    repository = QTableRepo.detached(gama, learning_rate, table)
+
+    student = AI("Worker", gama=gama, learning_rate=learning_rate)
+    student.q_table = repository
+    if setup["opponent"] == "self":
+        opponent: Player = AI("Sparring Partner", gama=gama, learning_rate=learning_rate)
+        opponent.q_table = repository
+    elif setup["opponent"] == "search":
+        opponent = AlphaBetaPlayer("Alpha-Beta", time_budget=setup["search_time_budget"])
+    else:
+        opponent = Player("Random")
+    game = GAME_MODELS[setup["backend"]](student, opponent, setup["size"], displayable=False)
+
+    while True:
+        merged = connection.recv()
+        if merged is None:
+            break
+        epsilons = connection.recv()
+        try:
+            table.update(merged)
+            repository.dirty.clear()
+            student.nb_wins = student.nb_loses = student.nb_draws = 0
+
+            for epsilon in epsilons:
+                student.epsilon = epsilon
+                if isinstance(opponent, AI):
+                    opponent.epsilon = epsilon
+                game.play()
+                game.reset()
+
+            rows = {state: table[state] for _, _, state in repository.dirty}
+            connection.send((rows, (student.nb_wins, student.nb_loses, student.nb_draws)))
+        except Exception as error:  # remonté au maître, qui arrête le run
+            connection.send(error)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Côté maître
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _reducer(merge: str) -> Callable[[List[float]], float]:
+    """Combinaison des écarts pour le mode `merge` (ValueError si inconnu)."""
+    try:
+        return _REDUCERS[merge]
+    except KeyError:
+        raise ValueError(
+            f"Mode de fusion Cubee inconnu : {merge!r} (modes : {', '.join(MERGE_MODES)})"
+        ) from None
+
+
+def merge_rows(
+    table: Dict[int, Row],
+    results: List[Dict[int, Row]],
+    merge: str = "mean",
+) -> Dict[int, Row]:
+    """
+    Fusionne les lignes renvoyées par les workers dans celles du maître.
+
+    Pour chaque action, seules les valeurs qui diffèrent de `table`
+    comptent ; l'écart part de 0.0 quand la valeur du maître est None. Les
+    actions qu'aucun worker n'a écrites gardent la valeur du maître, None
+    compris (cf. docstring du module).
+
+    Args:
+        table: Lignes du maître en début de manche, identiques à celles des
+            workers (non modifiées).
+        results: Pour chaque worker, dict état -> ligne complète des états
+            qu'il a modifiés.
+        merge: "mean" ou "sum" (cf. MERGE_MODES).
+
+    Returns:
+        Dict état -> ligne fusionnée, pour les états dont au moins une
+        action a changé.
+    """
+    reduce = _reducer(merge)
+    empty = [None] * len(ACTIONS)
+    deltas: Dict[int, List[List[float]]] = {}
+    for rows in results:
+        for state, row in rows.items():
+            base = table.get(state, empty)
+            for index, (value, old) in enumerate(zip(row, base)):
+                if value != old:
+                    per_action = deltas.setdefault(state, [[] for _ in ACTIONS])
+                    per_action[index].append(value - (old or 0.0))
+
+    merged = {}
+    for state, per_action in deltas.items():
+        row = list(table.get(state, empty))
+        for index, samples in enumerate(per_action):
+            if samples:
+                row[index] = (row[index] or 0.0) + reduce(samples)
+        merged[state] = row
+    return merged
+
+
+def _epsilon_of(epsilon: float, game: int, nb_games: int) -> float:
+    """ε de la partie `game`, comme après les `next_epsilon` de `train_with_progress`."""
+    nb_epsilon = max(1, int(nb_games / _NB_STEPS))
+    return max(epsilon * 0.95 ** (game // nb_epsilon), 0.05)
+
+
+def train_parallel(
+    q_table: QTableRepo,
+    nb_games: int,
+    gamma: float,
+    alpha: float,
+    epsilon: float,
+    opponent: str = "random",
+    size: int = 5,
+    backend: str = "bitboard",
+    nb_workers: Optional[int] = None,
+    merge: str = "mean",
+    round_games: int = _ROUND_GAMES,
+    search_time_budget: float = 0.01,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """
+    Lance un entraînement de N parties réparti sur des processus workers.
+
+    Même contrat que `ai_train.train_with_progress` (même table écrite,
+    même décroissance d'ε sur les numéros de partie), mais les parties
+    d'une manche sont jouées en parallèle sur des copies de la Q-table.
+
+    Chaque worker garde toute la table en RAM : `q_table` doit donc être
+    créé sans budget `max_states`.
+
+    Args:
+        q_table: Repository de la Q-table (utilisé par le maître seul).
+        nb_games: Nombre total de parties à jouer.
+        gamma: Facteur d'actualisation de l'IA entraînée.
+        alpha: Taux d'apprentissage de l'IA entraînée.
+        epsilon: ε initial (exploration).
+        opponent: Adversaire, parmi OPPONENTS. En self-play, les deux IA
+            partagent la table et le même ε.
+        size: Taille du plateau Cubee (défaut 5).
+        backend: Moteur de plateau (cf. `game_model.GAME_MODELS`).
+        nb_workers: Nombre de processus (défaut : nombre de cœurs).
+        merge: Fusion des deltas, "mean" ou "sum" (cf. `merge_rows`).
+        round_games: Parties jouées par worker entre deux fusions.
+        search_time_budget: Temps de réflexion par coup de l'adversaire
+            alpha-beta (opponent="search").
+        progress_callback: Fonction(games_done, total) appelée après chaque
+            manche. None pour désactiver.
+        seed: Graine de base des workers (reproductibilité), ou None.
+
+    Returns:
+        Tuple (wins, losses, draws) de l'IA entraînée, tous workers confondus.
+    """
+    _reducer(merge)   # avant de démarrer les processus
+    if opponent not in OPPONENTS:
+        raise ValueError(f"Adversaire inconnu : {opponent!r} (attendu : {OPPONENTS})")
+    if q_table.max_states is not None:
+        raise ValueError("L'entraînement parallèle a besoin de toute la Q-table en RAM")
+
+    nb_workers = nb_workers or os.cpu_count() or 1
+    q_table.init_final_states(str(gamma), str(alpha))
+    table = q_table.load(gamma, alpha)
+
+    workers = []
+    for worker in range(nb_workers):
+        parent_end, worker_end = multiprocessing.Pipe()
+        setup = {
+            "gama": gamma,
+            "learning_rate": alpha,
+            "table": table,
+            "opponent": opponent,
+            "size": size,
+            "backend": backend,
+            "search_time_budget": search_time_budget,
+            "seed": None if seed is None else seed + worker,
+        }
+        process = multiprocessing.Process(target=_worker_loop, args=(worker_end, setup), daemon=True)
+        process.start()
+        worker_end.close()
+        workers.append((process, parent_end))
+
+    wins = losses = draws = 0
+    games_done = 0
+    merged: Dict[int, Row] = {}
+    try:
+        while games_done < nb_games:
+            # Chaque worker reçoit les lignes fusionnées à la manche
+            # précédente (sérialisées une fois pour tous) et les ε de ses parties
+            payload = pickle.dumps(merged)
+            start = games_done
+            for _, connection in workers:
+                end = min(start + round_games, nb_games)
+                connection.send_bytes(payload)
+                connection.send([_epsilon_of(epsilon, game, nb_games) for game in range(start, end)])
+                start = end
+
+            results = []
+            for _, connection in workers:
+                result = connection.recv()
+                if isinstance(result, Exception):
+                    raise RuntimeError("Échec d'un worker d'entraînement Cubee") from result
+                rows, (nb_wins, nb_loses, nb_draws) = result
+                results.append(rows)
+                wins += nb_wins
+                losses += nb_loses
+                draws += nb_draws
+
+            merged = merge_rows(table, results, merge)
+            for state, row in merged.items():
+                q_table.set_row(gamma, alpha, state, row)
+
+            games_done = start
+            if progress_callback is not None:
+                progress_callback(games_done, nb_games)
+    finally:
+        for process, connection in workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass  # worker déjà arrêté
+            connection.close()
+        for process, _ in workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    q_table.commit()
+    return wins, losses, draws
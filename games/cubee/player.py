@@ -4,6 +4,9 @@ Représentation d'un joueur du jeu Cubee.
 import random
 from typing import Optional, Tuple, Dict
 
+from .dao.q_table_repository import ACTION_INDEX
+from .symmetry import IDENTITY, from_canonical, to_canonical
+
 class Player:
     """
     Représente un joueur dans le jeu Cubee.
@@ -90,14 +93,23 @@ class Human(Player):
 class AI(Player):
     """
     Joueur IA  — joue de façon automatique au début de l'entrainement
+
+    `training=True`  : politique ε-greedy, Q-table mise à jour à chaque coup.
+    `training=False` : exploitation pure (évaluation, cf. arena.py), ε
+    ignoré et Q-table seulement lue.
     """
-    def __init__(self, name: str, gama = 0.1,  learning_rate = 0.01, epsilon = 0.9, game=None):
+    def __init__(self, name: str, gama = 0.1,  learning_rate = 0.01, epsilon = 0.9, game=None,
+                 use_symmetry: bool = True, training: bool = True):
         super().__init__(name, game)
         self.gama: float = gama
         self.learning_rate: float = learning_rate
         self.epsilon: float = epsilon
+        self.training: bool = training
         self.type = "AI"
         self.q_table = None
+        # Apprend sur l'orientation canonique du plateau (cf. symmetry.py) :
+        # last_state / last_action sont alors exprimés dans ce repère.
+        self.use_symmetry: bool = use_symmetry
 
         self.last_state = None
         self.last_action = None
@@ -105,7 +117,7 @@ class AI(Player):
     def win(self):
         super().win()
 
-        if self.last_state and self.last_action:
+        if self.training and self.last_state is not None and self.last_action:
             self.update(10)
 
         self.last_state = None
@@ -114,18 +126,18 @@ class AI(Player):
     def lose(self):
         super().lose()
 
-        if self.last_state and self.last_action:
+        if self.training and self.last_state is not None and self.last_action:
             self.update(-10)
         
         self.last_state = None
         self.last_action = None
 
-    def _encode_state(self, state) -> str:
+    def _encode_state(self, state) -> int:
         """
-        Encode un GameStateDTO en clé string pour la Q-table.
+        Encode un GameStateDTO en clé entière compacte pour la Q-table.
 
-        Utilise les positions des joueurs, les scores et le tour
-        pour réduire l'espace d'états.
+        La clé est calculée et mise en cache par l'instantané lui-même
+        (`GameStateDTO.key`) : l'appeler plusieurs fois ne coûte rien.
 
         Args:
             state: GameStateDTO représentant l'état courant.
@@ -133,9 +145,23 @@ class AI(Player):
         Returns:
             Clé unique représentant l'état.
         """
-        board_flat = "".join(str(cell) for row in state['board'] for cell in row)
+        return state.key
+
+    def _canonical_state(self, state) -> Tuple[int, int]:
+        """
+        Clé de l'état dans le repère où la Q-table est indexée.
+
+        Args:
+            state: GameStateDTO représentant l'état courant.
 
-        return f"{state['turn']}_{state['position_player2']}_{state['position_player1']}_{state['scores'][1]}_{state['scores'][2]}_{board_flat}"
+        Returns:
+            Tuple (clé, transformation) : clé canonique et transformation
+            à appliquer aux directions si `use_symmetry`, sinon la clé
+            brute et l'identité.
+        """
+        if self.use_symmetry:
+            return state.canonical
+        return self._encode_state(state), IDENTITY
     
     def play(self):
         """
@@ -158,20 +184,20 @@ class AI(Player):
 
         state = self.game.get_state_dto() # état du jeux
 
-        if random.random() < self.epsilon:
+        if self.training and random.random() < self.epsilon:
             # Bot aléatoire qui peut se tromper (coups valides ET invalides) -> exploration
             all_moves = list(self.game.DIRECTIONS.keys())
-            self.last_state = self._encode_state(state)
+            self.last_state, transform = self._canonical_state(state)
 
-            self.last_action = random.choice(all_moves)
-            success = self.game.move(self.last_action)
+            action = random.choice(all_moves)
+            self.last_action = to_canonical(transform, action)
+            success = self.game.move(action)
             
         else:
             success = self.exploit(state) # -> exploitation
 
-        if success:
-            new_state = self.game.get_state_dto()
-            reward = self._compute_reward(state, new_state) # difference de score apres le mouvement
+        if success and self.training:
+            reward = self._compute_reward(self.game.history[-1]) # difference de score apres le mouvement
             self.update(reward) #calcule q-table 
 
         return success
@@ -199,23 +225,24 @@ class AI(Player):
         Returns:
             True si le coup a été joué, False si aucun coup possible.
         """
-        state_key = self._encode_state(state)
-        valid_moves = self.game.legal_move()
+        state_key, transform = self._canonical_state(state)
+        valid_moves = [to_canonical(transform, a) for a in self.game.legal_move()]
 
         if not valid_moves:
             return False
         
-        action = max(valid_moves, key=lambda a: self._get_q(state_key, a)) # a = action
+        row = self._q_row(state_key)  # une seule lecture pour tous les coups
+        action = max(valid_moves, key=lambda a: row[ACTION_INDEX[a]]) # a = action (repère canonique)
 
         self.last_state = state_key
         self.last_action = action
 
-        return self.game.move(action)
+        return self.game.move(from_canonical(transform, action))
     
-    def _get_q(self, state_key, action):
-        """Récupére la valeur de la q-table dans la db"""
+    def _q_row(self, state_key):
+        """Récupère les 4 Q-values d'un état (ordre `ACTION_INDEX`) en un accès."""
 
-        return self.q_table.get_q_value(self.gama, self.learning_rate, state_key, action)
+        return self.q_table.get_row(self.gama, self.learning_rate, state_key)
     
     def init_db(self):
         """Initialise les états finaux pour ce joueur dans la DB"""
@@ -240,46 +267,38 @@ class AI(Player):
             None
         """
         next_state = self.game.get_state_dto()
-        next_state = self._encode_state(next_state)
+        # max Q(s', a') ne dépend pas de l'orientation : seule la clé compte
+        next_state, _ = self._canonical_state(next_state)
 
         state = self.last_state
         action = self.last_action
 
-        all_moves = list(self.game.DIRECTIONS.keys())
-        best_q_value = max(self._get_q(next_state, action) for action in all_moves)
+        best_q_value = max(self._q_row(next_state))
 
-        current_q_value = self._get_q(state, action)
+        current_q_value = self._q_row(state)[ACTION_INDEX[action]]
 
 
         new_q = current_q_value + self.learning_rate * (reward + self.gama * best_q_value - current_q_value)
 
         self.q_table.update_q_value(str(self.gama), str(self.learning_rate), state, action, new_q)
 
-    def _compute_reward(self, state_before, state_after):
+    def _compute_reward(self, delta):
         """
         Calcule la récompense obtenue après un mouvement dans le jeu.
 
-        La récompense est définie comme la différence de score du joueur actuel
-        moins la moitié du gain accordé à l’adversaire. Cela favorise les coups
-        qui augmentent le score personnel tout en limitant les gains de l’adversaire.
+        La récompense est le nombre de cases gagnées par le coup (case
+        coloriée + captures), lu dans le delta journalisé par le modèle, sans
+        instantané avant / après. L'adversaire ne peut rien gagner pendant le
+        coup du joueur : toutes les cases gagnées reviennent à ce dernier.
 
         Args:
-            state_before (dict): L'état du jeu avant le mouvement, incluant les scores et le joueur actif.
-            state_after (dict): L'état du jeu après le mouvement.
+            delta (MoveDelta): Delta du coup qui vient d'être joué
+                (`game.history[-1]`).
 
         Returns:
             float: La récompense calculée pour le mouvement effectué.
         """
-        my_turn = state_before['turn']
-        opponent = 3 - my_turn
-
-        # Points que je gagne
-        my_gain = state_after['scores'][my_turn] - state_before['scores'][my_turn]
-    
-        # Points que j'offre à l'adversaire
-        opponent_gain = state_after['scores'][opponent] - state_before['scores'][opponent]
-
-        return my_gain - 0.5 * opponent_gain
+        return float(delta.gained.bit_count())
 
     
 
@@ -0,0 +1,472 @@
+"""
+Joueurs Cubee par recherche : alpha-beta et Monte-Carlo (MCTS).
+
+Contrairement à l'IA tabulaire (`player.AI`), ces joueurs n'apprennent
+rien : ils explorent les coups à partir de la position courante, ce qui
+les rend utilisables sur des plateaux jamais vus (évaluation, adversaire
+d'entraînement).
+
+Les deux recherches s'appuient sur `BitboardGameModel.legal_move()` /
+`move()` / `undo()` : un seul modèle privé, rechargé depuis l'instantané
+de la partie à chaque coup (`load_state`), est parcouru sans copie du
+plateau. Chaque recherche reçoit un budget de temps par coup.
+
+- `AlphaBetaSearch` : negamax alpha-beta à approfondissement itératif,
+  table de transposition indexée par un hachage de Zobrist tenu à jour
+  coup par coup (`Zobrist.after_move`).
+- `MCTSSearch` : UCT avec parties de simulation semi-aléatoires (les coups
+  qui colorient une case vide sont préférés).
+"""
+
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from .game_model import BitboardGameModel, GameStateDTO
+from .player import Player
+
+
+_WIN_VALUE: int = 10_000
+"""Valeur d'une fin de partie gagnée (la marge de score s'y ajoute)."""
+
+_TIME_CHECK_NODES: int = 256
+"""Nombre de nœuds entre deux lectures de l'horloge."""
+
+# Types d'entrée de la table de transposition
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+class _Timeout(Exception):
+    """Budget de temps épuisé au milieu d'une itération."""
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Hachage de Zobrist
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class Zobrist:
+    """
+    Hachage de Zobrist d'une position Cubee (64 bits).
+
+    Une clé aléatoire par (case, propriétaire), par (case, position d'un
+    joueur) et une pour le trait ; le hachage d'une position est le XOR
+    des clés présentes. Un coup ne change que quelques clés : le hachage
+    suivant se calcule à partir du delta journalisé par le modèle.
+
+    Attributes:
+        size: Côté du plateau.
+    """
+
+    def __init__(self, size: int, seed: int = 0) -> None:
+        """
+        Tire les clés (déterministes pour une graine donnée).
+
+        Args:
+            size: Côté du plateau.
+            seed: Graine du générateur des clés.
+        """
+        rng = random.Random(seed)
+        nb_cells = size * size
+        self.size = size
+        self._cells = {player: [rng.getrandbits(64) for _ in range(nb_cells)] for player in (1, 2)}
+        self._positions = {player: [rng.getrandbits(64) for _ in range(nb_cells)] for player in (1, 2)}
+        self._turn = rng.getrandbits(64)
+
+    def _mask_keys(self, player: int, mask: int) -> int:
+        """XOR des clés de propriété des cases de `mask`."""
+        keys = self._cells[player]
+        value = 0
+        while mask:
+            low = mask & -mask
+            value ^= keys[low.bit_length() - 1]
+            mask ^= low
+        return value
+
+    def _position_key(self, player: int, position: Tuple[int, int]) -> int:
+        row, col = position
+        return self._positions[player][row * self.size + col]
+
+    def hash(self, model: BitboardGameModel) -> int:
+        """Hachage complet de la position de `model`."""
+        value = self._mask_keys(1, model.masks[1]) ^ self._mask_keys(2, model.masks[2])
+        for player in (1, 2):
+            value ^= self._position_key(player, model.player_position[player])
+        if model.player_turn == 2:
+            value ^= self._turn
+        return value
+
+    def after_move(self, value: int, model: BitboardGameModel) -> int:
+        """
+        Hachage après le dernier coup de `model`, à partir du précédent.
+
+        Args:
+            value: Hachage de la position avant ce coup.
+            model: Modèle dont `history[-1]` est le coup qui vient d'être joué.
+        """
+        delta = model.history[-1]
+        player = delta.player
+        return (
+            value
+            ^ self._mask_keys(player, delta.gained)
+            ^ self._position_key(player, delta.previous_position)
+            ^ self._position_key(player, model.player_position[player])
+            ^ self._turn
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Alpha-beta
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def evaluate(model: BitboardGameModel) -> int:
+    """
+    Évaluation statique pour le joueur au trait : écart de score.
+
+    En fin de partie, ±_WIN_VALUE (plus l'écart) pour préférer les victoires
+    larges et les défaites courtes.
+    """
+    player = model.player_turn
+    margin = model.scores[player] - model.scores[3 - player]
+    if model.is_game_over():
+        if margin > 0:
+            return _WIN_VALUE + margin
+        if margin < 0:
+            return -_WIN_VALUE + margin
+    return margin
+
+
+class AlphaBetaSearch:
+    """
+    Negamax alpha-beta à approfondissement itératif avec table de transposition.
+
+    La table survit d'un coup à l'autre (les positions se recoupent entre
+    deux coups) ; elle est vidée quand elle dépasse `max_entries`.
+
+    Attributes:
+        max_depth: Profondeur maximale de l'approfondissement itératif.
+        max_entries: Taille maximale de la table de transposition.
+        nodes: Nœuds visités lors de la dernière recherche.
+        depth_reached: Dernière profondeur entièrement explorée.
+    """
+
+    def __init__(self, size: int, max_depth: int = 64, max_entries: int = 500_000) -> None:
+        self.zobrist = Zobrist(size)
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        # hachage -> (profondeur, valeur, type, meilleur coup)
+        self.table: Dict[int, Tuple[int, int, int, Optional[str]]] = {}
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = 0.0
+
+    def best_move(self, model: BitboardGameModel, time_budget: float) -> Optional[str]:
+        """
+        Meilleur coup du joueur au trait dans le budget de temps imparti.
+
+        Le modèle est rendu dans l'état où il a été reçu.
+
+        Args:
+            model: Position à analyser.
+            time_budget: Temps maximal de réflexion, en secondes.
+
+        Returns:
+            Direction à jouer, ou None si aucun coup n'est légal.
+        """
+        moves = model.legal_move()
+        if not moves:
+            return None
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+
+        self._deadline = time.perf_counter() + time_budget
+        self.nodes = 0
+        self.depth_reached = 0
+        root_hash = self.zobrist.hash(model)
+        best = self._ordered_moves(model, moves, root_hash)[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, move = self._search_root(model, depth, root_hash)
+            except _Timeout:
+                break
+            best = move
+            self.depth_reached = depth
+            if abs(value) >= _WIN_VALUE // 2:
+                break  # fin de partie prouvée
+        return best
+
+    def _search_root(self, model: BitboardGameModel, depth: int, root_hash: int) -> Tuple[int, str]:
+        """Une itération à profondeur `depth` ; renvoie (valeur, coup)."""
+        alpha, beta = -math.inf, math.inf
+        best_value, best_move = -math.inf, None
+        for move in self._ordered_moves(model, model.legal_move(), root_hash):
+            model.move(move)
+            try:
+                value = -self._negamax(
+                    model, depth - 1, -beta, -alpha, self.zobrist.after_move(root_hash, model)
+                )
+            finally:
+                model.undo()
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+        self.table[root_hash] = (depth, best_value, _EXACT, best_move)
+        return best_value, best_move
+
+    def _negamax(self, model: BitboardGameModel, depth: int, alpha: float, beta: float,
+                 position_hash: int) -> float:
+        """Valeur de la position pour le joueur au trait (fenêtre alpha-beta)."""
+        self.nodes += 1
+        if self.nodes % _TIME_CHECK_NODES == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+        entry = self.table.get(position_hash)
+        if entry is not None and entry[0] >= depth:
+            _, value, kind, _ = entry
+            if kind == _EXACT:
+                return value
+            if kind == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        moves = model.legal_move()
+        if depth == 0 or not moves or not model.empty:
+            return evaluate(model)
+
+        original_alpha = alpha
+        best_value, best_move = -math.inf, None
+        for move in self._ordered_moves(model, moves, position_hash):
+            model.move(move)
+            try:
+                value = -self._negamax(
+                    model, depth - 1, -beta, -alpha, self.zobrist.after_move(position_hash, model)
+                )
+            finally:
+                model.undo()
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            kind = _UPPER
+        elif best_value >= beta:
+            kind = _LOWER
+        else:
+            kind = _EXACT
+        self.table[position_hash] = (depth, best_value, kind, best_move)
+        return best_value
+
+    def _ordered_moves(self, model: BitboardGameModel, moves: List[str],
+                       position_hash: int) -> List[str]:
+        """Coup de la table d'abord, puis les coups qui colorient une case vide."""
+        entry = self.table.get(position_hash)
+        table_move = entry[3] if entry is not None else None
+
+        def priority(move: str) -> int:
+            if move == table_move:
+                return 0
+            return 1 if model.colours_new_cell(move) else 2
+
+        return sorted(moves, key=priority)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# MCTS
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class _Node:
+    """Nœud de l'arbre MCTS (statistiques du coup qui y mène)."""
+
+    __slots__ = ("player", "untried", "children", "visits", "wins")
+
+    def __init__(self, player: int, moves: List[str]) -> None:
+        self.player = player          # joueur qui a joué le coup menant ici
+        self.untried = moves          # coups pas encore développés
+        self.children: Dict[str, "_Node"] = {}
+        self.visits = 0
+        self.wins = 0.0               # victoires (0.5 par nul) pour `player`
+
+
+class MCTSSearch:
+    """
+    Recherche arborescente Monte-Carlo (UCT).
+
+    Attributes:
+        exploration: Constante d'exploration de la formule UCT.
+        playout_limit: Nombre maximal de coups d'une simulation (les
+            joueurs peuvent tourner sur leurs propres cases) ; au-delà, la
+            partie est jugée sur les scores courants.
+        iterations: Simulations effectuées lors de la dernière recherche.
+    """
+
+    def __init__(self, size: int, exploration: float = 1.4,
+                 seed: Optional[int] = None) -> None:
+        self.exploration = exploration
+        self.playout_limit = 2 * size * size
+        self.rng = random.Random(seed)
+        self.iterations = 0
+
+    def best_move(self, model: BitboardGameModel, time_budget: float) -> Optional[str]:
+        """
+        Coup le plus visité après `time_budget` secondes de simulations.
+
+        Le modèle est rendu dans l'état où il a été reçu.
+        """
+        moves = model.legal_move()
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+
+        deadline = time.perf_counter() + time_budget
+        root = _Node(3 - model.player_turn, list(moves))
+        self.iterations = 0
+        while time.perf_counter() < deadline:
+            self._iterate(model, root)
+            self.iterations += 1
+        return max(root.children.items(), key=lambda item: item[1].visits)[0]
+
+    def _iterate(self, model: BitboardGameModel, root: _Node) -> None:
+        """Sélection, expansion, simulation puis rétro-propagation."""
+        path = [root]
+        node = root
+        nb_played = 0
+        try:
+            # Sélection : descente UCT tant que le nœud est entièrement développé
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                move, node = max(
+                    node.children.items(),
+                    key=lambda item: item[1].wins / item[1].visits
+                    + self.exploration * math.sqrt(log_visits / item[1].visits),
+                )
+                model.move(move)
+                nb_played += 1
+                path.append(node)
+
+            # Expansion d'un coup non essayé
+            if node.untried and model.empty:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                player = model.player_turn
+                model.move(move)
+                nb_played += 1
+                child = _Node(player, model.legal_move() if model.empty else [])
+                node.children[move] = child
+                path.append(child)
+
+            # Simulation
+            for _ in range(self.playout_limit):
+                move = self._playout_move(model)
+                if move is None:
+                    break
+                model.move(move)
+                nb_played += 1
+            winner = model.get_winner()
+        finally:
+            for _ in range(nb_played):
+                model.undo()
+
+        for visited in path:
+            visited.visits += 1
+            if winner is None:
+                visited.wins += 0.5
+            elif winner == visited.player:
+                visited.wins += 1.0
+
+    def _playout_move(self, model: BitboardGameModel) -> Optional[str]:
+        """Coup de simulation : une case vide au hasard si possible, sinon un coup légal."""
+        if not model.empty:
+            return None
+        moves = model.legal_move()
+        if not moves:
+            return None
+        colouring = [move for move in moves if model.colours_new_cell(move)]
+        return self.rng.choice(colouring or moves)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Joueurs
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class _SearchPlayer(Player, ABC):
+    """
+    Base des joueurs à recherche : recopie la partie dans un bitboard privé.
+
+    La partie réelle (grille ou bitboard, UI ou entraînement) n'est jamais
+    modifiée pendant la réflexion ; seul le coup choisi y est joué. Les
+    sous-classes fournissent la recherche (`_new_search`), recréée à chaque
+    changement de taille de plateau.
+    """
+
+    def __init__(self, name: str, time_budget: float = 0.1, game=None) -> None:
+        """
+        Args:
+            name: Nom affiché du joueur.
+            time_budget: Temps de réflexion par coup, en secondes.
+            game: Référence optionnelle à la partie en cours.
+        """
+        super().__init__(name, game)
+        self.time_budget = time_budget
+        self.search: Optional[AlphaBetaSearch | MCTSSearch] = None
+        self._model: Optional[BitboardGameModel] = None
+
+    def _load(self, state: GameStateDTO) -> BitboardGameModel:
+        """Bitboard privé chargé avec l'état de la partie."""
+        if self._model is None or self._model.size != state.size:
+            self._model = BitboardGameModel(Player("a"), Player("b"), state.size, displayable=False)
+            self.search = self._new_search(state.size)
+        self._model.load_state(state)
+        return self._model
+
+    @abstractmethod
+    def _new_search(self, size: int) -> AlphaBetaSearch | MCTSSearch:
+        """Recherche pour un plateau de côté `size`."""
+
+    def play(self) -> bool:
+        """
+        Joue le coup trouvé par la recherche dans le budget de temps.
+
+        Returns:
+            True si le coup a été joué, False si aucun coup n'est possible.
+        """
+        if self.game is None:
+            return False
+        model = self._load(self.game.get_state_dto())
+        move = self.search.best_move(model, self.time_budget)
+        if move is None:
+            return False
+        return self.game.move(move)
+
+
+class AlphaBetaPlayer(_SearchPlayer):
+    """Joueur alpha-beta (approfondissement itératif + table de transposition)."""
+
+    def __init__(self, name: str, time_budget: float = 0.1, max_depth: int = 64,
+                 game=None) -> None:
+        super().__init__(name, time_budget, game)
+        self.max_depth = max_depth
+
+    def _new_search(self, size: int) -> AlphaBetaSearch:
+        return AlphaBetaSearch(size, max_depth=self.max_depth)
+
+
+class MCTSPlayer(_SearchPlayer):
+    """Joueur Monte-Carlo (UCT)."""
+
+    def __init__(self, name: str, time_budget: float = 0.1, seed: Optional[int] = None,
+                 game=None) -> None:
+        super().__init__(name, time_budget, game)
+        self.seed = seed
+
+    def _new_search(self, size: int) -> MCTSSearch:
+        return MCTSSearch(size, seed=self.seed)
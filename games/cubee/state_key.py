@@ -0,0 +1,130 @@
+"""
+Encodage compact des états Cubee pour la Q-table.
+
+Un état (plateau, positions, tour, taille) est empaqueté dans un seul
+entier Python, en base mixte :
+
+    clé = (((plateau_base3 * n + pos1) * n + pos2) * 2 + (tour - 1)) * 64 + taille
+
+où `n = taille²`, `plateau_base3` lit le plateau aplati comme un nombre en
+base 3 (une case = un chiffre 0/1/2) et `pos1` / `pos2` sont les indices
+linéaires des joueurs. Les scores ne sont pas encodés : ils se déduisent
+du plateau.
+
+En mémoire la clé reste un `int` (hash et comparaison rapides) ; en base
+elle est stockée en BLOB par `key_to_bytes` (8 octets pour un 5x5, contre
+~45 caractères pour l'ancienne clé texte).
+"""
+
+from typing import Optional, Tuple
+
+
+WIN_KEY: int = -1
+"""Clé réservée de l'état terminal "victoire"."""
+
+LOSE_KEY: int = -2
+"""Clé réservée de l'état terminal "défaite"."""
+
+_SIZE_RADIX: int = 64
+"""Base du chiffre de poids faible qui encode la taille du plateau."""
+
+_CELL_DIGITS = bytes.maketrans(b"\x00\x01\x02", b"012")
+_DIGIT_CELLS = bytes.maketrans(b"012", b"\x00\x01\x02")
+
+
+def encode_key(
+    size: int,
+    board: bytes,
+    position_player1: Tuple[int, int],
+    position_player2: Tuple[int, int],
+    turn: int,
+) -> int:
+    """
+    Empaquette un état dans un entier.
+
+    Args:
+        size: Côté du plateau (< 64).
+        board: Plateau aplati, un octet 0/1/2 par case (GameStateDTO.board).
+        position_player1: (ligne, colonne) du joueur 1.
+        position_player2: (ligne, colonne) du joueur 2.
+        turn: Joueur dont c'est le tour (1 ou 2).
+
+    Returns:
+        Clé entière positive, unique pour cet état.
+    """
+    cells = size * size
+    key = int(board.translate(_CELL_DIGITS), 3)
+    key = key * cells + position_player1[0] * size + position_player1[1]
+    key = key * cells + position_player2[0] * size + position_player2[1]
+    key = key * 2 + (turn - 1)
+    return key * _SIZE_RADIX + size
+
+
+def decode_key(key: int) -> Tuple[int, bytes, Tuple[int, int], Tuple[int, int], int]:
+    """
+    Inverse de `encode_key`.
+
+    Args:
+        key: Clé produite par `encode_key` (pas une clé réservée).
+
+    Returns:
+        Tuple (size, board, position_player1, position_player2, turn).
+    """
+    key, size = divmod(key, _SIZE_RADIX)
+    cells = size * size
+    key, turn_bit = divmod(key, 2)
+    key, position2 = divmod(key, cells)
+    board_value, position1 = divmod(key, cells)
+
+    digits = []
+    for _ in range(cells):
+        board_value, digit = divmod(board_value, 3)
+        digits.append(digit)
+    board = bytes(reversed(digits))
+
+    return size, board, divmod(position1, size), divmod(position2, size), turn_bit + 1
+
+
+def key_to_bytes(key: int) -> bytes:
+    """Sérialise une clé en BLOB minimal (big-endian signé)."""
+    return key.to_bytes((key.bit_length() + 8) // 8, "big", signed=True)
+
+
+def key_from_bytes(data: bytes) -> int:
+    """Inverse de `key_to_bytes`."""
+    return int.from_bytes(data, "big", signed=True)
+
+
+def parse_legacy_key(text: str) -> Optional[int]:
+    """
+    Convertit une ancienne clé texte de la Q-table en clé entière.
+
+    Format historique (AI._encode_state) :
+        "{tour}_{(l2, c2)}_{(l1, c1)}_{score1}_{score2}_{plateau}"
+    ainsi que les états terminaux "win" et "lose".
+
+    Args:
+        text: Ancienne clé lue dans `q_table.state`.
+
+    Returns:
+        La clé entière équivalente, ou None si le texte est illisible.
+    """
+    if text == "win":
+        return WIN_KEY
+    if text == "lose":
+        return LOSE_KEY
+
+    parts = text.split("_")
+    if len(parts) != 6:
+        return None
+    turn, position2, position1, _score1, _score2, board_flat = parts
+    try:
+        size = int(round(len(board_flat) ** 0.5))
+        if size * size != len(board_flat):
+            return None
+        row2, col2 = (int(v) for v in position2.strip("()").split(","))
+        row1, col1 = (int(v) for v in position1.strip("()").split(","))
+        board = board_flat.encode("ascii").translate(_DIGIT_CELLS)
+        return encode_key(size, board, (row1, col1), (row2, col2), int(turn))
+    except ValueError:
+        return None
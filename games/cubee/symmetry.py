@@ -0,0 +1,155 @@
+"""
+Canonicalisation des états Cubee par symétrie du plateau.
+
+Le plateau est carré et les règles (déplacements 4-connexes, enclos) ne
+dépendent pas de l'orientation : les 8 rotations / réflexions d'une
+position (groupe diédral D4) sont équivalentes. Plutôt que d'apprendre
+chacune séparément, l'IA ramène chaque état à son orientation canonique
+(la plus petite selon (plateau, positions)) et traduit ses actions dans
+ce repère.
+
+Usage :
+    key, transform = canonical_key(dto)
+    q = repo.get_q_value(..., key, to_canonical(transform, "up"))
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, Tuple
+
+from .state_key import decode_key, encode_key
+
+
+IDENTITY: int = 0
+"""Indice de la transformation identité."""
+
+# Les 8 isométries du carré, exprimées sur (ligne, colonne) avec n = size - 1
+_TRANSFORMS: Tuple[Callable[[int, int, int], Tuple[int, int]], ...] = (
+    lambda r, c, n: (r, c),          # identité
+    lambda r, c, n: (c, n - r),      # rotation 90°
+    lambda r, c, n: (n - r, n - c),  # rotation 180°
+    lambda r, c, n: (n - c, r),      # rotation 270°
+    lambda r, c, n: (r, n - c),      # miroir gauche / droite
+    lambda r, c, n: (n - r, c),      # miroir haut / bas
+    lambda r, c, n: (c, r),          # transposition
+    lambda r, c, n: (n - c, n - r),  # anti-transposition
+)
+
+# Mêmes directions (et même ordre) que GameModel.DIRECTIONS
+_DIRECTIONS: Dict[str, Tuple[int, int]] = {
+    "up":    (-1,  0),
+    "down":  ( 1,  0),
+    "left":  ( 0, -1),
+    "right": ( 0,  1),
+}
+_DIRECTION_NAMES: Dict[Tuple[int, int], str] = {v: k for k, v in _DIRECTIONS.items()}
+
+
+def _direction_map(transform: int) -> Dict[str, str]:
+    """Image de chaque direction par la partie linéaire de `transform`."""
+    apply = _TRANSFORMS[transform]
+    # Sur un plateau assez grand, T(p + d) - T(p) ne dépend pas de p
+    origin_row, origin_col = apply(1, 1, 2)
+    mapping = {}
+    for name, (delta_row, delta_col) in _DIRECTIONS.items():
+        row, col = apply(1 + delta_row, 1 + delta_col, 2)
+        mapping[name] = _DIRECTION_NAMES[(row - origin_row, col - origin_col)]
+    return mapping
+
+
+_TO_CANONICAL: Tuple[Dict[str, str], ...] = tuple(
+    _direction_map(t) for t in range(len(_TRANSFORMS))
+)
+_FROM_CANONICAL: Tuple[Dict[str, str], ...] = tuple(
+    {v: k for k, v in mapping.items()} for mapping in _TO_CANONICAL
+)
+
+
+def to_canonical(transform: int, direction: str) -> str:
+    """Traduit une direction du plateau réel vers le repère canonique."""
+    return _TO_CANONICAL[transform][direction]
+
+
+def from_canonical(transform: int, direction: str) -> str:
+    """Traduit une direction du repère canonique vers le plateau réel."""
+    return _FROM_CANONICAL[transform][direction]
+
+
+@lru_cache(maxsize=None)
+def _tables(size: int):
+    """
+    Précalcule, pour chaque transformation, de quoi transformer un état.
+
+    Returns:
+        Tuple de (gather, position_map) par transformation :
+        - gather : itemgetter qui lit le plateau source dans l'ordre du
+          plateau transformé (transformé[j] = source[gather[j]]),
+        - position_map : image de chaque indice de case.
+    """
+    n = size - 1
+    tables = []
+    for apply in _TRANSFORMS:
+        position_map = [0] * (size * size)
+        source = [0] * (size * size)
+        for row in range(size):
+            for col in range(size):
+                new_row, new_col = apply(row, col, n)
+                target = new_row * size + new_col
+                position_map[row * size + col] = target
+                source[target] = row * size + col
+        tables.append((itemgetter(*source), tuple(position_map)))
+    return tuple(tables)
+
+
+def canonicalize(
+    size: int,
+    board: bytes,
+    position_player1: Tuple[int, int],
+    position_player2: Tuple[int, int],
+    turn: int,
+) -> Tuple[int, int]:
+    """
+    Ramène un état à son orientation canonique.
+
+    Parmi les 8 images de l'état, retient la plus petite selon
+    (plateau, position J1, position J2) ; en cas d'égalité (position
+    elle-même symétrique), la première transformation est gardée.
+
+    Returns:
+        Tuple (clé canonique, indice de la transformation appliquée).
+    """
+    index1 = position_player1[0] * size + position_player1[1]
+    index2 = position_player2[0] * size + position_player2[1]
+
+    best = None
+    best_transform = IDENTITY
+    for transform, (gather, position_map) in enumerate(_tables(size)):
+        candidate = (bytes(gather(board)), position_map[index1], position_map[index2])
+        if best is None or candidate < best:
+            best = candidate
+            best_transform = transform
+
+    board_t, index1_t, index2_t = best
+    key = encode_key(size, board_t, divmod(index1_t, size), divmod(index2_t, size), turn)
+    return key, best_transform
+
+
+def canonical_key(state) -> Tuple[int, int]:
+    """
+    Clé canonique d'un GameStateDTO et transformation correspondante.
+
+    Args:
+        state: Instantané GameStateDTO.
+
+    Returns:
+        Tuple (clé canonique, indice de transformation).
+    """
+    return canonicalize(
+        state.size, state.board,
+        state.position_player1, state.position_player2, state.turn,
+    )
+
+
+def canonicalize_key(key: int) -> Tuple[int, int]:
+    """Comme `canonical_key`, mais à partir d'une clé déjà encodée."""
+    return canonicalize(*decode_key(key))
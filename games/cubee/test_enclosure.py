@@ -1,7 +1,14 @@
 import pytest
-from games.jeux_2.game_model import GameModel
+from games.cubee.game_model import GAME_MODELS
 
-def test_check_enclosure_empty_board():
+
+@pytest.fixture(params=sorted(GAME_MODELS))
+def GameModel(request):
+    """Rejoue chaque scénario sur tous les moteurs de plateau."""
+    return GAME_MODELS[request.param]
+
+
+def test_check_enclosure_empty_board(GameModel):
     game = GameModel("P1", "P2", size=3)
     game.board = [[0,0,0],
                   [0,0,0],
@@ -12,7 +19,7 @@ def test_check_enclosure_empty_board():
                          [0,0,0],
                          [0,0,2]]
 
-def test_check_enclosure_simple_case():
+def test_check_enclosure_simple_case(GameModel):
     game = GameModel("P1", "P2", size=3)
     game.board = [[1,1,0],
                   [1,1,1],
@@ -23,7 +30,7 @@ def test_check_enclosure_simple_case():
                          [1,1,1],
                          [1,2,2]]
 
-def test_check_enclosure_no_enclosed_area():
+def test_check_enclosure_no_enclosed_area(GameModel):
     game = GameModel("P1", "P2", size=3)
     game.board = [[1,1,1],
                   [1,0,0],
@@ -34,7 +41,7 @@ def test_check_enclosure_no_enclosed_area():
                          [1,0,0],
                          [1,1,2]]
 
-def test_check_enclosure_multiple_spaces():
+def test_check_enclosure_multiple_spaces(GameModel):
     game = GameModel("P1", "P2", size=4)
     game.board = [[1,1,1,1],
                   [1,0,0,1],
@@ -47,7 +54,7 @@ def test_check_enclosure_multiple_spaces():
                          [1,1,1,1],
                          [1,1,2,2]]
 
-def test_check_enclosure_multiple_enclosure():
+def test_check_enclosure_multiple_enclosure(GameModel):
     game = GameModel("P1", "P2", size=4)
     game.board = [[1,1,0,0],
                   [1,1,0,1],
@@ -92,7 +99,7 @@ tests = [
 ]   
 
 @pytest.mark.parametrize("board,turn,expected", tests)
-def test_enclosure(board, turn, expected):
+def test_enclosure(GameModel, board, turn, expected):
 		game = GameModel("P1", "P2", size=len(board))
 		game.board = board
 		game.player_turn = turn
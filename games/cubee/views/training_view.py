@@ -2,7 +2,7 @@
 Vue d'entraînement de l'IA pour Cubee.
 
 L'utilisateur configure les hyperparamètres (gamma, alpha, epsilon, nb parties,
-type d'adversaire) puis lance l'entraînement. La vue affiche une barre de
+nb de processus, type d'adversaire) puis lance l'entraînement. La vue affiche une barre de
 progression pendant l'entraînement, puis un récapitulatif à la fin.
 
 Architecture :
@@ -11,13 +11,16 @@ Architecture :
 - Carte des résultats (après l'entraînement)
 
 Le calcul de l'entraînement lui-même est délégué au callback `on_start_training`
-fourni par l'application principale.
+fourni par l'application principale, qui l'exécute en arrière-plan
+(cf. training_service) ; les boutons Pause / Annuler de la section
+progression passent par `on_pause`, `on_resume` et `on_cancel`.
 """
 
 import tkinter as tk
 from tkinter import Frame, ttk
 
 from language_manager import lang_manager
+from training_service import TrainingControls
 
 
 class CubeeTrainingView(Frame):
@@ -27,7 +30,9 @@ class CubeeTrainingView(Frame):
     Callbacks :
         on_start_training(params: dict)
             Lance l'entraînement avec les hyperparamètres choisis.
-            params = {nb_games, gamma, alpha, epsilon, opponent}
+            params = {nb_games, gamma, alpha, epsilon, nb_workers, opponent}
+        on_pause() / on_resume() / on_cancel()
+            Contrôle de l'entraînement en cours.
         on_back()
             Retour au menu Cubee.
     """
@@ -43,8 +48,10 @@ class CubeeTrainingView(Frame):
     DEFAULT_GAMMA = "0.9"
     DEFAULT_ALPHA = "0.1"
     DEFAULT_EPSILON = "0.9"
+    DEFAULT_NB_WORKERS = "1"
 
-    def __init__(self, master, on_start_training=None, on_back=None) -> None:
+    def __init__(self, master, on_start_training=None, on_back=None,
+                 on_pause=None, on_resume=None, on_cancel=None) -> None:
         """
         Construit la frame d'entraînement.
 
@@ -52,16 +59,23 @@ class CubeeTrainingView(Frame):
             master:            Fenêtre Tkinter parente (CubeeApp).
             on_start_training: Callback(dict) appelé au clic sur "Start".
             on_back:           Callback() pour revenir au menu.
+            on_pause:          Callback() pour suspendre l'entraînement.
+            on_resume:         Callback() pour le reprendre.
+            on_cancel:         Callback() pour l'annuler.
         """
         super().__init__(master, bg=self.BG_COLOR)
         self.on_start_training = on_start_training
         self.on_back = on_back
+        self.on_pause = on_pause
+        self.on_resume = on_resume
+        self.on_cancel = on_cancel
 
         # Variables Tkinter pour les champs et la progression
         self.nb_games_var = tk.StringVar(value=self.DEFAULT_NB_GAMES)
         self.gamma_var = tk.StringVar(value=self.DEFAULT_GAMMA)
         self.alpha_var = tk.StringVar(value=self.DEFAULT_ALPHA)
         self.epsilon_var = tk.StringVar(value=self.DEFAULT_EPSILON)
+        self.nb_workers_var = tk.StringVar(value=self.DEFAULT_NB_WORKERS)
         self.opponent_var = tk.StringVar(value="random")
         self.progress_var = tk.IntVar(value=0)
 
@@ -115,6 +129,7 @@ class CubeeTrainingView(Frame):
             ("cubee_train_gamma",    self.gamma_var),
             ("cubee_train_alpha",    self.alpha_var),
             ("cubee_train_epsilon",  self.epsilon_var),
+            ("cubee_train_workers",  self.nb_workers_var),
         ]
         self.row_labels = []  # gardés pour le multilingue
         for i, (key, var) in enumerate(rows):
@@ -141,6 +156,11 @@ class CubeeTrainingView(Frame):
             variable=self.opponent_var, value="self", bg=self.CARD_BG,
         )
         self.opp_self_radio.grid(row=len(rows) + 1, column=1, sticky="w")
+        self.opp_search_radio = tk.Radiobutton(
+            form, text=lang_manager.get_text("cubee_train_opponent_search"),
+            variable=self.opponent_var, value="search", bg=self.CARD_BG,
+        )
+        self.opp_search_radio.grid(row=len(rows) + 2, column=1, sticky="w")
 
         self.start_btn = tk.Button(
             self.params_card,
@@ -173,7 +193,13 @@ class CubeeTrainingView(Frame):
             self.progress_frame, text="",
             bg=self.CARD_BG, font=("Helvetica", 11),
         )
-        self.progress_label.pack(pady=(5, 15))
+        self.progress_label.pack(pady=(5, 5))
+
+        self.controls = TrainingControls(
+            self.progress_frame, on_pause=self.on_pause,
+            on_resume=self.on_resume, on_cancel=self.on_cancel,
+        )
+        self.controls.pack(pady=(0, 15))
 
     def _create_results_section(self) -> None:
         """Section affichée à la fin de l'entraînement (statistiques)."""
@@ -214,6 +240,7 @@ class CubeeTrainingView(Frame):
                 "gamma":    float(self.gamma_var.get()),
                 "alpha":    float(self.alpha_var.get()),
                 "epsilon":  float(self.epsilon_var.get()),
+                "nb_workers": max(1, int(self.nb_workers_var.get())),
                 "opponent": self.opponent_var.get(),
             }
         except ValueError:
@@ -250,7 +277,6 @@ class CubeeTrainingView(Frame):
         self.progress_label.config(
             text=lang_manager.get_text("cubee_train_games_played").format(current, total)
         )
-        # Force le rafraîchissement Tkinter pendant la boucle d'entraînement
         self.update_idletasks()
 
     def show_results(self, wins: int, losses: int, total: int, elapsed_s: float) -> None:
@@ -279,6 +305,13 @@ class CubeeTrainingView(Frame):
             text=lang_manager.get_text("cubee_train_elapsed").format(f"{elapsed_s:.1f}")
         )
 
+    def show_cancelled(self) -> None:
+        """Entraînement annulé : retour au formulaire des paramètres."""
+        self.progress_frame.pack_forget()
+        self.controls.reset()
+        self.progress_var.set(0)
+        self.params_card.pack(fill=tk.X, padx=60, pady=15)
+
     # ──────────────────────────────────────────────────────────────────────────
     # Multilingue
     # ──────────────────────────────────────────────────────────────────────────
@@ -292,6 +325,8 @@ class CubeeTrainingView(Frame):
         self.opp_label.config(text=lang_manager.get_text("cubee_train_opponent"))
         self.opp_random_radio.config(text=lang_manager.get_text("cubee_train_opponent_random"))
         self.opp_self_radio.config(text=lang_manager.get_text("cubee_train_opponent_self"))
+        self.opp_search_radio.config(text=lang_manager.get_text("cubee_train_opponent_search"))
         self.start_btn.config(text=lang_manager.get_text("cubee_train_start"))
         self.progress_title.config(text=lang_manager.get_text("cubee_train_progress"))
         self.results_title.config(text=lang_manager.get_text("cubee_train_complete"))
+        self.controls.update_language()
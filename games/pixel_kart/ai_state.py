@@ -3,7 +3,11 @@ Encodage de l'état et des actions pour l'IA Q-learning de Pixel Kart.
 
 Contient uniquement la représentation de l'état :
 - ACTION_TO_CHAR / CHAR_TO_ACTION : encodage 1 caractère des actions
+- ACTION_CHARS / ACTION_INDEX : ordre des colonnes de la Q-table dense
+- ACTIONS : actions publiques dans ce même ordre (colonne -> action)
 - encode_state : transforme un (Kart, Circuit) en clé string de 6 chars
+- encode_state_index : même état, directement en indice entier
+  (cf. state_to_index / index_to_state pour passer de l'un à l'autre)
 
 Format d'état : "{front}{left}{right}{back}{terrain}{speed}"
     front/left/right/back ∈ {0,1,2,3} : cases route consécutives dans la
@@ -12,15 +16,13 @@ Format d'état : "{front}{left}{right}{back}{terrain}{speed}"
     speed                 ∈ {0,1,2,3} : vitesse remappée (-1→0, 0→1, 1→2, 2→3).
 
 Les sensors sont RELATIFS à la direction du kart, ce qui permet à l'IA de
-réutiliser ce qu'elle apprend quelle que soit l'orientation absolue.
+réutiliser ce qu'elle apprend quelle que soit l'orientation absolue. Ils
+sont précalculés par case et par cap dans `Circuit.sensor_map`.
 """
 
-from games.pixel_kart.game_model import (
-    DIRECTION_ORDER,
-    DIRECTIONS,
-    Circuit,
-    Kart,
-)
+import math
+
+from games.pixel_kart.game_model import Circuit, Kart
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -39,61 +41,62 @@ ACTION_TO_CHAR: dict[str, str] = {
 CHAR_TO_ACTION: dict[str, str] = {v: k for k, v in ACTION_TO_CHAR.items()}
 """Mapping inverse : 1 caractère DB -> action publique."""
 
+ACTION_CHARS: tuple[str, ...] = tuple(ACTION_TO_CHAR.values())
+"""Caractères d'action dans l'ordre des colonnes de la Q-table dense."""
+
+ACTION_INDEX: dict[str, int] = {char: i for i, char in enumerate(ACTION_CHARS)}
+"""Mapping caractère d'action -> indice de colonne."""
+
+ACTIONS: tuple[str, ...] = tuple(ACTION_TO_CHAR)
+"""Actions publiques dans l'ordre des colonnes (= ordre de Race.ACTIONS)."""
+
+ACTION_COLUMNS: tuple[int, ...] = tuple(range(len(ACTIONS)))
+"""Indices de colonne, pour tirer une action au hasard sans la nommer."""
+
 
 # ──────────────────────────────────────────────────────────────────────────
 # Constantes
 # ──────────────────────────────────────────────────────────────────────────
 
-_MAX_DISTANCE: int = 3
+_MAX_DISTANCE: int = Circuit.SENSOR_RANGE
 """Distance maximale renvoyée par les sensors (saturation)."""
 
-_TERRAIN_ROAD: str = "0"
-_TERRAIN_GRASS: str = "1"
+STATE_RADICES: tuple[int, ...] = (
+    _MAX_DISTANCE + 1,                    # front
+    _MAX_DISTANCE + 1,                    # left
+    _MAX_DISTANCE + 1,                    # right
+    _MAX_DISTANCE + 1,                    # back
+    2,                                    # terrain
+    Kart.MAX_SPEED - Kart.MIN_SPEED + 1,  # speed
+)
+"""Nombre de valeurs de chaque chiffre de l'état (base mixte)."""
 
-_DIR_INDEX: dict[str, int] = {d: i for i, d in enumerate(DIRECTION_ORDER)}
+_DIGITS: str = "0123456789abcdefghijklmnopqrstuvwxyz"
+"""Caractère de chaque chiffre dans la clé string (un caractère par chiffre)."""
 
+if max(STATE_RADICES) > len(_DIGITS):
+    raise ValueError(f"Chiffre d'état hors de la base {len(_DIGITS)} : {STATE_RADICES}")
 
-# ──────────────────────────────────────────────────────────────────────────
-# Helpers privés
-# ──────────────────────────────────────────────────────────────────────────
+STATE_WEIGHTS: tuple[int, ...] = tuple(
+    math.prod(STATE_RADICES[position + 1:]) for position in range(len(STATE_RADICES))
+)
+"""Poids de chaque chiffre dans l'indice : indice = Σ chiffre × poids."""
 
+SPEED_DIGIT: int = len(STATE_RADICES) - 1
+"""Position du chiffre de vitesse (le dernier ; les autres viennent de `Circuit.sensor_map`)."""
 
-def _relative_direction(kart_direction: str, offset: int) -> str:
-    """
-    Retourne la direction absolue obtenue en tournant `offset` fois à droite.
+NB_STATES: int = math.prod(STATE_RADICES)
+"""Nombre d'états distincts (produit de STATE_RADICES, 2048 avec SENSOR_RANGE = 3)."""
 
-    offset: 0=devant, -1=gauche, +1=droite, +2=derrière.
-    """
-    idx = _DIR_INDEX[kart_direction]
-    return DIRECTION_ORDER[(idx + offset) % 4]
 
+# ──────────────────────────────────────────────────────────────────────────
+# Helpers privés
+# ──────────────────────────────────────────────────────────────────────────
 
-def _scan_distance(kart: Kart, circuit: Circuit, direction: str) -> int:
-    """
-    Compte les cases ROUTE consécutives depuis la position du kart dans
-    `direction`, avant de rencontrer un mur, de l'herbe ou le bord.
 
-    La ligne d'arrivée (F) est traitée comme de la route.
-    Retourne un entier dans [0, _MAX_DISTANCE].
-    """
-    dr, dc = DIRECTIONS[direction]
-    r, c = kart.position
-    distance = 0
-    for _ in range(_MAX_DISTANCE):
-        r += dr
-        c += dc
-        if not circuit.is_inside(r, c):
-            break
-        cell = circuit.cell(r, c)
-        if cell == Circuit.LETTER_WALL or cell == Circuit.LETTER_GRASS:
-            break
-        distance += 1
-    return distance
-
-
-def _encode_speed(speed: int) -> str:
-    """Remappe la vitesse [-1, 2] sur [0, 3]."""
-    return str(speed + 1)
+def _encode_speed(speed: int) -> int:
+    """Remappe la vitesse [MIN_SPEED, MAX_SPEED] sur [0, radix de la vitesse)."""
+    return speed - Kart.MIN_SPEED
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -101,26 +104,57 @@ def _encode_speed(speed: int) -> str:
 # ──────────────────────────────────────────────────────────────────────────
 
 
+def _sensors(kart: Kart, circuit: Circuit) -> tuple[int, int, int, int, int, int]:
+    """
+    Chiffres (front, left, right, back, terrain, speed) de l'état courant.
+
+    Les distances et le terrain sont lus dans `circuit.sensor_map`,
+    précalculée à la construction du circuit : aucun parcours de grille
+    par tic.
+    """
+    front, left, right, back, terrain = circuit.sensor_map[kart.position][kart.direction]
+    return front, left, right, back, terrain, _encode_speed(kart.speed)
+
+
 def encode_state(kart: Kart, circuit: Circuit) -> str:
     """
     Encode l'état de jeu en string de 6 caractères pour la Q-table.
 
-    Format : "{front}{left}{right}{back}{terrain}{speed}"
+    Format : "{front}{left}{right}{back}{terrain}{speed}", un caractère par
+    chiffre (`_DIGITS`, base 36 : la clé garde 6 caractères même si
+    `Circuit.SENSOR_RANGE` dépasse 9).
 
     Retourne une chaîne de 6 caractères ASCII. Exemples : "321002", "000013".
     """
-    front_dir = kart.direction
-    left_dir  = _relative_direction(kart.direction, -1)
-    right_dir = _relative_direction(kart.direction, +1)
-    back_dir  = _relative_direction(kart.direction, +2)
+    return "".join([_DIGITS[digit] for digit in _sensors(kart, circuit)])
 
-    front = _scan_distance(kart, circuit, front_dir)
-    left  = _scan_distance(kart, circuit, left_dir)
-    right = _scan_distance(kart, circuit, right_dir)
-    back  = _scan_distance(kart, circuit, back_dir)
 
-    cell = circuit.cell(*kart.position)
-    terrain = _TERRAIN_GRASS if cell == Circuit.LETTER_GRASS else _TERRAIN_ROAD
-    speed = _encode_speed(kart.speed)
+def encode_state_index(kart: Kart, circuit: Circuit) -> int:
+    """
+    Encode l'état de jeu directement en indice entier dans [0, NB_STATES).
 
-    return f"{front}{left}{right}{back}{terrain}{speed}"
+    Équivaut à `state_to_index(encode_state(kart, circuit))` sans passer
+    par la chaîne : c'est la forme utilisée par la boucle d'entraînement
+    pour indexer la Q-table dense.
+    """
+    index = 0
+    for digit, radix in zip(_sensors(kart, circuit), STATE_RADICES):
+        index = index * radix + digit
+    return index
+
+
+def state_to_index(state: str) -> int:
+    """Convertit une clé string de 6 chiffres en indice entier (base mixte)."""
+    index = 0
+    for digit, radix in zip(state, STATE_RADICES):
+        index = index * radix + int(digit, len(_DIGITS))
+    return index
+
+
+def index_to_state(index: int) -> str:
+    """Inverse de `state_to_index` : indice entier -> clé string de 6 chiffres."""
+    digits = []
+    for radix in reversed(STATE_RADICES):
+        index, digit = divmod(index, radix)
+        digits.append(_DIGITS[digit])
+    return "".join(reversed(digits))
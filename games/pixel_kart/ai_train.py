@@ -1,40 +1,52 @@
 """
 Boucle d'entraînement Q-learning pour Pixel Kart.
 
-Trois fonctions publiques :
+Quatre fonctions publiques :
 
 - `create_run`  : crée une nouvelle ligne `runs` en base et renvoie son ID.
 - `train`       : lance N épisodes pour un run donné, en flushant la
                   Q-table périodiquement et en notifiant l'UI via callback.
 - `run_episode` : joue un épisode complet (un kart seul sur le circuit)
                   et renvoie ses statistiques.
+- `train_batch` : variante de `train` qui joue les épisodes par lots sur
+                  le simulateur vectorisé `batch_env.BatchRace`.
 
 Utilitaires d'entraînement également définis ici :
 
 - `count_road_cells` : nombre de cases parcourables d'un circuit.
 - `compute_timeout`  : borne max de tics par épisode.
 - `compute_reward`   : récompense d'une transition (avant → après).
+- `compute_rewards_batch` : même récompense, pour tout un lot de karts.
+- `compile_rewards`  : récompense de chaque transition de la table
+                       compilée d'un circuit (`transition_table`).
 
 Architecture :
 - L'IA est instanciée localement à `train()` ; elle n'est pas exposée hors
   de cette boucle (la vue d'entraînement n'a pas à connaître `QLearningAI`).
 - La récompense est calculée ici, séparée du modèle de jeu (MVC strict).
 - Le repository `QTableRepository` cache les Q-values en RAM et flushe
-  par batch de `_FLUSH_INTERVAL` épisodes.
+  par batch de `_FLUSH_INTERVAL` épisodes, sur un thread d'écriture
+  (`dao.async_flush.AsyncFlusher`) : la boucle continue pendant l'écriture.
 """
 
+from functools import lru_cache
 from typing import Callable, Optional
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from games.pixel_kart.ai_state import (
-    ACTION_TO_CHAR,
-    encode_state,
-)
+from games.pixel_kart.ai_state import ACTION_CHARS
+from games.pixel_kart.batch_env import BatchRace
+from games.pixel_kart.dao.async_flush import AsyncFlusher
 from games.pixel_kart.dao.q_table import EpisodeLog, Run
 from games.pixel_kart.dao.q_table_repository import QTableRepository
-from games.pixel_kart.game_model import Circuit, KartDTO, Race
+from games.pixel_kart.game_model import Circuit, Kart, KartDTO
 from games.pixel_kart.player import QLearningAI
+from games.pixel_kart.transition_table import (
+    CACHE_SIZE,
+    NB_ACTIONS,
+    compile_circuit,
+)
 
 
 _FLUSH_INTERVAL: int = 500
@@ -68,7 +80,7 @@ _MAX_DIST_FALLBACK: int = 10_000
 # ──────────────────────────────────────────────────────────────────────────
 
 
-def _tick_reward(kart_after: KartDTO, circuit: Circuit) -> float:
+def _tick_reward(kart_after: Kart | KartDTO, circuit: Circuit) -> float:
     """
     Récompense de base appliquée à chaque tic non terminal.
 
@@ -102,16 +114,49 @@ def _lap_bonus(turns_done: int) -> float:
     return _LAP_BONUS if turns_done > 0 else 0.0
 
 
-def _shaping_reward(kart_before: KartDTO, kart_after: KartDTO, circuit: Circuit) -> float:
+def _shaping_reward(
+    position_before: tuple[int, int],
+    kart_after: Kart | KartDTO,
+    circuit: Circuit,
+) -> float:
     """Récompense de shaping basée sur la différence de distance à l'arrivée."""
     distance_map = getattr(circuit, "distance_map", None)
     if not distance_map:
         return 0.0
-    dist_before = distance_map.get(kart_before.position, _MAX_DIST_FALLBACK)
+    dist_before = distance_map.get(position_before, _MAX_DIST_FALLBACK)
     dist_after = distance_map.get(kart_after.position, _MAX_DIST_FALLBACK)
     return (dist_before - dist_after) * _SHAPING_SCALE
 
 
+def _transition_reward(
+    alive_before: bool,
+    turns_before: int,
+    position_before: tuple[int, int],
+    kart_after: Kart | KartDTO,
+    circuit: Circuit,
+) -> float:
+    """
+    Corps de `compute_reward`, sur les seuls champs utiles de l'état avant.
+
+    `kart_after` peut être un Kart ou un KartDTO. La boucle d'entraînement
+    ne l'appelle pas : elle lit les récompenses précompilées par
+    `compile_rewards`, qui somme les mêmes termes dans le même ordre.
+    """
+    if alive_before and not kart_after.is_alive:
+        return _CRASH_PENALTY
+
+    reward = _tick_reward(kart_after, circuit)
+    reward += _shaping_reward(position_before, kart_after, circuit)
+
+    turns_diff = kart_after.turns_done - turns_before
+    if turns_diff > 0:
+        reward += _lap_bonus(kart_after.turns_done)
+    elif turns_diff < 0:
+        reward -= _REVERSE_FINISH_PENALTY
+
+    return reward
+
+
 # ──────────────────────────────────────────────────────────────────────────
 # API publique — utilitaires d'entraînement
 # ──────────────────────────────────────────────────────────────────────────
@@ -150,20 +195,84 @@ def compute_reward(
     - +400 si la ligne d'arrivée est franchie dans le bon sens
     - -30 si la ligne d'arrivée est franchie à contresens
     """
-    crashed = kart_before.is_alive and not kart_after.is_alive
-    if crashed:
-        return _CRASH_PENALTY
+    return _transition_reward(
+        kart_before.is_alive, kart_before.turns_done, kart_before.position, kart_after, circuit,
+    )
 
-    reward = _tick_reward(kart_after, circuit)
-    reward += _shaping_reward(kart_before, kart_after, circuit)
 
-    turns_diff = kart_after.turns_done - kart_before.turns_done
-    if turns_diff > 0:
-        reward += _lap_bonus(kart_after.turns_done)
-    elif turns_diff < 0:
-        reward -= _REVERSE_FINISH_PENALTY
+_SPEED_BONUS = np.array([-0.2, -0.1, 0.2, 0.4])
+"""Bonus vitesse de `_tick_reward`, indexé par vitesse - Kart.MIN_SPEED."""
 
-    return reward
+
+def compute_rewards_batch(
+    env: BatchRace,
+    alive_before: np.ndarray,
+    turns_before: np.ndarray,
+    distance_before: np.ndarray,
+) -> np.ndarray:
+    """
+    Version vectorisée de `compute_reward` pour tous les karts d'un lot.
+
+    Les termes sont additionnés dans le même ordre que `compute_reward`,
+    ce qui donne des valeurs identiques au bit près.
+
+    Args:
+        env: Lot de karts, dans l'état APRÈS le tic.
+        alive_before: `env.alive` avant le tic.
+        turns_before: `env.turns_done` avant le tic.
+        distance_before: Distance à l'arrivée avant le tic
+            (`env.distance[row, col]`).
+
+    Returns:
+        Récompense de chaque kart pour ce tic.
+    """
+    reward = -0.5 + _SPEED_BONUS[env.speed - Kart.MIN_SPEED] + np.where(env.on_grass(), -2.0, 0.0)
+    if env.circuit.distance_map:
+        reward += (distance_before - env.distance[env.row, env.col]) * _SHAPING_SCALE
+
+    turns_diff = env.turns_done - turns_before
+    reward += np.where((turns_diff > 0) & (env.turns_done > 0), _LAP_BONUS, 0.0)
+    reward -= np.where(turns_diff < 0, _REVERSE_FINISH_PENALTY, 0.0)
+
+    crashed = alive_before & ~env.alive
+    return np.where(crashed, _CRASH_PENALTY, reward)
+
+
+def compile_rewards(circuit: Circuit) -> list[float]:
+    """
+    Récompense de chaque transition de `compile_circuit(circuit)`, hors
+    termes de tour.
+
+    Vaut `_CRASH_PENALTY` pour un crash, sinon récompense par tic +
+    shaping, sommés dans le même ordre que `_transition_reward`. Le bonus
+    de tour dépend du nombre de tours atteint (`_lap_bonus`) : il est
+    ajouté au moment du tic, à partir de `table.lap_delta`. Les
+    transitions d'une configuration non atteignable valent 0.
+
+    Returns:
+        Liste plate (lue en boucle scalaire, à ne pas modifier), indexée
+        comme `table.next_config` et mise en cache par tracé.
+    """
+    return _compile_rewards(circuit.raw)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_rewards(raw: str) -> list[float]:
+    """Corps de `compile_rewards`, par tracé (cache LRU, cf. `CACHE_SIZE`)."""
+    circuit = Circuit(name="", raw=raw)
+    table = compile_circuit(circuit)
+    rewards = [0.0] * len(table.next_config)
+    kart = Kart("Compiler")
+    for transition in np.flatnonzero(table.next_config >= 0).tolist():
+        if table.crashed_list[transition]:
+            rewards[transition] = _CRASH_PENALTY
+            continue
+        position_before, _, _ = table.decode(transition // NB_ACTIONS)
+        kart.position, _, kart.speed = table.decode(table.next_list[transition])
+        reward = _tick_reward(kart, circuit)
+        reward += _shaping_reward(position_before, kart, circuit)
+        rewards[transition] = reward
+    return rewards
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -229,7 +338,8 @@ def train(
 
     Décroissance d'epsilon linéaire : ε(i) = max(end, start − (start−end)·i/N).
     À chaque flush, la Q-table dirty est upsertée et le compteur
-    `episodes_done` est mis à jour pour permettre la reprise.
+    `episodes_done` est mis à jour pour permettre la reprise, en une
+    transaction écrite en arrière-plan (`AsyncFlusher`).
 
     Args:
         session: Session SQLAlchemy active.
@@ -258,40 +368,41 @@ def train(
     pending_logs: list[dict] = []
     base_episodes_done = run.episodes_done
 
-    for episode in range(nb_episodes):
-        ratio = episode / nb_episodes if nb_episodes > 0 else 1.0
-        ai_kart.epsilon = max(
-            run.epsilon_end,
-            run.epsilon_start - (run.epsilon_start - run.epsilon_end) * ratio,
-        )
-
-        total_reward, ticks, finished, crashed = run_episode(
-            ai_kart=ai_kart,
-            circuit=circuit,
-            nb_turns=nb_turns,
-            timeout=timeout,
-        )
-
-        pending_logs.append(
-            {
-                "run_id": run_id,
-                "episode_num": base_episodes_done + episode + 1,
-                "total_reward": total_reward,
-                "ticks": ticks,
-                "finished": finished,
-                "crashed": crashed,
-            }
-        )
-
-        if (episode + 1) % _FLUSH_INTERVAL == 0:
-            repository.flush(episode_logs=pending_logs)
-            repository.update_episodes_done(base_episodes_done + episode + 1)
-            pending_logs.clear()
-            if progress_callback is not None:
-                progress_callback(episode + 1, nb_episodes)
-
-    repository.flush(episode_logs=pending_logs)
-    repository.update_episodes_done(base_episodes_done + nb_episodes)
+    with AsyncFlusher(repository) as flusher:
+        for episode in range(nb_episodes):
+            ratio = episode / nb_episodes if nb_episodes > 0 else 1.0
+            ai_kart.epsilon = max(
+                run.epsilon_end,
+                run.epsilon_start - (run.epsilon_start - run.epsilon_end) * ratio,
+            )
+
+            total_reward, ticks, finished, crashed = run_episode(
+                ai_kart=ai_kart,
+                circuit=circuit,
+                nb_turns=nb_turns,
+                timeout=timeout,
+            )
+
+            pending_logs.append(
+                {
+                    "run_id": run_id,
+                    "episode_num": base_episodes_done + episode + 1,
+                    "total_reward": total_reward,
+                    "ticks": ticks,
+                    "finished": finished,
+                    "crashed": crashed,
+                }
+            )
+
+            if (episode + 1) % _FLUSH_INTERVAL == 0:
+                flusher.submit(pending_logs, base_episodes_done + episode + 1)
+                pending_logs = []
+                if progress_callback is not None:
+                    progress_callback(episode + 1, nb_episodes)
+
+        flusher.submit(pending_logs, base_episodes_done + nb_episodes)
+
+    repository.save_policy(base_episodes_done + nb_episodes)
     if progress_callback is not None:
         progress_callback(nb_episodes, nb_episodes)
 
@@ -311,12 +422,20 @@ def run_episode(
     Joue un épisode complet : un kart seul sur le circuit.
 
     À chaque tic :
-    - encodage de l'état courant,
-    - choix de l'action (politique ε-greedy si training),
-    - application via `race.play_action`,
-    - calcul de la récompense,
+    - choix de l'action (politique ε-greedy si training) pour l'état
+      courant (indice entier de la Q-table dense),
+    - transition lue dans la table compilée du circuit
+      (`transition_table.compile_circuit`),
+    - récompense lue dans `compile_rewards`, plus les termes de tour,
     - mise à jour Q.
 
+    Le tic ne manipule que des entiers : la configuration du kart
+    (position, direction, vitesse) est un indice de la table, dont on lit
+    la configuration d'arrivée, le crash, l'écart de tours et l'indice
+    d'état. Départ, récompenses, tirages aléatoires et Q-values sont
+    identiques au bit près à une course `Race` + `compute_reward` ; le
+    kart est remis dans son état final en fin d'épisode.
+
     L'épisode s'arrête si la course est finie, si le kart crashe, ou si
     le nombre de tics atteint `timeout`.
 
@@ -326,48 +445,240 @@ def run_episode(
     Returns:
         Tuple (total_reward, ticks, finished, crashed).
     """
-    race = Race(circuit=circuit, karts=[ai_kart], nb_turns=nb_turns)
+    table = compile_circuit(circuit)
+    rewards = compile_rewards(circuit)
+    next_config = table.next_list
+    crash_of = table.crashed_list
+    lap_of = table.lap_list
+    state_of = table.state_list
+
+    ai_kart.reset(circuit.random_start())   # comme Race.__init__
+    config = table.config_of(ai_kart.position, ai_kart.direction, ai_kart.speed)
+    turns = 0
 
     total_reward = 0.0
     ticks = 0
     crashed = False
-    last_state: str = ""
-    last_action_char: str = ""
+    last_state: int = -1
+    last_column: int = -1
+    current_state = state_of[config]
 
-    while ticks < timeout and not race.is_finished():
-        kart_before_dto = ai_kart.to_dto()
-        current_state = encode_state(ai_kart, circuit)
-
-        action = ai_kart.choose_action(current_state)
-        action_char = ACTION_TO_CHAR[action]
+    while ticks < timeout and turns < nb_turns:
+        column = ai_kart.choose_action_index(current_state)
         last_state = current_state
-        last_action_char = action_char
-
-        race.play_action(action)
-        kart_after_dto = ai_kart.to_dto()
-
-        was_crashed = (not ai_kart.is_alive) and (not crashed)
-        crashed = crashed or was_crashed
-
-        reward = compute_reward(
-            kart_before=kart_before_dto,
-            kart_after=kart_after_dto,
-            circuit=circuit,
-        )
+        last_column = column
+
+        transition = config * NB_ACTIONS + column
+        config = next_config[transition]
+        lap = lap_of[transition]
+        turns += lap
+        crashed = crash_of[transition]
+
+        if crashed:
+            reward = _CRASH_PENALTY
+        else:
+            reward = rewards[transition]
+            if lap > 0:
+                reward += _lap_bonus(turns)
+            elif lap < 0:
+                reward -= _REVERSE_FINISH_PENALTY
         total_reward += reward
 
-        terminal = was_crashed or race.is_finished()
-        new_state = "" if terminal else encode_state(ai_kart, circuit)
-        ai_kart.update_q(current_state, action_char, reward, new_state, terminal=terminal)
+        terminal = crashed or turns >= nb_turns
+        new_state = -1 if terminal else state_of[config]
+        ai_kart.update_q_index(current_state, column, reward, new_state, terminal=terminal)
+        current_state = new_state
 
         ticks += 1
-        if was_crashed:
+        if crashed:
             break
 
-    finished = race.is_finished() and not crashed
+    ai_kart.position, ai_kart.direction, ai_kart.speed = table.decode(config)
+    ai_kart.turns_done = turns
+    ai_kart.is_alive = not crashed
 
-    if not finished and not crashed and last_state:
+    finished = turns >= nb_turns and not crashed
+
+    if not finished and not crashed and last_state >= 0:
         total_reward += TIMEOUT_PENALTY
-        ai_kart.update_q(last_state, last_action_char, TIMEOUT_PENALTY, "", terminal=True)
+        ai_kart.update_q_index(last_state, last_column, TIMEOUT_PENALTY, -1, terminal=True)
 
     return total_reward, ticks, finished, crashed
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Entraînement par lot (simulateur vectorisé)
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _batch_q_update(
+    repository: QTableRepository,
+    states: np.ndarray,
+    actions: np.ndarray,
+    targets: np.ndarray,
+    alpha: float,
+) -> None:
+    """
+    Mise à jour Q-learning d'un lot de transitions.
+
+    Q(s,a) ← Q(s,a) + α · [ cible − Q(s,a) ], où la cible d'une paire
+    (s, a) vue plusieurs fois dans le lot est la moyenne de ses cibles
+    (sommer les corrections ferait diverger les paires fréquentes, comme
+    l'état de départ commun à tous les karts).
+    """
+    if len(states) == 0:
+        return
+    flat = states * len(ACTION_CHARS) + actions
+    pairs, inverse = np.unique(flat, return_inverse=True)
+    mean_target = np.bincount(inverse, weights=targets) / np.bincount(inverse)
+    pair_states, pair_actions = np.divmod(pairs, len(ACTION_CHARS))
+    current = repository.values[pair_states, pair_actions]
+    repository.set_many(pair_states, pair_actions, current + alpha * (mean_target - current))
+
+
+def train_batch(
+    session: Session,
+    run_id: int,
+    nb_episodes: int,
+    circuit: Circuit,
+    nb_turns: int,
+    batch_size: int = 1024,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    Variante de `train` qui fait rouler `batch_size` épisodes à la fois.
+
+    Chaque kart du lot joue son propre épisode (ε calculé comme dans
+    `train` d'après son numéro d'épisode) ; dès qu'un épisode se termine
+    (arrivée, crash ou timeout), son log est mis de côté et le kart repart
+    pour l'épisode suivant. Choix ε-greedy, récompenses et mises à jour Q
+    sont faits pour tout le lot en une opération NumPy par tic.
+
+    Différence avec `train` : les transitions d'un même tic sont appliquées
+    ensemble (cf. `_batch_q_update`) au lieu d'être enchaînées.
+
+    Args:
+        session: Session SQLAlchemy active.
+        run_id: ID du Run en base (créé via `create_run`).
+        nb_episodes: Nombre d'épisodes à jouer dans cet appel.
+        circuit: Circuit sur lequel entraîner l'IA.
+        nb_turns: Nombre de tours par course.
+        batch_size: Nombre de karts simulés simultanément.
+        progress_callback: Fonction(episodes_done, total) appelée à chaque
+            flush. None pour désactiver.
+        seed: Graine du générateur NumPy (reproductibilité).
+    """
+    run = session.get(Run, run_id)
+    if run is None:
+        raise ValueError(f"Run {run_id} introuvable en base")
+    if nb_episodes <= 0:
+        return
+
+    repository = QTableRepository(session, run_id)
+    values = repository.values
+    rng = np.random.default_rng(seed)
+    env = BatchRace(circuit, min(batch_size, nb_episodes), nb_turns, rng, _MAX_DIST_FALLBACK)
+    nb_karts = env.nb_karts
+    nb_actions = len(ACTION_CHARS)
+
+    timeout = compute_timeout(circuit, nb_turns)
+    base_episodes_done = run.episodes_done
+    pending_logs: list[dict] = []
+    episodes_done = 0
+
+    episode = np.arange(nb_karts)        # numéro d'épisode joué par chaque kart
+    next_episode = nb_karts
+    running = np.ones(nb_karts, dtype=bool)
+    total_reward = np.zeros(nb_karts)
+    ticks = np.zeros(nb_karts, dtype=np.int64)
+    crashed = np.zeros(nb_karts, dtype=bool)
+
+    def epsilon_of(episodes: np.ndarray) -> np.ndarray:
+        ratio = episodes / nb_episodes
+        return np.maximum(
+            run.epsilon_end,
+            run.epsilon_start - (run.epsilon_start - run.epsilon_end) * ratio,
+        )
+
+    epsilon = epsilon_of(episode)
+
+    with AsyncFlusher(repository) as flusher:
+        while running.any():
+            # 1) Politique ε-greedy (égalités départagées au hasard)
+            states = env.state_indices()
+            q = values[states]
+            ties = q == q.max(axis=1, keepdims=True)
+            greedy = np.argmax(np.where(ties, rng.random(q.shape), -1.0), axis=1)
+            explore = rng.random(nb_karts) < epsilon
+            actions = np.where(explore, rng.integers(nb_actions, size=nb_karts), greedy)
+
+            # 2) Tic du simulateur + récompenses
+            alive_before = env.alive.copy()
+            turns_before = env.turns_done.copy()
+            distance_before = env.distance[env.row, env.col]
+            env.step(actions, running)
+            rewards = compute_rewards_batch(env, alive_before, turns_before, distance_before)
+
+            was_crashed = running & alive_before & ~env.alive
+            terminal = was_crashed | env.finished()
+            future = np.where(terminal, 0.0, values[env.state_indices()].max(axis=1))
+
+            # 3) Mise à jour Q des karts qui ont joué
+            _batch_q_update(
+                repository, states[running], actions[running],
+                (rewards + run.gamma * future)[running], run.alpha,
+            )
+            ticks += running
+            total_reward += np.where(running, rewards, 0.0)
+            crashed |= was_crashed
+
+            # 4) Timeout : malus sur la dernière transition
+            timed_out = running & ~terminal & (ticks >= timeout)
+            if timed_out.any():
+                total_reward[timed_out] += TIMEOUT_PENALTY
+                _batch_q_update(
+                    repository, states[timed_out], actions[timed_out],
+                    np.full(int(timed_out.sum()), TIMEOUT_PENALTY), run.alpha,
+                )
+
+            # 5) Épisodes terminés : log, flush périodique, relance
+            ended = running & (terminal | timed_out)
+            if not ended.any():
+                continue
+            finished = env.finished()
+            for kart in np.flatnonzero(ended):
+                pending_logs.append(
+                    {
+                        "run_id": run_id,
+                        "episode_num": base_episodes_done + int(episode[kart]) + 1,
+                        "total_reward": float(total_reward[kart]),
+                        "ticks": int(ticks[kart]),
+                        "finished": bool(finished[kart] and not crashed[kart]),
+                        "crashed": bool(crashed[kart]),
+                    }
+                )
+                episodes_done += 1
+                if episodes_done % _FLUSH_INTERVAL == 0:
+                    flusher.submit(pending_logs, base_episodes_done + episodes_done)
+                    pending_logs = []
+                    if progress_callback is not None:
+                        progress_callback(episodes_done, nb_episodes)
+
+            restart = ended & (np.cumsum(ended) + next_episode <= nb_episodes)
+            nb_restart = int(restart.sum())
+            episode[restart] = np.arange(next_episode, next_episode + nb_restart)
+            next_episode += nb_restart
+            running &= ~(ended & ~restart)
+            env.reset(restart)
+            epsilon[restart] = epsilon_of(episode[restart])
+            total_reward[ended] = 0.0
+            ticks[ended] = 0
+            crashed[ended] = False
+
+        flusher.submit(pending_logs, base_episodes_done + nb_episodes)
+
+    repository.save_policy(base_episodes_done + nb_episodes)
+    if progress_callback is not None:
+        progress_callback(nb_episodes, nb_episodes)
+
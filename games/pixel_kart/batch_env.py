@@ -0,0 +1,236 @@
+"""
+Simulateur vectorisé de Pixel Kart pour l'entraînement.
+
+`BatchRace` fait rouler N karts indépendants (un kart seul par course, comme
+`ai_train.run_episode`) sur le même `Circuit`, tous au même tic. L'état des
+karts est porté par des tableaux NumPy (position, direction, vitesse,
+tours, vivant) et chaque `step` reproduit `Race.play_action` +
+`Race._move_kart` pour tout le lot d'un coup :
+- l'herbe divise |vitesse| par 2 (arrondi vers zéro),
+- la vitesse négative fait reculer,
+- une sortie de grille remet la vitesse à 0,
+- un mur élimine le kart,
+- le franchissement de la ligne d'arrivée ajoute / retire un tour.
+
+Les actions sont des indices de colonne de la Q-table dense
+(`ai_state.ACTION_CHARS` : A, B, L, R, P).
+"""
+
+import numpy as np
+
+from games.pixel_kart.ai_state import ACTION_INDEX, SPEED_DIGIT, STATE_WEIGHTS
+from games.pixel_kart.game_model import DIRECTION_ORDER, DIRECTIONS, Circuit, Kart
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Constantes
+# ──────────────────────────────────────────────────────────────────────────
+
+CELL_ROAD: int = 0
+CELL_GRASS: int = 1
+CELL_WALL: int = 2
+CELL_FINISH: int = 3
+
+_CELL_CODES: dict[str, int] = {
+    Circuit.LETTER_ROAD: CELL_ROAD,
+    Circuit.LETTER_GRASS: CELL_GRASS,
+    Circuit.LETTER_WALL: CELL_WALL,
+    Circuit.LETTER_FINISH: CELL_FINISH,
+}
+
+_EAST: int = DIRECTION_ORDER.index("EAST")
+
+# Vecteurs de déplacement indexés comme DIRECTION_ORDER
+_DELTA_ROW = np.array([DIRECTIONS[d][0] for d in DIRECTION_ORDER])
+_DELTA_COL = np.array([DIRECTIONS[d][1] for d in DIRECTION_ORDER])
+
+# Poids des chiffres de l'indice d'état (cf. ai_state.encode_state_index) :
+# ceux de `Circuit.sensor_map`, puis celui de la vitesse
+_SENSOR_WEIGHTS = np.array(
+    [w for position, w in enumerate(STATE_WEIGHTS) if position != SPEED_DIGIT],
+    dtype=np.int64,
+)
+_SPEED_WEIGHT: int = STATE_WEIGHTS[SPEED_DIGIT]
+
+_ACCELERATE: int = ACTION_INDEX["A"]
+_BRAKE: int = ACTION_INDEX["B"]
+_TURN_LEFT: int = ACTION_INDEX["L"]
+_TURN_RIGHT: int = ACTION_INDEX["R"]
+
+
+class BatchRace:
+    """
+    N courses à un kart, simulées en parallèle sur un même circuit.
+
+    Attributes:
+        circuit (Circuit): circuit commun à tout le lot.
+        nb_karts (int): taille du lot.
+        nb_turns (int): nombre de tours par course.
+        row, col (np.ndarray[int]): position de chaque kart.
+        direction (np.ndarray[int]): indice dans DIRECTION_ORDER.
+        speed (np.ndarray[int]): vitesse dans [Kart.MIN_SPEED, Kart.MAX_SPEED].
+        turns_done (np.ndarray[int]): tours effectués.
+        alive (np.ndarray[bool]): faux après un crash.
+        cells (np.ndarray[int]): grille codée (CELL_ROAD / GRASS / WALL / FINISH).
+        distance (np.ndarray[float]): `circuit.distance_map` en tableau, les
+            cases absentes valant `missing_distance`.
+    """
+
+    def __init__(
+        self,
+        circuit: Circuit,
+        nb_karts: int,
+        nb_turns: int,
+        rng: np.random.Generator | None = None,
+        missing_distance: int = 10_000,
+    ) -> None:
+        """
+        Prépare les tableaux du circuit et place tous les karts au départ.
+
+        Args:
+            circuit: Circuit sur lequel rouler.
+            nb_karts: Nombre de karts simulés simultanément.
+            nb_turns: Nombre de tours pour terminer une course.
+            rng: Générateur aléatoire (départs). Un nouveau par défaut.
+            missing_distance: Distance attribuée aux cases hors
+                `distance_map` (cf. `ai_train._MAX_DIST_FALLBACK`).
+        """
+        self.circuit = circuit
+        self.nb_karts = nb_karts
+        self.nb_turns = nb_turns
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Une lettre inconnue (ex. "\n" final du fichier de l'éditeur) se
+        # comporte comme de la route dans Race._move_kart
+        self.cells = np.array(
+            [[_CELL_CODES.get(letter, CELL_ROAD) for letter in row[:circuit.cols]]
+             for row in circuit.grid],
+            dtype=np.int8,
+        ).reshape(circuit.rows, circuit.cols)
+        self.distance = np.full((circuit.rows, circuit.cols), float(missing_distance))
+        for (r, c), d in circuit.distance_map.items():
+            self.distance[r, c] = d
+        self._state_base = self._compile_state_base(circuit)
+        self._starts = np.array(circuit.finish_positions or [(0, 0)]).reshape(-1, 2)
+
+        self.row = np.zeros(nb_karts, dtype=np.int64)
+        self.col = np.zeros(nb_karts, dtype=np.int64)
+        self.direction = np.zeros(nb_karts, dtype=np.int64)
+        self.speed = np.zeros(nb_karts, dtype=np.int64)
+        self.turns_done = np.zeros(nb_karts, dtype=np.int64)
+        self.alive = np.ones(nb_karts, dtype=bool)
+        self.reset(np.ones(nb_karts, dtype=bool))
+
+    @staticmethod
+    def _compile_state_base(circuit: Circuit) -> np.ndarray:
+        """
+        Indice d'état sans la vitesse, par (ligne, colonne, direction).
+
+        Même base mixte que `ai_state.encode_state_index` : l'indice complet
+        vaut `base + (vitesse - MIN_SPEED) × poids de la vitesse`.
+        """
+        base = np.zeros((circuit.rows, circuit.cols, len(DIRECTION_ORDER)), dtype=np.int64)
+        for (r, c), headings in circuit.sensor_map.items():
+            for d, heading in enumerate(DIRECTION_ORDER):
+                digits = headings[heading]
+                if len(digits) != len(_SENSOR_WEIGHTS):
+                    raise ValueError(
+                        f"sensor_map donne {len(digits)} chiffres, l'état en attend "
+                        f"{len(_SENSOR_WEIGHTS)} hors vitesse (cf. ai_state.STATE_RADICES)"
+                    )
+                base[r, c, d] = int(np.dot(digits, _SENSOR_WEIGHTS))
+        return base
+
+    # ──────────────────────────────────────────────────────────────────────
+    # État
+    # ──────────────────────────────────────────────────────────────────────
+
+    def reset(self, mask: np.ndarray) -> None:
+        """Replace les karts de `mask` au départ (comme `Kart.reset`)."""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        starts = self._starts[self.rng.integers(len(self._starts), size=count)]
+        self.row[mask] = starts[:, 0]
+        self.col[mask] = starts[:, 1]
+        self.direction[mask] = _EAST
+        self.speed[mask] = 0
+        self.turns_done[mask] = 0
+        self.alive[mask] = True
+
+    def state_indices(self) -> np.ndarray:
+        """Indice d'état (ai_state.encode_state_index) de chaque kart."""
+        speed_digit = self.speed - Kart.MIN_SPEED
+        return self._state_base[self.row, self.col, self.direction] + speed_digit * _SPEED_WEIGHT
+
+    def finished(self) -> np.ndarray:
+        """Karts vivants ayant terminé tous leurs tours (cf. `Race.is_finished`)."""
+        return self.alive & (self.turns_done >= self.nb_turns)
+
+    def on_grass(self) -> np.ndarray:
+        """Karts dont la case courante est de l'herbe."""
+        return self.cells[self.row, self.col] == CELL_GRASS
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Dynamique
+    # ──────────────────────────────────────────────────────────────────────
+
+    def step(self, actions: np.ndarray, active: np.ndarray) -> None:
+        """
+        Joue un tic pour les karts de `active` (les autres ne bougent pas).
+
+        Args:
+            actions: Indice d'action (ACTION_CHARS) pour chaque kart.
+            active: Masque des karts qui jouent ce tic. Les karts morts ou
+                ayant terminé sont ignorés, comme dans `Race.play_action`.
+        """
+        active = active & self.alive & (self.turns_done < self.nb_turns)
+
+        # 1) Action
+        self.speed += (active & (actions == _ACCELERATE) & (self.speed < Kart.MAX_SPEED))
+        self.speed -= (active & (actions == _BRAKE) & (self.speed > Kart.MIN_SPEED))
+        self.direction = np.where(
+            active & (actions == _TURN_LEFT), (self.direction - 1) % 4, self.direction
+        )
+        self.direction = np.where(
+            active & (actions == _TURN_RIGHT), (self.direction + 1) % 4, self.direction
+        )
+
+        # 2) Déplacement pas à pas (|vitesse| <= 2, divisée par 2 sur l'herbe)
+        magnitude = np.abs(self.speed)
+        magnitude = np.where(self.on_grass(), magnitude // 2, magnitude)
+        sign = np.where(self.speed < 0, -1, 1)
+        delta_row = _DELTA_ROW[self.direction] * sign
+        delta_col = _DELTA_COL[self.direction] * sign
+        moving = active & (magnitude > 0)
+
+        finish_col = self.circuit.finish_col
+        for step in range(Kart.MAX_SPEED):
+            moving &= magnitude > step
+            if not moving.any():
+                break
+            new_row = self.row + delta_row
+            new_col = self.col + delta_col
+
+            # Sortie de grille => vitesse = 0, arrêt
+            inside = ((new_row >= 0) & (new_row < self.circuit.rows)
+                      & (new_col >= 0) & (new_col < self.circuit.cols))
+            outside = moving & ~inside
+            self.speed[outside] = 0
+            moving &= inside
+
+            # Mur => crash, arrêt
+            cell = self.cells[np.where(moving, new_row, 0), np.where(moving, new_col, 0)]
+            crash = moving & (cell == CELL_WALL)
+            self.alive[crash] = False
+            self.speed[crash] = 0
+            moving &= ~crash
+
+            # Franchissements de la ligne d'arrivée (cf. Race._move_kart)
+            east = moving & (self.col < finish_col) & (finish_col <= new_col)
+            west = moving & (new_col < finish_col) & (finish_col <= self.col)
+            self.turns_done += east
+            self.turns_done -= west
+
+            self.row = np.where(moving, new_row, self.row)
+            self.col = np.where(moving, new_col, self.col)
@@ -0,0 +1,158 @@
+"""
+Flush différé (write-behind) de la Q-table de Pixel Kart.
+
+`QTableRepository.flush` écrit en ligne : la boucle d'entraînement attend
+la fin de l'upsert des Q-values, de l'insertion des logs et du commit,
+puis d'un second commit pour `episodes_done`. `AsyncFlusher` sort ces
+écritures du thread d'entraînement :
+
+1. `submit` (thread d'entraînement) bascule le set dirty du repository
+   vers un lot (`QTableRepository.take_dirty` : paires + valeurs copiées,
+   le repository repart d'un set vide) et prend la liste de logs telle
+   quelle ; c'est le double tampon : la boucle remplit le tampon neuf
+   pendant que l'ancien est écrit ;
+2. un thread d'écriture, avec sa propre session (donc sa propre
+   connexion), écrit chaque lot en une seule transaction : Q-values, logs
+   et `episodes_done` (`QTableRepository.write_batch`).
+
+Contre-pression : au plus `max_pending` lots peuvent attendre ou être en
+cours d'écriture ; au-delà, `submit` bloque jusqu'à la fin d'une écriture
+(la mémoire ne grossit pas si la base est plus lente que l'entraînement).
+Le temps passé bloqué est cumulé dans `stalled_seconds`.
+
+Une base SQLite en mémoire n'est visible que de sa propre connexion : le
+flusher y écrit alors en ligne, dans le thread appelant.
+
+Utilisation :
+    with AsyncFlusher(repository) as flusher:
+        ...
+        flusher.submit(pending_logs, episodes_done)
+        pending_logs = []
+"""
+
+import queue
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from .q_table_repository import QTableRepository
+
+
+_MAX_PENDING: int = 1
+"""Lots en attente ou en cours d'écriture avant blocage de `submit`."""
+
+
+class AsyncFlusher:
+    """
+    Écrit les lots d'un repository sur un thread d'arrière-plan.
+
+    Attributes:
+        repository (QTableRepository): repository dont on vide le set dirty.
+        threaded (bool): faux pour une base en mémoire (écriture en ligne).
+        stalled_seconds (float): temps passé par `submit` à attendre la fin
+            d'une écriture (contre-pression).
+    """
+
+    def __init__(self, repository: QTableRepository, max_pending: int = _MAX_PENDING) -> None:
+        """
+        Démarre le thread d'écriture.
+
+        Args:
+            repository: Repository de la boucle d'entraînement.
+            max_pending: Nombre de lots en vol au-delà duquel `submit` bloque.
+        """
+        self.repository = repository
+        self.stalled_seconds = 0.0
+        self._engine = repository.session.get_bind()
+        self.threaded = self._engine.url.database not in (None, "", ":memory:")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._batches: queue.Queue = queue.Queue()
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Thread d'entraînement
+    # ──────────────────────────────────────────────────────────────────────
+
+    def submit(self, episode_logs: list[dict], episodes_done: int) -> None:
+        """
+        Confie au thread d'écriture les Q-values dirty et des logs.
+
+        Bloque si `max_pending` lots sont déjà en vol. L'appelant ne doit
+        plus modifier `episode_logs` (repartir d'une nouvelle liste).
+
+        Args:
+            episode_logs: Logs d'épisodes à insérer.
+            episodes_done: Compteur `episodes_done` du run après ce lot.
+        """
+        self._raise_if_failed()
+        batch = (self.repository.take_dirty(), episode_logs, episodes_done)
+        if not self.threaded:
+            self._write(self.repository.session, batch)
+            return
+
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            self._slots.acquire()
+            self.stalled_seconds += time.perf_counter() - start
+        self._batches.put(batch)
+
+    def close(self) -> None:
+        """Attend l'écriture des lots en vol puis arrête le thread."""
+        if self._thread is not None:
+            self._batches.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_if_failed()
+
+    def __enter__(self) -> "AsyncFlusher":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        # Les lots déjà confiés sont écrits même si l'entraînement s'arrête
+        # sur une exception (annulation depuis l'UI, par exemple)
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except RuntimeError:
+            pass  # l'exception de la boucle prime
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Échec de l'écriture différée de la Q-table") from self._error
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Thread d'écriture
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _write(self, session: Session, batch: tuple) -> None:
+        """Écrit un lot (Q-values, logs, avancement) en une transaction."""
+        values, episode_logs, episodes_done = batch
+        QTableRepository.write_batch(
+            session, self.repository.run_id, values, episode_logs, episodes_done,
+        )
+
+    def _run(self) -> None:
+        """Boucle du thread d'écriture : un lot par transaction."""
+        session = Session(bind=self._engine)
+        try:
+            while True:
+                batch = self._batches.get()
+                if batch is None:
+                    break
+                try:
+                    if self._error is None:   # après un échec, on n'écrit plus
+                        self._write(session, batch)
+                except Exception as error:
+                    session.rollback()
+                    self._error = error
+                finally:
+                    self._slots.release()
+        finally:
+            session.close()
@@ -1,7 +1,7 @@
 """
 Modèles SQLAlchemy pour la persistance de la Q-table de Pixel Kart.
 
-Schéma à 3 tables (refonte complète vs l'ancien schéma 1 table de la V1) :
+Schéma à 4 tables (refonte complète vs l'ancien schéma 1 table de la V1) :
 
 - `runs`        : un enregistrement par configuration d'entraînement
                   (γ, α, ε, circuit, nb épisodes faits, etc.)
@@ -10,6 +10,8 @@ Schéma à 3 tables (refonte complète vs l'ancien schéma 1 table de la V1) :
 - `episode_log` : statistiques par épisode (récompense, ticks, fini, crashed)
                   → CASCADE sur suppression du run, utile pour tracer les
                   courbes d'apprentissage à la défense orale.
+- `run_policy`  : politique greedy compilée du run (un octet par état,
+                  cf. `policy.py`) → CASCADE sur suppression du run
 
 L'utilisation de `Run` comme table parente permet :
 - de lancer plusieurs entraînements en parallèle sans collision de Q-values,
@@ -26,6 +28,7 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Integer,
+    LargeBinary,
     String,
 )
 from sqlalchemy.orm import relationship
@@ -69,6 +72,13 @@ class Run(Base):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+    policy = relationship(
+        "RunPolicy",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        uselist=False,
+    )
 
 
 class QValue(Base):
@@ -122,3 +132,27 @@ class EpisodeLog(Base):
     crashed = Column(Boolean, nullable=False)   # crash mur ?
 
     run = relationship("Run", back_populates="episodes")
+
+
+class RunPolicy(Base):
+    """
+    Politique greedy compilée d'un run, pour jouer sans charger la Q-table.
+
+    Réécrite à la fin de chaque entraînement (`QTableRepository.save_policy`).
+    `episodes_done` est celui du run au moment de la compilation : si le
+    run a été repris depuis (interruption en cours d'entraînement), la
+    politique est périmée et l'adversaire retombe sur la Q-table.
+    """
+
+    __tablename__ = "run_policy"
+
+    run_id = Column(
+        Integer,
+        ForeignKey("runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    episodes_done = Column(Integer, nullable=False)
+    actions = Column(LargeBinary, nullable=False)  # NB_STATES octets, cf. policy.py
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    run = relationship("Run", back_populates="policy")
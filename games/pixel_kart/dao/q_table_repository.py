@@ -6,7 +6,11 @@ Refonte complète vs l'implémentation V1.
 Stratégie :
 - À l'initialisation, on charge TOUTES les Q-values du run en mémoire
   (`SELECT *` unique).
-- Les `get_q` / `set_q` n'accèdent ensuite qu'au dict en RAM.
+- L'espace d'états est petit et fixe (`ai_state.NB_STATES` états × 5 actions) :
+  la Q-table est un tableau NumPy dense `values[état, action]`, l'état étant
+  l'indice entier de `ai_state.state_to_index` et l'action la colonne de
+  `ai_state.ACTION_INDEX`. `best_q` / `best_action` lisent une seule ligne.
+- Les `get_q` / `set_q` n'accèdent ensuite qu'au tableau en RAM.
 - Les modifications sont marquées dans un set `dirty` puis écrites en
   base par batch lors d'un appel à `flush()` (typiquement toutes les
   500 épisodes via la boucle d'entraînement).
@@ -18,10 +22,24 @@ ce qui rend le training ~50–100x plus rapide qu'une approche per-row.
 
 import random
 
-from sqlalchemy import insert
+import numpy as np
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
-from .q_table import EpisodeLog, QValue, Run
+from games.pixel_kart.ai_state import (
+    ACTION_CHARS,
+    ACTION_INDEX,
+    NB_STATES,
+    index_to_state,
+    state_to_index,
+)
+from games.pixel_kart.policy import compile_policy
+from .q_table import EpisodeLog, QValue, Run, RunPolicy
+
+
+def _state_index(state: int | str) -> int:
+    """Accepte un indice d'état ou une clé string ai_state."""
+    return state_to_index(state) if type(state) is str else state
 
 
 class QTableRepository:
@@ -30,12 +48,13 @@ class QTableRepository:
 
     Utilisation typique :
         repo = QTableRepository(session, run_id=42)
-        repo.get_q("32102", "A")             # lecture mémoire
-        repo.set_q("32102", "A", new_value)  # écriture mémoire + dirty
-        repo.flush(episode_logs=[...])       # commit à la base
+        repo.get_q(1234, "A")              # lecture mémoire
+        repo.set_q(1234, "A", new_value)   # écriture mémoire + dirty
+        repo.flush(episode_logs=[...])     # commit à la base
 
     Les dépendances avec le module IA :
-        - `state` est une string de 6 caractères (cf. ai_state.encode_state)
+        - `state` est l'indice entier de ai_state.encode_state_index ; la
+          string de 6 caractères (ai_state.encode_state) est aussi acceptée
         - `action` est un caractère de ACTION_TO_CHAR.values()
     """
 
@@ -49,62 +68,156 @@ class QTableRepository:
         """
         self.session = session
         self.run_id = run_id
-        self.q_values: dict[tuple[str, str], float] = {}
-        self.dirty: set[tuple[str, str]] = set()
+        self.values = np.zeros((NB_STATES, len(ACTION_CHARS)))
+        self.known = np.zeros((NB_STATES, len(ACTION_CHARS)), dtype=bool)
+        self.dirty: set[tuple[int, int]] = set()
         self._load_from_db()
 
+    @classmethod
+    def detached(cls, values: np.ndarray, known: np.ndarray) -> "QTableRepository":
+        """
+        Copie locale de la Q-table, sans session ni run.
+
+        Sert aux processus d'entraînement parallèle : ils apprennent sur
+        leur copie en RAM et renvoient leurs valeurs au processus maître,
+        seul à écrire en base (pas de `flush` sur une copie).
+
+        Args:
+            values: Tableau (NB_STATES, nb actions) des Q-values de départ.
+            known: Masque des paires (état, action) déjà apprises.
+        """
+        repository = cls.__new__(cls)
+        repository.session = None
+        repository.run_id = None
+        repository.values = values.copy()
+        repository.known = known.copy()
+        repository.dirty = set()
+        return repository
+
     # ──────────────────────────────────────────────────────────────────────
     # Chargement initial
     # ──────────────────────────────────────────────────────────────────────
 
     def _load_from_db(self) -> None:
-        """Lit toutes les Q-values du run en un seul SELECT et peuple le cache."""
-        rows = (
-            self.session.query(QValue)
-            .filter(QValue.run_id == self.run_id)
-            .all()
-        )
-        self.q_values = {(row.state, row.action): row.value for row in rows}
+        """Lit toutes les Q-values du run en un seul SELECT et remplit le tableau."""
+        rows = self.session.execute(
+            select(QValue.state, QValue.action, QValue.value)
+            .where(QValue.run_id == self.run_id)
+        ).all()
+        if not rows:
+            return
+        states, actions, values = zip(*rows)
+        state_idx = [state_to_index(state) for state in states]
+        action_idx = [ACTION_INDEX[action] for action in actions]
+        self.values[state_idx, action_idx] = values
+        self.known[state_idx, action_idx] = True
+
+    @property
+    def q_values(self) -> dict[tuple[str, str], float]:
+        """
+        Vue dict {(état string, action): valeur} des Q-values connues.
+
+        Construite à la demande (inspection, tests) : la boucle
+        d'entraînement lit directement le tableau `values`.
+        """
+        states, actions = np.nonzero(self.known)
+        return {
+            (index_to_state(int(state)), ACTION_CHARS[action]): float(self.values[state, action])
+            for state, action in zip(states, actions)
+        }
 
     # ──────────────────────────────────────────────────────────────────────
     # Lecture / écriture en RAM
     # ──────────────────────────────────────────────────────────────────────
 
-    def get_q(self, state: str, action: str) -> float:
+    def get_q(self, state: int | str, action: str) -> float:
         """
         Retourne la Q-value (state, action) depuis la RAM.
 
         Args:
-            state: Clé d'état (string ai_state).
+            state: Indice d'état (ou clé string ai_state).
             action: Caractère d'action.
 
         Returns:
             La valeur Q stockée, ou 0.0 si la paire est inconnue.
         """
-        return self.q_values.get((state, action), 0.0)
+        return float(self.values[_state_index(state), ACTION_INDEX[action]])
 
-    def set_q(self, state: str, action: str, value: float) -> None:
+    def set_q(self, state: int | str, action: str, value: float) -> None:
         """
         Met à jour la Q-value en RAM et marque l'entrée comme dirty.
 
         Args:
-            state: Clé d'état.
+            state: Indice d'état (ou clé string ai_state).
             action: Caractère d'action.
             value: Nouvelle valeur Q.
         """
-        self.q_values[(state, action)] = value
-        self.dirty.add((state, action))
+        self.set_q_index(_state_index(state), ACTION_INDEX[action], value)
+
+    def get_q_index(self, state: int, column: int) -> float:
+        """`get_q` par indices (état, colonne), sans conversion de clés."""
+        return self.values[state, column].item()
+
+    def q_row(self, state: int) -> list[float]:
+        """
+        Les Q-values d'un état, dans l'ordre des colonnes (`ACTION_CHARS`).
+
+        Forme utilisée par la boucle d'entraînement : indice d'état entier,
+        une seule lecture de la ligne, floats Python natifs.
+        """
+        return self.values[state].tolist()
+
+    def set_q_index(self, state: int, column: int, value: float) -> None:
+        """
+        `set_q` par indices (état, colonne), sans conversion de clés.
+
+        Args:
+            state: Indice d'état.
+            column: Indice de colonne (ACTION_INDEX).
+            value: Nouvelle valeur Q.
+        """
+        key = (state, column)
+        self.values[key] = value
+        self.known[key] = True
+        self.dirty.add(key)
+
+    def set_many(self, states: np.ndarray, actions: np.ndarray, values: np.ndarray) -> None:
+        """
+        Variante vectorisée de `set_q` pour l'entraînement par lot.
+
+        Args:
+            states: Indices d'état (paires (état, action) toutes distinctes).
+            actions: Indices de colonne (ACTION_INDEX) correspondants.
+            values: Nouvelles valeurs Q.
+        """
+        self.values[states, actions] = values
+        self.known[states, actions] = True
+        self.dirty.update(zip(states.tolist(), actions.tolist()))
 
     # ──────────────────────────────────────────────────────────────────────
     # Helpers de politique
     # ──────────────────────────────────────────────────────────────────────
 
-    def best_q(self, state: str, valid_actions: list[str]) -> float:
+    def _row(self, state: int | str, valid_actions) -> list[float]:
+        """
+        Q-values de `valid_actions` pour cet état, dans leur ordre.
+
+        La ligne du tableau est lue en une fois (`tolist`) : sur 5 valeurs,
+        les comparaisons en Python natif coûtent moins que l'appel d'un
+        ufunc NumPy. Passer `ai_state.ACTION_CHARS` lui-même évite aussi
+        l'indexation par colonne.
+        """
+        row = self.values[_state_index(state)]
+        if valid_actions is ACTION_CHARS:
+            return row.tolist()
+        return row[[ACTION_INDEX[a] for a in valid_actions]].tolist()
+
+    def best_q(self, state: int | str, valid_actions: list[str]) -> float:
         """
         Renvoie la meilleure Q-value parmi `valid_actions` pour cet état.
 
         Args:
-            state: Clé d'état.
+            state: Indice d'état (ou clé string ai_state).
             valid_actions: Liste de caractères d'action à considérer.
 
         Returns:
@@ -113,26 +226,28 @@ class QTableRepository:
         """
         if not valid_actions:
             return 0.0
-        return max(self.get_q(state, a) for a in valid_actions)
+        return max(self._row(state, valid_actions))
 
-    def best_action(self, state: str, valid_actions: list[str]) -> str:
+    def best_action(self, state: int | str, valid_actions: list[str]) -> str:
         """
         Retourne le caractère d'action ayant la meilleure Q-value.
 
-        En cas d'égalité, `max(..., key=...)` renvoie la première occurrence
-        rencontrée selon l'ordre de `valid_actions`. C'est déterministe : utile
-        pour des tests reproductibles.
+        Une seule lecture de la ligne de l'état ; en cas d'égalité, tirage
+        au hasard parmi les actions ex aequo (toutes à 0.0 pour un état
+        jamais visité).
 
         Args:
-            state: Clé d'état.
+            state: Indice d'état (ou clé string ai_state).
             valid_actions: Liste non vide de caractères d'action.
 
         Returns:
             Le caractère d'action ayant le Q maximum.
         """
-        best_q = max(self.get_q(state, a) for a in valid_actions)
-        best_actions = [a for a in valid_actions if self.get_q(state, a) == best_q]
-        return random.choice(best_actions)
+        row = self._row(state, valid_actions)
+        best_q = max(row)
+        if row.count(best_q) == 1:
+            return valid_actions[row.index(best_q)]
+        return random.choice([a for a, q in zip(valid_actions, row) if q == best_q])
 
     # ──────────────────────────────────────────────────────────────────────
     # Persistance par batch
@@ -154,27 +269,69 @@ class QTableRepository:
                 `episode_log` (clés : run_id, episode_num, total_reward,
                 ticks, finished, crashed).
         """
+        self.write_batch(self.session, self.run_id, self.take_dirty(), episode_logs)
+
+    def take_dirty(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extrait les paires dirty et leurs valeurs actuelles, puis vide `dirty`.
+
+        Les valeurs sont copiées : l'entraînement peut continuer à modifier
+        la Q-table pendant que ce lot est écrit (cf. `AsyncFlusher`).
+
+        Returns:
+            Tuple (états, colonnes, valeurs) du lot à écrire.
+        """
+        dirty, self.dirty = self.dirty, set()
+        if not dirty:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        states, actions = np.array(list(dirty)).T
+        return states, actions, self.values[states, actions]
+
+    @staticmethod
+    def write_batch(
+        session: Session,
+        run_id: int,
+        batch: tuple[np.ndarray, np.ndarray, np.ndarray],
+        episode_logs: list[dict] | None = None,
+        episodes_done: int | None = None,
+    ) -> None:
+        """
+        Écrit un lot (`take_dirty`) en une seule transaction.
+
+        Args:
+            session: Session qui porte la transaction.
+            run_id: Run auquel appartiennent les Q-values.
+            batch: Tuple (états, colonnes, valeurs) renvoyé par `take_dirty`.
+            episode_logs: Logs d'épisodes à insérer, optionnels.
+            episodes_done: Nouveau compteur `episodes_done` du run, ou None
+                pour ne pas y toucher.
+        """
         # 1) Upsert des Q-values dirty (SQLite supporte INSERT OR REPLACE)
-        if self.dirty:
+        states, actions, values = batch
+        if len(states):
             rows = [
                 {
-                    "run_id": self.run_id,
-                    "state": state,
-                    "action": action,
-                    "value": self.q_values[(state, action)],
+                    "run_id": run_id,
+                    "state": index_to_state(state),
+                    "action": ACTION_CHARS[action],
+                    "value": value,
                 }
-                for (state, action) in self.dirty
+                for state, action, value in zip(states.tolist(), actions.tolist(), values.tolist())
             ]
             stmt = insert(QValue).prefix_with("OR REPLACE")
-            self.session.execute(stmt, rows)
-            self.dirty.clear()
+            session.execute(stmt, rows)
 
         # 2) Insertion des logs d'épisode si fournis
         if episode_logs:
-            self.session.bulk_insert_mappings(EpisodeLog, episode_logs)
+            session.bulk_insert_mappings(EpisodeLog, episode_logs)
 
-        # 3) Un seul commit pour toute la transaction
-        self.session.commit()
+        # 3) Avancement du run, dans la même transaction
+        if episodes_done is not None:
+            session.execute(update(Run).where(Run.id == run_id).values(episodes_done=episodes_done))
+
+        # 4) Un seul commit pour toute la transaction
+        session.commit()
 
     def update_episodes_done(self, episodes_done: int) -> None:
         """
@@ -190,3 +347,39 @@ class QTableRepository:
         if run is not None:
             run.episodes_done = episodes_done
             self.session.commit()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Politique compilée
+    # ──────────────────────────────────────────────────────────────────────
+
+    def save_policy(self, episodes_done: int) -> None:
+        """
+        Compile la Q-table en RAM en politique greedy et l'enregistre.
+
+        Appelé par les boucles d'entraînement après le dernier flush : la
+        politique reflète alors exactement les Q-values en base.
+
+        Args:
+            episodes_done: Compteur `episodes_done` du run à cet instant.
+        """
+        stmt = insert(RunPolicy).prefix_with("OR REPLACE")
+        self.session.execute(stmt, [{
+            "run_id": self.run_id,
+            "episodes_done": episodes_done,
+            "actions": compile_policy(self.values),
+        }])
+        self.session.commit()
+
+    @staticmethod
+    def load_policy(session: Session, run: Run) -> bytes | None:
+        """
+        Politique compilée d'un run, sans charger ses Q-values.
+
+        Returns:
+            Les NB_STATES octets de la politique, ou None si le run n'en a
+            pas ou si elle est périmée (run repris depuis la compilation).
+        """
+        return session.execute(
+            select(RunPolicy.actions)
+            .where(RunPolicy.run_id == run.id, RunPolicy.episodes_done == run.episodes_done)
+        ).scalar_one_or_none()
@@ -74,6 +74,9 @@ class Circuit:
         rows (int), cols (int): dimensions.
         finish_positions (list[(r,c)]): cellules formant la ligne d'arrivée.
         finish_col (int): colonne de la ligne d'arrivée (verticale).
+        distance_map (dict[(r,c), int]): distance BFS à la ligne d'arrivée.
+        sensor_map (dict[(r,c), dict[str, tuple]]): capteurs précalculés
+            par case et par cap (cf. `_compute_sensor_map`).
     """
 
     # Lettres issues de la configuration centrale des types de pixels
@@ -82,6 +85,9 @@ class Circuit:
     LETTER_WALL = PIXEL_TYPES["WALL"]["letter"]
     LETTER_FINISH = PIXEL_TYPES["FINISH"]["letter"]
 
+    SENSOR_RANGE = 3
+    """Portée des capteurs de distance (en cases) : au-delà, saturation."""
+
     def __init__(self, name: str, raw: str):
         self.name = name
         self.raw = raw
@@ -98,6 +104,9 @@ class Circuit:
         # On suppose une ligne d'arrivée verticale (toutes les F sur la même colonne)
         self.finish_col = self.finish_positions[0][1] if self.finish_positions else 0
         self.distance_map: Dict[Tuple[int, int], int] = self._compute_distance_map()
+        self.sensor_map: Dict[
+            Tuple[int, int], Dict[str, Tuple[int, int, int, int, int]]
+        ] = self._compute_sensor_map()
 
     def _compute_distance_map(self) -> Dict[Tuple[int, int], int]:
         """
@@ -141,6 +150,57 @@ class Circuit:
 
         return distance_map
 
+    def _scan_distance(self, row: int, col: int, direction: str) -> int:
+        """
+        Compte les cases ROUTE consécutives depuis (row, col) dans
+        `direction`, avant de rencontrer un mur, de l'herbe ou le bord.
+
+        La ligne d'arrivée (F) est traitée comme de la route.
+        Retourne un entier dans [0, SENSOR_RANGE].
+        """
+        dr, dc = DIRECTIONS[direction]
+        distance = 0
+        for _ in range(self.SENSOR_RANGE):
+            row += dr
+            col += dc
+            if not self.is_inside(row, col):
+                break
+            if self.grid[row][col] in (self.LETTER_WALL, self.LETTER_GRASS):
+                break
+            distance += 1
+        return distance
+
+    def _compute_sensor_map(self) -> Dict[Tuple[int, int], Dict[str, Tuple[int, int, int, int, int]]]:
+        """
+        Précalcule les capteurs de l'IA pour chaque case et chaque cap.
+
+        Le circuit ne change plus après construction : les distances
+        saturées vues depuis une case ne dépendent que de la case et de la
+        direction du kart. On les calcule donc une fois ici, et l'encodage
+        d'état (cf. `ai_state.encode_state`) devient une simple lecture.
+
+        Returns:
+            {(r, c): {cap: (devant, gauche, droite, derrière, herbe)}} où les
+            distances sont relatives au cap du kart et `herbe` vaut 1 si la
+            case elle-même est de l'herbe, 0 sinon.
+        """
+        sensor_map: Dict[Tuple[int, int], Dict[str, Tuple[int, int, int, int, int]]] = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                scans = [self._scan_distance(r, c, d) for d in DIRECTION_ORDER]
+                terrain = 1 if self.grid[r][c] == self.LETTER_GRASS else 0
+                sensor_map[(r, c)] = {
+                    heading: (
+                        scans[i],            # devant
+                        scans[(i - 1) % 4],  # gauche
+                        scans[(i + 1) % 4],  # droite
+                        scans[(i + 2) % 4],  # derrière
+                        terrain,
+                    )
+                    for i, heading in enumerate(DIRECTION_ORDER)
+                }
+        return sensor_map
+
     def cell(self, row: int, col: int) -> str:
         """
         Retourne la lettre de la cellule demandée.
@@ -268,23 +328,33 @@ class Race:
         """
         kart = self.current_kart
         if kart.is_alive and not self._kart_done(kart):
-            # 1) Appliquer l'action choisie
-            if action == "ACCELERATE":
-                kart.accelerate()
-            elif action == "BRAKE":
-                kart.brake()
-            elif action == "TURN_LEFT":
-                kart.turn_left()
-            elif action == "TURN_RIGHT":
-                kart.turn_right()
-            # PASS ne change rien
-
-            # 2) Faire avancer le kart en fonction de sa vitesse et de sa direction
-            self._move_kart(kart)
-
-        # 3) Passer au prochain kart encore jouable
+            self.apply_action(kart, action)
+
+        # Passer au prochain kart encore jouable
         self._advance_to_next_playable()
 
+    def apply_action(self, kart: Kart, action: str) -> None:
+        """
+        Applique une action à un kart puis le fait avancer, sans toucher au
+        tour de jeu (cf. `play_action`).
+
+        Sert aussi à compiler la table de transitions d'un circuit
+        (cf. transition_table.py) : un seul endroit décrit la dynamique.
+        """
+        # 1) Appliquer l'action choisie
+        if action == "ACCELERATE":
+            kart.accelerate()
+        elif action == "BRAKE":
+            kart.brake()
+        elif action == "TURN_LEFT":
+            kart.turn_left()
+        elif action == "TURN_RIGHT":
+            kart.turn_right()
+        # PASS ne change rien
+
+        # 2) Faire avancer le kart en fonction de sa vitesse et de sa direction
+        self._move_kart(kart)
+
     def _move_kart(self, kart: Kart) -> None:
         """
         Déplace le kart pas à pas selon sa vitesse :
@@ -386,12 +456,15 @@ class Race:
         - Tous les karts sont soit morts soit ont terminé → personne ne peut
           plus avancer.
         """
-        if any(kart.is_alive and self._kart_done(kart) for kart in self.karts):
-            return True
-        return all(
-            (not kart.is_alive) or self._kart_done(kart)
-            for kart in self.karts
-        )
+        # Boucles explicites : appelée plusieurs fois par tic d'entraînement
+        nb_turns = self.nb_turns
+        for kart in self.karts:
+            if kart.is_alive and kart.turns_done >= nb_turns:
+                return True
+        for kart in self.karts:
+            if kart.is_alive and kart.turns_done < nb_turns:
+                return False
+        return True
 
     def winner(self) -> Optional[Kart]:
         """Retourne le premier kart à avoir terminé la course (ou None)."""
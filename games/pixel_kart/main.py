@@ -25,6 +25,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from language_manager import lang_manager
+from training_service import TrainingJobMixin
 from .ai_train import create_run, train
 from .dao.base import Base
 from .dao.q_table import EpisodeLog, Run
@@ -32,7 +33,8 @@ from .dao.q_table_repository import QTableRepository
 from .editor import map_dao
 from .game_controller import GameController
 from .game_model import Circuit, Race
-from .player import Human, QLearningAI, RandomAI
+from .parallel_train import train_parallel
+from .player import GreedyPolicyAI, Human, QLearningAI, RandomAI
 from .views.menu_view import PixelKartMenuView
 from .views.race_view import PixelKartRaceView
 from .views.training_view import PixelKartTrainingView
@@ -43,7 +45,7 @@ _DAO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dao", "data
 _DB_PATH = os.path.join(_DAO_DIR, "pixelkart.db")
 
 
-class PixelKartApp(tk.Tk):
+class PixelKartApp(TrainingJobMixin, tk.Tk):
     """
     Application principale du jeu Pixel Kart.
 
@@ -66,8 +68,8 @@ class PixelKartApp(tk.Tk):
         os.makedirs(_DAO_DIR, exist_ok=True)
         engine = create_engine(f"sqlite:///{_DB_PATH}")
         Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+        self.Session = sessionmaker(bind=engine)
+        self.session = self.Session()
 
         self.current_view: tk.Frame | None = None
         self.game_controller: GameController | None = None
@@ -79,7 +81,12 @@ class PixelKartApp(tk.Tk):
     # ──────────────────────────────────────────────────────────────────────
 
     def clear_view(self) -> None:
-        """Détruit la vue courante en se désabonnant du gestionnaire de langue."""
+        """
+        Détruit la vue courante en se désabonnant du gestionnaire de langue.
+
+        Un entraînement en cours est annulé (au prochain flush).
+        """
+        self._cancel_training()
         if self.current_view is not None:
             lang_manager.unregister_observer(self.current_view)
             self.current_view.pack_forget()
@@ -105,6 +112,9 @@ class PixelKartApp(tk.Tk):
             self,
             on_start_training=self._start_training,
             on_back=self.show_menu,
+            on_pause=self._pause_training,
+            on_resume=self._resume_training,
+            on_cancel=self._cancel_training,
         )
         self.current_view.pack(fill=tk.BOTH, expand=True)
 
@@ -142,16 +152,20 @@ class PixelKartApp(tk.Tk):
         """
         Construit l'adversaire IA pour le mode "vs AI".
 
-        Si un Run a déjà été entraîné en base, on instancie un `QLearningAI`
-        en mode exploitation pure (`training=False`, `epsilon=0.0`) branché
-        sur la Q-table du dernier run. Sinon, on retombe sur un `RandomAI`
-        pour ne pas faire planter le mode "vs AI" sur une base vide.
+        Si le dernier Run a une politique compilée à jour (écrite en fin
+        d'entraînement), on instancie un `GreedyPolicyAI` qui ne charge que
+        cette politique (un SELECT d'une ligne). Sinon (run jamais mené à
+        terme), on retombe sur un `QLearningAI` en mode exploitation pure
+        (`training=False`, `epsilon=0.0`) branché sur la Q-table du run. Sans
+        aucun run, on retombe sur un `RandomAI` pour ne pas faire planter le
+        mode "vs AI" sur une base vide.
 
         Args:
             name: Nom du kart IA à afficher.
 
         Returns:
-            Un Kart prêt à être placé sur la grille (QLearningAI ou RandomAI).
+            Un Kart prêt à être placé sur la grille (GreedyPolicyAI,
+            QLearningAI ou RandomAI).
         """
         latest_run: Run | None = (
             self.session.query(Run).order_by(Run.created_at.desc()).first()
@@ -159,6 +173,10 @@ class PixelKartApp(tk.Tk):
         if latest_run is None:
             return RandomAI(name)
 
+        policy = QTableRepository.load_policy(self.session, latest_run)
+        if policy is not None:
+            return GreedyPolicyAI(name, policy)
+
         repository = QTableRepository(self.session, run_id=latest_run.id)
         return QLearningAI(
             name=name,
@@ -203,7 +221,9 @@ class PixelKartApp(tk.Tk):
         Args:
             params: Hyperparamètres collectés par PixelKartTrainingView :
                 {name, circuit, nb_turns, nb_episodes, gamma, alpha,
-                 epsilon_start, epsilon_end}.
+                 epsilon_start, epsilon_end, nb_workers}. Avec plus d'un
+                worker, les épisodes sont répartis sur un pool de processus
+                (cf. `parallel_train.train_parallel`).
         """
         view = self.current_view
         if not isinstance(view, PixelKartTrainingView):
@@ -228,33 +248,51 @@ class PixelKartApp(tk.Tk):
             notes=f"nb_turns={params['nb_turns']}",
         )
 
-        # Wrapper du callback pour rafraîchir Tkinter pendant la boucle
-        def progress(current: int, total: int) -> None:
-            view.update_progress(current, total)
-            view.update()
-
-        start_ts = time.time()
-        train(
-            session=self.session,
-            run_id=run_id,
-            nb_episodes=params["nb_episodes"],
-            circuit=circuit,
-            nb_turns=params["nb_turns"],
-            progress_callback=progress,
-        )
-        elapsed = time.time() - start_ts
-
-        # Calcul des stats finales depuis la table episode_log
-        finished_count, crashed_count, avg_reward = self._summarize_run(
-            run_id, params["nb_episodes"]
-        )
-        view.show_results(
-            nb_finished=finished_count,
-            nb_crashed=crashed_count,
-            total=params["nb_episodes"],
-            avg_reward=avg_reward,
-            elapsed_s=elapsed,
-        )
+        # Boucle d'entraînement dans un thread (TrainingJob), avec sa propre
+        # session : la fenêtre reste réactive, la vue relève la progression
+        # via `after()`. Pause / annulation prennent effet au prochain flush.
+        def run(progress) -> float:
+            session = self.Session()
+            try:
+                start_ts = time.time()
+                nb_workers = params.get("nb_workers", 1)
+                if nb_workers > 1:
+                    train_parallel(
+                        session=session,
+                        run_id=run_id,
+                        nb_episodes=params["nb_episodes"],
+                        circuit=circuit,
+                        nb_turns=params["nb_turns"],
+                        nb_workers=nb_workers,
+                        progress_callback=progress,
+                    )
+                else:
+                    train(
+                        session=session,
+                        run_id=run_id,
+                        nb_episodes=params["nb_episodes"],
+                        circuit=circuit,
+                        nb_turns=params["nb_turns"],
+                        progress_callback=progress,
+                    )
+                return time.time() - start_ts
+            finally:
+                session.close()
+
+        def on_done(elapsed: float) -> None:
+            # Calcul des stats finales depuis la table episode_log
+            finished_count, crashed_count, avg_reward = self._summarize_run(
+                run_id, params["nb_episodes"]
+            )
+            view.show_results(
+                nb_finished=finished_count,
+                nb_crashed=crashed_count,
+                total=params["nb_episodes"],
+                avg_reward=avg_reward,
+                elapsed_s=elapsed,
+            )
+
+        self._start_training_job(run, view, on_done)
 
     def _summarize_run(self, run_id: int, nb_episodes: int) -> tuple[int, int, float]:
         """
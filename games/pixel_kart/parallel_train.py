@@ -0,0 +1,238 @@
+"""
+Entraînement Q-learning multi-processus pour Pixel Kart.
+
+`train_parallel` répartit les épisodes d'un run sur un pool de processus.
+L'entraînement avance par manches (« rounds ») :
+
+1. le maître envoie à chaque worker une copie de la Q-table courante et
+   une tranche d'épisodes (numéros globaux, pour garder la décroissance
+   d'ε de `ai_train.train`) ;
+2. chaque worker joue ses épisodes avec `ai_train.run_episode` sur une
+   copie locale (`QTableRepository.detached`) et renvoie les écarts
+   (delta) de ses Q-values ainsi que ses logs d'épisodes ;
+3. le maître fusionne les deltas dans sa Q-table, puis relance une manche.
+
+Fusion des deltas (`merge`) :
+- "mean" : pour chaque paire (état, action), moyenne des deltas des
+  workers qui l'ont modifiée (stable, conseillé) ;
+- "sum"  : somme des deltas (équivaut à enchaîner les mises à jour
+  quand les workers visitent des états disjoints).
+
+Seul le maître parle à SQLite : Q-values, logs et `episodes_done` sont
+écrits en une fois à la fin du run.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from games.pixel_kart.ai_train import compute_timeout, run_episode
+from games.pixel_kart.dao.q_table import Run
+from games.pixel_kart.dao.q_table_repository import QTableRepository
+from games.pixel_kart.game_model import Circuit
+from games.pixel_kart.player import QLearningAI
+
+
+MERGE_MODES: tuple[str, ...] = ("mean", "sum")
+"""Stratégies de fusion des deltas de Q-values."""
+
+_ROUND_EPISODES: int = 250
+"""Nombre d'épisodes joués par chaque worker entre deux fusions."""
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Côté worker
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _play_slice(task: dict) -> tuple[np.ndarray, np.ndarray, list[tuple]]:
+    """
+    Joue une tranche d'épisodes sur une copie locale de la Q-table.
+
+    Exécutée dans un processus du pool : tout ce qu'elle reçoit et renvoie
+    doit être picklable (tableaux NumPy, types simples).
+
+    Args:
+        task: Dict {values, known, circuit_name, circuit_raw, nb_turns,
+            gamma, alpha, epsilons, seed}. `epsilons` contient un ε par
+            épisode à jouer.
+
+    Returns:
+        Tuple (delta, touched, stats) : écart des Q-values par rapport à la
+        copie reçue, masque des paires modifiées et, par épisode,
+        (total_reward, ticks, finished, crashed).
+    """
+    if task["seed"] is not None:
+        random.seed(task["seed"])
+
+    circuit = Circuit(name=task["circuit_name"], raw=task["circuit_raw"])
+    repository = QTableRepository.detached(task["values"], task["known"])
+    ai_kart = QLearningAI(
+        name="Worker",
+        repository=repository,
+        gamma=task["gamma"],
+        alpha=task["alpha"],
+        training=True,
+    )
+    timeout = compute_timeout(circuit, task["nb_turns"])
+
+    stats = []
+    for epsilon in task["epsilons"]:
+        ai_kart.epsilon = epsilon
+        stats.append(run_episode(ai_kart, circuit, task["nb_turns"], timeout))
+
+    touched = np.zeros_like(repository.known)
+    if repository.dirty:
+        states, actions = zip(*repository.dirty)
+        touched[list(states), list(actions)] = True
+    return repository.values - task["values"], touched, stats
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Côté maître
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def merge_deltas(
+    values: np.ndarray,
+    results: list[tuple[np.ndarray, np.ndarray]],
+    merge: str = "mean",
+) -> np.ndarray:
+    """
+    Fusionne les deltas des workers dans la Q-table du maître.
+
+    Args:
+        values: Q-table du maître (modifiée sur place).
+        results: Liste de (delta, touched) renvoyés par les workers.
+        merge: "mean" ou "sum" (cf. MERGE_MODES).
+
+    Returns:
+        Masque des paires (état, action) modifiées par au moins un worker.
+    """
+    if merge not in MERGE_MODES:
+        raise ValueError(f"Fusion inconnue : {merge!r} (attendu : {MERGE_MODES})")
+
+    total = np.zeros_like(values)
+    count = np.zeros(values.shape, dtype=np.int64)
+    for delta, touched in results:
+        total += delta
+        count += touched
+
+    touched_any = count > 0
+    if merge == "mean":
+        values[touched_any] += total[touched_any] / count[touched_any]
+    else:
+        values[touched_any] += total[touched_any]
+    return touched_any
+
+
+def train_parallel(
+    session: Session,
+    run_id: int,
+    nb_episodes: int,
+    circuit: Circuit,
+    nb_turns: int,
+    nb_workers: Optional[int] = None,
+    merge: str = "mean",
+    round_episodes: int = _ROUND_EPISODES,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    Lance un entraînement de N épisodes réparti sur un pool de processus.
+
+    Même contrat que `ai_train.train` (mêmes tables écrites, même
+    décroissance linéaire d'ε sur les numéros d'épisode), mais les épisodes
+    d'une manche sont joués en parallèle sur des copies de la Q-table.
+
+    Args:
+        session: Session SQLAlchemy active (utilisée par le maître seul).
+        run_id: ID du Run en base (créé via `create_run`).
+        nb_episodes: Nombre d'épisodes à jouer dans cet appel.
+        circuit: Circuit sur lequel entraîner l'IA.
+        nb_turns: Nombre de tours par course.
+        nb_workers: Taille du pool (défaut : nombre de cœurs).
+        merge: Fusion des deltas, "mean" ou "sum" (cf. `merge_deltas`).
+        round_episodes: Épisodes joués par worker entre deux fusions.
+        progress_callback: Fonction(episodes_done, total) appelée après
+            chaque manche. None pour désactiver.
+        seed: Graine de base des workers (reproductibilité), ou None.
+    """
+    if merge not in MERGE_MODES:
+        raise ValueError(f"Fusion inconnue : {merge!r} (attendu : {MERGE_MODES})")
+    run = session.get(Run, run_id)
+    if run is None:
+        raise ValueError(f"Run {run_id} introuvable en base")
+
+    nb_workers = nb_workers or os.cpu_count() or 1
+    repository = QTableRepository(session, run_id)
+    base_episodes_done = run.episodes_done
+    episode_logs: list[dict] = []
+
+    def epsilon_of(episode: int) -> float:
+        ratio = episode / nb_episodes if nb_episodes > 0 else 1.0
+        return max(
+            run.epsilon_end,
+            run.epsilon_start - (run.epsilon_start - run.epsilon_end) * ratio,
+        )
+
+    episodes_done = 0
+    round_index = 0
+    with ProcessPoolExecutor(max_workers=nb_workers) as pool:
+        while episodes_done < nb_episodes:
+            # Découpage de la manche en tranches contiguës, une par worker
+            slices = []
+            start = episodes_done
+            for _ in range(nb_workers):
+                end = min(start + round_episodes, nb_episodes)
+                if end > start:
+                    slices.append(range(start, end))
+                start = end
+
+            tasks = [
+                {
+                    "values": repository.values,
+                    "known": repository.known,
+                    "circuit_name": circuit.name,
+                    "circuit_raw": circuit.raw,
+                    "nb_turns": nb_turns,
+                    "gamma": run.gamma,
+                    "alpha": run.alpha,
+                    "epsilons": [epsilon_of(episode) for episode in episodes],
+                    "seed": None if seed is None else seed + round_index * nb_workers + worker,
+                }
+                for worker, episodes in enumerate(slices)
+            ]
+            results = list(pool.map(_play_slice, tasks))
+
+            touched = merge_deltas(
+                repository.values, [(delta, mask) for delta, mask, _ in results], merge
+            )
+            states, actions = np.nonzero(touched)
+            repository.set_many(states, actions, repository.values[states, actions])
+
+            for episodes, (_, _, stats) in zip(slices, results):
+                for episode, (total_reward, ticks, finished, crashed) in zip(episodes, stats):
+                    episode_logs.append(
+                        {
+                            "run_id": run_id,
+                            "episode_num": base_episodes_done + episode + 1,
+                            "total_reward": total_reward,
+                            "ticks": ticks,
+                            "finished": finished,
+                            "crashed": crashed,
+                        }
+                    )
+
+            episodes_done = slices[-1].stop
+            round_index += 1
+            if progress_callback is not None:
+                progress_callback(episodes_done, nb_episodes)
+
+    repository.flush(episode_logs=episode_logs)
+    repository.update_episodes_done(base_episodes_done + nb_episodes)
+    repository.save_policy(base_episodes_done + nb_episodes)
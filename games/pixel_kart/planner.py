@@ -0,0 +1,535 @@
+"""
+Planificateur exact (itération de valeur) pour Pixel Kart.
+
+Un kart seul sur un circuit forme un MDP déterministe et fini :
+- état : configuration du kart (position, direction, vitesse, cf.
+  `transition_table`) × progression en tours (`turns_done`),
+- actions : les 5 colonnes de la Q-table (`ai_state.ACTIONS`),
+- récompenses : celles de `ai_train.compute_reward` (crash, tic, shaping,
+  bonus / malus de ligne d'arrivée),
+- fin : crash, ou `nb_turns` tours effectués.
+
+`solve` construit ce MDP à partir de la table de transitions compilée et
+le résout par itération de valeur vectorisée (NumPy). Le plan obtenu sert
+de référence pour les runs Q-learning :
+
+- `Plan.rollouts` : la politique optimale jouée depuis chaque case de
+  départ (tics par tour, récompense, arrivée) ;
+- `Plan.fastest` : la course la plus courte possible (en tics) depuis
+  chaque départ, indépendamment des récompenses (`fastest_finish`) ;
+- `save_reference_run` : enregistre le plan comme un `Run` (Q-values
+  projetées sur les états observés par l'IA), affichable et jouable comme
+  n'importe quel run ;
+- `warm_start` : copie ces Q-values dans le repository d'un run à
+  entraîner ;
+- `score_policy` / `score_run` : joue une politique greedy apprise sur la
+  table compilée, en quelques millisecondes, sans `Race`.
+
+Le timeout d'épisode (`ai_train.compute_timeout`) n'entre pas dans le MDP
+(horizon infini actualisé par γ) ; il est appliqué aux rollouts, comme
+dans `ai_train.run_episode`.
+
+Niveaux de tours : `Race._move_kart` compte un franchissement dès que le
+kart passe la colonne `finish_col`, quelle que soit la ligne. `turns_done`
+vaut donc toujours (côté est maintenant) - (côté est au départ), soit -1, 0
+ou 1 : les niveaux [MIN_TURNS, nb_turns[ couvrent exactement le MDP (le
+rabattement sur MIN_TURNS n'est qu'une garde). Conséquence visible dans
+`Plan.fastest` : sur un circuit en boucle, le retour vers la ligne repasse
+la colonne à contresens et aucun tour n'est jamais validé.
+
+Utilisation en ligne de commande :
+    python -m games.pixel_kart.planner --circuit Basic --turns 1 --gamma 0.99 --save
+"""
+
+import argparse
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from games.pixel_kart.ai_state import NB_STATES
+from games.pixel_kart.ai_train import (
+    TIMEOUT_PENALTY,
+    _CRASH_PENALTY,
+    _LAP_BONUS,
+    _REVERSE_FINISH_PENALTY,
+    compile_rewards,
+    compute_timeout,
+    create_run,
+)
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table_repository import QTableRepository
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import Circuit
+from games.pixel_kart.transition_table import (
+    NB_ACTIONS,
+    UNREACHABLE,
+    TransitionTable,
+    compile_circuit,
+)
+
+
+MIN_TURNS: int = -1
+"""Plus petit niveau de tours atteignable (cf. docstring du module)."""
+
+_TOLERANCE: float = 1e-6
+"""Écart max entre deux itérations (sur toutes les Q-values) pour conclure."""
+
+_MAX_ITERATIONS: int = 100_000
+"""Borne du nombre d'itérations de valeur."""
+
+_DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dao", "data", "pixelkart.db"
+)
+
+
+class EpisodeScore(NamedTuple):
+    """Résultat d'une politique jouée depuis une case de départ."""
+
+    start: tuple[int, int]
+    total_reward: float
+    ticks: int
+    finished: bool
+    crashed: bool
+    lap_ticks: tuple[int, ...]
+    """Durée (en tics) de chaque tour complété."""
+
+
+@dataclass
+class Plan:
+    """
+    MDP d'un circuit résolu par itération de valeur.
+
+    Attributes:
+        circuit_name (str): nom du circuit.
+        nb_turns (int): nombre de tours de la course.
+        gamma (float): facteur d'actualisation.
+        table (TransitionTable): table de transitions du circuit.
+        configs (np.ndarray[int]): configurations atteignables (indices de
+            `table`), dans l'ordre des colonnes de `q`.
+        q (np.ndarray[float]): Q-values optimales, forme
+            (niveaux de tours, configurations, actions) ; le niveau `i`
+            correspond à `MIN_TURNS + i` tours effectués.
+        iterations (int): nombre d'itérations effectuées.
+        converged (bool): vrai si l'écart est passé sous la tolérance.
+        rollouts (list[EpisodeScore]): politique optimale jouée depuis
+            chaque case de départ.
+        fastest (list[Optional[int]]): course la plus courte (tics) depuis
+            chaque case de départ, None si aucune arrivée n'est possible.
+    """
+
+    circuit_name: str
+    nb_turns: int
+    gamma: float
+    table: TransitionTable
+    configs: np.ndarray
+    q: np.ndarray
+    iterations: int
+    converged: bool
+    rollouts: list[EpisodeScore] = field(default_factory=list)
+    fastest: list[Optional[int]] = field(default_factory=list)
+
+    @property
+    def policy(self) -> np.ndarray:
+        """Colonne optimale par (niveau de tours, configuration)."""
+        return self.q.argmax(axis=-1)
+
+    @property
+    def best_lap(self) -> Optional[int]:
+        """Tour le plus rapide (en tics) de la politique optimale, ou None."""
+        laps = [ticks for score in self.rollouts for ticks in score.lap_ticks]
+        return min(laps) if laps else None
+
+    def summary(self) -> str:
+        """Résumé d'une ligne (notes du run de référence, ligne de commande)."""
+        mean_reward = np.mean([score.total_reward for score in self.rollouts])
+        reachable = [ticks for ticks in self.fastest if ticks is not None]
+        fastest = f"{min(reachable)} tics" if reachable else "aucune arrivée possible"
+        return (
+            f"Itération de valeur γ={self.gamma:g}, {self.nb_turns} tour(s) : "
+            f"course la plus rapide {fastest}, meilleur tour optimal {self.best_lap} tics, "
+            f"récompense moyenne {mean_reward:.1f} "
+            f"({len(self.configs)} configurations, {self.iterations} itérations)"
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Construction et résolution du MDP
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _transition_arrays(table: TransitionTable, circuit: Circuit):
+    """
+    Transitions des configurations atteignables, en tableaux (C, actions).
+
+    Returns:
+        Tuple (configs, index, next, crashed, lap, base_reward) : `index`
+        renumérote une configuration de `table` en colonne [0, C), `next`
+        est déjà renuméroté (0 pour un crash, jamais lu).
+    """
+    configs = np.flatnonzero(table.state != UNREACHABLE)
+    index = np.zeros(table.nb_configs, dtype=np.int64)
+    index[configs] = np.arange(len(configs))
+
+    transitions = (configs[:, None] * NB_ACTIONS + np.arange(NB_ACTIONS)).ravel()
+    crashed = table.crashed[transitions].reshape(-1, NB_ACTIONS)
+    arrival = table.next_config[transitions].reshape(-1, NB_ACTIONS)
+    next_index = np.where(crashed, 0, index[arrival])
+    lap = table.lap_delta[transitions].reshape(-1, NB_ACTIONS).astype(np.int64)
+    base_reward = np.array(compile_rewards(circuit))[transitions].reshape(-1, NB_ACTIONS)
+    return configs, index, next_index, crashed, lap, base_reward
+
+
+def solve(
+    circuit: Circuit,
+    nb_turns: int,
+    gamma: float,
+    tolerance: float = _TOLERANCE,
+    max_iterations: int = _MAX_ITERATIONS,
+) -> Plan:
+    """
+    Résout le MDP du circuit par itération de valeur.
+
+    Q(t, c, a) ← R(t, c, a) + γ · max_a' Q(t', c', a'), avec (c', t') la
+    configuration et le nombre de tours après l'action, et 0 pour la
+    valeur future d'une transition terminale. Toutes les Q-values sont
+    mises à jour d'un bloc à chaque itération.
+
+    Args:
+        circuit: Circuit à planifier.
+        nb_turns: Nombre de tours de la course (>= 1).
+        gamma: Facteur d'actualisation, dans [0, 1[ (celui du run comparé).
+        tolerance: Écart max entre deux itérations pour conclure.
+        max_iterations: Borne du nombre d'itérations.
+
+    Returns:
+        Le plan, politique optimale déjà jouée depuis chaque départ.
+    """
+    if not 0.0 <= gamma < 1.0:
+        raise ValueError(f"gamma doit être dans [0, 1[ (reçu : {gamma})")
+    if nb_turns < 1:
+        raise ValueError(f"nb_turns doit être >= 1 (reçu : {nb_turns})")
+
+    table = compile_circuit(circuit)
+    configs, index, next_index, crashed, lap, base_reward = _transition_arrays(table, circuit)
+    nb_configs = len(configs)
+    nb_levels = nb_turns - MIN_TURNS
+
+    # Niveau de tours après chaque (niveau, configuration, action)
+    turns = np.arange(MIN_TURNS, nb_turns)[:, None, None]
+    turns_after = turns + lap[None]
+    terminal = crashed[None] | (turns_after >= nb_turns)
+    level_after = np.clip(turns_after, MIN_TURNS, nb_turns - 1) - MIN_TURNS
+
+    # Récompenses : mêmes termes que ai_train._transition_reward
+    reward = base_reward[None] \
+        + np.where((lap[None] > 0) & (turns_after > 0), _LAP_BONUS, 0.0) \
+        - np.where(lap[None] < 0, _REVERSE_FINISH_PENALTY, 0.0)
+    reward = np.where(crashed[None], _CRASH_PENALTY, reward)
+
+    # Indice plat de l'état d'arrivée dans V (niveaux × configurations)
+    flat_next = level_after * nb_configs + next_index[None]
+    discount = np.where(terminal, 0.0, gamma)
+
+    q = np.zeros((nb_levels, nb_configs, NB_ACTIONS))
+    converged = False
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        values = q.max(axis=-1).ravel()
+        new_q = reward + discount * values[flat_next]
+        delta = np.abs(new_q - q).max()
+        q = new_q
+        if delta < tolerance:
+            converged = True
+            break
+
+    plan = Plan(
+        circuit_name=circuit.name,
+        nb_turns=nb_turns,
+        gamma=gamma,
+        table=table,
+        configs=configs,
+        q=q,
+        iterations=iterations,
+        converged=converged,
+    )
+
+    policy = plan.policy.tolist()
+    config_column = index.tolist()
+    plan.rollouts = [
+        _play(
+            table, circuit, start, nb_turns, compute_timeout(circuit, nb_turns),
+            lambda config, turns_done: policy[max(turns_done, MIN_TURNS) - MIN_TURNS][config_column[config]],
+        )
+        for start in table.start_configs(circuit)
+    ]
+    plan.fastest = [fastest_finish(table, start, nb_turns) for start in table.start_configs(circuit)]
+    return plan
+
+
+def fastest_finish(table: TransitionTable, start: int, nb_turns: int) -> Optional[int]:
+    """
+    Nombre minimal de tics pour boucler `nb_turns` tours sans crash.
+
+    Parcours en largeur sur (configuration, tours effectués), les niveaux
+    sous `MIN_TURNS` étant écartés (la durée trouvée est donc toujours
+    réalisable).
+
+    Returns:
+        Durée de la course la plus courte, ou None si aucune arrivée
+        n'est atteignable depuis `start`.
+    """
+    ticks_of = {(start, 0): 0}
+    pending = deque([(start, 0)])
+    while pending:
+        config, turns = pending.popleft()
+        ticks = ticks_of[(config, turns)] + 1
+        for column in range(NB_ACTIONS):
+            transition = config * NB_ACTIONS + column
+            if table.crashed_list[transition]:
+                continue
+            turns_after = turns + table.lap_list[transition]
+            if turns_after >= nb_turns:
+                return ticks
+            node = (table.next_list[transition], turns_after)
+            if turns_after >= MIN_TURNS and node not in ticks_of:
+                ticks_of[node] = ticks
+                pending.append(node)
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Rollouts sur la table compilée
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _play(
+    table: TransitionTable,
+    circuit: Circuit,
+    start: int,
+    nb_turns: int,
+    timeout: int,
+    choose: Callable[[int, int], int],
+) -> EpisodeScore:
+    """
+    Joue une politique déterministe depuis la configuration `start`.
+
+    Mêmes règles que `ai_train.run_episode` (fin, récompenses, malus de
+    timeout), sans mise à jour Q.
+
+    Args:
+        choose: Fonction(configuration, tours effectués) -> colonne.
+    """
+    rewards = compile_rewards(circuit)
+    config = start
+    turns = 0
+    best_turns = 0
+    last_lap_tick = 0
+    lap_ticks: list[int] = []
+    total_reward = 0.0
+    ticks = 0
+    crashed = False
+
+    while ticks < timeout and turns < nb_turns:
+        transition = config * NB_ACTIONS + choose(config, turns)
+        config = table.next_list[transition]
+        lap = table.lap_list[transition]
+        turns += lap
+        crashed = table.crashed_list[transition]
+        ticks += 1
+
+        if crashed:
+            total_reward += _CRASH_PENALTY
+            break
+        reward = rewards[transition]
+        if lap > 0:
+            reward += _LAP_BONUS if turns > 0 else 0.0
+        elif lap < 0:
+            reward -= _REVERSE_FINISH_PENALTY
+        total_reward += reward
+
+        if turns > best_turns:
+            best_turns = turns
+            lap_ticks.append(ticks - last_lap_tick)
+            last_lap_tick = ticks
+
+    finished = turns >= nb_turns and not crashed
+    if not finished and not crashed:
+        total_reward += TIMEOUT_PENALTY
+
+    position, _, _ = table.decode(start)
+    return EpisodeScore(position, total_reward, ticks, finished, crashed, tuple(lap_ticks))
+
+
+def greedy_policy(values: np.ndarray) -> np.ndarray:
+    """
+    Colonne de meilleure Q-value de chaque état observé.
+
+    Les ex aequo sont départagés par la première colonne (et non au
+    hasard comme `QLearningAI`) : le score d'une politique est ainsi
+    reproductible.
+    """
+    return values.argmax(axis=1)
+
+
+def score_policy(
+    circuit: Circuit,
+    policy: np.ndarray,
+    nb_turns: int,
+    timeout: Optional[int] = None,
+) -> list[EpisodeScore]:
+    """
+    Joue une politique sur états observés depuis chaque case de départ.
+
+    Args:
+        circuit: Circuit de la course.
+        policy: Colonne jouée pour chaque indice d'état ai_state
+            (tableau de NB_STATES entiers, cf. `greedy_policy`).
+        nb_turns: Nombre de tours de la course.
+        timeout: Borne de tics (défaut : `ai_train.compute_timeout`).
+
+    Returns:
+        Un `EpisodeScore` par case de départ.
+    """
+    table = compile_circuit(circuit)
+    if timeout is None:
+        timeout = compute_timeout(circuit, nb_turns)
+    columns = policy.tolist()
+    state_of = table.state_list
+    return [
+        _play(table, circuit, start, nb_turns, timeout,
+              lambda config, turns_done: columns[state_of[config]])
+        for start in table.start_configs(circuit)
+    ]
+
+
+def score_run(session: Session, run_id: int, circuit: Circuit, nb_turns: int) -> list[EpisodeScore]:
+    """`score_policy` de la politique greedy d'un run enregistré."""
+    repository = QTableRepository(session, run_id)
+    return score_policy(circuit, greedy_policy(repository.values), nb_turns)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Run de référence et warm-start
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def observation_values(plan: Plan) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Q-values optimales projetées sur les états observés par l'IA.
+
+    Plusieurs configurations (et niveaux de tours) partagent le même état
+    ai_state : on prend la moyenne de leurs Q-values sur les niveaux de
+    tours d'une course normale (0 à nb_turns - 1).
+
+    Returns:
+        Tuple (values, known) de forme (NB_STATES, actions), comme
+        `QTableRepository.values` / `.known`.
+    """
+    states = plan.table.state[plan.configs]
+    levels = plan.q[-MIN_TURNS:]          # niveaux 0 .. nb_turns - 1
+    totals = np.zeros((NB_STATES, NB_ACTIONS))
+    counts = np.zeros(NB_STATES)
+    for level in levels:
+        np.add.at(totals, states, level)
+        np.add.at(counts, states, 1)
+
+    known_states = counts > 0
+    values = np.zeros((NB_STATES, NB_ACTIONS))
+    values[known_states] = totals[known_states] / counts[known_states, None]
+    known = np.repeat(known_states[:, None], NB_ACTIONS, axis=1)
+    return values, known
+
+
+def warm_start(repository: QTableRepository, plan: Plan) -> None:
+    """
+    Copie les Q-values optimales projetées dans un repository.
+
+    Les paires écrites sont marquées dirty : le prochain `flush` (celui
+    de `ai_train.train`, par exemple) les enregistre pour le run.
+    """
+    values, known = observation_values(plan)
+    states, actions = np.nonzero(known)
+    repository.set_many(states, actions, values[states, actions])
+
+
+def save_reference_run(session: Session, circuit: Circuit, plan: Plan, name: Optional[str] = None) -> int:
+    """
+    Enregistre le plan comme un `Run` de référence.
+
+    Le run porte γ du plan, α = ε = 0 (aucun apprentissage), le résumé du
+    plan en notes, les Q-values projetées (`observation_values`) et leur
+    politique compilée (adversaire "vs AI" immédiat).
+
+    Returns:
+        ID du run créé.
+    """
+    run_id = create_run(
+        session=session,
+        name=name or f"Optimal (value iteration) @ {circuit.name}",
+        gamma=plan.gamma,
+        alpha=0.0,
+        epsilon_start=0.0,
+        epsilon_end=0.0,
+        circuit_name=circuit.name,
+        notes=plan.summary()[:500],
+    )
+    repository = QTableRepository(session, run_id)
+    warm_start(repository, plan)
+    repository.flush()
+    repository.save_policy(0)
+    return run_id
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Ligne de commande
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _print_scores(label: str, scores: list[EpisodeScore]) -> None:
+    """Affiche un score par case de départ."""
+    for score in scores:
+        status = "arrivé" if score.finished else ("crash" if score.crashed else "timeout")
+        print(
+            f"{label:<10} départ={score.start} reward={score.total_reward:9.1f} "
+            f"tics={score.ticks:5d} tours={list(score.lap_ticks)} {status}"
+        )
+
+
+def _main() -> None:
+    """Résout un circuit, affiche le plan et le compare éventuellement à un run."""
+    parser = argparse.ArgumentParser(description="Planificateur optimal Pixel Kart")
+    parser.add_argument("--db", default=_DEFAULT_DB_PATH)
+    parser.add_argument("--circuit", default=sorted(map_dao.get_all())[0])
+    parser.add_argument("--turns", type=int, default=1)
+    parser.add_argument("--gamma", type=float, default=0.99)
+    parser.add_argument("--save", action="store_true", help="enregistrer le run de référence")
+    parser.add_argument("--score-run", type=int, default=None, help="run à comparer")
+    args = parser.parse_args()
+
+    circuit = Circuit(name=args.circuit, raw=map_dao.get_all()[args.circuit])
+    plan = solve(circuit, args.turns, args.gamma)
+    print(plan.summary())
+    _print_scores("optimal", plan.rollouts)
+    for score, ticks in zip(plan.rollouts, plan.fastest):
+        print(f"{'au plus vite':<10} départ={score.start} tics={ticks}")
+
+    if args.save or args.score_run is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+        engine = create_engine(f"sqlite:///{args.db}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        if args.save:
+            print(f"Run de référence #{save_reference_run(session, circuit, plan)}")
+        if args.score_run is not None:
+            _print_scores(f"run #{args.score_run}", score_run(session, args.score_run, circuit, args.turns))
+        session.close()
+
+
+if __name__ == "__main__":
+    _main()
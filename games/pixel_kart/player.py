@@ -4,16 +4,21 @@ Définit les types de joueurs pour Pixel Kart.
 - Human       : ne choisit rien automatiquement (les actions viennent de l'UI)
 - RandomAI    : choisit une action aléatoire à chaque tour
 - QLearningAI : choisit selon une politique ε-greedy sur une Q-table persistée
+- GreedyPolicyAI : joue la politique greedy compilée d'un run (inférence seule)
 """
 
 import random
 
 from games.pixel_kart.ai_state import (
-    ACTION_TO_CHAR,
-    CHAR_TO_ACTION,
+    ACTION_COLUMNS,
+    ACTION_INDEX,
+    ACTIONS,
+    encode_state_index,
+    state_to_index,
 )
 from games.pixel_kart.dao.q_table_repository import QTableRepository
 from games.pixel_kart.game_model import Kart, Race
+from games.pixel_kart.policy import decode_policy
 
 
 class Human(Kart):
@@ -43,6 +48,10 @@ class QLearningAI(Kart):
 
     L'agent ne touche pas directement à la base : il dialogue avec un
     `QTableRepository` qui s'occupe du cache RAM et du flush par batch.
+
+    `choose_action_index` / `update_q_index` sont les variantes par indices
+    (état entier, colonne de la Q-table) utilisées à chaque tic de
+    l'entraînement ; `choose_action` / `update_q` s'y ramènent.
     """
 
     def __init__(
@@ -66,7 +75,7 @@ class QLearningAI(Kart):
     # Politique
     # ──────────────────────────────────────────────────────────────────────
 
-    def choose_action(self, state: str) -> str:
+    def choose_action(self, state: int | str | Race) -> str:
         """
         Choisit la prochaine action selon la politique courante.
 
@@ -74,17 +83,40 @@ class QLearningAI(Kart):
         Sinon, choisit l'action de meilleure Q-value (greedy).
 
         Args:
-            state: État courant encodé (string ai_state).
+            state: État courant encodé (indice ou string ai_state), ou la
+                course en cours (appel du GameController, comme RandomAI) :
+                l'état du kart y est alors encodé.
 
         Returns:
             Une action publique parmi `Race.ACTIONS`.
         """
+        if isinstance(state, Race):
+            state = encode_state_index(self, state.circuit)
+        elif type(state) is str:
+            state = state_to_index(state)
+        return ACTIONS[self.choose_action_index(state)]
+
+    def choose_action_index(self, state: int) -> int:
+        """
+        `choose_action` par indices : renvoie la colonne de l'action choisie.
+
+        Mêmes tirages aléatoires que `choose_action` (exploration, puis
+        départage des ex aequo), donc mêmes choix à graine égale.
+
+        Args:
+            state: Indice d'état (ai_state.encode_state_index).
+
+        Returns:
+            Indice de colonne, à traduire par `ai_state.ACTIONS`.
+        """
         if self.training and random.random() < self.epsilon:
-            return random.choice(Race.ACTIONS)
+            return random.choice(ACTION_COLUMNS)
 
-        action_chars = list(CHAR_TO_ACTION.keys())
-        action_char = self.repository.best_action(state, action_chars)
-        return CHAR_TO_ACTION[action_char]
+        row = self.repository.q_row(state)
+        best_q = max(row)
+        if row.count(best_q) == 1:
+            return row.index(best_q)
+        return random.choice([column for column, q in enumerate(row) if q == best_q])
 
     # ──────────────────────────────────────────────────────────────────────
     # Mise à jour Q
@@ -92,10 +124,10 @@ class QLearningAI(Kart):
 
     def update_q(
         self,
-        state: str,
+        state: int | str,
         action_char: str,
         reward: float,
-        new_state: str,
+        new_state: int | str,
         terminal: bool = False,
     ) -> None:
         """
@@ -107,19 +139,69 @@ class QLearningAI(Kart):
         Pour un état terminal, `max_a' Q(s',a') = 0`.
 
         Args:
-            state: État avant l'action (string ai_state).
+            state: État avant l'action (indice ou string ai_state).
             action_char: Caractère d'action (ACTION_TO_CHAR).
             reward: Récompense reçue.
-            new_state: État résultant, ou "" si terminal.
+            new_state: État résultant (ignoré si terminal).
+            terminal: True si la transition mène à un état terminal.
+        """
+        if type(state) is str:
+            state = state_to_index(state)
+        if type(new_state) is str:
+            new_state = state_to_index(new_state)
+        self.update_q_index(state, ACTION_INDEX[action_char], reward, new_state, terminal)
+
+    def update_q_index(
+        self,
+        state: int,
+        column: int,
+        reward: float,
+        new_state: int,
+        terminal: bool = False,
+    ) -> None:
+        """
+        `update_q` par indices (état entier, colonne de la Q-table).
+
+        Args:
+            state: Indice de l'état avant l'action.
+            column: Colonne de l'action jouée (ACTION_INDEX).
+            reward: Récompense reçue.
+            new_state: Indice de l'état résultant (ignoré si terminal).
             terminal: True si la transition mène à un état terminal.
         """
-        current_q = self.repository.get_q(state, action_char)
+        repository = self.repository
+        current_q = repository.get_q_index(state, column)
 
         if terminal:
             future_value = 0.0
         else:
-            action_chars = list(CHAR_TO_ACTION.keys())
-            future_value = self.repository.best_q(new_state, action_chars)
+            future_value = max(repository.q_row(new_state))
 
         new_q = current_q + self.alpha * (reward + self.gamma * future_value - current_q)
-        self.repository.set_q(state, action_char, new_q)
+        repository.set_q_index(state, column, new_q)
+
+
+class GreedyPolicyAI(Kart):
+    """
+    Kart IA d'inférence : joue la politique greedy compilée d'un run.
+
+    Ne charge que les NB_STATES octets de `RunPolicy` (cf. policy.py), ni
+    repository ni Q-values. Ses choix sont ceux d'un `QLearningAI` en
+    exploitation pure (`training=False`) sur la même Q-table, ex aequo
+    compris (même `random.choice` sur les mêmes colonnes).
+    """
+
+    def __init__(self, name: str, policy: bytes, color: str = "grey") -> None:
+        super().__init__(name=name, color=color, is_ai=True)
+        self.policy = decode_policy(policy)
+
+    def choose_action_index(self, state: int) -> int:
+        """Colonne à jouer dans l'état `state` (indice ai_state)."""
+        column = self.policy[state]
+        if type(column) is int:
+            return column
+        return random.choice(column)
+
+    def choose_action(self, race: Race) -> str:
+        """Action à jouer pour l'état courant du kart dans `race`."""
+        return ACTIONS[self.choose_action_index(encode_state_index(self, race.circuit))]
@@ -0,0 +1,59 @@
+"""
+Politique greedy compilée d'un run Pixel Kart.
+
+Une fois entraîné, un run ne sert plus en course qu'à une chose : choisir
+la meilleure action de chaque état. `compile_policy` réduit sa Q-table
+(NB_STATES × 5 floats) à un octet par état :
+
+- bit 7 à 0 : colonne de l'unique meilleure action (0 à 4) ;
+- bit 7 à 1 (`TIE_FLAG`) : les bits 0 à 4 sont le masque des colonnes
+  ex aequo, départagées au hasard au moment de jouer, exactement comme
+  `QLearningAI.choose_action_index` (mêmes colonnes, même ordre, même
+  tirage `random.choice`).
+
+La table compilée (NB_STATES octets) est enregistrée à côté du run
+(`dao.q_table.RunPolicy`) à la fin de chaque entraînement et chargée par
+`player.GreedyPolicyAI`, sans relire les Q-values.
+"""
+
+import numpy as np
+
+from games.pixel_kart.ai_state import ACTION_COLUMNS, NB_STATES
+
+
+TIE_FLAG: int = 0x80
+"""Bit marquant un octet de politique « ex aequo » (masque de colonnes)."""
+
+_COLUMN_BITS = np.array([1 << column for column in ACTION_COLUMNS])
+
+
+def compile_policy(values: np.ndarray) -> bytes:
+    """
+    Compile une Q-table dense en politique greedy (un octet par état).
+
+    Args:
+        values: Q-values (NB_STATES, actions), cf. `QTableRepository.values`.
+
+    Returns:
+        NB_STATES octets (cf. docstring du module).
+    """
+    ties = values == values.max(axis=1, keepdims=True)
+    mask = (ties * _COLUMN_BITS).sum(axis=1)
+    policy = np.where(ties.sum(axis=1) == 1, values.argmax(axis=1), TIE_FLAG | mask)
+    return policy.astype(np.uint8).tobytes()
+
+
+def decode_policy(policy: bytes) -> list[int | tuple[int, ...]]:
+    """
+    Forme jouable d'une politique compilée : pour chaque état, la colonne
+    à jouer, ou le tuple des colonnes ex aequo à départager.
+    """
+    if len(policy) != NB_STATES:
+        raise ValueError(f"Politique de {len(policy)} octets (attendu : {NB_STATES})")
+    decoded: list[int | tuple[int, ...]] = []
+    for byte in policy:
+        if byte & TIE_FLAG:
+            decoded.append(tuple(column for column in ACTION_COLUMNS if byte & (1 << column)))
+        else:
+            decoded.append(byte)
+    return decoded
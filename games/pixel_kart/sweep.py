@@ -0,0 +1,377 @@
+"""
+Balayage d'hyperparamètres Q-learning pour Pixel Kart.
+
+Un balayage (« sweep ») crée un `Run` par combinaison (γ, α, ε début,
+ε fin, circuit) puis entraîne tous ces runs en parallèle, un run par
+processus. Les résultats restent dans les tables existantes (`runs`,
+`q_values`, `episode_log`) : un run de balayage se consulte, se reprend ou
+s'affronte en course comme un run lancé depuis `PixelKartTrainingView`.
+
+Trois étapes :
+
+- `grid_configs` / `random_configs` : génèrent les combinaisons à tester
+  (produit cartésien ou tirage aléatoire dans des intervalles).
+- `run_sweep` : crée les runs (processus maître) puis les entraîne sur un
+  pool de processus avec `ai_train.train_batch`.
+- `summarize_sweep` : requête de synthèse sur les derniers épisodes de
+  chaque run (récompense moyenne, taux d'arrivée, taux de crash).
+
+Accès concurrents à SQLite : chaque worker ouvre son propre engine sur le
+fichier de la base. La base passe en journal WAL (lectures non bloquées
+pendant une écriture) et chaque connexion attend le verrou d'écriture
+jusqu'à `_BUSY_TIMEOUT` secondes au lieu d'échouer (« database is
+locked »). Les flushes de `train_batch` étant groupés, les workers
+passent l'essentiel de leur temps hors verrou.
+
+Utilisation en ligne de commande (balayage de nuit) :
+    python -m games.pixel_kart.sweep --gamma 0.9 0.99 --alpha 0.05 0.1 \\
+        --episodes 20000 --workers 8
+"""
+
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import case, create_engine, event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from games.pixel_kart.ai_train import create_run, train_batch
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import EpisodeLog, Run
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import Circuit
+
+
+_BUSY_TIMEOUT: float = 60.0
+"""Attente max (s) du verrou d'écriture SQLite avant « database is locked »."""
+
+_SUMMARY_WINDOW: int = 500
+"""Nombre de derniers épisodes d'un run pris en compte par la synthèse."""
+
+_DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dao", "data", "pixelkart.db"
+)
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Une combinaison d'hyperparamètres à entraîner (un futur `Run`)."""
+
+    gamma: float
+    alpha: float
+    epsilon_start: float
+    epsilon_end: float
+    circuit_name: str
+
+    @property
+    def label(self) -> str:
+        """Nom lisible du run, ex. `γ=0.9 α=0.1 ε=0.9→0.05 @ Oval`."""
+        return (
+            f"γ={self.gamma:g} α={self.alpha:g} "
+            f"ε={self.epsilon_start:g}→{self.epsilon_end:g} @ {self.circuit_name}"
+        )
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Ligne de la synthèse d'un balayage (cf. `summarize_sweep`)."""
+
+    run_id: int
+    name: str
+    gamma: float
+    alpha: float
+    epsilon_start: float
+    epsilon_end: float
+    circuit_name: str
+    episodes_done: int
+    mean_reward: float
+    finish_rate: float
+    crash_rate: float
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Génération des combinaisons
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def grid_configs(
+    gammas: Iterable[float],
+    alphas: Iterable[float],
+    epsilon_starts: Iterable[float],
+    epsilon_ends: Iterable[float],
+    circuit_names: Iterable[str],
+) -> list[SweepConfig]:
+    """
+    Recherche en grille : produit cartésien de toutes les valeurs données.
+
+    Returns:
+        Une `SweepConfig` par combinaison, dans l'ordre du produit.
+    """
+    return [
+        SweepConfig(gamma, alpha, eps_start, eps_end, circuit)
+        for gamma, alpha, eps_start, eps_end, circuit in itertools.product(
+            gammas, alphas, epsilon_starts, epsilon_ends, circuit_names
+        )
+    ]
+
+
+def random_configs(
+    nb_configs: int,
+    gamma_range: tuple[float, float],
+    alpha_range: tuple[float, float],
+    epsilon_start_range: tuple[float, float],
+    epsilon_end_range: tuple[float, float],
+    circuit_names: list[str],
+    seed: Optional[int] = None,
+) -> list[SweepConfig]:
+    """
+    Recherche aléatoire : tirages uniformes dans chaque intervalle [min, max].
+
+    ε de fin est borné par ε de début (décroissance, jamais croissance).
+    Le circuit est tiré parmi `circuit_names`.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(nb_configs):
+        epsilon_start = rng.uniform(*epsilon_start_range)
+        configs.append(
+            SweepConfig(
+                gamma=rng.uniform(*gamma_range),
+                alpha=rng.uniform(*alpha_range),
+                epsilon_start=epsilon_start,
+                epsilon_end=min(epsilon_start, rng.uniform(*epsilon_end_range)),
+                circuit_name=rng.choice(circuit_names),
+            )
+        )
+    return configs
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Accès base partagé entre processus
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def open_engine(db_path: str) -> Engine:
+    """
+    Ouvre un engine SQLite adapté aux écritures concurrentes.
+
+    Journal WAL sur chaque connexion et attente du verrou d'écriture
+    (`_BUSY_TIMEOUT`). Les tables sont créées si besoin.
+    """
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"timeout": _BUSY_TIMEOUT})
+
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _train_one(task: dict) -> int:
+    """
+    Entraîne un run dans un processus du pool (connexion SQLite propre).
+
+    Args:
+        task: Dict {db_path, run_id, circuit_name, circuit_raw, nb_episodes,
+            nb_turns, batch_size, seed}.
+
+    Returns:
+        L'ID du run entraîné.
+    """
+    engine = open_engine(task["db_path"])
+    session = sessionmaker(bind=engine)()
+    try:
+        train_batch(
+            session=session,
+            run_id=task["run_id"],
+            nb_episodes=task["nb_episodes"],
+            circuit=Circuit(name=task["circuit_name"], raw=task["circuit_raw"]),
+            nb_turns=task["nb_turns"],
+            batch_size=task["batch_size"],
+            seed=task["seed"],
+        )
+    finally:
+        session.close()
+        engine.dispose()
+    return task["run_id"]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Balayage
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def run_sweep(
+    db_path: str,
+    configs: list[SweepConfig],
+    nb_episodes: int,
+    nb_turns: int,
+    nb_workers: Optional[int] = None,
+    batch_size: int = 1024,
+    name_prefix: str = "sweep",
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+) -> list[int]:
+    """
+    Crée un run par configuration puis les entraîne en parallèle.
+
+    Les runs sont créés par le processus maître avant le lancement du
+    pool : un balayage interrompu laisse des runs partiellement entraînés
+    (cf. `episodes_done`), que `train` / `train_batch` peuvent reprendre.
+
+    Args:
+        db_path: Chemin du fichier SQLite (partagé par tous les workers).
+        configs: Combinaisons à entraîner (`grid_configs`, `random_configs`).
+        nb_episodes: Épisodes joués par run.
+        nb_turns: Nombre de tours par course.
+        nb_workers: Taille du pool (défaut : nombre de cœurs).
+        batch_size: Taille de lot de `train_batch`.
+        name_prefix: Préfixe du nom des runs, pour les retrouver ensuite.
+        progress_callback: Fonction(runs_done, total) appelée à la fin de
+            chaque run. None pour désactiver.
+        seed: Graine de base (run i : seed + i), ou None.
+
+    Returns:
+        IDs des runs créés, dans l'ordre de `configs`.
+
+    Raises:
+        ValueError: si un circuit des configurations est introuvable.
+    """
+    circuits = map_dao.get_all()
+    missing = {config.circuit_name for config in configs} - circuits.keys()
+    if missing:
+        raise ValueError(f"Circuit(s) introuvable(s) : {sorted(missing)}")
+
+    engine = open_engine(db_path)
+    session = sessionmaker(bind=engine)()
+    try:
+        run_ids = [
+            create_run(
+                session=session,
+                name=f"{name_prefix} {config.label}",
+                gamma=config.gamma,
+                alpha=config.alpha,
+                epsilon_start=config.epsilon_start,
+                epsilon_end=config.epsilon_end,
+                circuit_name=config.circuit_name,
+                notes=name_prefix,
+            )
+            for config in configs
+        ]
+    finally:
+        session.close()
+        engine.dispose()
+
+    tasks = [
+        {
+            "db_path": db_path,
+            "run_id": run_id,
+            "circuit_name": config.circuit_name,
+            "circuit_raw": circuits[config.circuit_name],
+            "nb_episodes": nb_episodes,
+            "nb_turns": nb_turns,
+            "batch_size": batch_size,
+            "seed": None if seed is None else seed + index,
+        }
+        for index, (run_id, config) in enumerate(zip(run_ids, configs))
+    ]
+    with ProcessPoolExecutor(max_workers=nb_workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(_train_one, task) for task in tasks]
+        for runs_done, future in enumerate(as_completed(futures), start=1):
+            future.result()
+            if progress_callback is not None:
+                progress_callback(runs_done, len(tasks))
+    return run_ids
+
+
+def summarize_sweep(
+    session: Session,
+    run_ids: Optional[list[int]] = None,
+    window: int = _SUMMARY_WINDOW,
+) -> list[SweepResult]:
+    """
+    Synthèse des runs, du meilleur au moins bon (récompense moyenne).
+
+    Une seule requête agrégée sur `episode_log`, restreinte aux `window`
+    derniers épisodes de chaque run (la performance finale, pas la phase
+    d'exploration).
+
+    Args:
+        session: Session SQLAlchemy active.
+        run_ids: Runs à résumer (défaut : tous).
+        window: Nombre de derniers épisodes pris en compte par run.
+    """
+    query = (
+        select(
+            Run.id,
+            Run.name,
+            Run.gamma,
+            Run.alpha,
+            Run.epsilon_start,
+            Run.epsilon_end,
+            Run.circuit_name,
+            Run.episodes_done,
+            func.avg(EpisodeLog.total_reward),
+            func.avg(case((EpisodeLog.finished, 1.0), else_=0.0)),
+            func.avg(case((EpisodeLog.crashed, 1.0), else_=0.0)),
+        )
+        .join(EpisodeLog, EpisodeLog.run_id == Run.id)
+        .where(EpisodeLog.episode_num > Run.episodes_done - window)
+        .group_by(Run.id)
+        .order_by(func.avg(EpisodeLog.total_reward).desc())
+    )
+    if run_ids is not None:
+        query = query.where(Run.id.in_(run_ids))
+    return [SweepResult(*row) for row in session.execute(query).all()]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Ligne de commande
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def _main() -> None:
+    """Lance un balayage en grille depuis la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Balayage d'hyperparamètres Pixel Kart")
+    parser.add_argument("--db", default=_DEFAULT_DB_PATH)
+    parser.add_argument("--gamma", type=float, nargs="+", default=[0.9])
+    parser.add_argument("--alpha", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--epsilon-start", type=float, nargs="+", default=[0.9])
+    parser.add_argument("--epsilon-end", type=float, nargs="+", default=[0.05])
+    parser.add_argument("--circuit", nargs="+", default=sorted(map_dao.get_all()))
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--turns", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--name", default="sweep")
+    args = parser.parse_args()
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+
+    configs = grid_configs(
+        args.gamma, args.alpha, args.epsilon_start, args.epsilon_end, args.circuit
+    )
+    run_ids = run_sweep(
+        args.db, configs, args.episodes, args.turns,
+        nb_workers=args.workers, name_prefix=args.name,
+        progress_callback=lambda done, total: print(f"{done}/{total} runs terminés"),
+    )
+
+    engine = open_engine(args.db)
+    session = sessionmaker(bind=engine)()
+    for result in summarize_sweep(session, run_ids):
+        print(
+            f"#{result.run_id:<5} {result.name:<50} reward={result.mean_reward:9.1f} "
+            f"finish={result.finish_rate:6.1%} crash={result.crash_rate:6.1%}"
+        )
+    session.close()
+
+
+if __name__ == "__main__":
+    _main()
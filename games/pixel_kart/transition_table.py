@@ -0,0 +1,182 @@
+"""
+Table de transitions compilée d'un circuit Pixel Kart.
+
+Sur un `Circuit` donné, `Race.apply_action` est déterministe : la
+configuration d'arrivée d'un kart ne dépend que de sa configuration de
+départ (position, direction, vitesse) et de l'action jouée. Les tours
+effectués n'influent pas sur le déplacement ; seul leur écart (+1 / -1 au
+franchissement de la ligne) est une conséquence de la transition.
+
+`compile_circuit` énumère une fois toutes les configurations atteignables
+depuis la ligne de départ (parcours en largeur, en jouant la vraie
+dynamique sur un kart de travail) et range, pour chaque couple
+(configuration, action), dans des tableaux plats :
+- la configuration d'arrivée,
+- le crash (mur percuté),
+- l'écart de tours.
+
+Chaque configuration atteignable porte aussi son indice d'état
+(`ai_state.encode_state_index`). Un tic d'entraînement se réduit alors à
+quelques lectures de tableau, sans `DIRECTION_ORDER.index` ni appels
+`is_inside` / `cell` par pas de déplacement.
+
+Les tables sont mises en cache par tracé (`Circuit.raw`) : deux `Circuit`
+construits à partir du même tracé partagent la même table. Le cache est
+borné (LRU de `CACHE_SIZE` tracés) : les circuits modifiés dans l'éditeur
+au fil d'une session n'y restent pas indéfiniment.
+La récompense, qui relève de l'entraînement, est compilée à part
+(cf. `ai_train.compile_rewards`).
+"""
+
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+from games.pixel_kart.ai_state import ACTIONS, encode_state_index
+from games.pixel_kart.game_model import DIRECTION_ORDER, Circuit, Kart, Race
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Constantes
+# ──────────────────────────────────────────────────────────────────────────
+
+NB_ACTIONS: int = len(ACTIONS)
+"""Nombre d'actions (colonnes de la Q-table dense) par configuration."""
+
+NB_SPEEDS: int = Kart.MAX_SPEED - Kart.MIN_SPEED + 1
+"""Nombre de vitesses possibles d'un kart."""
+
+UNREACHABLE: int = -1
+"""Configuration d'arrivée (et indice d'état) d'une configuration jamais atteinte."""
+
+_DIRECTION_INDEX: dict[str, int] = {d: i for i, d in enumerate(DIRECTION_ORDER)}
+
+CACHE_SIZE: int = 8
+"""Nombre de tracés gardés dans les caches de tables et de récompenses."""
+
+
+def circuit_key(circuit: Circuit) -> str:
+    """Empreinte (SHA-1) du tracé d'un circuit, clé du cache des tables."""
+    return hashlib.sha1(circuit.raw.encode("utf-8")).hexdigest()
+
+
+class TransitionTable:
+    """
+    Dynamique d'un circuit, précalculée pour toutes les configurations
+    atteignables.
+
+    Une configuration encode (ligne, colonne, direction, vitesse) :
+    `((row * cols + col) * 4 + direction) * NB_SPEEDS + speed - MIN_SPEED`.
+    Les tableaux de transitions sont plats, indexés par
+    `config * NB_ACTIONS + colonne` (colonnes de `ai_state.ACTIONS`).
+
+    Attributes:
+        key (str): empreinte du circuit (cf. `circuit_key`).
+        rows, cols (int): dimensions du circuit.
+        nb_configs (int): nombre de configurations (atteignables ou non).
+        next_config (np.ndarray[int32]): configuration d'arrivée, ou
+            UNREACHABLE si la configuration de départ n'est jamais atteinte.
+        crashed (np.ndarray[bool]): vrai si la transition percute un mur.
+        lap_delta (np.ndarray[int8]): écart de `turns_done` (-1, 0 ou +1).
+        state (np.ndarray[int32]): indice d'état de chaque configuration,
+            UNREACHABLE si elle n'est jamais atteinte.
+        reachable (int): nombre de configurations atteignables.
+    """
+
+    def __init__(self, circuit: Circuit) -> None:
+        """Compile la table (préférer `compile_circuit`, qui met en cache)."""
+        self.key = circuit_key(circuit)
+        self.rows = circuit.rows
+        self.cols = circuit.cols
+        self.nb_configs = circuit.rows * circuit.cols * len(DIRECTION_ORDER) * NB_SPEEDS
+
+        size = self.nb_configs * NB_ACTIONS
+        self.next_config = np.full(size, UNREACHABLE, dtype=np.int32)
+        self.crashed = np.zeros(size, dtype=bool)
+        self.lap_delta = np.zeros(size, dtype=np.int8)
+        self.state = np.full(self.nb_configs, UNREACHABLE, dtype=np.int32)
+
+        self._explore(circuit)
+        self.reachable = int((self.state != UNREACHABLE).sum())
+
+        # Copies en listes Python : en boucle scalaire, l'indexation d'une
+        # liste est bien plus rapide que celle d'un tableau NumPy
+        self.next_list: list[int] = self.next_config.tolist()
+        self.crashed_list: list[bool] = self.crashed.tolist()
+        self.lap_list: list[int] = self.lap_delta.tolist()
+        self.state_list: list[int] = self.state.tolist()
+
+    # ---------- Configurations ----------
+
+    def config_of(self, position: tuple[int, int], direction: str, speed: int) -> int:
+        """Indice de la configuration (position, direction, vitesse)."""
+        row, col = position
+        cell = row * self.cols + col
+        return (cell * len(DIRECTION_ORDER) + _DIRECTION_INDEX[direction]) * NB_SPEEDS \
+            + speed - Kart.MIN_SPEED
+
+    def decode(self, config: int) -> tuple[tuple[int, int], str, int]:
+        """Inverse de `config_of` : configuration -> (position, direction, vitesse)."""
+        rest, speed = divmod(config, NB_SPEEDS)
+        cell, direction = divmod(rest, len(DIRECTION_ORDER))
+        return divmod(cell, self.cols), DIRECTION_ORDER[direction], speed + Kart.MIN_SPEED
+
+    def start_configs(self, circuit: Circuit) -> list[int]:
+        """Configurations de départ (cf. `Race.__init__` / `Kart.reset`)."""
+        return [
+            self.config_of(position, "EAST", 0)
+            for position in circuit.finish_positions or [(0, 0)]
+        ]
+
+    # ---------- Compilation ----------
+
+    def _explore(self, circuit: Circuit) -> None:
+        """
+        Parcours en largeur des configurations atteignables depuis le départ.
+
+        Chaque transition est jouée par `Race.apply_action` sur un kart de
+        travail : la table ne réimplémente pas la dynamique, elle la
+        mémorise.
+        """
+        race = Race(circuit=circuit, karts=[], nb_turns=1)
+        kart = Kart("Compiler")
+
+        pending = self.start_configs(circuit)
+        for config in pending:
+            position, direction, speed = self.decode(config)
+            kart.position, kart.direction, kart.speed = position, direction, speed
+            self.state[config] = encode_state_index(kart, circuit)
+
+        while pending:
+            config = pending.pop()
+            position, direction, speed = self.decode(config)
+            for column, action in enumerate(ACTIONS):
+                kart.position, kart.direction, kart.speed = position, direction, speed
+                kart.turns_done = 0
+                kart.is_alive = True
+                race.apply_action(kart, action)
+
+                arrival = self.config_of(kart.position, kart.direction, kart.speed)
+                transition = config * NB_ACTIONS + column
+                self.next_config[transition] = arrival
+                self.crashed[transition] = not kart.is_alive
+                self.lap_delta[transition] = kart.turns_done
+
+                if kart.is_alive and self.state[arrival] == UNREACHABLE:
+                    self.state[arrival] = encode_state_index(kart, circuit)
+                    pending.append(arrival)
+
+
+def compile_circuit(circuit: Circuit) -> TransitionTable:
+    """
+    Table de transitions du circuit, compilée au premier appel puis lue
+    dans le cache (clé : `Circuit.raw`).
+    """
+    return _compile_raw(circuit.raw)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_raw(raw: str) -> TransitionTable:
+    """Table d'un tracé (le nom du circuit n'intervient pas)."""
+    return TransitionTable(Circuit(name="", raw=raw))
@@ -11,7 +11,9 @@ Layout calqué sur les autres vues du projet :
 L'entraînement lui-même n'est PAS lancé par cette vue — la vue se contente
 de collecter les paramètres et d'appeler `on_start_training(params)`. C'est
 l'application principale (`PixelKartApp`) qui orchestre la session DB et la
-boucle d'entraînement, ce qui garde la vue pure côté présentation.
+boucle d'entraînement (en arrière-plan, cf. training_service), ce qui garde
+la vue pure côté présentation. Les boutons Pause / Annuler de la section
+progression passent par `on_pause`, `on_resume` et `on_cancel`.
 """
 
 import tkinter as tk
@@ -19,6 +21,7 @@ from tkinter import Frame, ttk
 
 import games.pixel_kart.editor.map_dao as map_dao
 from language_manager import lang_manager
+from training_service import TrainingControls
 
 
 class PixelKartTrainingView(Frame):
@@ -29,7 +32,9 @@ class PixelKartTrainingView(Frame):
         on_start_training(params: dict)
             Lance l'entraînement avec les hyperparamètres collectés.
             params = {name, circuit, nb_turns, nb_episodes, gamma, alpha,
-                      epsilon_start, epsilon_end}
+                      epsilon_start, epsilon_end, nb_workers}
+        on_pause() / on_resume() / on_cancel()
+            Contrôle de l'entraînement en cours.
         on_back()
             Retour au menu Pixel Kart.
     """
@@ -49,9 +54,11 @@ class PixelKartTrainingView(Frame):
         "alpha": "0.1",
         "epsilon_start": "1.0",
         "epsilon_end": "0.01",
+        "nb_workers": "1",
     }
 
-    def __init__(self, master, on_start_training=None, on_back=None) -> None:
+    def __init__(self, master, on_start_training=None, on_back=None,
+                 on_pause=None, on_resume=None, on_cancel=None) -> None:
         """
         Construit la frame d'entraînement.
 
@@ -59,10 +66,16 @@ class PixelKartTrainingView(Frame):
             master: Fenêtre Tkinter parente (PixelKartApp).
             on_start_training: Callback(dict) appelé au clic sur "Start".
             on_back: Callback() pour revenir au menu.
+            on_pause: Callback() pour suspendre l'entraînement.
+            on_resume: Callback() pour le reprendre.
+            on_cancel: Callback() pour l'annuler.
         """
         super().__init__(master, bg=self.BG_COLOR)
         self.on_start_training = on_start_training
         self.on_back = on_back
+        self.on_pause = on_pause
+        self.on_resume = on_resume
+        self.on_cancel = on_cancel
 
         # Variables Tkinter du formulaire
         self.name_var = tk.StringVar(value=self.DEFAULTS["name"])
@@ -73,6 +86,7 @@ class PixelKartTrainingView(Frame):
         self.alpha_var = tk.StringVar(value=self.DEFAULTS["alpha"])
         self.epsilon_start_var = tk.StringVar(value=self.DEFAULTS["epsilon_start"])
         self.epsilon_end_var = tk.StringVar(value=self.DEFAULTS["epsilon_end"])
+        self.nb_workers_var = tk.StringVar(value=self.DEFAULTS["nb_workers"])
         self.progress_var = tk.IntVar(value=0)
 
         # Le dropdown circuit est reconstruit dynamiquement (cf. menu_view)
@@ -133,6 +147,7 @@ class PixelKartTrainingView(Frame):
             ("pk_train_alpha",          self.alpha_var),
             ("pk_train_epsilon_start",  self.epsilon_start_var),
             ("pk_train_epsilon_end",    self.epsilon_end_var),
+            ("pk_train_workers",        self.nb_workers_var),
         ]
         for i, (key, var) in enumerate(rows):
             label = tk.Label(form, text=lang_manager.get_text(key),
@@ -189,7 +204,13 @@ class PixelKartTrainingView(Frame):
             self.progress_frame, text="",
             bg=self.CARD_BG, font=("Helvetica", 11),
         )
-        self.progress_label.pack(pady=(5, 15))
+        self.progress_label.pack(pady=(5, 5))
+
+        self.controls = TrainingControls(
+            self.progress_frame, on_pause=self.on_pause,
+            on_resume=self.on_resume, on_cancel=self.on_cancel,
+        )
+        self.controls.pack(pady=(0, 15))
 
     def _create_results_section(self) -> None:
         """Section résultats finale, masquée tant que l'entraînement n'est pas terminé."""
@@ -274,6 +295,7 @@ class PixelKartTrainingView(Frame):
                 "alpha": float(self.alpha_var.get()),
                 "epsilon_start": float(self.epsilon_start_var.get()),
                 "epsilon_end": float(self.epsilon_end_var.get()),
+                "nb_workers": max(1, int(self.nb_workers_var.get())),
             }
         except ValueError:
             return
@@ -355,6 +377,13 @@ class PixelKartTrainingView(Frame):
             text=lang_manager.get_text("pk_train_elapsed").format(f"{elapsed_s:.1f}")
         )
 
+    def show_cancelled(self) -> None:
+        """Entraînement annulé : retour au formulaire des paramètres."""
+        self.progress_frame.pack_forget()
+        self.controls.reset()
+        self.progress_var.set(0)
+        self.params_card.pack(fill=tk.X, padx=60, pady=15)
+
     # ──────────────────────────────────────────────────────────────────────
     # Multilingue
     # ──────────────────────────────────────────────────────────────────────
@@ -369,3 +398,4 @@ class PixelKartTrainingView(Frame):
         self.start_btn.config(text=lang_manager.get_text("pk_train_start"))
         self.progress_title.config(text=lang_manager.get_text("pk_train_progress"))
         self.results_title.config(text=lang_manager.get_text("pk_train_complete"))
+        self.controls.update_language()
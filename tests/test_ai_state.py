@@ -15,7 +15,11 @@ import pytest
 from games.pixel_kart.ai_state import (
     ACTION_TO_CHAR,
     CHAR_TO_ACTION,
+    NB_STATES,
     encode_state,
+    encode_state_index,
+    index_to_state,
+    state_to_index,
 )
 from games.pixel_kart.ai_train import (
     compute_reward,
@@ -145,6 +149,44 @@ def test_state_has_six_characters() -> None:
     assert len(encode_state(kart, circuit)) == 6
 
 
+def test_state_index_roundtrip() -> None:
+    """Chaque indice de [0, NB_STATES) correspond à une clé string unique."""
+    states = {index_to_state(i) for i in range(NB_STATES)}
+    assert len(states) == NB_STATES
+    assert all(state_to_index(index_to_state(i)) == i for i in range(NB_STATES))
+
+
+def test_encoders_follow_a_wider_sensor_range(monkeypatch) -> None:
+    """Avec SENSOR_RANGE = 12, les distances > 9 restent sur un caractère."""
+    from games.pixel_kart import ai_state
+
+    monkeypatch.setattr(Circuit, "SENSOR_RANGE", 12)
+    monkeypatch.setattr(ai_state, "STATE_RADICES", (13, 13, 13, 13, 2, 4))
+    circuit = _make_circuit(["R" * 15])
+
+    states, indices = set(), set()
+    for column in range(15):
+        kart = _make_kart((0, column), direction="EAST", speed=1)
+        state = encode_state(kart, circuit)
+        assert len(state) == 6
+        assert encode_state_index(kart, circuit) == state_to_index(state)
+        assert index_to_state(state_to_index(state)) == state
+        states.add(state)
+        indices.add(state_to_index(state))
+    assert len(states) == len(indices) == 15   # aucune collision
+    assert any(state[0] == "c" for state in states)   # distance avant 12
+
+
+def test_encode_state_index_matches_string_encoding() -> None:
+    circuit = _make_circuit(["WRRRG", "RRFRR", "GGRRW"])
+    for direction in ("NORTH", "EAST", "SOUTH", "WEST"):
+        for speed in (-1, 0, 1, 2):
+            kart = _make_kart((1, 2), direction=direction, speed=speed)
+            index = encode_state_index(kart, circuit)
+            assert 0 <= index < NB_STATES
+            assert index == state_to_index(encode_state(kart, circuit))
+
+
 # ──────────────────────────────────────────────────────────────────────────
 # encode_state — directions relatives
 # ──────────────────────────────────────────────────────────────────────────
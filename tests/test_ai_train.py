@@ -6,20 +6,26 @@ Couvre `run_episode` :
   applique bien le malus TIMEOUT_PENALTY.
 - Un épisode terminé normalement (victoire ou crash) n'applique pas
   ce malus.
+- Le tic par indices (sans KartDTO) reste identique au bit près à la
+  boucle d'origine (to_dto + compute_reward + choose_action / update_q).
 """
 
 import os
+import random
 import tempfile
 
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from games.pixel_kart.ai_train import TIMEOUT_PENALTY, create_run, run_episode
+from games.pixel_kart.ai_state import ACTION_INDEX, ACTION_TO_CHAR, encode_state_index
+from games.pixel_kart.ai_train import (
+    TIMEOUT_PENALTY, compute_reward, compute_timeout, create_run, run_episode,
+)
 from games.pixel_kart.dao.base import Base
 from games.pixel_kart.dao.q_table_repository import QTableRepository
 from games.pixel_kart.editor import map_dao
-from games.pixel_kart.game_model import Circuit
+from games.pixel_kart.game_model import Circuit, Race
 from games.pixel_kart.player import QLearningAI
 
 
@@ -70,7 +76,7 @@ def test_timeout_penalty_applied_when_episode_times_out(
     )
 
     # Forcer l'IA à toujours jouer PASS → le kart ne bouge pas
-    monkeypatch.setattr(QLearningAI, "choose_action", lambda self, state: "PASS")
+    monkeypatch.setattr(QLearningAI, "choose_action_index", lambda self, state: ACTION_INDEX["P"])
 
     timeout = 10
     total_reward, ticks, finished, crashed = run_episode(
@@ -104,7 +110,7 @@ def test_no_timeout_penalty_on_crash(
     )
 
     # Forcer ACCELERATE → speed 1 EAST → bump into wall en 1 tic
-    monkeypatch.setattr(QLearningAI, "choose_action", lambda self, state: "ACCELERATE")
+    monkeypatch.setattr(QLearningAI, "choose_action_index", lambda self, state: ACTION_INDEX["A"])
 
     timeout = 50
     total_reward, ticks, finished, crashed = run_episode(
@@ -121,3 +127,62 @@ def test_no_timeout_penalty_on_crash(
     assert total_reward > -200.0 + TIMEOUT_PENALTY + 10, (
         "Le malus timeout ne doit pas être appliqué après un crash"
     )
+
+
+def _reference_episode(ai_kart, circuit, nb_turns, timeout):
+    """Boucle d'épisode d'origine, par KartDTO et actions nommées."""
+    race = Race(circuit=circuit, karts=[ai_kart], nb_turns=nb_turns)
+    total_reward, ticks, crashed = 0.0, 0, False
+    last_state, last_char = -1, ""
+    while ticks < timeout and not race.is_finished():
+        before = ai_kart.to_dto()
+        state = encode_state_index(ai_kart, circuit)
+        action = ai_kart.choose_action(state)
+        last_state, last_char = state, ACTION_TO_CHAR[action]
+        race.play_action(action)
+        was_crashed = not ai_kart.is_alive and not crashed
+        crashed = crashed or was_crashed
+        reward = compute_reward(before, ai_kart.to_dto(), circuit)
+        total_reward += reward
+        terminal = was_crashed or race.is_finished()
+        new_state = -1 if terminal else encode_state_index(ai_kart, circuit)
+        ai_kart.update_q(state, last_char, reward, new_state, terminal=terminal)
+        ticks += 1
+        if was_crashed:
+            break
+    finished = race.is_finished() and not crashed
+    if not finished and not crashed and last_state >= 0:
+        total_reward += TIMEOUT_PENALTY
+        ai_kart.update_q(last_state, last_char, TIMEOUT_PENALTY, -1, terminal=True)
+    return total_reward, ticks, finished, crashed
+
+
+def test_index_step_matches_dto_reference_bit_for_bit(repo_and_circuit) -> None:
+    repository, circuit = repo_and_circuit
+    timeout = compute_timeout(circuit, 1)
+    outcomes = []
+    for episode_fn in (_reference_episode, run_episode):
+        repository.values[:] = 0.0
+        random.seed(3)
+        ai = QLearningAI(name="Twin", repository=repository,
+                         gamma=0.9, alpha=0.1, epsilon=0.3, training=True)
+        stats = [episode_fn(ai, circuit, 1, timeout) for _ in range(30)]
+        outcomes.append((stats, repository.values.copy()))
+
+    (stats_ref, values_ref), (stats_new, values_new) = outcomes
+    assert stats_new == stats_ref
+    assert (values_new == values_ref).all()
+
+
+def test_repository_flush_and_reload_dense_table(repo_and_circuit) -> None:
+    """Les Q-values écrites par indice se relisent à l'identique après flush."""
+    repository, _ = repo_and_circuit
+    repository.set_q(5, "A", 1.5)
+    repository.set_q("000013", "L", -2.0)
+    repository.flush()
+
+    reloaded = QTableRepository(repository.session, run_id=repository.run_id)
+    assert reloaded.q_values == {("000011", "A"): 1.5, ("000013", "L"): -2.0}
+    assert reloaded.get_q(7, "L") == -2.0
+    assert reloaded.best_action(5, ["B", "A"]) == "A"
+    assert reloaded.best_q("000013", ["A", "L"]) == 0.0
@@ -0,0 +1,70 @@
+"""
+Tests de games/allumette/batch_train.py.
+
+Couvre :
+- La politique gloutonne vectorisée vs `ValueTable.best_move`.
+- La mise à jour TD par lot vs `AI.train` sur une même partie.
+- Un entraînement complet : compteurs, décroissance d'ε et politique
+  apprise parfaite contre le joueur parfait.
+"""
+
+import numpy as np
+import pytest
+
+from games.allumette.batch_train import (
+    _greedy_moves,
+    play_batch,
+    td_update_batch,
+    train_batch,
+)
+from games.allumette.player import AI, Human, PerfectPlayer, Player
+from games.allumette.solver import ValueTable
+
+
+def test_greedy_moves_match_best_move() -> None:
+    rng = np.random.default_rng(0)
+    table = ValueTable(40)
+    table.values[1:] = rng.choice([-1.0, 0.0, 0.5, 1.0], size=39)
+    counts = np.arange(1, 40)
+    assert _greedy_moves(table.values, counts).tolist() == [table.best_move(n) for n in counts]
+
+
+def test_td_update_matches_sequential_train_on_one_game() -> None:
+    """Une partie : mêmes valeurs que AI.train sur le même historique."""
+    sequential = AI("Seq", learning_rate=0.3)
+    sequential.value_function = ValueTable.from_dict({"3": 0.5, "7": -0.2, "12": 0.1})
+    sequential.history = [(12, 7), (7, 3), (3, "win")]
+    batched = ValueTable.from_dict(sequential.value_function.to_dict())
+    sequential.train()
+
+    counts = np.zeros((13, 8), dtype=np.int64)
+    counts[12, 12 - 7 - 1] = counts[7, 7 - 3 - 1] = counts[3, 6] = 1
+    td_update_batch(batched, counts, 0.3)
+    assert np.allclose(batched.values[:13], sequential.value_function.values[:13])
+
+
+def test_play_batch_counts_one_terminal_transition_per_game() -> None:
+    student = AI("Student", epsilon=1.0)
+    counts, wins = play_batch(student, Player("Random"), 500, 15, 1.0, np.random.default_rng(1))
+    # Chaque partie se termine par une transition "win" ou "lose" de l'élève
+    assert counts[:, 6:].sum() == 500
+    assert counts[:, 6].sum() == wins
+    assert 0 < wins < 500
+
+
+def test_train_batch_against_perfect_player() -> None:
+    student, opponent = AI("Student", epsilon=0.9, learning_rate=0.3), PerfectPlayer("Perfect")
+    progress = []
+    train_batch(student, opponent, 20_000, nb_matches=12, epsilon_decay=1000,
+                batch_size=512, progress_callback=lambda d, t: progress.append(d), seed=0)
+
+    assert student.nb_games == opponent.nb_games == 20_000
+    assert student.nb_wins == opponent.nb_loses
+    assert progress[-1] == 20_000
+    assert student.epsilon == pytest.approx(max(0.9 * 0.95 ** 19, 0.05))
+    assert student.value_function.policy_accuracy(12) == 1.0
+
+
+def test_human_cannot_play_a_batch() -> None:
+    with pytest.raises(ValueError):
+        train_batch(AI("Student"), Human("Bob"), 10, seed=0)
@@ -0,0 +1,96 @@
+"""
+Tests de games/allumette/solver.py et de la value-function de l'IA.
+
+Couvre :
+- La résolution rétrograde vs la formule close n ≡ 1 (mod 4).
+- Le joueur parfait : il gagne toujours depuis une position gagnante.
+- L'aller-retour JSON de l'IA (clés string reconverties en entiers).
+- Un entraînement TD court contre le joueur parfait.
+"""
+
+import random
+
+import numpy as np
+
+from games.allumette.game_model import GameModel
+from games.allumette.player import AI, PerfectPlayer, Player
+from games.allumette.solver import (
+    LOSE,
+    WIN,
+    ValueTable,
+    is_winning,
+    solve,
+    winning_move,
+)
+
+
+def _brute_force(n: int) -> float:
+    """Valeur par récursion naïve (référence pour les petites positions)."""
+    if n == 0:
+        return WIN
+    return WIN if any(_brute_force(n - a) == LOSE for a in range(1, min(3, n) + 1)) else LOSE
+
+
+def test_solve_matches_brute_force_and_closed_form() -> None:
+    values = solve(5000)
+    assert values[:16].tolist() == [_brute_force(n) for n in range(16)]
+    counts = np.arange(len(values))
+    assert np.array_equal(values == LOSE, counts % 4 == 1)
+    assert all(is_winning(n) == (values[n] == WIN) for n in range(1, 200))
+
+
+def test_winning_move_leaves_a_losing_position() -> None:
+    for n in [2, 3, 4, 6, 12, 15, 1_000_002, 10_000_003]:
+        take = winning_move(n)
+        assert 1 <= take <= 3 and not is_winning(n - take)
+    assert winning_move(1) is None
+    assert winning_move(13) is None
+
+
+def test_perfect_player_always_wins_from_winning_positions() -> None:
+    random.seed(0)
+    for nb in (12, 15, 102):
+        perfect, opponent = PerfectPlayer("Perfect"), Player("Random")
+        game = GameModel(nb, perfect, opponent, displayable=False)
+        for _ in range(50):
+            # Le joueur parfait commence depuis une position gagnante
+            game.nb, game.player1, game.player2 = nb, perfect, opponent
+            game.current_player = 0
+            while not game.is_game_over():
+                game.step(game.get_current_player().play())
+                if not game.is_game_over():
+                    game.switch_player()
+            assert game.get_winner() is perfect
+
+
+def test_ai_value_function_survives_json_roundtrip(tmp_path) -> None:
+    ai = AI("Saved", epsilon=0.2, learning_rate=0.5)
+    ai.value_function = ValueTable.exact(20)
+    path = tmp_path / "ai.json"
+    ai.upload(path)
+
+    loaded = AI("Loaded")
+    loaded.download(path)
+    assert loaded.epsilon == 0.2
+    assert np.array_equal(loaded.value_function.values[:21], solve(20))
+    assert loaded.value_function.policy_accuracy(20) == 1.0
+
+
+def test_legacy_string_keys_are_read_as_counts() -> None:
+    table = ValueTable.from_dict({"win": 1, "lose": -1, "1": -0.9, "5": -0.8, "3": 0.7})
+    assert table[1] == -0.9 and table[5] == -0.8 and table[3] == 0.7
+    assert table[0] == WIN
+    assert table.best_move(6) == 1  # laisse 5 (valeur la plus basse)
+
+
+def test_td_training_against_perfect_player_learns_losing_positions() -> None:
+    random.seed(1)
+    student = AI("Student", epsilon=0.9, learning_rate=0.3)
+    game = GameModel(12, student, PerfectPlayer("Perfect"), displayable=False)
+    for i in range(3000):
+        if i % 200 == 0 and i > 0:
+            student.next_epsilon()
+        game.play()
+        student.train()
+    assert student.value_function[1] < 0
+    assert student.value_function.policy_accuracy(12) == 1.0
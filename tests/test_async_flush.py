@@ -0,0 +1,114 @@
+"""
+Tests de games/pixel_kart/dao/async_flush.py.
+
+Couvre :
+- Un lot confié au flusher est écrit par le thread d'écriture : Q-values
+  (valeurs au moment du `submit`), logs et `episodes_done`.
+- La bascule du set dirty (double tampon).
+- La contre-pression : `submit` bloque tant que l'écriture précédente
+  n'est pas terminée.
+- La remontée d'une erreur d'écriture, et l'écriture en ligne sur une
+  base en mémoire.
+"""
+
+import os
+import tempfile
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.ai_state import index_to_state
+from games.pixel_kart.ai_train import create_run
+from games.pixel_kart.dao.async_flush import AsyncFlusher
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import EpisodeLog, QValue, Run
+from games.pixel_kart.dao.q_table_repository import QTableRepository
+
+
+def _log(run_id: int, episode_num: int) -> dict:
+    return {"run_id": run_id, "episode_num": episode_num, "total_reward": 1.0,
+            "ticks": 3, "finished": False, "crashed": False}
+
+
+@pytest.fixture
+def repository():
+    """Repository d'un run, sur une base SQLite temporaire (fichier)."""
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    engine = create_engine(f"sqlite:///{tmp.name}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    run_id = create_run(session, "t", 0.9, 0.1, 1.0, 0.1, "mini")
+    yield QTableRepository(session, run_id)
+    session.close()
+    engine.dispose()
+    os.unlink(tmp.name)
+
+
+def test_batches_are_written_in_background(repository) -> None:
+    with AsyncFlusher(repository) as flusher:
+        assert flusher.threaded
+        repository.set_q_index(7, 1, 2.5)
+        flusher.submit([_log(repository.run_id, 1)], 1)
+        assert not repository.dirty            # tampon basculé
+        repository.set_q_index(7, 1, 9.0)      # modifié pendant l'écriture
+        repository.set_q_index(8, 0, -1.0)
+        flusher.submit([_log(repository.run_id, 2)], 2)
+
+    session = repository.session
+    session.expire_all()
+    values = {(row.state, row.action): row.value for row in session.query(QValue)}
+    assert values == {(index_to_state(7), "B"): 9.0, (index_to_state(8), "A"): -1.0}
+    assert session.query(EpisodeLog).count() == 2
+    assert session.get(Run, repository.run_id).episodes_done == 2
+
+
+def test_submit_blocks_while_previous_batch_is_written(repository, monkeypatch) -> None:
+    release = threading.Event()
+    write = QTableRepository.write_batch
+
+    def slow_write(*args, **kwargs):
+        release.wait(5)
+        write(*args, **kwargs)
+
+    monkeypatch.setattr(QTableRepository, "write_batch", staticmethod(slow_write))
+    flusher = AsyncFlusher(repository, max_pending=1)
+    flusher.submit([], 1)
+
+    second = threading.Thread(target=flusher.submit, args=([], 2))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()                   # contre-pression
+    release.set()
+    second.join(5)
+    flusher.close()
+    assert flusher.stalled_seconds > 0.0
+
+
+def test_write_error_is_raised_to_training_thread(repository, monkeypatch) -> None:
+    def failing_write(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(QTableRepository, "write_batch", staticmethod(failing_write))
+    flusher = AsyncFlusher(repository)
+    flusher.submit([], 1)
+    with pytest.raises(RuntimeError):
+        flusher.close()
+
+
+def test_memory_database_is_written_inline() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    run_id = create_run(session, "t", 0.9, 0.1, 1.0, 0.1, "mini")
+    repository = QTableRepository(session, run_id)
+
+    with AsyncFlusher(repository) as flusher:
+        assert not flusher.threaded
+        repository.set_q_index(3, 4, 1.5)
+        flusher.submit([_log(run_id, 1)], 1)
+        assert session.query(QValue).count() == 1
+    assert session.get(Run, run_id).episodes_done == 1
+    session.close()
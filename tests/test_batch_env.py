@@ -0,0 +1,103 @@
+"""
+Tests de games/pixel_kart/batch_env.py et de ai_train.train_batch.
+
+Couvre :
+- L'équivalence tic par tic entre `BatchRace` et N `Race` à un kart
+  rejouant les mêmes actions (position, direction, vitesse, tours, crash).
+- L'égalité exacte des récompenses vectorisées avec `compute_reward`.
+- L'encodage d'état vectorisé (`state_indices`) vs `encode_state_index`.
+- Un entraînement par lot complet : Q-values et episode_log peuplés.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.ai_state import ACTION_CHARS, CHAR_TO_ACTION, encode_state_index
+from games.pixel_kart.ai_train import (
+    compute_reward,
+    compute_rewards_batch,
+    create_run,
+    train_batch,
+)
+from games.pixel_kart.batch_env import BatchRace
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import EpisodeLog, QValue, Run
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import DIRECTION_ORDER, Circuit, Kart, Race
+
+
+def _circuits() -> list[Circuit]:
+    """Circuits de l'éditeur + un mini-circuit avec herbe, murs et bord."""
+    circuits = [Circuit(name=name, raw=raw) for name, raw in map_dao.get_all().items()]
+    circuits.append(Circuit(name="mini", raw="RRGRR,RWFGR,RRRRW"))
+    return circuits
+
+
+@pytest.mark.parametrize("circuit", _circuits(), ids=lambda c: c.name)
+def test_batch_race_matches_sequential_races(circuit: Circuit) -> None:
+    """Mêmes actions => mêmes trajectoires et mêmes récompenses que Race."""
+    nb_karts, nb_turns = 32, 2
+    env = BatchRace(circuit, nb_karts, nb_turns, np.random.default_rng(0))
+    karts = [Kart(f"k{i}") for i in range(nb_karts)]
+    races = []
+    for i, kart in enumerate(karts):
+        races.append(Race(circuit=circuit, karts=[kart], nb_turns=nb_turns))
+        kart.position = (int(env.row[i]), int(env.col[i]))
+
+    rng = random.Random(1)
+    for _ in range(200):
+        actions = np.array([rng.randrange(len(ACTION_CHARS)) for _ in karts])
+        active = np.array([not race.is_finished() for race in races])
+        if not active.any():
+            break
+
+        before = [kart.to_dto() for kart in karts]
+        assert env.state_indices()[active].tolist() == [
+            encode_state_index(kart, circuit) for kart, a in zip(karts, active) if a
+        ]
+        alive_before = env.alive.copy()
+        turns_before = env.turns_done.copy()
+        distance_before = env.distance[env.row, env.col]
+
+        env.step(actions, active)
+        for kart, race, action, is_active in zip(karts, races, actions, active):
+            if is_active:
+                race.play_action(CHAR_TO_ACTION[ACTION_CHARS[action]])
+
+        rewards = compute_rewards_batch(env, alive_before, turns_before, distance_before)
+        for i, kart in enumerate(karts):
+            assert (int(env.row[i]), int(env.col[i])) == kart.position
+            assert DIRECTION_ORDER[env.direction[i]] == kart.direction
+            assert env.speed[i] == kart.speed
+            assert env.turns_done[i] == kart.turns_done
+            assert env.alive[i] == kart.is_alive
+            if active[i]:
+                assert rewards[i] == compute_reward(before[i], kart.to_dto(), circuit)
+
+
+def test_train_batch_populates_q_values_and_logs() -> None:
+    """Un petit entraînement par lot écrit Q-values, logs et episodes_done."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    name = next(iter(map_dao.get_all()))
+    circuit = Circuit(name=name, raw=map_dao.get_all()[name])
+    run_id = create_run(
+        session=session, name="batch", gamma=0.9, alpha=0.1,
+        epsilon_start=0.9, epsilon_end=0.1, circuit_name=name,
+    )
+
+    progress = []
+    train_batch(session, run_id, nb_episodes=40, circuit=circuit, nb_turns=1,
+                batch_size=16, progress_callback=lambda d, t: progress.append((d, t)), seed=0)
+
+    assert session.query(QValue).filter_by(run_id=run_id).count() > 0
+    logs = session.query(EpisodeLog).filter_by(run_id=run_id).all()
+    assert sorted(log.episode_num for log in logs) == list(range(1, 41))
+    assert session.get(Run, run_id).episodes_done == 40
+    assert progress[-1] == (40, 40)
+    session.close()
@@ -0,0 +1,121 @@
+"""
+Tests de l'IA Q-learning de Cubee (games/cubee/player.py + ai_train.py).
+
+Couvre un cycle d'entraînement court de bout en bout sur une base SQLite
+en mémoire : l'IA joue, calcule ses récompenses depuis les instantanés
+GameStateDTO et écrit sa Q-table via le repository.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.cubee.ai_train import train_with_progress
+from games.cubee.dao.base import Base
+from games.cubee.dao.q_table import QTable
+from games.cubee.dao.q_table_repository import ACTIONS, QTableRepo
+from games.cubee.player import AI, Player
+
+
+@pytest.fixture
+def repository():
+    """Repository Q-table branché sur une base SQLite en mémoire."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield QTableRepo(session)
+    session.close()
+
+
+@pytest.mark.parametrize("backend", ["grid", "bitboard"])
+def test_training_against_random_fills_q_table(repository, backend: str) -> None:
+    """Quelques parties contre un joueur aléatoire suffisent à peupler la Q-table."""
+    student = AI("Trainee", gama=0.9, learning_rate=0.1, epsilon=0.5)
+    student.q_table = repository
+    student.init_db()
+
+    wins, losses, draws = train_with_progress(
+        student=student, opponent=Player("Random"), nb_games=10, backend=backend,
+    )
+
+    assert wins + losses + draws == 10
+    assert repository.session.query(QTable).count() > 2
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Repository RAM-first
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def test_repository_writes_behind_and_reloads(repository) -> None:
+    """Les updates restent en RAM jusqu'au commit, puis se rechargent en un SELECT."""
+    repository.update_q_value("0.9", "0.1", 42, "up", 1.5)
+    repository.update_q_value("0.9", "0.1", 42, "left", -0.5)
+    assert repository.get_q_value(0.9, 0.1, 42, "up") == 1.5
+    assert repository.get_q_value(0.9, 0.1, 42, "down") == 0.0
+    assert repository.session.query(QTable).count() == 0
+
+    repository.commit()
+    assert not repository.dirty
+    assert len(repository.session.identity_map) == 0
+
+    fresh = QTableRepo(repository.session)
+    table = fresh.load(0.9, 0.1)
+    assert table == {42: [1.5, None, -0.5, None]}
+    assert fresh.get_by_id(0.9, 0.1, 42) == {"up": 1.5, "down": 0.0, "left": -0.5, "right": 0.0}
+    assert fresh.get_q_value(0.5, 0.1, 42, "up") == 0.0  # autre couple d'hyperparamètres
+
+
+def test_repository_rows(repository) -> None:
+    """get_row / set_row lisent et écrivent les 4 actions d'un état en un accès."""
+    assert repository.get_row(0.9, 0.1, 7) == (0.0, 0.0, 0.0, 0.0)
+
+    repository.update_q_value("0.9", "0.1", 7, "left", 2.0)
+    assert repository.get_row(0.9, 0.1, 7) == (0.0, 0.0, 2.0, 0.0)
+
+    repository.set_row("0.9", "0.1", 8, (1.0, None, -1.0, 0.5))
+    assert repository.get_row(0.9, 0.1, 8) == (1.0, 0.0, -1.0, 0.5)
+    assert repository.get_q_value(0.9, 0.1, 8, "right") == 0.5
+
+    repository.commit()
+    assert QTableRepo(repository.session).load(0.9, 0.1)[8] == [1.0, None, -1.0, 0.5]
+
+
+def _train_and_dump(max_states):
+    """Entraînement court déterministe ; renvoie (repository, lignes en base)."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    repository = QTableRepo(sessionmaker(bind=engine)(), max_states=max_states)
+    random.seed(0)
+    student = AI("Trainee", gama=0.9, learning_rate=0.1, epsilon=0.9)
+    student.q_table = repository
+    student.init_db()
+    train_with_progress(student=student, opponent=Player("Random"), nb_games=30)
+    columns = [QTable.state] + [getattr(QTable, f"action_{a}") for a in ACTIONS]
+    return repository, sorted(tuple(row) for row in repository.session.query(*columns))
+
+
+def test_bounded_cache_spills_to_disk_without_losing_updates() -> None:
+    """Avec un budget, la RAM reste bornée et la Q-table finale est identique."""
+    _, expected = _train_and_dump(None)
+    bounded, rows = _train_and_dump(50)
+
+    assert rows == expected
+    assert all(len(table) <= 50 for table in bounded.tables.values())
+    assert bounded.stats.evictions > 0
+    assert bounded.stats.write_backs > 0
+    assert 0.0 < bounded.stats.hit_rate < 1.0
+
+
+def test_bounded_cache_reloads_evicted_state(repository) -> None:
+    """Un état évincé (dirty) est écrit en base puis relu au besoin."""
+    repository = QTableRepo(repository.session, max_states=10)
+    repository.update_q_value("0.9", "0.1", 0, "up", 3.0)
+    for state in range(1, 40):
+        repository.update_q_value("0.9", "0.1", state, "down", 1.0)
+    assert 0 not in repository.tables[("0.9", "0.1")]
+
+    assert repository.get_row(0.9, 0.1, 0) == (3.0, 0.0, 0.0, 0.0)
+    assert repository.get_by_id(0.9, 0.1, 1000) is None
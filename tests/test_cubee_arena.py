@@ -0,0 +1,103 @@
+"""
+Tests de games/cubee/arena.py.
+
+Couvre :
+- L'estimation Elo (Bradley-Terry) et son intervalle de confiance.
+- Les appariements suisses (pas de revanche évitable, exemption).
+- Un tournoi complet sur un pool de processus : classement écrit dans
+  `arena_result`, reproductible quel que soit le nombre de processus.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.cubee.ai_train import train_with_progress
+from games.cubee.arena import (
+    ELO_BASE, AgentSpec, MatchResult, elo_ratings, run_tournament, saved_agents,
+    swiss_pairings,
+)
+from games.cubee.dao.arena_result import ArenaResult
+from games.cubee.dao.base import Base
+from games.cubee.dao.q_table_repository import QTableRepo
+from games.cubee.player import AI, Player
+
+
+@pytest.fixture
+def session():
+    """Session sur une base SQLite en mémoire, avec une Q-table entraînée."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    student = AI("Trainee", gama=0.9, learning_rate=0.1, epsilon=0.5)
+    student.q_table = QTableRepo(session)
+    student.init_db()
+    train_with_progress(student=student, opponent=Player("Random"), nb_games=20)
+    yield session
+    session.close()
+
+
+def test_elo_orders_agents_and_brackets_estimate() -> None:
+    results = [MatchResult(0, 1, 15, 0, 5), MatchResult(1, 2, 14, 2, 4), MatchResult(2, 0, 3, 0, 17)]
+    elo, low, high = elo_ratings(3, results, nb_bootstrap=100)
+    assert elo[0] > elo[1] > elo[2]
+    assert elo.mean() == pytest.approx(ELO_BASE)
+    assert all(low <= elo) and all(elo <= high)
+
+
+def test_elo_stays_finite_for_unbeaten_agent() -> None:
+    elo, _, _ = elo_ratings(2, [MatchResult(0, 1, 10, 0, 0)], nb_bootstrap=0)
+    assert elo[0] > elo[1]
+    assert elo[0] - elo[1] < 1000
+
+
+def test_swiss_pairings_avoid_rematch_and_rotate_byes() -> None:
+    played = [{1}, {0}, set(), set(), set()]
+    byes: set = set()
+    pairs, bye = swiss_pairings([3, 3, 1, 1, 0], played, byes)
+    assert bye == 4
+    assert (0, 1) not in pairs
+    assert sorted(i for pair in pairs for i in pair) == [0, 1, 2, 3]
+
+    _, bye = swiss_pairings([0, 0, 0, 0, 0], played, byes)
+    assert bye == 3
+
+
+def test_evaluation_mode_does_not_learn(session) -> None:
+    player = AI("Eval", gama=0.9, learning_rate=0.1, training=False)
+    player.q_table = QTableRepo(session)
+    from games.cubee.game_model import BitboardGameModel
+    BitboardGameModel(player, Player("Random"), displayable=False).play()
+    assert not player.q_table.dirty
+
+
+def test_tournament_writes_reproducible_standings(session) -> None:
+    agents = saved_agents(session) + [
+        AgentSpec("Random", kind="random"),
+        AgentSpec("Alpha-Beta", kind="alphabeta", time_budget=10.0, max_depth=2),
+    ]
+    assert agents[0].gama == "0.9"
+
+    standings = run_tournament(session, agents, games_per_match=10, nb_workers=2,
+                               seed=7, nb_bootstrap=50, name="t1")
+    assert {s.agent for s in standings} == {spec.name for spec in agents}
+    assert all(s.games == 20 for s in standings)   # 2 rencontres de 10 parties
+    assert all(s.elo_low <= s.elo <= s.elo_high for s in standings)
+
+    rows = session.query(ArenaResult).filter_by(tournament="t1").all()
+    assert len(rows) == 3
+
+    again = run_tournament(session, agents, games_per_match=10, nb_workers=1,
+                           seed=7, nb_bootstrap=50, name="t2")
+    assert [(s.agent, s.wins, s.draws, s.losses) for s in again] == \
+           [(s.agent, s.wins, s.draws, s.losses) for s in standings]
+
+
+def test_swiss_tournament_plays_requested_rounds(session) -> None:
+    agents = [AgentSpec(f"Random {i}", kind="random") for i in range(4)]
+    progress = []
+    standings = run_tournament(session, agents, fmt="swiss", rounds=2, games_per_match=10,
+                               nb_workers=2, nb_bootstrap=0,
+                               progress_callback=lambda done, total: progress.append((done, total)))
+    assert progress == [(2, 4), (4, 4)]
+    assert sum(s.games for s in standings) == 2 * 2 * 2 * 10
@@ -0,0 +1,202 @@
+"""
+Tests unitaires de games/cubee/game_model.py.
+
+Couvre l'équivalence entre le moteur grille (`GameModel`) et le moteur
+bitboard (`BitboardGameModel`) : sur des parties aléatoires rejouées coup
+par coup, plateau, scores, coups légaux et fin de partie doivent rester
+identiques. La détection d'enclos incrémentale des deux moteurs est
+comparée au BFS complet de `check_enclosure`, et l'annulation de coups
+(`undo` / `redo`) doit retrouver chaque position.
+"""
+
+import dataclasses
+import random
+
+import pytest
+
+from games.cubee.bitboard import ring_runs
+from games.cubee.game_model import BitboardGameModel, GameModel
+from games.cubee.player import Player
+
+
+def _play_side_by_side(size: int, seed: int) -> None:
+    """Joue la même partie aléatoire sur les deux moteurs et compare chaque état."""
+    random.seed(seed)
+    grid = GameModel(Player("a"), Player("b"), size, displayable=False)
+    random.seed(seed)
+    bitboard = BitboardGameModel(Player("a"), Player("b"), size, displayable=False)
+    rng = random.Random(seed)
+
+    while not grid.is_game_over():
+        assert not bitboard.is_game_over()
+        assert grid.legal_move() == bitboard.legal_move()
+        direction = rng.choice(grid.legal_move())
+        assert grid.move(direction) == bitboard.move(direction)
+        assert grid.board == bitboard.board
+        assert grid.get_scores() == bitboard.get_scores()
+        assert grid.player_position == bitboard.player_position
+        assert grid.player_turn == bitboard.player_turn
+
+    assert bitboard.is_game_over()
+    assert grid.get_winner() == bitboard.get_winner()
+
+
+@pytest.mark.parametrize("size", [3, 5, 7, 9])
+def test_bitboard_matches_grid_on_random_games(size: int) -> None:
+    """Le bitboard reproduit exactement les parties du modèle grille."""
+    for seed in range(20):
+        _play_side_by_side(size, seed)
+
+
+def test_bitboard_rejects_opponent_cell_and_border() -> None:
+    """Sortie de plateau et case adverse sont refusées comme dans GameModel."""
+    game = BitboardGameModel(Player("a"), Player("b"), 3, displayable=False)
+    assert not game.is_valid_move(1, "up")
+    assert not game.is_valid_move(1, "left")
+    assert game.is_valid_move(1, "right")
+
+    game.board = [[1, 2, 0],
+                  [0, 0, 0],
+                  [0, 0, 2]]
+    assert not game.is_valid_move(1, "right")
+    assert game.get_scores() == {1: 1, 2: 2}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Instantanés GameStateDTO
+# ──────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("model_class", [GameModel, BitboardGameModel])
+def test_state_dto_is_shared_until_next_move(model_class) -> None:
+    """Le même instantané est renvoyé tant que la position ne change pas."""
+    game = model_class(Player("a"), Player("b"), 5, displayable=False)
+    before = game.get_state_dto()
+    assert game.get_state_dto() is before
+
+    game.move("right")
+    after = game.get_state_dto()
+    assert after is not before
+    assert before.position_player1 == (0, 0)
+    assert after.position_player1 == (0, 1)
+    assert after.turn == 2
+    assert after.scores == (2, 1)
+
+
+def test_state_dto_is_identical_across_backends() -> None:
+    """Grille et bitboard produisent des instantanés égaux (même hash, même clé)."""
+    random.seed(3)
+    grid = GameModel(Player("a"), Player("b"), 5, displayable=False)
+    random.seed(3)
+    bitboard = BitboardGameModel(Player("a"), Player("b"), 5, displayable=False)
+    for direction in ("right", "up", "down", "left", "down", "left"):
+        grid.move(direction)
+        bitboard.move(direction)
+        grid_dto, bitboard_dto = grid.get_state_dto(), bitboard.get_state_dto()
+        assert grid_dto == bitboard_dto
+        assert hash(grid_dto) == hash(bitboard_dto)
+        assert grid_dto.key == bitboard_dto.key
+
+
+def test_state_dto_is_immutable() -> None:
+    """Un instantané ne peut pas être modifié par ses consommateurs."""
+    dto = GameModel(Player("a"), Player("b"), 3, displayable=False).get_state_dto()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        dto.turn = 2
+    assert dto.board == bytes([1, 0, 0, 0, 0, 0, 0, 0, 2])
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Détection d'enclos incrémentale
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class _FullCheckModel(GameModel):
+    """Référence : BFS complet (check_enclosure) après chaque coup."""
+
+    def _enclose_around(self, row: int, column: int) -> int:
+        return 0
+
+    def next_player(self) -> None:
+        self.check_enclosure()
+        super().next_player()
+
+
+def test_ring_runs() -> None:
+    """Groupes de voisins franchissables autour d'une case."""
+    assert ring_runs([True] * 8) == [0]
+    assert ring_runs([False] * 8) == []
+    # Haut et droite reliés par la diagonale haut-droite
+    assert ring_runs([True, True, True, False, False, False, False, False]) == [0]
+    # Haut et bas séparés : la case coupe peut-être le plateau
+    assert sorted(ring_runs([True, False, False, False, True, False, False, False])) == [0, 4]
+    # Une diagonale seule n'est pas voisine de la case
+    assert ring_runs([False, True, False, False, False, False, False, False]) == []
+
+
+@pytest.mark.parametrize("size,nb_games", [(3, 20), (5, 20), (9, 10), (15, 2)])
+def test_incremental_enclosure_matches_full_bfs(size: int, nb_games: int) -> None:
+    """Les deux moteurs capturent exactement comme le BFS complet."""
+    for seed in range(nb_games):
+        models = []
+        for model_class in (_FullCheckModel, GameModel, BitboardGameModel):
+            random.seed(seed)
+            models.append(model_class(Player("a"), Player("b"), size, displayable=False))
+        reference = models[0]
+        rng = random.Random(seed)
+
+        while not reference.is_game_over():
+            direction = rng.choice(reference.legal_move())
+            for model in models:
+                assert model.move(direction)
+            for model in models[1:]:
+                assert model.board == reference.board
+                assert model.get_scores() == reference.get_scores()
+        assert all(model.is_game_over() for model in models)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Annulation / rétablissement
+# ──────────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("model_class", [GameModel, BitboardGameModel])
+def test_undo_redo_walks_the_whole_game(model_class) -> None:
+    """undo() remonte chaque position, redo() rejoue jusqu'à la fin."""
+    random.seed(4)
+    game = model_class(Player("a"), Player("b"), 6, displayable=False)
+    rng = random.Random(4)
+    positions = []
+
+    def position():
+        return game.board, dict(game.player_position), game.player_turn, game.get_scores()
+
+    while not game.is_game_over():
+        positions.append(position())
+        scores_before = game.get_scores()
+        player = game.player_turn
+        assert game.move(rng.choice(game.legal_move()))
+        # Le delta porte exactement les cases gagnées par le coup
+        gained = game.get_scores()[player] - scores_before[player]
+        assert game.history[-1].gained.bit_count() == gained
+    final = position()
+
+    for expected in reversed(positions):
+        assert game.undo()
+        assert position() == expected
+    assert not game.undo()
+
+    while game.redo():
+        pass
+    assert position() == final
+
+
+@pytest.mark.parametrize("model_class", [GameModel, BitboardGameModel])
+def test_new_move_discards_redo(model_class) -> None:
+    game = model_class(Player("a"), Player("b"), 4, displayable=False)
+    game.move("right")
+    game.move("up")
+    assert game.undo()
+    assert game.move("left")
+    assert not game.redo()
+    assert len(game.history) == 2
@@ -0,0 +1,85 @@
+"""
+Tests de games/cubee/parallel_train.py.
+
+Couvre :
+- La fusion des lignes renvoyées par les workers : actions jamais écrites
+  (None) conservées, écarts mesurés depuis 0.0, modes "mean" et "sum".
+- Un entraînement parallèle complet sur 2 processus : Q-table écrite en
+  base par le maître, statistiques de parties cumulées.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.cubee.dao.base import Base
+from games.cubee.dao.q_table import QTable
+from games.cubee.dao.q_table_repository import QTableRepo
+from games.cubee.parallel_train import merge_rows, train_parallel
+from games.cubee.state_key import WIN_KEY
+
+
+@pytest.fixture
+def repository():
+    """Repository Q-table branché sur une base SQLite en mémoire."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield QTableRepo(session)
+    session.close()
+
+
+def test_merge_keeps_unwritten_actions_of_new_state_as_none() -> None:
+    """Un état découvert par un seul worker ne reçoit que ses actions écrites."""
+    results = [{5: [None, 2.0, None, None]}, {}]
+    for merge in ("mean", "sum"):
+        assert merge_rows({}, results, merge) == {5: [None, 2.0, None, None]}
+
+
+def test_merge_measures_gaps_from_zero_for_never_written_values() -> None:
+    table = {1: [None, 1.0, 1.0, 1.0]}
+    results = [{1: [2.0, 1.0, 1.0, 1.0]}, {1: [4.0, 1.0, 1.0, 1.0]}]
+    assert merge_rows(table, results, "mean")[1] == [3.0, 1.0, 1.0, 1.0]
+    assert merge_rows(table, results, "sum")[1] == [6.0, 1.0, 1.0, 1.0]
+
+
+def test_merge_mean_ignores_workers_that_left_an_action_unchanged() -> None:
+    table = {1: [1.0, 1.0, None, 1.0]}
+    results = [
+        {1: [3.0, 1.0, None, 1.0]},   # action 0 seulement
+        {1: [1.0, 0.0, None, 1.0]},   # action 1 seulement
+    ]
+    assert merge_rows(table, results, "mean")[1] == [3.0, 0.0, None, 1.0]
+    assert table[1] == [1.0, 1.0, None, 1.0]   # lignes du maître intactes
+
+
+def test_merge_skips_unchanged_rows() -> None:
+    table = {1: [1.0, None, 0.0, 0.0]}
+    assert merge_rows(table, [{1: [1.0, None, 0.0, 0.0]}]) == {}
+
+
+def test_unknown_merge_mode_is_rejected_before_starting_workers(repository) -> None:
+    with pytest.raises(ValueError):
+        merge_rows({}, [], "max")
+    with pytest.raises(ValueError):
+        train_parallel(repository, nb_games=10, gamma=0.9, alpha=0.1, epsilon=0.5,
+                       nb_workers=1, merge="max")
+
+
+def test_parallel_training_writes_merged_q_table(repository) -> None:
+    wins, losses, draws = train_parallel(
+        repository, nb_games=40, gamma=0.9, alpha=0.1, epsilon=0.5,
+        nb_workers=2, round_games=10, seed=0,
+    )
+    assert wins + losses + draws == 40
+
+    rows = repository.session.query(QTable).filter_by(gama="0.9", learning_rate="0.1").all()
+    assert len(rows) > 2
+    assert any(row.state == WIN_KEY for row in rows)
+    assert not repository.dirty
+
+
+def test_parallel_training_requires_unbounded_repository(repository) -> None:
+    bounded = QTableRepo(repository.session, max_states=100)
+    with pytest.raises(ValueError):
+        train_parallel(bounded, nb_games=10, gamma=0.9, alpha=0.1, epsilon=0.5, nb_workers=1)
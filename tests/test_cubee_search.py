@@ -0,0 +1,106 @@
+"""
+Tests de games/cubee/search.py et de l'annulation de coups du bitboard.
+
+Couvre :
+- `BitboardGameModel.undo` : retour exact à l'état précédent.
+- Le hachage de Zobrist incrémental, égal au hachage complet.
+- Les joueurs alpha-beta et MCTS : budget de temps respecté, coup légal,
+  partie réelle non modifiée pendant la réflexion, victoire contre le
+  joueur aléatoire.
+"""
+
+import random
+import time
+
+import pytest
+
+from games.cubee.game_model import BitboardGameModel, GameModel
+from games.cubee.player import Player
+from games.cubee.search import AlphaBetaPlayer, AlphaBetaSearch, MCTSPlayer, Zobrist
+
+
+def _state(model: BitboardGameModel) -> tuple:
+    """Tout ce que `undo` doit restaurer."""
+    return (
+        dict(model.masks), model.empty, dict(model.scores), bytes(model.cells),
+        dict(model.player_position), model.player_turn,
+    )
+
+
+def _random_game(size: int, seed: int) -> BitboardGameModel:
+    random.seed(seed)
+    return BitboardGameModel(Player("a"), Player("b"), size, displayable=False)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_undo_restores_every_position(seed: int) -> None:
+    model = _random_game(5, seed)
+    rng = random.Random(seed)
+    states = []
+    while not model.is_game_over():
+        states.append(_state(model))
+        assert model.move(rng.choice(model.legal_move()))
+    while states:
+        assert model.undo()
+        assert _state(model) == states.pop()
+    assert not model.undo()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_zobrist_incremental_matches_full_hash(seed: int) -> None:
+    model = _random_game(6, seed)
+    zobrist = Zobrist(6)
+    rng = random.Random(seed)
+    hashes = [zobrist.hash(model)]
+    while not model.is_game_over():
+        model.move(rng.choice(model.legal_move()))
+        hashes.append(zobrist.after_move(hashes[-1], model))
+        assert hashes[-1] == zobrist.hash(model)
+    assert len(set(hashes)) > 1
+
+
+def test_alpha_beta_respects_budget_on_7x7() -> None:
+    model = _random_game(7, 0)
+    rng = random.Random(0)
+    for _ in range(6):
+        model.move(rng.choice(model.legal_move()))
+    before = _state(model)
+
+    search = AlphaBetaSearch(7)
+    start = time.perf_counter()
+    move = search.best_move(model, 0.1)
+    assert time.perf_counter() - start < 0.2
+    assert move in model.legal_move()
+    assert search.depth_reached >= 2
+    assert _state(model) == before
+
+
+@pytest.mark.parametrize("player_class", [AlphaBetaPlayer, MCTSPlayer])
+def test_search_player_leaves_game_untouched_until_its_move(player_class) -> None:
+    """Sur le modèle grille, seul le coup choisi est joué."""
+    random.seed(1)
+    game = GameModel(Player("a"), Player("b"), 5, displayable=False)
+    player = player_class("search", time_budget=0.02, game=game)
+    board = [row[:] for row in game.board]
+
+    assert player.play()
+    assert game.player_turn == 2
+    changed = [
+        (row, col) for row in range(5) for col in range(5)
+        if game.board[row][col] != board[row][col]
+    ]
+    assert game.player_position[1] in changed
+
+
+@pytest.mark.parametrize("player_class", [AlphaBetaPlayer, MCTSPlayer])
+def test_search_player_beats_random(player_class) -> None:
+    random.seed(2)
+    searcher = player_class("search", time_budget=0.01)
+    opponent = Player("random")
+    wins = 0
+    for _ in range(3):
+        game = BitboardGameModel(searcher, opponent, 5, displayable=False)
+        game.play()
+        winner = game.get_winner()
+        wins += winner is not None and game.players[winner] is searcher
+    assert wins == 3
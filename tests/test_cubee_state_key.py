@@ -0,0 +1,121 @@
+"""
+Tests de games/cubee/state_key.py et de la migration de cubee.db.
+
+Couvre :
+- L'aller-retour encode_key / decode_key et la sérialisation BLOB.
+- La conversion des anciennes clés texte (dont "win" / "lose").
+- La migration d'une base à l'ancien schéma vers les clés compactes.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.cubee.dao.base import Base
+from games.cubee.dao.migration import migrate, migrate_state_keys
+from games.cubee.dao.q_table import QTable
+from games.cubee.game_model import BitboardGameModel
+from games.cubee.player import Player
+from games.cubee.state_key import (
+    LOSE_KEY,
+    WIN_KEY,
+    decode_key,
+    key_from_bytes,
+    key_to_bytes,
+    parse_legacy_key,
+)
+
+
+def _legacy_key(dto) -> str:
+    """Reproduit l'ancienne clé texte de AI._encode_state."""
+    board_flat = "".join(str(cell) for cell in dto.board)
+    return (
+        f"{dto.turn}_{dto.position_player2}_{dto.position_player1}"
+        f"_{dto.scores[0]}_{dto.scores[1]}_{board_flat}"
+    )
+
+
+def _random_states(size: int, count: int, seed: int = 0):
+    """Instantanés rencontrés pendant quelques parties aléatoires."""
+    rng = random.Random(seed)
+    game = BitboardGameModel(Player("a"), Player("b"), size, displayable=False)
+    states = []
+    while len(states) < count:
+        if game.is_game_over():
+            game.reset()
+        states.append(game.get_state_dto())
+        game.move(rng.choice(game.legal_move()))
+    return states
+
+
+@pytest.mark.parametrize("size", [3, 5, 9])
+def test_key_roundtrip(size: int) -> None:
+    """decode_key(encode_key(état)) redonne l'état, BLOB compris."""
+    for dto in _random_states(size, 50):
+        key = dto.key
+        assert key_from_bytes(key_to_bytes(key)) == key
+        assert decode_key(key) == (
+            size, dto.board, dto.position_player1, dto.position_player2, dto.turn,
+        )
+
+
+def test_keys_are_unique_and_compact() -> None:
+    """Deux états différents n'ont jamais la même clé ; 8 octets suffisent en 5x5."""
+    states = set(_random_states(5, 500))
+    assert len({dto.key for dto in states}) == len(states)
+    assert max(len(key_to_bytes(dto.key)) for dto in states) <= 8
+
+
+def test_parse_legacy_key() -> None:
+    """Les anciennes clés texte se convertissent vers la clé compacte."""
+    for dto in _random_states(5, 30):
+        assert parse_legacy_key(_legacy_key(dto)) == dto.key
+    assert parse_legacy_key("win") == WIN_KEY
+    assert parse_legacy_key("lose") == LOSE_KEY
+    assert parse_legacy_key("garbage") is None
+
+
+def test_migrate_legacy_database(tmp_path) -> None:
+    """Une base à clés texte est réécrite avec des clés compactes."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cubee.db'}")
+    states = _random_states(5, 20)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE q_table (gama VARCHAR(10), learning_rate VARCHAR(10), "
+            "state VARCHAR(1000), action_up FLOAT, action_down FLOAT, "
+            "action_right FLOAT, action_left FLOAT, "
+            "PRIMARY KEY (gama, learning_rate, state))"
+        )
+        connection.exec_driver_sql("CREATE INDEX ix_q_table_state ON q_table (state)")
+        legacy_rows = [("0.9", "0.1", "win", 10, 10, 10, 10)]
+        legacy_rows += [("0.9", "0.1", _legacy_key(dto), i, -i, 0.5, None)
+                        for i, dto in enumerate(states)]
+        connection.exec_driver_sql(
+            "INSERT OR REPLACE INTO q_table (gama, learning_rate, state, action_up, "
+            "action_down, action_right, action_left) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            legacy_rows,
+        )
+
+    converted = migrate_state_keys(engine)
+    assert converted == len({dto.key for dto in states}) + 1
+    assert migrate_state_keys(engine) == 0  # idempotent
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    assert session.get(QTable, ("0.9", "0.1", WIN_KEY)).action_up == 10
+    last = states[-1]
+    row = session.get(QTable, ("0.9", "0.1", last.key))
+    assert row.action_right == 0.5
+    session.close()
+
+
+def test_migrate_records_schema_version(tmp_path) -> None:
+    """`migrate` applique les étapes une seule fois grâce à PRAGMA user_version."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cubee.db'}")
+    migrate(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA user_version").scalar() == 2
+    migrate(engine)  # sans effet sur une base à jour
@@ -0,0 +1,121 @@
+"""
+Tests de games/cubee/symmetry.py.
+
+Couvre :
+- Les tables de directions (bijections, aller-retour).
+- L'invariance de la clé canonique sur les 8 orientations d'un état.
+- La cohérence avec les règles : jouer un coup puis transformer donne le
+  même état canonique que transformer puis jouer le coup transformé.
+- Le repli d'une Q-table existante par QTableRepo.canonicalize.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.cubee.dao.base import Base
+from games.cubee.dao.q_table import QTable
+from games.cubee.dao.q_table_repository import QTableRepo
+from games.cubee.game_model import GameModel
+from games.cubee.player import Player
+from games.cubee.symmetry import _TRANSFORMS, from_canonical, to_canonical
+
+DIRECTIONS = list(GameModel.DIRECTIONS)
+
+
+def _random_positions(size: int, count: int, seed: int = 0):
+    """(partie, instantané) rencontrés pendant des parties aléatoires."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = GameModel(Player("a"), Player("b"), size, displayable=False)
+        for _ in range(rng.randrange(1, size * size)):
+            if game.is_game_over():
+                break
+            game.move(rng.choice(game.legal_move()))
+        if not game.is_game_over():
+            positions.append(game.get_state_dto())
+    return positions
+
+
+def _transformed_game(dto, transform: int) -> GameModel:
+    """Partie (modèle grille) placée dans l'image de `dto` par `transform`."""
+    size, n = dto.size, dto.size - 1
+    apply = _TRANSFORMS[transform]
+    game = GameModel(Player("a"), Player("b"), size, displayable=False)
+    board = [[0] * size for _ in range(size)]
+    for row in range(size):
+        for col in range(size):
+            new_row, new_col = apply(row, col, n)
+            board[new_row][new_col] = dto.board[row * size + col]
+    game.board = board
+    game.player_position = {
+        1: apply(*dto.position_player1, n),
+        2: apply(*dto.position_player2, n),
+    }
+    game.player_turn = dto.turn
+    return game
+
+
+@pytest.mark.parametrize("transform", range(8))
+def test_direction_maps_are_bijections(transform: int) -> None:
+    """Chaque transformation permute les 4 directions et s'inverse."""
+    images = {to_canonical(transform, d) for d in DIRECTIONS}
+    assert images == set(DIRECTIONS)
+    for direction in DIRECTIONS:
+        assert from_canonical(transform, to_canonical(transform, direction)) == direction
+
+
+@pytest.mark.parametrize("size", [3, 5, 6])
+def test_canonical_key_is_orientation_invariant(size: int) -> None:
+    """Les 8 orientations d'un état partagent la même clé canonique."""
+    for dto in _random_positions(size, 20):
+        keys = {
+            _transformed_game(dto, t).get_state_dto().canonical[0]
+            for t in range(8)
+        }
+        assert keys == {dto.canonical[0]}
+
+
+def test_moves_commute_with_symmetries() -> None:
+    """Jouer `a` puis transformer == transformer puis jouer l'image de `a`."""
+    for dto in _random_positions(5, 15, seed=1):
+        for transform in range(8):
+            for direction in DIRECTIONS:
+                original = _transformed_game(dto, 0)
+                image = _transformed_game(dto, transform)
+                played = original.move(direction)
+                assert image.move(to_canonical(transform, direction)) == played
+                assert (original.get_state_dto().canonical[0]
+                        == image.get_state_dto().canonical[0])
+
+
+def test_repository_folds_symmetric_rows() -> None:
+    """canonicalize fusionne les orientations d'un état en une seule ligne."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = QTableRepo(session)
+
+    dto = _random_positions(5, 1, seed=2)[0]
+    canonical, to_image = dto.canonical
+    # Deux orientations distinctes du même état, valeurs sur "up" réel
+    other = next(
+        t for t in range(1, 8)
+        if _transformed_game(dto, t).get_state_dto().key != dto.key
+    )
+    other_dto = _transformed_game(dto, other).get_state_dto()
+    rows = [(dto, "up", 1.0), (other_dto, to_canonical(other, "up"), 3.0)]
+    for state, action, value in rows:
+        repo.update_q_value("0.9", "0.1", state.key, action, value)
+    repo.commit()
+
+    folded = repo.canonicalize()
+    assert folded == sum(state.key != canonical for state, _, _ in rows)
+    assert session.query(QTable).count() == 1
+    row = session.get(QTable, ("0.9", "0.1", canonical))
+    assert getattr(row, f"action_{to_canonical(to_image, 'up')}") == 2.0
+    assert repo.canonicalize() == 0
+    session.close()
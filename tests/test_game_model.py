@@ -201,3 +201,25 @@ def test_distance_map_empty_when_no_finish() -> None:
     """Sans ligne d'arrivée, pas de heat-map calculable."""
     circuit = Circuit("t", "RRR")
     assert circuit.distance_map == {}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Capteurs précalculés (Circuit._compute_sensor_map)
+# ──────────────────────────────────────────────────────────────────────────
+
+
+def test_sensor_map_covers_every_cell_and_heading() -> None:
+    circuit = Circuit("t", "RRRRR,RGWRF,RRRRR")
+    assert len(circuit.sensor_map) == circuit.rows * circuit.cols
+    assert all(len(headings) == 4 for headings in circuit.sensor_map.values())
+
+
+def test_sensor_map_is_relative_to_heading() -> None:
+    """Les distances sont lues devant / gauche / droite / derrière selon le cap."""
+    circuit = Circuit("t", "RRRRR,RGWRF,RRRRR")
+    # (devant, gauche, droite, derrière, herbe)
+    assert circuit.sensor_map[(1, 0)]["EAST"] == (0, 1, 1, 0, 0)
+    assert circuit.sensor_map[(1, 0)]["NORTH"] == (1, 0, 0, 1, 0)
+    assert circuit.sensor_map[(0, 0)]["EAST"] == (3, 0, 2, 0, 0)
+    assert circuit.sensor_map[(1, 1)]["WEST"][4] == 1  # case d'herbe
+    assert circuit.sensor_map[(1, 3)]["EAST"][0] == 1  # F compte comme route
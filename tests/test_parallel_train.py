@@ -0,0 +1,72 @@
+"""
+Tests de games/pixel_kart/parallel_train.py.
+
+Couvre :
+- La fusion des deltas de Q-values ("mean" et "sum").
+- Un entraînement parallèle complet sur 2 processus : Q-values, logs
+  d'épisodes et compteur `episodes_done` écrits par le maître.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.ai_train import create_run
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import EpisodeLog, QValue, Run
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import Circuit
+from games.pixel_kart.parallel_train import merge_deltas, train_parallel
+
+
+def _worker_result(values: dict) -> tuple[np.ndarray, np.ndarray]:
+    """(delta, touched) d'un worker ayant modifié les cases de `values`."""
+    delta = np.zeros((3, 2))
+    touched = np.zeros((3, 2), dtype=bool)
+    for key, value in values.items():
+        delta[key] = value
+        touched[key] = True
+    return delta, touched
+
+
+def test_merge_mean_averages_only_over_workers_that_touched() -> None:
+    values = np.ones((3, 2))
+    results = [_worker_result({(0, 0): 2.0, (1, 1): 4.0}), _worker_result({(0, 0): 4.0})]
+    touched = merge_deltas(values, results, "mean")
+    assert values[0, 0] == 4.0   # 1 + (2 + 4) / 2
+    assert values[1, 1] == 5.0   # 1 + 4 / 1
+    assert values[2, 0] == 1.0
+    assert touched.sum() == 2
+
+
+def test_merge_sum_adds_deltas() -> None:
+    values = np.zeros((3, 2))
+    merge_deltas(values, [_worker_result({(0, 0): 2.0}), _worker_result({(0, 0): 4.0})], "sum")
+    assert values[0, 0] == 6.0
+    with pytest.raises(ValueError):
+        merge_deltas(values, [], "median")
+
+
+def test_train_parallel_writes_run_once(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'pk.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    name = next(iter(map_dao.get_all()))
+    circuit = Circuit(name=name, raw=map_dao.get_all()[name])
+    run_id = create_run(
+        session=session, name="parallel", gamma=0.9, alpha=0.1,
+        epsilon_start=0.9, epsilon_end=0.1, circuit_name=name,
+    )
+
+    progress = []
+    train_parallel(session, run_id, nb_episodes=30, circuit=circuit, nb_turns=1,
+                   nb_workers=2, round_episodes=5,
+                   progress_callback=lambda d, t: progress.append(d), seed=0)
+
+    assert progress == [10, 20, 30]
+    assert session.query(QValue).filter_by(run_id=run_id).count() > 0
+    logs = session.query(EpisodeLog).filter_by(run_id=run_id).all()
+    assert sorted(log.episode_num for log in logs) == list(range(1, 31))
+    assert session.get(Run, run_id).episodes_done == 30
+    session.close()
@@ -8,7 +8,7 @@ Couvre les scénarios principaux de la phase 5 :
 - Les modes "Solo" et "vs Human" produisent les bons karts (1 humain
   pour Solo, 2 humains pour vs Human).
 - Un cycle d'entraînement complet (petit) populate Q-values + episode_log
-  et le mode "vs AI" exploite ensuite la Q-table apprise.
+  et le mode "vs AI" joue ensuite la politique compilée du run.
 
 Les tests utilisent une base SQLite temporaire pour ne pas polluer la
 vraie `pixelkart.db` du projet.
@@ -23,9 +23,11 @@ import pytest
 from games.pixel_kart import main as pk_main
 from games.pixel_kart.ai_train import create_run, train
 from games.pixel_kart.dao.q_table import EpisodeLog, QValue, Run
+from games.pixel_kart.dao.q_table_repository import QTableRepository
 from games.pixel_kart.editor import map_dao
 from games.pixel_kart.game_model import Circuit
-from games.pixel_kart.player import Human, QLearningAI, RandomAI
+from games.pixel_kart.player import GreedyPolicyAI, Human, QLearningAI, RandomAI
+from games.pixel_kart.policy import compile_policy, decode_policy
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -241,8 +243,8 @@ def test_vs_ai_after_training_exploits_q_table(
     app: Any, basic_circuit: Circuit
 ) -> None:
     """
-    Après un entraînement réel, le mode "vs AI" charge bien la Q-table
-    apprise (cache RAM non vide).
+    Après un entraînement réel, le mode "vs AI" joue la politique compilée
+    en fin d'entraînement, identique à la Q-table apprise.
     """
     run_id = create_run(
         session=app.session,
@@ -262,8 +264,7 @@ def test_vs_ai_after_training_exploits_q_table(
     )
 
     opponent = app._build_ai_opponent("Randy")
-    assert isinstance(opponent, QLearningAI)
-    # Le repository a chargé en RAM les Q-values du run
-    assert len(opponent.repository.q_values) > 0
-    # On exploite, on n'apprend plus
-    assert opponent.training is False
+    assert isinstance(opponent, GreedyPolicyAI)
+    # La politique chargée est celle des Q-values apprises
+    values = QTableRepository(app.session, run_id=run_id).values
+    assert opponent.policy == decode_policy(compile_policy(values))
@@ -0,0 +1,118 @@
+"""
+Tests de games/pixel_kart/planner.py.
+
+Couvre :
+- La résolution du MDP : valeur optimale = retour actualisé de la
+  politique optimale jouée depuis le départ (équation de Bellman).
+- La course la plus rapide (`fastest_finish`), y compris sans arrivée
+  possible.
+- Le run de référence : Run + Q-values projetées en base, puis score de
+  sa politique greedy identique à `score_policy`.
+- Le warm-start d'un repository.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.ai_train import compile_rewards
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import QValue, Run
+from games.pixel_kart.dao.q_table_repository import QTableRepository
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import Circuit
+from games.pixel_kart.planner import (
+    MIN_TURNS,
+    fastest_finish,
+    greedy_policy,
+    observation_values,
+    save_reference_run,
+    score_policy,
+    score_run,
+    solve,
+    warm_start,
+)
+from games.pixel_kart.transition_table import NB_ACTIONS, compile_circuit
+
+
+# Ligne d'arrivée décalée : depuis (1, 1), un pas vers l'est valide un tour
+_SHIFTED_FINISH = "RRFRRR,RFRRRR,RRRRRR"
+
+
+@pytest.fixture
+def session():
+    """Session sur une base SQLite en mémoire."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_optimal_value_matches_discounted_rollout() -> None:
+    circuit = Circuit(name="shifted", raw=_SHIFTED_FINISH)
+    plan = solve(circuit, nb_turns=1, gamma=0.9)
+    assert plan.converged
+
+    table = plan.table
+    rewards = compile_rewards(circuit)
+    column_of = {config: column for column, config in enumerate(plan.configs.tolist())}
+    start = table.config_of((1, 1), "EAST", 0)
+
+    # Rejouer la politique optimale (niveau 0 tour) et actualiser ses récompenses
+    config, discounted, discount = start, 0.0, 1.0
+    for _ in range(100):
+        transition = config * NB_ACTIONS + int(plan.policy[-MIN_TURNS, column_of[config]])
+        lap = int(table.lap_delta[transition])
+        if table.crashed[transition]:
+            discounted += discount * -200.0
+            break
+        discounted += discount * (rewards[transition] + (400.0 if lap > 0 else -30.0 if lap < 0 else 0.0))
+        if lap:
+            break   # tour validé (fin de course) ; pas de recul sur la politique optimale
+        discount *= 0.9
+        config = int(table.next_config[transition])
+
+    assert discounted == pytest.approx(plan.q[-MIN_TURNS, column_of[start]].max(), abs=1e-4)
+    scores = {score.start: score for score in plan.rollouts}
+    assert scores[(1, 1)].finished and scores[(1, 1)].lap_ticks == (1,)
+    assert plan.fastest[table.start_configs(circuit).index(start)] == 1
+
+
+def test_fastest_finish_is_none_when_no_lap_can_count() -> None:
+    """Petit : le retour vers la ligne repasse la colonne à contresens."""
+    circuit = Circuit(name="Petit", raw=map_dao.get_all()["Petit"])
+    table = compile_circuit(circuit)
+    assert fastest_finish(table, table.start_configs(circuit)[0], 1) is None
+
+
+def test_reference_run_is_saved_and_scored(session) -> None:
+    circuit = Circuit(name="shifted", raw=_SHIFTED_FINISH)
+    plan = solve(circuit, nb_turns=1, gamma=0.9)
+
+    run_id = save_reference_run(session, circuit, plan)
+    run = session.get(Run, run_id)
+    assert run.alpha == 0.0 and run.gamma == 0.9
+    assert "γ=0.9" in run.notes
+
+    values, known = observation_values(plan)
+    assert session.query(QValue).filter_by(run_id=run_id).count() == int(known.sum())
+    expected = score_policy(circuit, greedy_policy(values), nb_turns=1)
+    assert score_run(session, run_id, circuit, nb_turns=1) == expected
+
+
+def test_warm_start_copies_projected_values(session) -> None:
+    circuit = Circuit(name="shifted", raw=_SHIFTED_FINISH)
+    plan = solve(circuit, nb_turns=1, gamma=0.9)
+    values, known = observation_values(plan)
+    repository = QTableRepository.detached(np.zeros_like(values), np.zeros_like(known))
+    warm_start(repository, plan)
+    assert np.array_equal(repository.known, known)
+    assert np.array_equal(repository.values[known], values[known])
+    assert len(repository.dirty) == int(known.sum())
+
+
+def test_solve_rejects_undiscounted_problem() -> None:
+    with pytest.raises(ValueError):
+        solve(Circuit(name="shifted", raw=_SHIFTED_FINISH), nb_turns=1, gamma=1.0)
@@ -0,0 +1,101 @@
+"""
+Tests de games/pixel_kart/policy.py, de GreedyPolicyAI et de la politique
+enregistrée avec un run.
+
+Couvre :
+- La compilation (action unique / masque des ex aequo) et son décodage.
+- L'équivalence des choix de GreedyPolicyAI avec ceux d'un QLearningAI en
+  exploitation pure, tirages des ex aequo compris.
+- L'écriture de la politique en fin d'entraînement et son invalidation
+  quand le run est repris.
+- L'appel `choose_action(race)` du GameController sur les karts IA.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.ai_state import NB_STATES
+from games.pixel_kart.ai_train import create_run, train
+from games.pixel_kart.dao.base import Base
+from games.pixel_kart.dao.q_table import Run
+from games.pixel_kart.dao.q_table_repository import QTableRepository
+from games.pixel_kart.game_model import Circuit, Race
+from games.pixel_kart.player import GreedyPolicyAI, QLearningAI
+from games.pixel_kart.policy import TIE_FLAG, compile_policy, decode_policy
+
+
+_CIRCUIT_RAW = "RRGRR,RWFGR,RRRRW"
+
+
+@pytest.fixture
+def session():
+    """Session sur une base SQLite en mémoire."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _values_with_ties() -> np.ndarray:
+    """Q-table aléatoire, arrondie pour produire des ex aequo."""
+    values = np.round(np.random.default_rng(0).normal(size=(NB_STATES, 5)), 1)
+    values[:10] = 0.0   # états jamais visités
+    return values
+
+
+def test_compile_encodes_best_column_or_tie_mask() -> None:
+    values = np.zeros((NB_STATES, 5))
+    values[1] = [0.0, 3.0, 1.0, 0.0, 0.0]
+    values[2] = [2.0, 0.0, 2.0, 0.0, -1.0]
+    policy = compile_policy(values)
+
+    assert len(policy) == NB_STATES
+    assert policy[1] == 1
+    assert policy[2] == TIE_FLAG | 0b00101
+    assert policy[0] == TIE_FLAG | 0b11111
+    assert decode_policy(policy)[:3] == [(0, 1, 2, 3, 4), 1, (0, 2)]
+    with pytest.raises(ValueError):
+        decode_policy(policy[:-1])
+
+
+def test_greedy_policy_ai_plays_like_exploiting_q_learning_ai() -> None:
+    values = _values_with_ties()
+    known = np.ones_like(values, dtype=bool)
+    learner = QLearningAI("Q", QTableRepository.detached(values, known), training=False)
+    player = GreedyPolicyAI("P", compile_policy(values))
+
+    states = list(range(NB_STATES)) * 3
+    random.seed(4)
+    expected = [learner.choose_action_index(state) for state in states]
+    random.seed(4)
+    assert [player.choose_action_index(state) for state in states] == expected
+
+
+def test_training_saves_policy_until_run_is_resumed(session) -> None:
+    circuit = Circuit(name="mini", raw=_CIRCUIT_RAW)
+    run_id = create_run(session, "t", 0.9, 0.1, 1.0, 0.1, circuit.name)
+    train(session, run_id, nb_episodes=5, circuit=circuit, nb_turns=1)
+
+    run = session.get(Run, run_id)
+    policy = QTableRepository.load_policy(session, run)
+    assert policy == compile_policy(QTableRepository(session, run_id).values)
+
+    QTableRepository(session, run_id).update_episodes_done(run.episodes_done + 1)
+    assert QTableRepository.load_policy(session, run) is None
+
+
+def test_ai_karts_choose_from_race(session) -> None:
+    """Le GameController appelle `kart.choose_action(race)` sur chaque IA."""
+    circuit = Circuit(name="mini", raw=_CIRCUIT_RAW)
+    run_id = create_run(session, "t", 0.9, 0.1, 0.0, 0.0, circuit.name)
+    learner = QLearningAI("Q", QTableRepository(session, run_id), training=False)
+    player = GreedyPolicyAI("P", compile_policy(learner.repository.values))
+    race = Race(circuit=circuit, karts=[learner, player], nb_turns=1)
+
+    for kart in (learner, player):
+        assert kart.choose_action(race) in Race.ACTIONS
@@ -0,0 +1,65 @@
+"""
+Tests de games/pixel_kart/sweep.py.
+
+Couvre :
+- La génération des combinaisons (grille et tirage aléatoire).
+- Un balayage complet sur 2 processus écrivant dans un même fichier
+  SQLite (WAL), puis la requête de synthèse.
+"""
+
+from sqlalchemy.orm import sessionmaker
+
+from games.pixel_kart.dao.q_table import EpisodeLog, Run
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.sweep import (
+    grid_configs,
+    open_engine,
+    random_configs,
+    run_sweep,
+    summarize_sweep,
+)
+
+
+def test_grid_and_random_configs() -> None:
+    grid = grid_configs([0.9, 0.99], [0.1], [0.9], [0.05, 0.1], ["A", "B"])
+    assert len(grid) == 8
+    assert len(set(grid)) == 8
+
+    configs = random_configs(
+        20, (0.8, 0.99), (0.01, 0.5), (0.5, 1.0), (0.0, 0.9), ["A", "B"], seed=3
+    )
+    assert configs == random_configs(
+        20, (0.8, 0.99), (0.01, 0.5), (0.5, 1.0), (0.0, 0.9), ["A", "B"], seed=3
+    )
+    for config in configs:
+        assert 0.8 <= config.gamma <= 0.99
+        assert config.epsilon_end <= config.epsilon_start
+        assert config.circuit_name in ("A", "B")
+
+
+def test_sweep_trains_runs_in_parallel_and_summarizes(tmp_path) -> None:
+    """Chaque worker entraîne son run sur sa propre connexion à la base."""
+    db_path = str(tmp_path / "sweep.db")
+    circuit = next(iter(map_dao.get_all()))
+    configs = grid_configs([0.9, 0.99], [0.1], [0.9], [0.1], [circuit])
+
+    progress = []
+    run_ids = run_sweep(
+        db_path, configs, nb_episodes=20, nb_turns=1, nb_workers=2, batch_size=8,
+        name_prefix="test", progress_callback=lambda d, t: progress.append((d, t)), seed=0,
+    )
+
+    assert progress[-1] == (2, 2)
+    session = sessionmaker(bind=open_engine(db_path))()
+    for run_id in run_ids:
+        assert session.get(Run, run_id).episodes_done == 20
+        assert session.query(EpisodeLog).filter_by(run_id=run_id).count() == 20
+
+    results = summarize_sweep(session, run_ids, window=10)
+    assert sorted(result.run_id for result in results) == sorted(run_ids)
+    assert results[0].mean_reward >= results[1].mean_reward
+    assert {result.gamma for result in results} == {0.9, 0.99}
+    for result in results:
+        assert 0.0 <= result.finish_rate <= 1.0
+        assert result.name.startswith("test γ=")
+    session.close()
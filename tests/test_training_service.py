@@ -0,0 +1,242 @@
+"""
+Tests de training_service.py (sans Tk : un faux widget sert d'horloge).
+
+Couvre :
+- La fin normale d'un job et la remontée du résultat.
+- Le regroupement des progressions (seule la dernière est affichée).
+- Pause / reprise et annulation coopératives.
+- La remontée d'une exception via on_error.
+- TrainingJobMixin : fin relevée par l'application même quand la vue a été
+  quittée, callbacks de la vue seulement si elle existe encore, un seul
+  thread d'entraînement à la fois après une annulation.
+"""
+
+import threading
+
+from training_service import TrainingCancelled, TrainingJob, TrainingJobMixin
+
+
+class _FakeWidget:
+    """Remplace la vue : `after` mémorise l'appel au lieu de le planifier."""
+
+    def __init__(self) -> None:
+        self.alive = True
+        self.scheduled = []
+
+    def winfo_exists(self) -> bool:
+        return self.alive
+
+    def after(self, delay, callback, *args) -> None:
+        self.scheduled.append((callback, args))
+
+
+class _FakeApp(TrainingJobMixin, _FakeWidget):
+    """Application minimale : horloge `after` du faux widget."""
+
+    def run_scheduled(self) -> None:
+        """Exécute les relèves planifiées jusqu'à la fin du suivi."""
+        while self.scheduled:
+            callback, args = self.scheduled.pop(0)
+            callback(*args)
+
+
+class _FakeView(_FakeWidget):
+    """Vue d'entraînement : enregistre ce qu'on lui demande d'afficher."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.progress = []
+        self.cancelled = False
+
+    def update_progress(self, current: int, total: int) -> None:
+        self.progress.append((current, total))
+
+    def show_cancelled(self) -> None:
+        self.cancelled = True
+
+
+def _poll(job: TrainingJob, widget: _FakeWidget, **callbacks) -> list:
+    """Relève la file une fois et renvoie les progressions affichées."""
+    shown = []
+    job.poll(widget, on_progress=lambda cur, tot: shown.append((cur, tot)), **callbacks)
+    return shown
+
+
+def test_done_delivers_last_progress_and_result() -> None:
+    def target(progress):
+        for i in range(1, 6):
+            progress(i, 5)
+        return "ok"
+
+    job = TrainingJob(target)
+    job.start()
+    job.join(5)
+
+    results = []
+    widget = _FakeWidget()
+    shown = _poll(job, widget, on_done=results.append)
+    assert shown == [(5, 5)]
+    assert results == ["ok"]
+    assert widget.scheduled == []   # suivi terminé
+
+
+def test_poll_reschedules_while_running() -> None:
+    release = threading.Event()
+    job = TrainingJob(lambda progress: release.wait(5))
+    job.start()
+
+    widget = _FakeWidget()
+    _poll(job, widget, on_done=lambda result: None)
+    assert len(widget.scheduled) == 1
+
+    release.set()
+    job.join(5)
+
+
+def _paused_job(steps: list) -> TrainingJob:
+    """Job de 1000 pas démarré en pause (bloqué au 1er point de contrôle)."""
+    def target(progress):
+        for i in range(1000):
+            steps.append(i)
+            progress(i, 1000)
+        return len(steps)
+
+    job = TrainingJob(target)
+    job.pause()
+    job.start()
+    job.join(0.2)
+    assert job.is_alive() and job.paused
+    assert steps == [0]
+    return job
+
+
+def test_pause_then_resume_completes() -> None:
+    steps = []
+    job = _paused_job(steps)
+    job.resume()
+    job.join(5)
+    assert not job.is_alive()
+    assert job.result == 1000
+
+
+def test_cancel_unblocks_pause_and_stops() -> None:
+    steps = []
+    job = _paused_job(steps)
+    job.cancel()
+    job.join(5)
+    assert not job.is_alive()
+    assert steps == [0]
+
+    cancelled = []
+    _poll(job, _FakeWidget(), on_done=lambda r: None, on_cancelled=lambda: cancelled.append(True))
+    assert cancelled == [True]
+
+
+def test_destroyed_widget_cancels_job() -> None:
+    def target(progress):
+        while True:
+            progress(0, 1)
+
+    job = TrainingJob(target)
+    job.start()
+    _poll(job, _FakeWidget(), on_done=lambda r: None)
+
+    dead = _FakeWidget()
+    dead.alive = False
+    _poll(job, dead, on_done=lambda r: None)
+    job.join(5)
+    assert job.cancelled and not job.is_alive()
+
+
+def test_error_routed_to_on_error() -> None:
+    def target(progress):
+        raise ValueError("boom")
+
+    job = TrainingJob(target)
+    job.start()
+    job.join(5)
+
+    errors = []
+    _poll(job, _FakeWidget(), on_done=lambda r: None, on_error=errors.append)
+    assert isinstance(errors[0], ValueError)
+    assert not isinstance(errors[0], TrainingCancelled)
+
+
+def test_mixin_clears_job_and_notifies_app_on_done() -> None:
+    app, view = _FakeApp(), _FakeView()
+    release = threading.Event()
+
+    def target(progress):
+        release.wait(5)
+        progress(1, 1)
+        return "ok"
+
+    done, finished = [], []
+    job = app._start_training_job(target, view, on_done=done.append,
+                                  on_finished=lambda: finished.append(True))
+    assert app.training_job is job
+    release.set()
+    job.join(5)
+    app.run_scheduled()
+
+    assert view.progress == [(1, 1)]
+    assert done == ["ok"] and finished == [True]
+    assert app.training_job is None
+
+
+def test_mixin_finishes_cancelled_job_after_view_is_left() -> None:
+    app, view = _FakeApp(), _FakeView()
+    release = threading.Event()
+
+    def target(progress):
+        release.wait(5)
+        progress(0, 1)
+
+    finished = []
+    job = app._start_training_job(target, view, on_done=lambda r: None,
+                                  on_finished=lambda: finished.append(True))
+    app._cancel_training()
+    view.alive = False          # l'utilisateur a quitté la vue
+    release.set()
+    job.join(5)
+    app.run_scheduled()
+
+    assert finished == [True]   # l'application est prévenue
+    assert not view.cancelled   # la vue détruite n'est plus appelée
+
+
+def test_mixin_starts_new_job_only_after_cancelled_thread_ends() -> None:
+    app = _FakeApp()
+    release = threading.Event()
+    events = []
+
+    def first(progress):
+        release.wait(5)
+        events.append("first commit")     # écriture finale du job annulé
+        progress(0, 1)
+
+    def second(progress):
+        events.append("second start")
+        return "ok"
+
+    old_view = _FakeView()
+    job = app._start_training_job(first, old_view, on_done=lambda r: None,
+                                  on_finished=lambda: events.append("first finished"))
+    app._cancel_training()
+    assert app.training_job is job        # thread encore vivant
+    old_view.alive = False                # retour au menu puis nouvelle vue
+
+    done = []
+    follower = app._start_training_job(second, _FakeView(), on_done=done.append)
+    assert app.training_job is follower
+    assert not follower.is_alive()        # en attente du premier thread
+
+    release.set()
+    job.join(5)
+    app.run_scheduled()
+    follower.join(5)
+    app.run_scheduled()
+
+    assert events == ["first commit", "first finished", "second start"]
+    assert done == ["ok"]
+    assert app.training_job is None
@@ -0,0 +1,85 @@
+"""
+Tests de games/pixel_kart/transition_table.py et de ai_train.compile_rewards.
+
+Couvre :
+- L'équivalence, pour chaque configuration atteignable et chaque action,
+  entre la table compilée et `Race.apply_action` (arrivée, crash, tours)
+  ainsi qu'avec `compute_reward` (récompense + termes de tour).
+- L'encodage d'état précalculé vs `encode_state_index`.
+- Le cache par empreinte de `Circuit.raw`.
+"""
+
+import numpy as np
+import pytest
+
+from games.pixel_kart.ai_state import ACTIONS, encode_state_index
+from games.pixel_kart.ai_train import compile_rewards, compute_reward
+from games.pixel_kart.editor import map_dao
+from games.pixel_kart.game_model import Circuit, Kart, Race
+from games.pixel_kart.transition_table import CACHE_SIZE, NB_ACTIONS, UNREACHABLE, compile_circuit
+
+
+def _circuits() -> list[Circuit]:
+    """Circuits de l'éditeur + un mini-circuit avec herbe, murs et bord."""
+    circuits = [Circuit(name=name, raw=raw) for name, raw in map_dao.get_all().items()]
+    circuits.append(Circuit(name="mini", raw="RRGRR,RWFGR,RRRRW"))
+    return circuits
+
+
+@pytest.mark.parametrize("circuit", _circuits(), ids=lambda c: c.name)
+def test_table_matches_race_dynamics_and_rewards(circuit: Circuit) -> None:
+    """Toute transition atteignable = Race.apply_action + compute_reward."""
+    table = compile_circuit(circuit)
+    rewards = compile_rewards(circuit)
+    race = Race(circuit=circuit, karts=[], nb_turns=1)
+    kart = Kart("k")
+
+    assert table.reachable > 0
+    for config in np.flatnonzero(table.state != UNREACHABLE).tolist():
+        position, direction, speed = table.decode(config)
+        assert table.config_of(position, direction, speed) == config
+        kart.position, kart.direction, kart.speed = position, direction, speed
+        assert table.state[config] == encode_state_index(kart, circuit)
+
+        for column, action in enumerate(ACTIONS):
+            for turns_before in (-1, 0, 1):
+                kart.position, kart.direction, kart.speed = position, direction, speed
+                kart.turns_done, kart.is_alive = turns_before, True
+                before = kart.to_dto()
+                race.apply_action(kart, action)
+
+                transition = config * NB_ACTIONS + column
+                assert table.decode(int(table.next_config[transition])) == \
+                    (kart.position, kart.direction, kart.speed)
+                assert bool(table.crashed[transition]) == (not kart.is_alive)
+                lap = int(table.lap_delta[transition])
+                assert turns_before + lap == kart.turns_done
+
+                reward = rewards[transition]
+                if not table.crashed[transition]:
+                    if lap > 0:
+                        reward += 400.0 if kart.turns_done > 0 else 0.0
+                    elif lap < 0:
+                        reward -= 30.0
+                assert reward == compute_reward(before, kart.to_dto(), circuit)
+
+
+def test_table_is_cached_by_circuit_raw() -> None:
+    raw = "RRGRR,RWFGR,RRRRW"
+    table = compile_circuit(Circuit(name="a", raw=raw))
+    assert compile_circuit(Circuit(name="b", raw=raw)) is table
+    assert compile_circuit(Circuit(name="c", raw="RRRRR,RRFRR,RRRRR")) is not table
+    assert compile_rewards(Circuit(name="b", raw=raw)) is compile_rewards(Circuit(name="a", raw=raw))
+
+
+def test_table_cache_is_bounded() -> None:
+    """Un tracé sort du cache après CACHE_SIZE tracés plus récents."""
+    first = Circuit(name="old", raw="RRFRR,RRRRR")
+    table, rewards = compile_circuit(first), compile_rewards(first)
+    for width in range(CACHE_SIZE):
+        edited = Circuit(name="edited", raw="RRFRR" + "R" * (width + 1) + ",RRRRR" + "R" * (width + 1))
+        compile_circuit(edited)
+        compile_rewards(edited)
+    assert compile_circuit(first) is not table
+    assert compile_rewards(first) is not rewards
+    assert compile_rewards(first) == rewards
@@ -0,0 +1,379 @@
+"""
+Service d'entraînement en arrière-plan partagé par les trois jeux.
+
+Les boucles d'entraînement (Allumette, Cubee, Pixel Kart) tournent dans un
+thread de travail au lieu du thread Tk : la fenêtre reste réactive et la
+boucle n'est plus ralentie par des `view.update()` répétés.
+
+Communication :
+- La boucle reçoit un `progress_callback(current, total)` (même contrat que
+  les fonctions `train*` existantes). Chaque appel dépose la progression
+  dans une `queue.Queue` et sert de point de contrôle : il bloque tant que
+  le job est en pause et lève `TrainingCancelled` si le job est annulé.
+- La vue appelle `job.poll(widget, ...)` : un `after()` périodique vide la
+  file, ne garde que la dernière progression (coût d'affichage indépendant
+  du débit d'entraînement) et appelle `on_done` / `on_error` /
+  `on_cancelled` à la fin, toujours dans le thread Tk.
+
+Pause et annulation sont coopératives : elles prennent effet au prochain
+appel du callback de progression (fin de lot, flush, etc.).
+
+Côté Tk, les trois applications partagent :
+- `TrainingJobMixin` : le job courant (`training_job`), son démarrage et les
+  callbacks Pause / Reprise / Annulation à brancher sur la vue ;
+- `TrainingControls` : la rangée de boutons Pause / Annuler des vues
+  d'entraînement.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+from language_manager import lang_manager
+
+
+_POLL_INTERVAL_MS: int = 100
+"""Période de rafraîchissement de la vue (indépendante de l'entraînement)."""
+
+
+class TrainingCancelled(Exception):
+    """Levée dans le thread de travail quand le job est annulé."""
+
+
+class TrainingJob:
+    """
+    Une boucle d'entraînement exécutée dans un thread de travail.
+
+    Utilisation typique (dans l'application Tk) :
+        job = TrainingJob(lambda progress: train(..., progress_callback=progress))
+        job.start()
+        job.poll(view, on_progress=view.update_progress, on_done=show_results)
+        ...
+        job.pause() / job.resume() / job.cancel()
+
+    Attributes:
+        target: Fonction(progress_callback) -> résultat, exécutée dans le thread.
+        result: Valeur renvoyée par `target` une fois le job terminé.
+    """
+
+    def __init__(self, target: Callable[[Callable[[int, int], None]], Any]) -> None:
+        """
+        Prépare le job sans le démarrer.
+
+        Args:
+            target: Fonction appelée dans le thread avec le callback de
+                progression à transmettre à la boucle d'entraînement.
+        """
+        self.target = target
+        self.result: Any = None
+        self._messages: queue.Queue = queue.Queue()
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Contrôle (thread Tk)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Démarre le thread de travail."""
+        self._thread.start()
+
+    def pause(self) -> None:
+        """Suspend la boucle au prochain point de contrôle."""
+        self._running.clear()
+
+    def resume(self) -> None:
+        """Relance une boucle suspendue."""
+        self._running.set()
+
+    def cancel(self) -> None:
+        """Demande l'arrêt de la boucle (débloque aussi une pause)."""
+        self._cancelled.set()
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        """Vrai si une pause est demandée."""
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Vrai si une annulation est demandée."""
+        return self._cancelled.is_set()
+
+    def is_alive(self) -> bool:
+        """Vrai tant que le thread de travail tourne."""
+        return self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Attend la fin du thread de travail (tests, fermeture)."""
+        self._thread.join(timeout)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Thread de travail
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _checkpoint(self, current: int, total: int) -> None:
+        """Callback de progression passé à la boucle : publie, pause, annule."""
+        self._messages.put(("progress", (current, total)))
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise TrainingCancelled()
+
+    def _run(self) -> None:
+        """Exécute `target` et publie le message de fin dans la file."""
+        try:
+            self.result = self.target(self._checkpoint)
+        except TrainingCancelled:
+            self._messages.put(("cancelled", None))
+        except Exception as error:  # remonté à la vue via on_error
+            self._messages.put(("error", error))
+        else:
+            self._messages.put(("done", self.result))
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Suivi depuis la vue (thread Tk)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def poll(
+        self,
+        widget,
+        on_progress: Callable[[int, int], None],
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        interval_ms: int = _POLL_INTERVAL_MS,
+    ) -> None:
+        """
+        Vide la file des messages puis se re-planifie via `widget.after`.
+
+        Si le widget a été détruit (l'utilisateur a quitté la vue), le job
+        est annulé et le suivi s'arrête.
+
+        Args:
+            widget: Widget Tk servant d'horloge (`after`), en général la vue.
+            on_progress: Appelé avec la dernière progression reçue.
+            on_done: Appelé avec le résultat de `target` en fin de job.
+            on_error: Appelé avec l'exception levée par `target` (sinon
+                l'exception est relancée dans le thread Tk).
+            on_cancelled: Appelé quand l'annulation a pris effet.
+            interval_ms: Période de relève de la file.
+        """
+        if not widget.winfo_exists():
+            self.cancel()
+            return
+
+        latest = None
+        while True:
+            try:
+                kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest = payload
+                continue
+            if latest is not None:
+                on_progress(*latest)
+            if kind == "done":
+                on_done(payload)
+            elif kind == "cancelled":
+                if on_cancelled is not None:
+                    on_cancelled()
+            elif on_error is not None:
+                on_error(payload)
+            else:
+                raise payload
+            return
+
+        if latest is not None:
+            on_progress(*latest)
+        widget.after(
+            interval_ms, self.poll, widget, on_progress, on_done,
+            on_error, on_cancelled, interval_ms,
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Intégration Tk (applications et vues d'entraînement)
+# ──────────────────────────────────────────────────────────────────────────
+
+
+class TrainingJobMixin:
+    """
+    Gestion du job d'entraînement d'une application Tk (fenêtre `tk.Tk`).
+
+    La vue d'entraînement reçoit `_pause_training`, `_resume_training` et
+    `_cancel_training` comme callbacks ; l'application lance la boucle via
+    `_start_training_job` et annule le job en quittant la vue.
+
+    Un seul thread d'entraînement tourne à la fois : un job annulé reste
+    dans `training_job` jusqu'à la fin effective de son thread, et un job
+    lancé entre temps attend cette fin pour démarrer (les deux écriraient
+    sinon dans la même base).
+
+    Attributes:
+        training_job: Dernier job lancé, jusqu'à la fin de son thread, ou None.
+    """
+
+    training_job: Optional[TrainingJob] = None
+    _queued_launch: Optional[Callable[[], None]] = None
+
+    def _start_training_job(
+        self,
+        target: Callable[[Callable[[int, int], None]], Any],
+        view,
+        on_done: Callable[[Any], None],
+        on_finished: Optional[Callable[[], None]] = None,
+    ) -> TrainingJob:
+        """
+        Démarre `target` dans un thread et suit sa progression dans `view`.
+
+        Le suivi est cadencé par l'application (et non par la vue) : la fin
+        du thread est relevée même si l'utilisateur a quitté la vue entre
+        temps. Les méthodes de la vue ne sont appelées que si elle existe
+        encore.
+
+        Si le thread du job précédent tourne encore (annulation en cours),
+        ce job est annulé et le nouveau est mis en attente : il démarre à la
+        fin de ce thread. Un job en attente remplacé par un plus récent
+        n'est jamais lancé.
+
+        Args:
+            target: Boucle d'entraînement, cf. `TrainingJob`.
+            view: Vue d'entraînement (`update_progress`, `show_cancelled`).
+            on_done: Appelé avec le résultat de `target` si la vue existe
+                encore (affichage des résultats).
+            on_finished: Appelé dans le thread Tk à la fin du thread de
+                travail, quelle qu'en soit l'issue (mise à jour de l'état de
+                l'application, par exemple).
+
+        Returns:
+            Le job, démarré ou en attente (aussi rangé dans `training_job`).
+        """
+        job = TrainingJob(target)
+
+        def settle() -> None:
+            if self.training_job is job:
+                self.training_job = None
+            if on_finished is not None:
+                on_finished()
+            queued, self._queued_launch = self._queued_launch, None
+            if queued is not None:
+                queued()
+
+        def progressed(current: int, total: int) -> None:
+            if view.winfo_exists():
+                view.update_progress(current, total)
+
+        def done(result: Any) -> None:
+            settle()
+            if view.winfo_exists():
+                on_done(result)
+
+        def cancelled() -> None:
+            settle()
+            if view.winfo_exists():
+                view.show_cancelled()
+
+        def failed(error: Exception) -> None:
+            settle()
+            raise error
+
+        def launch() -> None:
+            if job.cancelled:       # annulé pendant l'attente : jamais démarré
+                cancelled()
+                return
+            job.start()
+            job.poll(self, on_progress=progressed, on_done=done,
+                     on_error=failed, on_cancelled=cancelled)
+
+        running = self.training_job
+        self.training_job = job
+        if running is not None:
+            running.cancel()
+            self._queued_launch = launch
+        else:
+            launch()
+        return job
+
+    def _pause_training(self) -> None:
+        """Suspend l'entraînement en cours (bouton Pause de la vue)."""
+        if self.training_job is not None:
+            self.training_job.pause()
+
+    def _resume_training(self) -> None:
+        """Reprend l'entraînement suspendu."""
+        if self.training_job is not None:
+            self.training_job.resume()
+
+    def _cancel_training(self) -> None:
+        """Annule l'entraînement en cours, s'il y en a un."""
+        if self.training_job is not None:
+            self.training_job.cancel()   # retiré à la fin de son thread
+
+
+class TrainingControls(tk.Frame):
+    """
+    Boutons Pause / Reprendre et Annuler d'une vue d'entraînement.
+
+    Callbacks :
+        on_pause() / on_resume() / on_cancel()
+            En général `_pause_training`, `_resume_training` et
+            `_cancel_training` de l'application (cf. TrainingJobMixin).
+    """
+
+    def __init__(self, master, on_pause=None, on_resume=None, on_cancel=None,
+                 bg: Optional[str] = None, font=("Helvetica", 11)) -> None:
+        """
+        Construit les deux boutons, côte à côte.
+
+        Args:
+            master: Frame parente (section progression de la vue).
+            on_pause: Callback() pour suspendre l'entraînement.
+            on_resume: Callback() pour le reprendre.
+            on_cancel: Callback() pour l'annuler.
+            bg: Couleur de fond (celle de la carte parente par défaut).
+            font: Police des boutons.
+        """
+        super().__init__(master, bg=bg if bg is not None else master.cget("bg"))
+        self.on_pause = on_pause
+        self.on_resume = on_resume
+        self.on_cancel = on_cancel
+        self.paused = False
+
+        self.pause_btn = tk.Button(self, text=lang_manager.get_text("train_pause"),
+                                   font=font, command=self._on_pause_click)
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = tk.Button(self, text=lang_manager.get_text("train_cancel"),
+                                    font=font, command=self._on_cancel_click)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+
+    def _on_pause_click(self) -> None:
+        """Bascule pause / reprise de l'entraînement en cours."""
+        self.paused = not self.paused
+        self.update_language()
+        callback = self.on_pause if self.paused else self.on_resume
+        if callback:
+            callback()
+
+    def _on_cancel_click(self) -> None:
+        """Demande l'annulation de l'entraînement en cours."""
+        self.cancel_btn.config(state="disabled")
+        if self.on_cancel:
+            self.on_cancel()
+
+    def reset(self) -> None:
+        """Remet les boutons dans leur état initial (nouvel entraînement)."""
+        self.paused = False
+        self.cancel_btn.config(state="normal")
+        self.update_language()
+
+    def update_language(self) -> None:
+        """Recharge les libellés depuis le LanguageManager."""
+        self.pause_btn.config(
+            text=lang_manager.get_text("train_resume" if self.paused else "train_pause")
+        )
+        self.cancel_btn.config(text=lang_manager.get_text("train_cancel"))
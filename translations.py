@@ -27,9 +27,11 @@ TRANSLATIONS = {
         "cubee_train_gamma": "Gamma (γ):",
         "cubee_train_alpha": "Learning rate (α):",
         "cubee_train_epsilon": "Initial epsilon (ε):",
+        "cubee_train_workers": "Worker processes:",
         "cubee_train_opponent": "Opponent:",
         "cubee_train_opponent_random": "Random",
         "cubee_train_opponent_self": "Self-play (AI vs AI)",
+        "cubee_train_opponent_search": "Alpha-beta search",
         "cubee_train_start": "Start Training",
         "cubee_train_progress": "Progress",
         "cubee_train_games_played": "Games played: {}/{}",
@@ -77,6 +79,7 @@ TRANSLATIONS = {
         "pk_train_alpha": "Learning rate (α):",
         "pk_train_epsilon_start": "Epsilon start:",
         "pk_train_epsilon_end": "Epsilon end:",
+        "pk_train_workers": "Worker processes:",
         "pk_train_start": "Start Training",
         "pk_train_progress": "Training progress",
         "pk_train_progress_label": "Episodes: {}/{}",
@@ -123,6 +126,11 @@ TRANSLATIONS = {
         "opp_wins": "Opponent wins: {} ({}%)",
         "analysis": "Analysis: {}",
         "save_results": "Save to File",
+
+        # Contrôle d'un entraînement en cours (training_service)
+        "train_pause": "⏸ Pause",
+        "train_resume": "▶ Resume",
+        "train_cancel": "✖ Cancel",
         
         # Analyses
         "balanced": "The training was balanced.",
@@ -151,9 +159,11 @@ TRANSLATIONS = {
         "cubee_train_gamma": "Gamma (γ) :",
         "cubee_train_alpha": "Taux d'apprentissage (α) :",
         "cubee_train_epsilon": "Epsilon initial (ε) :",
+        "cubee_train_workers": "Processus de calcul :",
         "cubee_train_opponent": "Adversaire :",
         "cubee_train_opponent_random": "Random",
         "cubee_train_opponent_self": "Self-play (IA contre IA)",
+        "cubee_train_opponent_search": "Recherche alpha-beta",
         "cubee_train_start": "Lancer l'entraînement",
         "cubee_train_progress": "Progression",
         "cubee_train_games_played": "Parties jouées : {}/{}",
@@ -201,6 +211,7 @@ TRANSLATIONS = {
         "pk_train_alpha": "Taux d'apprentissage (α) :",
         "pk_train_epsilon_start": "Epsilon initial :",
         "pk_train_epsilon_end": "Epsilon final :",
+        "pk_train_workers": "Processus de calcul :",
         "pk_train_start": "Lancer l'entraînement",
         "pk_train_progress": "Progression de l'entraînement",
         "pk_train_progress_label": "Épisodes : {}/{}",
@@ -247,6 +258,11 @@ TRANSLATIONS = {
         "opp_wins": "Victoires Adversaire : {} ({}%)",
         "analysis": "Analyse : {}",
         "save_results": "Sauvegarder les Résultats",
+
+        # Contrôle d'un entraînement en cours (training_service)
+        "train_pause": "⏸ Pause",
+        "train_resume": "▶ Reprendre",
+        "train_cancel": "✖ Annuler",
         
         # Analyses
         "balanced": "Les résultats sont équilibrés.",